@@ -0,0 +1,181 @@
+# app/api/admission.py
+"""
+Contrôle d'admission des requêtes : protège le worker des clients trop gourmands.
+
+Les endpoints exécutent leur travail (SQL, simulation) de façon bloquante dans la boucle d'événements :
+quelques simulations ou longs parcours de listes en parallèle suffisent à ralentir toutes les autres
+requêtes. Ce middleware refuse tôt, avant tout travail, ce qui dépasse les limites :
+- limite de débit par client (seau à jetons) sur toutes les requêtes, et une plus stricte sur les
+  simulations : 429 avec Retry-After (délai avant le prochain jeton) ;
+- nombre maximal de requêtes simultanées par famille de routes coûteuses (simulations, parcours de
+  listes), par worker : 503 avec Retry-After. Le total des limites doit rester sous la taille du pool
+  de connexions (5 + 10 par défaut) : une requête qui attend une connexion bloque la boucle d'événements,
+  donc aussi les requêtes qui la rendraient.
+
+Chaque tentative consomme un jeton, y compris celles refusées faute de place.
+
+Le client est identifié par son adresse IP (ou le premier X-Forwarded-For derrière un proxy de confiance).
+Les seaux sont en mémoire du processus, ou dans un fichier SQLite local partagé par les workers
+d'une même machine (settings.ADMISSION_STATE_PATH), qui tient lieu de stockage partagé (type Redis).
+"""
+import math
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Pattern, Tuple
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+
+class RouteRule:
+    """Famille de routes coûteuses : limite de simultanéité et limite de débit propre (optionnelles)."""
+
+    def __init__(self, nom: str, methode: str, motif: str, max_concurrent: int = 0, par_minute: float = 0):
+        self.nom = nom
+        self.methode = methode
+        self.motif: Pattern[str] = re.compile(motif)
+        self.max_concurrent = max_concurrent # 0 = pas de limite
+        self.par_minute = par_minute # 0 = pas de limite de débit propre
+
+    def matches(self, methode: str, path: str) -> bool:
+        return methode == self.methode and self.motif.match(path) is not None
+
+def default_rules() -> Tuple[RouteRule, ...]:
+    """Familles de routes coûteuses de l'API v1, limites lues dans settings."""
+    return (
+        RouteRule("simulations", "POST", r"^/api/v1/simulations/(run|run/stream|compare)$",
+                  max_concurrent=settings.SIMULATION_MAX_CONCURRENT, par_minute=settings.RATE_LIMIT_SIMULATIONS_PER_MINUTE),
+        # Listes paginées sans filtre (parcours de tables entières page par page)
+        RouteRule("listes", "GET", r"^/api/v1/(employes|pointages|evaluations)/$|^/api/v1/pointages/open$",
+                  max_concurrent=settings.LIST_MAX_CONCURRENT),
+    )
+
+class MemoryBuckets:
+    """Seaux à jetons en mémoire du processus."""
+
+    MAX_KEYS = 100000 # Au-delà, les seaux pleins (clients inactifs) sont oubliés
+
+    def __init__(self):
+        self.buckets: Dict[str, Tuple[float, float]] = {}
+        self.lock = threading.Lock()
+
+    def take(self, cle: str, taux: float, capacite: float, maintenant: float) -> float:
+        """Consomme un jeton ; renvoie 0 si la requête est admise, sinon le délai (s) avant le prochain jeton."""
+        with self.lock:
+            jetons, date = self.buckets.get(cle, (capacite, maintenant))
+            jetons = min(capacite, jetons + (maintenant - date) * taux)
+            attente = 0.0 if jetons >= 1 else (1 - jetons) / taux
+            self.buckets[cle] = (jetons - 1 if attente == 0 else jetons, maintenant)
+            if len(self.buckets) > self.MAX_KEYS:
+                self._prune(maintenant)
+            return attente
+
+    def _prune(self, maintenant: float) -> None:
+        # Sans connaître le taux de chaque seau, on garde ceux touchés dans la dernière minute
+        self.buckets = {cle: valeur for cle, valeur in self.buckets.items() if maintenant - valeur[1] < 60}
+
+class SQLiteBuckets:
+    """
+    Seaux à jetons dans un fichier SQLite partagé par les workers d'une machine : chaque prise de
+    jeton est une courte transaction BEGIN IMMEDIATE (sérialisée entre processus).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.local = threading.local() # Une connexion par thread
+        with self._connection() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS admission_buckets (cle TEXT PRIMARY KEY, jetons REAL, date REAL)")
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=1, isolation_level=None)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = OFF") # État jetable : inutile de le rendre durable
+            self.local.conn = conn
+        return conn
+
+    def take(self, cle: str, taux: float, capacite: float, maintenant: float) -> float:
+        conn = self._connection()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            ligne = conn.execute("SELECT jetons, date FROM admission_buckets WHERE cle = ?", (cle,)).fetchone()
+            jetons, date = ligne if ligne else (capacite, maintenant)
+            jetons = min(capacite, jetons + max(0.0, maintenant - date) * taux)
+            attente = 0.0 if jetons >= 1 else (1 - jetons) / taux
+            conn.execute(
+                "INSERT INTO admission_buckets (cle, jetons, date) VALUES (?, ?, ?) "
+                "ON CONFLICT (cle) DO UPDATE SET jetons = excluded.jetons, date = excluded.date",
+                (cle, jetons - 1 if attente == 0 else jetons, maintenant)
+            )
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            return 0.0 # État partagé indisponible : on admet plutôt que de refuser tout le monde
+        return attente
+
+class AdmissionControlMiddleware:
+    """Middleware ASGI de limitation de débit et de simultanéité (voir le docstring du module)."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        rules: Tuple[RouteRule, ...] = (),
+        par_seconde: float = 0,
+        rafale: Optional[float] = None,
+        state_path: str = "",
+        trust_forwarded: bool = False
+    ) -> None:
+        self.app = app
+        self.rules = rules
+        self.par_seconde = par_seconde # Limite générale par client (0 = aucune)
+        self.rafale = rafale or max(1.0, 2 * par_seconde)
+        self.buckets = SQLiteBuckets(state_path) if state_path else MemoryBuckets()
+        self.trust_forwarded = trust_forwarded
+        self.en_cours: Dict[str, int] = {rule.nom: 0 for rule in rules} # Par worker (boucle d'événements unique)
+
+    def _client(self, scope: Scope) -> str:
+        if self.trust_forwarded:
+            for nom, valeur in scope["headers"]:
+                if nom == b"x-forwarded-for":
+                    return valeur.decode("latin-1").split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "inconnu"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] == "/ping":
+            await self.app(scope, receive, send)
+            return
+
+        rule = next((r for r in self.rules if r.matches(scope["method"], scope["path"])), None)
+        if self.par_seconde > 0 or (rule is not None and rule.par_minute > 0):
+            client, maintenant = self._client(scope), time.time()
+            attente = 0.0
+            if self.par_seconde > 0:
+                attente = self.buckets.take(f"*:{client}", self.par_seconde, self.rafale, maintenant)
+            if attente == 0 and rule is not None and rule.par_minute > 0:
+                # Rafale d'une minute de quota au plus, et au moins une requête
+                attente = self.buckets.take(f"{rule.nom}:{client}", rule.par_minute / 60, max(1.0, rule.par_minute), maintenant)
+            if attente > 0:
+                await self._reject(scope, receive, send, 429, "Trop de requêtes : limite de débit atteinte.", attente)
+                return
+
+        if rule is None or not rule.max_concurrent:
+            await self.app(scope, receive, send)
+            return
+        if self.en_cours[rule.nom] >= rule.max_concurrent:
+            await self._reject(scope, receive, send, 503, f"Serveur saturé ({rule.nom}) : réessayer plus tard.", 1)
+            return
+        self.en_cours[rule.nom] += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.en_cours[rule.nom] -= 1
+
+    async def _reject(self, scope: Scope, receive: Receive, send: Send, status_code: int, detail: str, attente: float) -> None:
+        response = JSONResponse({"detail": detail}, status_code=status_code, headers={"Retry-After": str(max(1, math.ceil(attente)))})
+        await response(scope, receive, send)
@@ -1,7 +1,7 @@
 # app/api/api_v1/api.py
 from fastapi import APIRouter
 
-from app.api.api_v1.endpoints import employes, departements, pointages, evaluations, simulations
+from app.api.api_v1.endpoints import employes, departements, pointages, evaluations, simulations, events, horaires
 # Importez ici les futurs routeurs (departements, pointages, etc.)
 # from app.api.api_v1.endpoints import departements
 # from app.api.api_v1.endpoints import pointages
@@ -16,6 +16,8 @@ api_router.include_router(departements.router, prefix="/departements", tags=["D
 api_router.include_router(pointages.router, prefix="/pointages", tags=["Pointages"])
 api_router.include_router(evaluations.router, prefix="/evaluations", tags=["Évaluations"])
 api_router.include_router(simulations.router, prefix="/simulations", tags=["Simulations"])
+api_router.include_router(events.router, prefix="/events", tags=["Événements"])
+api_router.include_router(horaires.router, prefix="/horaires", tags=["Horaires"])
 
 # Inclure les autres routeurs quand ils seront prêts
 # api_router.include_router(departements.router, prefix="/departements", tags=["Départements"])
@@ -1,10 +1,14 @@
 # app/api/api_v1/endpoints/departements.py
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.orm import Session
-from typing import List, Any
+from typing import List, Any, Tuple
 
 from app import crud, schemas # Utilise-les __init__.py
+from app.core.config import settings
 from app.db.session import get_db
+from app.api.serialization import rows_response, sparse_fields
+from app.api.caching import CACHE_CONTROL_SHORT, cache_validators, not_modified_response, set_cache_headers
+from app.api.single_flight import session_key, single_flight
 
 router = APIRouter(
     tags=["Départements"] # Tag pour Swagger UI
@@ -36,32 +40,74 @@ async def create_new_departement(
 
 @router.get("/", response_model=List[schemas.Departement])
 async def read_all_departements(
+    request: Request,
     skip: int = 0,
     limit: int = Query(default=100, ge=1, le=500),
+    fields: Tuple[str, ...] = Depends(sparse_fields(schemas.Departement)),
     db: Session = Depends(get_db)
 ):
     """
     Récupère la liste de tous les départements avec pagination.
+    Supporte If-None-Match / If-Modified-Since (304 si la liste n'a pas changé).
     """
-    departements = crud.departement.get_departements(db, skip=skip, limit=limit)
-    return departements
+    etag, last_modified = cache_validators(db, "departements")
+    cached = not_modified_response(request, etag, last_modified, CACHE_CONTROL_SHORT)
+    if cached is not None:
+        return cached
+    departements = crud.departement.get_departements(db, skip=skip, limit=limit, fields=fields)
+    return set_cache_headers(rows_response(departements, fields), etag, last_modified, CACHE_CONTROL_SHORT)
 
 @router.get("/{departement_id}", response_model=schemas.Departement)
 async def read_single_departement(
     departement_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """
     Récupère un département spécifique par son ID.
+    Supporte If-None-Match / If-Modified-Since (304 si le département n'a pas changé).
     """
+    etag, last_modified = cache_validators(db, f"departements:{departement_id}")
+    cached = not_modified_response(request, etag, last_modified, CACHE_CONTROL_SHORT)
+    if cached is not None:
+        return cached
     db_departement = crud.departement.get_departement(db, departement_id=departement_id)
     if db_departement is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Le département avec l'ID {departement_id} n'a pas été trouvé."
         )
+    set_cache_headers(response, etag, last_modified, CACHE_CONTROL_SHORT)
     return db_departement
 
+@router.get("/{departement_id}/projections", response_model=List[schemas.ProjectionEmploye])
+async def read_departement_projections(
+    departement_id: int,
+    horizon_mois: int = Query(default=settings.PROJECTION_HORIZON_MOIS, ge=1, le=120),
+    skip: int = 0,
+    limit: int = Query(default=100, ge=1, le=1000),
+    fields: Tuple[str, ...] = Depends(sparse_fields(schemas.ProjectionEmploye)),
+    db: Session = Depends(get_db)
+):
+    """
+    Récupère les projections de performance (scénario standard) des employés d'un département.
+    Les projections sont pré-calculées en tâche de fond (voir projection_service) :
+    aucune simulation n'est lancée ici.
+    """
+    db_departement = crud.departement.get_departement(db, departement_id=departement_id)
+    if db_departement is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Le département avec l'ID {departement_id} n'a pas été trouvé."
+        )
+    projections = await single_flight.do(
+        "projections_by_departement", (departement_id, horizon_mois, skip, limit, fields, session_key(db)),
+        db, crud.projection.get_projections_by_departement,
+        departement_id=departement_id, horizon_mois=horizon_mois, skip=skip, limit=limit, fields=fields
+    )
+    return rows_response(projections, fields)
+
 @router.put("/{departement_id}", response_model=schemas.Departement)
 async def update_existing_departement(
     departement_id: int,
@@ -96,6 +142,33 @@ async def update_existing_departement(
             detail="Erreur lors de la mise à jour du département."
         )
 
+@router.post("/{departement_id}/reassign", response_model=schemas.DepartementReassignResult)
+async def reassign_departement_employes(
+    departement_id: int,
+    reassign_in: schemas.DepartementReassign,
+    db: Session = Depends(get_db)
+):
+    """
+    Déplace tous les employés du département vers un autre département
+    (ou les laisse sans département si departement_cible_id est null), en une seule requête UPDATE.
+    """
+    db_departement = crud.departement.get_departement(db, departement_id=departement_id)
+    if db_departement is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Le département avec l'ID {departement_id} n'a pas été trouvé."
+        )
+    try:
+        employe_ids = crud.departement.reassign_employes(
+            db, departement_id=departement_id, departement_cible_id=reassign_in.departement_cible_id
+        )
+    except ValueError as e: # Destination inexistante ou identique à l'origine
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return schemas.DepartementReassignResult(
+        departement_id=departement_id,
+        departement_cible_id=reassign_in.departement_cible_id,
+        employes_deplaces=len(employe_ids)
+    )
 
 @router.delete("/{departement_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_existing_departement(
@@ -104,7 +177,7 @@ async def delete_existing_departement(
 ) -> None:
     """
     Supprime un département existant par son ID.
-    Retourne 409 Conflict si le département ne peut pas être supprimé (ex: employés liés).
+    Ses employés sont conservés, sans département (voir POST /{departement_id}/reassign pour les déplacer avant).
     """
     db_departement = crud.departement.get_departement(db, departement_id=departement_id)
     if db_departement is None:
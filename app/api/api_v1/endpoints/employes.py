@@ -1,10 +1,13 @@
 # app/api/api_v1/endpoints/employes.py
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.orm import Session
-from typing import List, Any
+from typing import List, Any, Tuple
 
 from app import crud, models, schemas # Utilise les __init__.py pour importer
 from app.db.session import get_db # Importe la dépendance de session
+from app.api.serialization import rows_response, sparse_fields
+from app.api.caching import cache_validators, not_modified_response, set_cache_headers
+from app.api.single_flight import session_key, single_flight
 
 router = APIRouter(
     # prefix="/employes", # Préfixe pour toutes les routes de ce routeur
@@ -49,8 +52,10 @@ async def create_new_employe(
 
 @router.get("/", response_model=List[schemas.Employe])
 async def read_all_employes(
+    request: Request,
     skip: int = 0,
     limit: int = Query(default=100, ge=1, le=500), # Limite avec validation
+    fields: Tuple[str, ...] = Depends(sparse_fields(schemas.Employe)),
     db: Session = Depends(get_db)
 ):
     """
@@ -58,24 +63,38 @@ async def read_all_employes(
 
     - **skip**: Nombre d'employés à sauter.
     - **limit**: Nombre maximum d'employés à retourner (entre 1 et 500).
+
+    Supporte If-None-Match / If-Modified-Since (304 si la liste n'a pas changé).
     """
-    employes = crud.get_employes(db, skip=skip, limit=limit)
-    return employes
+    etag, last_modified = cache_validators(db, "employes")
+    cached = not_modified_response(request, etag, last_modified)
+    if cached is not None:
+        return cached
+    employes = crud.get_employes(db, skip=skip, limit=limit, fields=fields)
+    return set_cache_headers(rows_response(employes, fields), etag, last_modified)
 
 @router.get("/{employe_id}", response_model=schemas.Employe)
 async def read_single_employe(
     employe_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """
     Récupère un employé spécifique par son ID.
+    Supporte If-None-Match / If-Modified-Since (304 si l'employé n'a pas changé).
     """
+    etag, last_modified = cache_validators(db, f"employes:{employe_id}")
+    cached = not_modified_response(request, etag, last_modified)
+    if cached is not None:
+        return cached
     db_employe = crud.get_employe(db, employe_id=employe_id)
     if db_employe is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"L'employé avec l'ID {employe_id} n'a pas été trouvé."
         )
+    set_cache_headers(response, etag, last_modified)
     return db_employe
 
 @router.put("/{employe_id}", response_model=schemas.Employe)
@@ -113,7 +132,10 @@ async def update_existing_employe(
                  detail=f"Le département avec l'ID {employe_in.departement_id} n'existe pas."
              )
 
-    updated_employe = crud.update_employe(db=db, employe_id=employe_id, employe_update=employe_in)
+    try:
+        updated_employe = crud.update_employe(db=db, employe_id=employe_id, employe_update=employe_in)
+    except ValueError as e: # Mode shardé : département sur un autre shard
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     # update_employe devrait renvoyer None si l'employé n'est pas trouvé, mais nous l'avons déjà vérifié.
     # Si pour une raison quelconque l'update échoue autrement, `updated_employe` pourrait être None ou une erreur serait levée.
     if updated_employe is None:
@@ -147,13 +169,21 @@ async def delete_existing_employe(
 @router.get("/by_departement/{departement_id}", response_model=List[schemas.Employe])
 async def read_employes_by_departement(
     departement_id: int,
+    request: Request,
     skip: int = 0,
     limit: int = Query(default=100, ge=1, le=500),
+    fields: Tuple[str, ...] = Depends(sparse_fields(schemas.Employe)),
     db: Session = Depends(get_db)
 ):
     """
     Récupère la liste des employés pour un département spécifique.
+    Supporte If-None-Match / If-Modified-Since (304 si la liste n'a pas changé).
     """
+    etag, last_modified = cache_validators(db, "employes", f"departements:{departement_id}")
+    cached = not_modified_response(request, etag, last_modified)
+    if cached is not None:
+        return cached
+
     # Vérifier d'abord si le département existe (nécessite crud.departement.get_departement)
     db_departement = crud.departement.get_departement(db, departement_id=departement_id)
     if not db_departement:
@@ -162,5 +192,9 @@ async def read_employes_by_departement(
             detail=f"Le département avec l'ID {departement_id} n'existe pas."
         )
 
-    employes = crud.get_employes_by_departement(db, departement_id=departement_id, skip=skip, limit=limit)
-    return employes
\ No newline at end of file
+    # Requêtes identiques simultanées (même page, même version des données) : une seule lecture
+    employes = await single_flight.do(
+        "employes_by_departement", (departement_id, skip, limit, fields, etag, session_key(db)),
+        db, crud.get_employes_by_departement, departement_id=departement_id, skip=skip, limit=limit, fields=fields
+    )
+    return set_cache_headers(rows_response(employes, fields), etag, last_modified)
\ No newline at end of file
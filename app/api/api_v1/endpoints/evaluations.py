@@ -1,15 +1,20 @@
 # app/api/api_v1/endpoints/evaluations.py
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from starlette.concurrency import run_in_threadpool
+from typing import List, Literal, Optional, Tuple
+from datetime import date
 
 from app import crud, schemas
 from app.db.session import get_db
+from app.api.serialization import rows_response, sparse_fields
 
 router = APIRouter(
     tags=["Évaluations"]
 )
 
+AGREGATIONS = ("mean", "min", "max", "count")
+
 @router.post("/", response_model=schemas.Evaluation, status_code=status.HTTP_201_CREATED)
 async def create_new_evaluation(
     evaluation: schemas.EvaluationCreate,
@@ -33,19 +38,21 @@ async def create_new_evaluation(
 async def read_all_evaluations(
     skip: int = 0,
     limit: int = Query(default=100, ge=1, le=500),
+    fields: Tuple[str, ...] = Depends(sparse_fields(schemas.Evaluation)),
     db: Session = Depends(get_db)
 ):
     """
     Récupère la liste de toutes les évaluations.
     """
-    evaluations = crud.evaluation.get_evaluations(db, skip=skip, limit=limit)
-    return evaluations
+    evaluations = crud.evaluation.get_evaluations(db, skip=skip, limit=limit, fields=fields)
+    return rows_response(evaluations, fields)
 
 @router.get("/by_employe/{employe_id}", response_model=List[schemas.Evaluation])
 async def read_evaluations_for_employe(
     employe_id: int,
     skip: int = 0,
     limit: int = Query(default=100, ge=1, le=500),
+    fields: Tuple[str, ...] = Depends(sparse_fields(schemas.Evaluation)),
     db: Session = Depends(get_db)
 ):
     """
@@ -57,9 +64,50 @@ async def read_evaluations_for_employe(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Employé avec ID {employe_id} non trouvé.")
 
     evaluations = crud.evaluation.get_evaluations_by_employe(
-        db, employe_id=employe_id, skip=skip, limit=limit
+        db, employe_id=employe_id, skip=skip, limit=limit, fields=fields
+    )
+    return rows_response(evaluations, fields)
+
+@router.get("/timeseries", response_model=schemas.EvaluationTimeseries, response_model_exclude_none=True)
+async def read_evaluation_timeseries(
+    employe_id: Optional[int] = Query(None, description="Série d'un employé"),
+    departement_id: Optional[int] = Query(None, description="Série d'un département (ni employé ni département : toute l'entreprise)"),
+    bucket: Literal["month", "quarter", "year"] = Query("month", description="Période de regroupement"),
+    aggregations: str = Query(",".join(AGREGATIONS), description=f"Agrégations, séparées par des virgules (parmi : {', '.join(AGREGATIONS)})"),
+    start_date: Optional[date] = Query(None, description="Date de début (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="Date de fin (YYYY-MM-DD), incluse"),
+    db: Session = Depends(get_db)
+):
+    """
+    Évolution du score global par mois, trimestre ou année, pour un employé, un département ou
+    toute l'entreprise. Le regroupement et les agrégations sont calculés par la base ; la réponse est
+    en colonnes (une liste par agrégation, alignée sur 'periodes'), de taille proportionnelle au
+    nombre de périodes et non au nombre d'évaluations.
+    """
+    if employe_id is not None and departement_id is not None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Préciser employe_id ou departement_id, pas les deux.")
+    demandees = [agregation.strip() for agregation in aggregations.split(",") if agregation.strip()]
+    inconnues = [agregation for agregation in demandees if agregation not in AGREGATIONS]
+    if inconnues or not demandees:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Agrégation(s) inconnue(s) : {', '.join(inconnues) or aggregations}. Agrégations disponibles : {', '.join(AGREGATIONS)}."
+        )
+    if employe_id is not None and not crud.employe.get_employe(db, employe_id=employe_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Employé avec ID {employe_id} non trouvé.")
+    if departement_id is not None and not crud.departement.get_departement(db, departement_id=departement_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Département avec ID {departement_id} non trouvé.")
+
+    # Agrégation de toutes les évaluations de l'entreprise : dans le pool de threads
+    serie = await run_in_threadpool(
+        crud.evaluation.get_score_timeseries, db, bucket=bucket, employe_id=employe_id, departement_id=departement_id, start_date=start_date, end_date=end_date
+    )
+    periodes, count, mean, minimum, maximum = (list(colonne) for colonne in zip(*serie)) if serie else ([], [], [], [], [])
+    colonnes = {"mean": [round(valeur, 2) for valeur in mean], "min": minimum, "max": maximum, "count": count}
+    return schemas.EvaluationTimeseries(
+        bucket=bucket, employe_id=employe_id, departement_id=departement_id, periodes=periodes,
+        **{agregation: colonnes[agregation] for agregation in demandees}
     )
-    return evaluations
 
 @router.get("/{evaluation_id}", response_model=schemas.Evaluation)
 async def read_single_evaluation(
@@ -0,0 +1,87 @@
+# app/api/api_v1/endpoints/events.py
+"""
+Journal des modifications (employés, pointages, évaluations) pour les systèmes en aval (paie, BI) :
+synchronisation incrémentale à partir du dernier événement reçu, au lieu de relire les listes.
+
+- GET /events?since=N : long-poll ; renvoie les événements d'id > N dans l'ordre, ou attend
+  jusqu'à 'timeout' secondes qu'il y en ait (liste vide à l'expiration, relancer avec le même 'since').
+- Même URL avec 'Accept: text/event-stream' : flux SSE continu (reprise via Last-Event-ID).
+
+Les événements sont écrits par les fonctions crud dans la transaction de l'écriture (voir
+app/models/change_event.py) et lus en base principale par clé primaire.
+En mode shardé (DATABASE_SHARD_URLS), la donnée est sur un shard et le journal en base principale :
+l'événement est écrit juste après le commit de la donnée, dans une transaction séparée. Jamais
+d'événement pour une écriture annulée, mais un événement peut manquer (arrêt du processus entre
+les deux commits) : les consommateurs doivent alors se resynchroniser périodiquement par les listes.
+"""
+import asyncio
+import time
+from typing import AsyncIterator, List, Optional
+
+from fastapi import APIRouter, Header, Query, Request
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from app import crud, schemas
+from app.core.config import settings
+from app.db.session import SessionLocal
+
+router = APIRouter(
+    tags=["Événements"]
+)
+
+SSE_HEARTBEAT_SECONDS = 15 # Commentaire SSE envoyé sans événement : garde la connexion ouverte via les proxys
+
+def _fetch_events(since: int, limit: int) -> List[schemas.ChangeEvent]:
+    # Session propre à chaque lecture : un flux SSE dure plus longtemps que la requête (get_db)
+    db = SessionLocal()
+    try:
+        events = crud.change_event.get_events(db, since=since, limit=limit, settle_seconds=settings.EVENTS_SETTLE_SECONDS)
+        return [schemas.ChangeEvent.model_validate(event) for event in events]
+    finally:
+        db.close()
+
+def _sse_message(event: schemas.ChangeEvent) -> str:
+    return f"id: {event.id}\nevent: {event.ressource}.{event.operation}\ndata: {event.model_dump_json()}\n\n"
+
+async def _event_stream(request: Request, since: int, limit: int) -> AsyncIterator[str]:
+    dernier_envoi = time.monotonic()
+    while not await request.is_disconnected():
+        events = await run_in_threadpool(_fetch_events, since, limit)
+        if events:
+            since = events[-1].id
+            yield "".join(_sse_message(event) for event in events)
+            dernier_envoi = time.monotonic()
+            if len(events) == limit:
+                continue # Rattrapage d'un retard : lot suivant sans attendre
+        elif time.monotonic() - dernier_envoi >= SSE_HEARTBEAT_SECONDS:
+            yield ": ping\n\n"
+            dernier_envoi = time.monotonic()
+        await asyncio.sleep(settings.EVENTS_POLL_SECONDS)
+
+@router.get("/", response_model=List[schemas.ChangeEvent])
+async def read_events(
+    request: Request,
+    since: int = Query(default=0, ge=0, description="Dernier id d'événement déjà reçu (0 = début du journal)"),
+    limit: int = Query(default=500, ge=1, le=5000),
+    timeout: float = Query(default=25, ge=0, le=60, description="Attente maximale (secondes) si aucun événement"),
+    last_event_id: Optional[int] = Header(default=None, description="Reprise d'un flux SSE (envoyé par EventSource)")
+):
+    """
+    Récupère les modifications postérieures à 'since', dans l'ordre de validation.
+    Le consommateur repasse l'id du dernier événement traité comme 'since' à l'appel suivant.
+    """
+    if "text/event-stream" in request.headers.get("accept", ""):
+        return StreamingResponse(
+            _event_stream(request, last_event_id if last_event_id is not None else since, limit),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"} # Pas de mise en tampon par nginx
+        )
+
+    fin = time.monotonic() + timeout
+    while True:
+        events = await run_in_threadpool(_fetch_events, since, limit)
+        restant = fin - time.monotonic()
+        if events or restant <= 0 or await request.is_disconnected():
+            return events
+        await asyncio.sleep(min(settings.EVENTS_POLL_SECONDS, restant))
@@ -0,0 +1,142 @@
+# app/api/api_v1/endpoints/horaires.py
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from typing import List, Optional
+from datetime import date
+
+from app import crud, schemas
+from app.core.config import settings
+from app.db.session import get_db
+from app.services import horaire_service
+from app.api.single_flight import session_key, single_flight
+
+router = APIRouter(
+    tags=["Horaires"]
+)
+
+def _check_periode(start_date: date, end_date: date) -> None:
+    if end_date < start_date:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="end_date doit être postérieure ou égale à start_date.")
+    if (end_date - start_date).days + 1 > settings.PONCTUALITE_MAX_JOURS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Période limitée à {settings.PONCTUALITE_MAX_JOURS} jours."
+        )
+
+def _get_departement_or_404(db: Session, departement_id: int) -> None:
+    if not crud.departement.get_departement(db, departement_id=departement_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Département avec ID {departement_id} non trouvé.")
+
+def _get_employe_or_404(db: Session, employe_id: int) -> None:
+    if not crud.employe.get_employe(db, employe_id=employe_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Employé avec ID {employe_id} non trouvé.")
+
+@router.get("/departements/{departement_id}", response_model=List[schemas.HoraireJour])
+async def read_horaire_departement(departement_id: int, db: Session = Depends(get_db)):
+    """
+    Horaire hebdomadaire type d'un département (jours travaillés ; liste vide si aucun horaire).
+    """
+    _get_departement_or_404(db, departement_id)
+    return crud.horaire.get_horaire_departement(db, departement_id)
+
+@router.put("/departements/{departement_id}", response_model=List[schemas.HoraireJour])
+async def replace_horaire_departement(departement_id: int, horaire: schemas.Horaire, db: Session = Depends(get_db)):
+    """
+    Remplace l'horaire hebdomadaire d'un département. Les jours absents ne sont pas travaillés.
+    """
+    _get_departement_or_404(db, departement_id)
+    return crud.horaire.replace_horaire_departement(db, departement_id, horaire.jours)
+
+@router.get("/employes/{employe_id}", response_model=List[schemas.HoraireJour])
+async def read_horaire_employe(employe_id: int, db: Session = Depends(get_db)):
+    """
+    Horaire individuel d'un employé (liste vide : il suit l'horaire de son département).
+    """
+    _get_employe_or_404(db, employe_id)
+    return crud.horaire.get_horaire_employe(db, employe_id)
+
+@router.put("/employes/{employe_id}", response_model=List[schemas.HoraireJour])
+async def replace_horaire_employe(employe_id: int, horaire: schemas.Horaire, db: Session = Depends(get_db)):
+    """
+    Remplace l'horaire individuel d'un employé ; il remplace entièrement celui de son département.
+    Une liste de jours vide supprime l'horaire individuel.
+    """
+    _get_employe_or_404(db, employe_id)
+    return crud.horaire.replace_horaire_employe(db, employe_id, horaire.jours)
+
+@router.get("/jours_feries", response_model=List[schemas.JourFerie])
+async def read_jours_feries(
+    start_date: Optional[date] = Query(None, description="Date de début (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="Date de fin (YYYY-MM-DD)"),
+    db: Session = Depends(get_db)
+):
+    """
+    Jours fériés, avec filtre de date optionnel.
+    """
+    return crud.horaire.get_jours_feries(db, start_date=start_date, end_date=end_date)
+
+@router.post("/jours_feries", response_model=schemas.JourFerie, status_code=status.HTTP_201_CREATED)
+async def create_jour_ferie(jour_ferie: schemas.JourFerie, db: Session = Depends(get_db)):
+    """
+    Ajoute un jour férié (commun à tous les départements).
+    """
+    try:
+        return crud.horaire.create_jour_ferie(db, jour_ferie)
+    except ValueError as e: # Date déjà fériée
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+@router.delete("/jours_feries/{jour}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_jour_ferie(jour: date, db: Session = Depends(get_db)) -> None:
+    """
+    Supprime un jour férié.
+    """
+    if crud.horaire.delete_jour_ferie(db, jour) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Le {jour} n'est pas un jour férié.")
+    return None
+
+@router.get("/departements/{departement_id}/ponctualite", response_model=List[schemas.PonctualiteEmploye])
+async def read_ponctualite_departement(
+    departement_id: int,
+    start_date: date = Query(..., description="Date de début (YYYY-MM-DD)"),
+    end_date: date = Query(..., description="Date de fin (YYYY-MM-DD), incluse"),
+    tolerance_minutes: Optional[float] = Query(None, ge=0, description="Retard toléré (défaut : configuration)"),
+    db: Session = Depends(get_db)
+):
+    """
+    Retards, heures supplémentaires et absences de chaque employé du département sur la période,
+    par rapport à son horaire (individuel, sinon celui du département) et aux jours fériés.
+    Calcul vectorisé pour tout le département, dans le pool de threads ; les demandes identiques
+    simultanées partagent le même calcul.
+    """
+    _check_periode(start_date, end_date)
+    _get_departement_or_404(db, departement_id)
+
+    def calcul(session: Session):
+        ecarts = horaire_service.compute_deviations(
+            session, start_date, end_date, departement_id=departement_id, tolerance_minutes=tolerance_minutes
+        )
+        return horaire_service.summarize_by_employe(ecarts)
+
+    return await single_flight.do(
+        "ponctualite_departement", (departement_id, start_date, end_date, tolerance_minutes, session_key(db)), db, calcul
+    )
+
+@router.get("/employes/{employe_id}/ponctualite", response_model=List[schemas.PonctualiteJour])
+async def read_ponctualite_employe(
+    employe_id: int,
+    start_date: date = Query(..., description="Date de début (YYYY-MM-DD)"),
+    end_date: date = Query(..., description="Date de fin (YYYY-MM-DD), incluse"),
+    tolerance_minutes: Optional[float] = Query(None, ge=0, description="Retard toléré (défaut : configuration)"),
+    db: Session = Depends(get_db)
+):
+    """
+    Détail journalier d'un employé : horaire prévu, première arrivée, retard, temps pointé,
+    heures supplémentaires et absence.
+    """
+    _check_periode(start_date, end_date)
+    _get_employe_or_404(db, employe_id)
+    ecarts = await run_in_threadpool(
+        horaire_service.compute_deviations, db, start_date, end_date, employe_id=employe_id, tolerance_minutes=tolerance_minutes
+    )
+    return horaire_service.daily_details(ecarts)
@@ -1,11 +1,13 @@
 # app/api/api_v1/endpoints/pointages.py
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import date
 
 from app import crud, schemas
 from app.db.session import get_db
+from app.api.serialization import rows_response, sparse_fields
 
 router = APIRouter(
     tags=["Pointages"]
@@ -31,17 +33,37 @@ async def create_new_pointage(
          # Log error e
          raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Erreur interne lors de la création du pointage.")
 
+@router.post("/badge", response_model=schemas.PointageBadgeResult)
+async def badge_pointage(
+    badge: schemas.PointageBadge,
+    db: Session = Depends(get_db)
+):
+    """
+    Enregistre un passage de badge (entrée ou sortie) en un seul appel idempotent.
+    L'entrée ouvre un pointage (ou renvoie celui déjà ouvert), la sortie ferme le pointage ouvert.
+    Un badgeage renvoyé avec la même idempotency_key renvoie le résultat initial (rejeu=true)
+    sans rien écrire.
+    """
+    try:
+        db_pointage, action, rejeu = crud.pointage.record_badge(db, badge=badge)
+    except ValueError as e: # Employé inconnu, sortie sans entrée, clé déjà utilisée...
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except IntegrityError:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Conflit avec un badgeage concurrent, veuillez réessayer.")
+    return schemas.PointageBadgeResult(pointage=db_pointage, action=action, rejeu=rejeu)
+
 @router.get("/", response_model=List[schemas.Pointage])
 async def read_all_pointages(
     skip: int = 0,
     limit: int = Query(default=100, ge=1, le=500),
+    fields: Tuple[str, ...] = Depends(sparse_fields(schemas.Pointage)),
     db: Session = Depends(get_db)
 ):
     """
     Récupère la liste de tous les pointages (peut être volumineux).
     """
-    pointages = crud.pointage.get_pointages(db, skip=skip, limit=limit)
-    return pointages
+    pointages = crud.pointage.get_pointages(db, skip=skip, limit=limit, fields=fields)
+    return rows_response(pointages, fields)
 
 @router.get("/by_employe/{employe_id}", response_model=List[schemas.Pointage])
 async def read_pointages_for_employe(
@@ -50,6 +72,7 @@ async def read_pointages_for_employe(
     end_date: Optional[date] = Query(None, description="Date de fin (YYYY-MM-DD)"),
     skip: int = 0,
     limit: int = Query(default=100, ge=1, le=1000),
+    fields: Tuple[str, ...] = Depends(sparse_fields(schemas.Pointage)),
     db: Session = Depends(get_db)
 ):
     """
@@ -61,9 +84,82 @@ async def read_pointages_for_employe(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Employé avec ID {employe_id} non trouvé.")
 
     pointages = crud.pointage.get_pointages_by_employe(
-        db, employe_id=employe_id, start_date=start_date, end_date=end_date, skip=skip, limit=limit
+        db, employe_id=employe_id, start_date=start_date, end_date=end_date, skip=skip, limit=limit,
+        fields=fields
+    )
+    return rows_response(pointages, fields)
+
+@router.get("/open", response_model=List[schemas.Pointage])
+async def read_open_pointages(
+    departement_id: Optional[int] = Query(None, description="Filtrer sur un département"),
+    jour: Optional[date] = Query(None, description="Filtrer sur une date (YYYY-MM-DD), ex: aujourd'hui pour les présents"),
+    skip: int = 0,
+    limit: int = Query(default=100, ge=1, le=1000),
+    fields: Tuple[str, ...] = Depends(sparse_fields(schemas.Pointage)),
+    db: Session = Depends(get_db)
+):
+    """
+    Récupère les pointages ouverts (sans heure de départ) : employés actuellement sur site
+    si 'jour' est la date du jour, départs oubliés pour les jours précédents.
+    """
+    if departement_id is not None:
+        db_departement = crud.departement.get_departement(db, departement_id=departement_id)
+        if not db_departement:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Département avec ID {departement_id} non trouvé.")
+
+    pointages = crud.pointage.get_open_pointages(
+        db, departement_id=departement_id, jour=jour, skip=skip, limit=limit, fields=fields
+    )
+    return rows_response(pointages, fields)
+
+@router.get("/presences", response_model=List[schemas.PresenceJour])
+async def read_daily_presence(
+    start_date: date = Query(..., description="Date de début (YYYY-MM-DD)"),
+    end_date: date = Query(..., description="Date de fin (YYYY-MM-DD), incluse"),
+    departement_id: Optional[int] = Query(None, description="Filtrer sur un département"),
+    db: Session = Depends(get_db)
+):
+    """
+    Présences par jour sur la période : employés distincts et nombre de pointages. Les jours sont les
+    dates locales des pointages (fuseau de l'employé), un poste de nuit compte pour le jour de l'arrivée.
+    """
+    if end_date < start_date:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="end_date doit être postérieure ou égale à start_date.")
+    if departement_id is not None:
+        db_departement = crud.departement.get_departement(db, departement_id=departement_id)
+        if not db_departement:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Département avec ID {departement_id} non trouvé.")
+
+    presences = crud.pointage.get_daily_presence(db, start_date, end_date, departement_id=departement_id)
+    return [
+        schemas.PresenceJour(jour=jour, employes_presents=employes, pointages=nombre)
+        for jour, employes, nombre in presences
+    ]
+
+@router.get("/anomalies", response_model=List[schemas.PointageAnomalie])
+async def read_pointage_anomalies(
+    employe_id: Optional[int] = Query(None, description="Filtrer sur un employé"),
+    departement_id: Optional[int] = Query(None, description="Filtrer sur un département"),
+    type: Optional[schemas.TypeAnomalie] = Query(None, description="Filtrer sur un type d'anomalie"),
+    start_date: Optional[date] = Query(None, description="Date de début (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="Date de fin (YYYY-MM-DD), incluse"),
+    skip: int = 0,
+    limit: int = Query(default=100, ge=1, le=1000),
+    db: Session = Depends(get_db)
+):
+    """
+    Anomalies de pointage détectées par le job app/scripts/detect_anomalies.py (durées invraisemblables,
+    badgeages en double, arrivées, durées et écarts inhabituels), du jour le plus récent au plus ancien.
+    """
+    if departement_id is not None:
+        db_departement = crud.departement.get_departement(db, departement_id=departement_id)
+        if not db_departement:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Département avec ID {departement_id} non trouvé.")
+
+    return crud.anomalie.get_anomalies(
+        db, employe_id=employe_id, departement_id=departement_id, type_anomalie=type,
+        start_date=start_date, end_date=end_date, skip=skip, limit=limit
     )
-    return pointages
 
 @router.get("/{pointage_id}", response_model=schemas.Pointage)
 async def read_single_pointage(
@@ -71,9 +167,9 @@ async def read_single_pointage(
     db: Session = Depends(get_db)
 ):
     """
-    Récupère un pointage spécifique par son ID.
+    Récupère un pointage spécifique par son ID (y compris un pointage archivé).
     """
-    db_pointage = crud.pointage.get_pointage(db, pointage_id=pointage_id)
+    db_pointage = crud.pointage.get_pointage(db, pointage_id=pointage_id, include_archive=True)
     if db_pointage is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Pointage avec ID {pointage_id} non trouvé.")
     return db_pointage
@@ -89,14 +185,14 @@ async def update_existing_pointage(
     """
     try:
         updated_pointage = crud.pointage.update_pointage(db, pointage_id=pointage_id, pointage_update=pointage_in)
-        if updated_pointage is None:
-             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Pointage avec ID {pointage_id} non trouvé.")
-        return updated_pointage
     except ValueError as e: # Erreur de validation (ex: heure départ <= arrivée)
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         # Log error e
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Erreur interne lors de la mise à jour du pointage.")
+    if updated_pointage is None: # Inexistant ou archivé (les pointages archivés sont en lecture seule)
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Pointage avec ID {pointage_id} non trouvé.")
+    return updated_pointage
 
 
 @router.delete("/{pointage_id}", status_code=status.HTTP_204_NO_CONTENT)
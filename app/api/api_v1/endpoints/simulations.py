@@ -1,11 +1,20 @@
 # app/api/api_v1/endpoints/simulations.py
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import asyncio
+import json
+import threading
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from starlette.concurrency import run_in_threadpool
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
 
 from app import crud, schemas
-from app.db.session import get_db
+from app.db.session import get_db, write_session
 from app.services import simulation_service # Importer le service
+from app.api.serialization import rows_response, sparse_fields
+from app.api.caching import cache_validators, not_modified_response, set_cache_headers
+from app.api.single_flight import session_key, single_flight
 
 router = APIRouter(
     tags=["Simulations"]
@@ -31,8 +40,12 @@ async def run_and_save_simulation(
     # 2. Exécuter la simulation via le service
     try:
         print(f"Appel du service de simulation pour employe_id={simulation_input.employe_id}")
-        simulation_results = simulation_service.run_performance_simulation(
-            db=db,
+        # Simulations identiques simultanées : un seul calcul, chaque requête enregistre sa propre simulation
+        simulation_results = await single_flight.do(
+            "simulation",
+            (simulation_input.employe_id, simulation_input.parametres.model_dump_json(), session_key(db)),
+            db,
+            simulation_service.run_performance_simulation,
             employe_id=simulation_input.employe_id,
             params=simulation_input.parametres
         )
@@ -64,25 +77,257 @@ async def run_and_save_simulation(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Erreur lors de l'enregistrement des résultats de la simulation.")
 
 
+# --- Simulation progressive (SSE ou WebSocket) ---
+# Événements émis, dans l'ordre :
+#   debut       {"employe_id", "performance_initiale", "duree_mois"}
+#   progression {"temps_relatif_mois": [...], "performance_predite": [...]} (mois atteints par l'intégrateur)
+#   resultat    simulation enregistrée (même contenu que la réponse de POST /run)
+# ou, à la place de la suite : annule {} (arrêt demandé par le client, rien n'est enregistré)
+# ou erreur {"detail"}.
+
+def _prepare_simulation(db: Session, simulation_input: schemas.SimulationRun) -> Optional[Tuple[float, float, float]]:
+    """Lit la condition initiale et les taux de l'employé : (performance initiale, croissance, déclin), None si l'employé n'existe pas."""
+    if crud.employe.get_employe(db, employe_id=simulation_input.employe_id) is None:
+        return None
+    base_growth, base_decay = simulation_service.get_model_rates(db, simulation_input.employe_id)
+    return simulation_service.get_initial_performance(db, simulation_input.employe_id), base_growth, base_decay
+
+def _save_simulation(simulation_input: schemas.SimulationRun, resultats: Dict[str, Any]) -> Dict[str, Any]:
+    db = write_session() # Le flux survit à la session de la requête
+    try:
+        record = crud.simulation.create_simulation_record(
+            db=db,
+            employe_id=simulation_input.employe_id,
+            parametres=simulation_input.parametres.model_dump(),
+            resultats=resultats
+        )
+        return schemas.Simulation.model_validate(record).model_dump(mode="json")
+    finally:
+        db.close()
+
+async def _simulation_events(
+    simulation_input: schemas.SimulationRun,
+    conditions: Tuple[float, float, float],
+    annule: Callable[[], Awaitable[bool]]
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Déroule la simulation morceau par morceau dans le pool de threads, en rendant la main à la boucle
+    entre deux pas d'intégration : une annulation arrête le calcul au pas suivant et libère le thread.
+    Si le flux est interrompu pendant un morceau (déconnexion du client), l'arrêt est signalé au
+    générateur, qui n'est fermé qu'une fois le morceau en cours terminé dans son thread.
+    """
+    initial_performance, base_growth, base_decay = conditions
+    yield "debut", {
+        "employe_id": simulation_input.employe_id,
+        "performance_initiale": initial_performance,
+        "duree_mois": simulation_input.parametres.duree_mois
+    }
+    arret = threading.Event()
+    morceaux = simulation_service.iter_performance_simulation(
+        initial_performance, simulation_input.parametres, base_growth=base_growth, base_decay=base_decay, arret=arret
+    )
+    resultats = {"temps_relatif_mois": [], "performance_predite": []}
+    en_cours = None # Morceau en cours de calcul dans le pool de threads
+    try:
+        while True:
+            if await annule():
+                yield "annule", {}
+                return
+            en_cours = asyncio.ensure_future(run_in_threadpool(next, morceaux, None))
+            try:
+                morceau = await asyncio.shield(en_cours)
+            except ValueError as e:
+                yield "erreur", {"detail": f"Erreur lors de l'exécution de la simulation: {e}"}
+                return
+            if morceau is None:
+                break
+            for cle, valeurs in morceau.items():
+                resultats[cle].extend(valeurs)
+            yield "progression", morceau
+    finally:
+        # Flux interrompu avant la fin : arrêter l'intégration au prochain pas, attendre le thread, puis fermer
+        arret.set()
+        if en_cours is not None and not en_cours.done():
+            await asyncio.wait([en_cours])
+        morceaux.close()
+
+    try:
+        yield "resultat", await run_in_threadpool(_save_simulation, simulation_input, resultats)
+    except Exception as e:
+        print(f"Erreur lors de l'enregistrement de la simulation: {e}") # Log temporaire
+        yield "erreur", {"detail": "Erreur lors de l'enregistrement des résultats de la simulation."}
+
+@router.post("/run/stream")
+async def run_simulation_stream(
+    simulation_input: schemas.SimulationRun,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """
+    Comme POST /run, mais renvoie un flux SSE (text/event-stream) : la trajectoire est envoyée par
+    morceaux au fil de l'intégration, puis la simulation enregistrée. Fermer la connexion annule
+    la simulation (calcul arrêté, rien n'est enregistré).
+    """
+    conditions = _prepare_simulation(db, simulation_input)
+    if conditions is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Employé avec ID {simulation_input.employe_id} non trouvé."
+        )
+
+    async def flux() -> AsyncIterator[str]:
+        async for evenement, donnees in _simulation_events(simulation_input, conditions, request.is_disconnected):
+            yield f"event: {evenement}\ndata: {json.dumps(donnees)}\n\n"
+
+    return StreamingResponse(
+        flux(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.websocket("/ws")
+async def run_simulation_websocket(websocket: WebSocket):
+    """
+    Simulation progressive par WebSocket. Le client envoie un SimulationRun (JSON), reçoit les
+    événements sous la forme {"type": <événement>, ...données}, et peut envoyer {"action": "annuler"}
+    (ou fermer la connexion) à tout moment pour arrêter le calcul. La connexion est fermée à la fin.
+    """
+    await websocket.accept()
+    try:
+        simulation_input = schemas.SimulationRun.model_validate(await websocket.receive_json())
+    except (ValidationError, ValueError) as e:
+        await websocket.send_json({"type": "erreur", "detail": f"Paramètres invalides: {e}"})
+        await websocket.close(code=1003)
+        return
+    except WebSocketDisconnect:
+        return
+
+    def prepare() -> Optional[Tuple[float, float, float]]:
+        db = write_session()
+        try:
+            return _prepare_simulation(db, simulation_input)
+        finally:
+            db.close()
+
+    conditions = await run_in_threadpool(prepare)
+    if conditions is None:
+        await websocket.send_json({"type": "erreur", "detail": f"Employé avec ID {simulation_input.employe_id} non trouvé."})
+        await websocket.close()
+        return
+
+    annulation = asyncio.Event()
+
+    async def ecouter() -> None:
+        # Messages du client pendant le calcul : seule l'annulation (ou la déconnexion) est prise en compte
+        try:
+            while True:
+                message = await websocket.receive_json()
+                if isinstance(message, dict) and message.get("action") == "annuler":
+                    break
+        except (WebSocketDisconnect, ValueError):
+            pass
+        annulation.set()
+
+    async def annule() -> bool:
+        return annulation.is_set()
+
+    ecoute = asyncio.create_task(ecouter())
+    evenements = _simulation_events(simulation_input, conditions, annule)
+    try:
+        async for evenement, donnees in evenements:
+            await websocket.send_json({"type": evenement, **donnees})
+        await websocket.close()
+    except (WebSocketDisconnect, RuntimeError):
+        pass # Connexion fermée par le client
+    finally:
+        await evenements.aclose() # Arrête le calcul s'il est en cours
+        ecoute.cancel()
+
+@router.post("/compare", response_model=schemas.SimulationComparison)
+async def compare_and_save_simulations(
+    comparison_input: schemas.SimulationCompare,
+    db: Session = Depends(get_db)
+):
+    """
+    Compare plusieurs scénarios pour un même employé en un seul appel.
+    La performance initiale est lue une seule fois, tous les scénarios sont intégrés
+    comme un seul système vectorisé et enregistrés dans une seule transaction.
+    Le premier scénario de la liste sert de référence pour les écarts.
+    """
+    # 1. Vérifier si l'employé existe (une seule fois pour tous les scénarios)
+    db_employe = crud.employe.get_employe(db, employe_id=comparison_input.employe_id)
+    if not db_employe:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Employé avec ID {comparison_input.employe_id} non trouvé."
+        )
+
+    # 2. Exécuter tous les scénarios via le service
+    try:
+        comparaison = simulation_service.compare_performance_scenarios(
+            db=db,
+            employe_id=comparison_input.employe_id,
+            scenarios=comparison_input.scenarios
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Erreur lors de l'exécution de la simulation: {e}")
+    except Exception as e:
+        print(f"Erreur inattendue dans le service de simulation: {e}") # Log temporaire
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Erreur interne du serveur lors de la simulation.")
+
+    # 3. Enregistrer tous les résultats en une seule transaction
+    try:
+        records = crud.simulation.create_simulation_records(
+            db=db,
+            employe_id=comparison_input.employe_id,
+            runs=[(item["parametres"].model_dump(), item["resultats"]) for item in comparaison["scenarios"]]
+        )
+    except Exception as e:
+        print(f"Erreur lors de l'enregistrement des simulations: {e}") # Log temporaire
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Erreur lors de l'enregistrement des résultats de la simulation.")
+
+    return schemas.SimulationComparison(
+        employe_id=comparison_input.employe_id,
+        performance_initiale=comparaison["performance_initiale"],
+        temps_relatif_mois=comparaison["temps_relatif_mois"],
+        scenarios=[
+            schemas.SimulationComparisonScenario(
+                simulation_id=record.id,
+                parametres=item["parametres"],
+                performance_predite=item["serie_alignee"],
+                delta_final=item["delta_final"],
+                delta_vs_reference=item["delta_vs_reference"],
+            )
+            for record, item in zip(records, comparaison["scenarios"])
+        ]
+    )
+
+
 @router.get("/by_employe/{employe_id}", response_model=List[schemas.Simulation])
 async def read_simulations_for_employe(
     employe_id: int,
+    request: Request,
     skip: int = 0,
     limit: int = Query(default=10, ge=1, le=100), # Moins par défaut car potentiellement volumineux
+    fields: Tuple[str, ...] = Depends(sparse_fields(schemas.Simulation)),
     db: Session = Depends(get_db)
 ):
     """
     Récupère l'historique des simulations enregistrées pour un employé spécifique.
+    Supporte If-None-Match / If-Modified-Since (304 si aucune simulation n'a été ajoutée ou supprimée).
     """
+    etag, last_modified = cache_validators(db, f"simulations:employe:{employe_id}")
+    cached = not_modified_response(request, etag, last_modified)
+    if cached is not None:
+        return cached
+
     # Vérifier si l'employé existe
     db_employe = crud.employe.get_employe(db, employe_id=employe_id)
     if not db_employe:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Employé avec ID {employe_id} non trouvé.")
 
     simulations = crud.simulation.get_simulations_by_employe(
-        db, employe_id=employe_id, skip=skip, limit=limit
+        db, employe_id=employe_id, skip=skip, limit=limit, fields=fields
     )
-    return simulations
+    return set_cache_headers(rows_response(simulations, fields), etag, last_modified)
 
 @router.get("/{simulation_id}", response_model=schemas.Simulation)
 async def read_single_simulation(
@@ -0,0 +1,85 @@
+# app/api/caching.py
+"""
+Requêtes conditionnelles (ETag / Last-Modified) pour les endpoints de lecture.
+
+Les fonctions crud d'écriture incrémentent des compteurs de version par ressource et par collection
+(table 'change_counters', voir crud_change_counter). Un endpoint lit ces compteurs (lecture par clé
+primaire), en déduit un ETag, et répond 304 Not Modified si le client possède déjà cette version :
+la requête de l'endpoint et la sérialisation ne sont alors pas exécutées.
+
+L'ETag dépend uniquement des versions : il est propre à une URL (pagination et filtres compris),
+comme le prévoit HTTP. Il est faible (W/) car le corps peut être compressé différemment.
+"""
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional, Tuple
+
+from fastapi import Request, Response
+from sqlalchemy.orm import Session
+
+from app import crud
+
+# Le client peut conserver la réponse mais doit la revalider à chaque utilisation (tableaux de bord)
+CACHE_CONTROL_REVALIDATE = "private, no-cache"
+# Données qui changent rarement (départements) : une minute sans revalidation
+CACHE_CONTROL_SHORT = "private, max-age=60"
+
+def cache_validators(db: Session, *cles: str) -> Tuple[str, Optional[datetime]]:
+    """
+    Calcule l'ETag et la date Last-Modified d'une réponse dépendant des compteurs donnés.
+
+    Args:
+        db: Session de base de données.
+        cles: Clés de change_counters dont dépend la réponse (ex: "employes", "employes:42").
+
+    Returns:
+        Un tuple (etag, last_modified) ; last_modified vaut None si aucune clé n'a encore été modifiée.
+    """
+    versions = crud.change_counter.get_versions(db, *cles)
+    etag = 'W/"' + "-".join(f"{cle}.{versions[cle][0]}" for cle in cles) + '"'
+    dates = [date for _, date in versions.values() if date is not None]
+    return etag, max(dates) if dates else None
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Comparaison faible (RFC 9110) entre l'en-tête If-None-Match et l'ETag courant."""
+    if if_none_match.strip() == "*":
+        return True
+    courant = etag.removeprefix("W/")
+    return any(candidat.strip().removeprefix("W/") == courant for candidat in if_none_match.split(","))
+
+def _not_modified_since(if_modified_since: str, last_modified: datetime) -> bool:
+    try:
+        date_client = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if date_client.tzinfo is None:
+        date_client = date_client.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) <= date_client # Les dates HTTP sont à la seconde
+
+def set_cache_headers(
+    response: Response, etag: str, last_modified: Optional[datetime], cache_control: str = CACHE_CONTROL_REVALIDATE
+) -> Response:
+    """Ajoute ETag, Last-Modified et Cache-Control à une réponse et la renvoie."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    if last_modified is not None:
+        response.headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+    return response
+
+def not_modified_response(
+    request: Request, etag: str, last_modified: Optional[datetime], cache_control: str = CACHE_CONTROL_REVALIDATE
+) -> Optional[Response]:
+    """
+    Renvoie une réponse 304 si la version détenue par le client est à jour, sinon None.
+    If-None-Match est prioritaire ; If-Modified-Since n'est consulté qu'en son absence.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        fresh = _etag_matches(if_none_match, etag)
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        fresh = if_modified_since is not None and last_modified is not None \
+            and _not_modified_since(if_modified_since, last_modified)
+    if not fresh:
+        return None
+    return set_cache_headers(Response(status_code=304), etag, last_modified, cache_control)
@@ -0,0 +1,87 @@
+# app/api/compression.py
+"""
+Compression négociée des réponses (brotli ou gzip selon Accept-Encoding).
+
+Les réponses plus petites que le seuil, déjà encodées ou en flux SSE (text/event-stream) sont
+envoyées telles quelles ; les réponses en plusieurs morceaux sont compressées au fil de l'eau.
+S'appuie sur les responders de Starlette (même logique que GZipMiddleware) en y ajoutant brotli.
+brotli (ou brotlicffi) est optionnel : sans lui, seul gzip est proposé.
+"""
+from typing import Dict, Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipResponder, IdentityResponder
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError: # Dépendance optionnelle
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+class BrotliResponder(IdentityResponder):
+    content_encoding = "br"
+
+    def __init__(self, app: ASGIApp, minimum_size: int, quality: int = 4) -> None:
+        super().__init__(app, minimum_size)
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        compressed = self.compressor.process(body)
+        # flush() rend disponible ce qui a été reçu (flux) ; finish() termine le flux brotli
+        return compressed + (self.compressor.flush() if more_body else self.compressor.finish())
+
+def available_encodings() -> Tuple[str, ...]:
+    """Encodages proposés, par ordre de préférence du serveur."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+def negotiate_encoding(accept_encoding: str, available: Tuple[str, ...]) -> Optional[str]:
+    """
+    Choisit l'encodage à utiliser d'après l'en-tête Accept-Encoding (valeurs q comprises).
+
+    Returns:
+        L'encodage retenu parmi 'available', ou None pour envoyer la réponse non compressée.
+    """
+    poids: Dict[str, float] = {}
+    for element in accept_encoding.split(","):
+        nom, _, parametres = element.strip().partition(";")
+        q = 1.0
+        parametres = parametres.strip()
+        if parametres.startswith("q="):
+            try:
+                q = float(parametres[2:])
+            except ValueError:
+                q = 0.0
+        if nom:
+            poids[nom.strip().lower()] = q
+    candidats = [(poids.get(encodage, poids.get("*", 0.0)), -rang, encodage) for rang, encodage in enumerate(available)]
+    q, _, encodage = max(candidats)
+    return encodage if q > 0 else None
+
+class CompressionMiddleware:
+    """Middleware ASGI : compresse les réponses HTTP en brotli ou gzip selon Accept-Encoding."""
+
+    def __init__(
+        self, app: ASGIApp, minimum_size: int = 1000, gzip_level: int = 6, brotli_quality: int = 4
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.encodings = available_encodings()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encodage = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        if encodage == "br":
+            responder = BrotliResponder(self.app, self.minimum_size, quality=self.brotli_quality)
+        elif encodage == "gzip":
+            responder = GZipResponder(self.app, self.minimum_size, compresslevel=self.gzip_level)
+        else:
+            responder = IdentityResponder(self.app, self.minimum_size)
+        await responder(scope, receive, send)
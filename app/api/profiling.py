@@ -0,0 +1,213 @@
+# app/api/profiling.py
+"""
+Profilage à la demande des requêtes (désactivé par défaut, voir settings.PROFILING_ENABLED).
+
+Une requête est profilée si elle porte l'en-tête X-Profile (égal à settings.PROFILING_TOKEN s'il est
+défini), ou par tirage aléatoire selon settings.PROFILING_SAMPLE_RATE. Pendant la requête, un thread
+échantillonne toutes les PROFILING_INTERVAL_MS millisecondes la pile du thread de la boucle d'événements,
+où s'exécutent les endpoints (async def), l'hydratation ORM et la validation Pydantic. Le travail confié
+au pool de threads (dépendances synchrones comme get_db, run_in_threadpool) n'y apparaît que comme attente.
+Les requêtes concurrentes partagent ce thread : leurs piles peuvent se mêler au profil, à interpréter
+sur une instance peu chargée ou avec un taux d'échantillonnage faible.
+
+Les derniers profils (PROFILING_MAX_PROFILES, en mémoire du processus) sont consultables sous
+/debug/profiles, en piles repliées (flamegraph.pl, speedscope, inferno) ou au format JSON de speedscope.
+Coût hors profilage : une lecture d'en-tête et, si l'échantillonnage est actif, un tirage aléatoire.
+"""
+import collections
+import itertools
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Counter, Deque, Dict, List, Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+PROFILE_HEADER = b"x-profile" # Déclenchement (requête) et autorisation (consultation des profils)
+PROFILE_ID_HEADER = "x-profile-id" # Ajouté à la réponse d'une requête profilée
+
+class Profile:
+    """Profil d'une requête : piles repliées (« racine;...;feuille ») et nombre d'échantillons de chacune."""
+
+    def __init__(self, profile_id: int, method: str, path: str):
+        self.id = profile_id
+        self.date = datetime.now(timezone.utc)
+        self.method = method
+        self.path = path
+        self.route: Optional[str] = None
+        self.status: Optional[int] = None
+        self.duree_ms = 0.0
+        self.stacks: Counter[str] = collections.Counter()
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id, "date": self.date, "method": self.method, "path": self.path, "route": self.route,
+            "status": self.status, "duree_ms": round(self.duree_ms, 2), "echantillons": sum(self.stacks.values())
+        }
+
+    def collapsed(self) -> str:
+        """Format « piles repliées » de flamegraph.pl : une pile par ligne suivie de son nombre d'échantillons."""
+        return "".join(f"{pile} {n}\n" for pile, n in self.stacks.most_common())
+
+    def speedscope(self) -> Dict[str, Any]:
+        """Document speedscope (profil échantillonné, poids en millisecondes)."""
+        # Poids d'un échantillon : durée mesurée / nombre d'échantillons (l'intervalle réel dépend du GIL)
+        poids = self.duree_ms / max(1, sum(self.stacks.values()))
+        frames: List[Dict[str, str]] = []
+        index: Dict[str, int] = {}
+        samples, weights = [], []
+        for pile, n in self.stacks.items():
+            ids = []
+            for frame in pile.split(";"):
+                if frame not in index:
+                    index[frame] = len(frames)
+                    frames.append({"name": frame})
+                ids.append(index[frame])
+            samples.append(ids)
+            weights.append(n * poids)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled", "name": f"{self.method} {self.path}", "unit": "milliseconds",
+                "startValue": 0, "endValue": sum(weights), "samples": samples, "weights": weights
+            }],
+            "name": f"{self.method} {self.path} ({self.id})",
+            "exporter": "app.api.profiling"
+        }
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    fichier = "/".join(code.co_filename.replace("\\", "/").rsplit("/", 2)[-2:]) # ex. crud/crud_pointage.py
+    return f"{getattr(code, 'co_qualname', code.co_name)} ({fichier}:{code.co_firstlineno})"
+
+class _Sampler(threading.Thread):
+    """Thread d'échantillonnage de la pile d'un autre thread (sys._current_frames)."""
+
+    def __init__(self, thread_id: int, interval_s: float, stacks: Counter[str]):
+        super().__init__(name="profiling-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.interval_s = interval_s
+        self.stacks = stacks
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval_s):
+            frame = sys._current_frames().get(self.thread_id)
+            pile = []
+            while frame is not None:
+                pile.append(_frame_name(frame))
+                frame = frame.f_back
+            if pile:
+                self.stacks[";".join(reversed(pile))] += 1
+
+_profiles: Deque[Profile] = collections.deque(maxlen=settings.PROFILING_MAX_PROFILES)
+_profile_ids = itertools.count(1)
+
+# Le thread d'échantillonnage n'obtient le GIL qu'à chaque changement de thread (5 ms par défaut) :
+# l'intervalle est abaissé tant qu'au moins un profil est en cours, puis rétabli
+_switch_lock = threading.Lock()
+_active_profiles = 0
+_default_switch_interval = sys.getswitchinterval()
+
+def _enter_profiling(interval_s: float) -> None:
+    global _active_profiles
+    with _switch_lock:
+        _active_profiles += 1
+        sys.setswitchinterval(min(_default_switch_interval, interval_s / 2))
+
+def _exit_profiling() -> None:
+    global _active_profiles
+    with _switch_lock:
+        _active_profiles -= 1
+        if _active_profiles == 0:
+            sys.setswitchinterval(_default_switch_interval)
+
+def _authorized(value: Optional[str]) -> bool:
+    return bool(value) and (not settings.PROFILING_TOKEN or value == settings.PROFILING_TOKEN)
+
+class ProfilingMiddleware:
+    """Middleware ASGI : profile les requêtes déclenchées (en-tête X-Profile ou échantillonnage)."""
+
+    def __init__(self, app: ASGIApp, sample_rate: float = 0.0, interval_ms: float = 1.0) -> None:
+        self.app = app
+        self.sample_rate = sample_rate
+        self.interval_ms = interval_ms
+
+    def _triggered(self, scope: Scope) -> bool:
+        for nom, valeur in scope["headers"]:
+            if nom == PROFILE_HEADER:
+                return _authorized(valeur.decode("latin-1"))
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith("/debug/profiles") or not self._triggered(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile = Profile(next(_profile_ids), scope["method"], scope["path"])
+
+        async def send_with_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                profile.status = message["status"]
+                MutableHeaders(scope=message).append(PROFILE_ID_HEADER, str(profile.id))
+            await send(message)
+
+        sampler = _Sampler(threading.get_ident(), self.interval_ms / 1000, profile.stacks)
+        _enter_profiling(sampler.interval_s)
+        debut = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            sampler.stopped.set()
+            sampler.join()
+            _exit_profiling()
+            profile.duree_ms = (time.perf_counter() - debut) * 1000
+            route = scope.get("route") # Renseignée par le routeur : regroupement par modèle de chemin
+            profile.route = getattr(route, "path_format", None)
+            _profiles.append(profile)
+
+# --- Consultation (/debug/profiles, montée par app/main.py si le profilage est activé) ---
+router = APIRouter(
+    tags=["Debug"]
+)
+
+def check_access(x_profile: Optional[str]) -> None:
+    """Refuse la consultation (403) sans l'en-tête X-Profile attendu, si settings.PROFILING_TOKEN est défini."""
+    if settings.PROFILING_TOKEN and not _authorized(x_profile):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="En-tête X-Profile manquant ou invalide.")
+
+@router.get("/")
+async def list_profiles(
+    route: Optional[str] = Query(default=None, description="Filtrer sur un modèle de chemin, ex. /api/v1/pointages/by_employe/{employe_id}"),
+    x_profile: Optional[str] = Header(default=None)
+):
+    """Liste les profils conservés, du plus récent au plus ancien."""
+    check_access(x_profile)
+    return [p.summary() for p in reversed(_profiles) if route is None or p.route == route]
+
+@router.get("/{profile_id}")
+async def read_profile(
+    profile_id: int,
+    format: str = Query(default="speedscope", pattern="^(speedscope|collapsed)$"),
+    x_profile: Optional[str] = Header(default=None)
+):
+    """
+    Récupère un profil : JSON speedscope (à ouvrir sur speedscope.app) ou piles repliées (texte,
+    pour flamegraph.pl / inferno).
+    """
+    check_access(x_profile)
+    profile = next((p for p in _profiles if p.id == profile_id), None)
+    if profile is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Profil {profile_id} non trouvé (expiré ou inconnu).")
+    if format == "collapsed":
+        return PlainTextResponse(profile.collapsed())
+    return profile.speedscope()
@@ -0,0 +1,44 @@
+# app/api/read_your_writes.py
+"""
+Lecture de ses propres écritures avec des réplicas en lecture.
+
+Les réplicas ont un retard de réplication : un client qui vient d'écrire (POST/PUT/PATCH/DELETE réussi)
+pourrait relire l'état précédent. Ce middleware ajoute à la réponse d'une écriture un cookie, et le
+même en-tête pour les clients non navigateurs, donnant l'instant (timestamp Unix) jusqu'auquel les
+lectures de ce client doivent rester sur le primaire. get_db (app/db/session.py) le consulte pour
+router chaque requête.
+"""
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.db.session import READ_YOUR_WRITES_COOKIE, READ_YOUR_WRITES_HEADER
+
+WRITE_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+
+class ReadYourWritesMiddleware:
+    """Middleware ASGI : marque le client comme « collé » au primaire après chaque écriture réussie."""
+
+    def __init__(self, app: ASGIApp, window_seconds: float = 10) -> None:
+        self.app = app
+        self.window_seconds = window_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in WRITE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_marker(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                primary_until = f"{time.time() + self.window_seconds:.3f}"
+                headers = MutableHeaders(scope=message)
+                headers.append(READ_YOUR_WRITES_HEADER, primary_until)
+                headers.append(
+                    "set-cookie",
+                    f"{READ_YOUR_WRITES_COOKIE}={primary_until}; Max-Age={int(self.window_seconds) + 1}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_marker)
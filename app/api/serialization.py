@@ -0,0 +1,105 @@
+# app/api/serialization.py
+"""
+Sérialisation rapide des réponses de liste.
+
+Par défaut, un endpoint déclaré avec response_model=List[Schema] fait valider chaque objet ORM par
+Pydantic (from_attributes) puis encode le résultat en JSON : c'est le coût dominant pour des pages
+de plusieurs centaines de lignes. Pour les lectures, les lignes viennent de la base et sont déjà
+conformes au schéma : on les charge sous forme de tuples de colonnes (crud ..., fields=...) et on les
+encode directement en JSON, sans instancier de modèles. Le response_model reste déclaré sur la route,
+le schéma de réponse publié dans OpenAPI est donc inchangé.
+
+Les endpoints de liste acceptent aussi un paramètre 'fields' (sélection de colonnes, voir sparse_fields)
+pour réduire la taille des réponses.
+
+orjson est utilisé s'il est installé, sinon l'encodeur de pydantic_core (même format de sortie).
+Les horodatages lus sans fuseau sont en UTC (voir app/core/timezones.py) et encodés avec "Z", comme
+ceux des schémas.
+"""
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple, Type
+
+from fastapi import HTTPException, Query, status
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+try:
+    import orjson
+except ImportError: # Dépendance optionnelle
+    orjson = None
+
+if orjson is not None:
+    from fastapi.responses import ORJSONResponse as DefaultResponse # Encodage final des réponses validées par FastAPI
+else:
+    DefaultResponse = JSONResponse
+
+# Dates UTC au format "Z", comme Pydantic ; horodatages sans fuseau = UTC
+_ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+def schema_fields(schema: Type[BaseModel]) -> Tuple[str, ...]:
+    """Noms des champs d'un schéma de lecture (= colonnes à charger pour le sérialiser)."""
+    return tuple(schema.model_fields)
+
+def sparse_fields(schema: Type[BaseModel]) -> Callable[..., Tuple[str, ...]]:
+    """
+    Crée la dépendance FastAPI du paramètre de requête 'fields' d'un endpoint de liste.
+    Ex: ?fields=id,nom,prenom ne charge et ne renvoie que ces colonnes (toutes par défaut).
+    Un champ inconnu du schéma provoque une erreur 400.
+    """
+    autorises = schema_fields(schema)
+
+    def dependency(
+        fields: Optional[str] = Query(
+            None, description=f"Champs à renvoyer, séparés par des virgules (parmi : {', '.join(autorises)})"
+        )
+    ) -> Tuple[str, ...]:
+        if not fields:
+            return autorises
+        demandes = tuple(dict.fromkeys(champ.strip() for champ in fields.split(",") if champ.strip()))
+        inconnus = [champ for champ in demandes if champ not in autorises]
+        if inconnus or not demandes:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Champ(s) inconnu(s) : {', '.join(inconnus) or fields}. Champs disponibles : {', '.join(autorises)}."
+            )
+        return demandes
+
+    return dependency
+
+def _naive_utc(value: Any) -> Any:
+    # Encodeur de pydantic_core : pas d'équivalent à OPT_NAIVE_UTC
+    if isinstance(value, datetime) and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+def dumps(content: Any) -> bytes:
+    """Encode en JSON (dates ISO 8601, UTC en "Z" ; horodatage sans fuseau = UTC)."""
+    if orjson is not None:
+        return orjson.dumps(content, option=_ORJSON_OPTIONS)
+    return to_json(content)
+
+def rows_to_dicts(rows: Iterable[Sequence[Any]], fields: Sequence[str]) -> List[dict]:
+    """Convertit des lignes (tuples de colonnes dans l'ordre de 'fields') en dictionnaires."""
+    return [dict(zip(fields, row)) for row in rows]
+
+def rows_response(rows: Iterable[Sequence[Any]], fields: Sequence[str], status_code: int = 200) -> Response:
+    """
+    Construit directement la réponse JSON d'une liste de lignes, sans validation Pydantic.
+    À réserver aux lignes lues en base avec exactement les colonnes du schéma de réponse.
+
+    Args:
+        rows: Lignes renvoyées par une requête crud appelée avec fields=fields.
+        fields: Noms des colonnes, dans l'ordre de la requête (en général schema_fields(Schema)).
+        status_code: Code HTTP de la réponse.
+
+    Returns:
+        Une Response 'application/json' prête à être renvoyée par l'endpoint.
+    """
+    if orjson is None:
+        rows = ([_naive_utc(value) for value in row] for row in rows)
+    return Response(
+        content=dumps(rows_to_dicts(rows, fields)),
+        status_code=status_code,
+        media_type="application/json"
+    )
@@ -0,0 +1,101 @@
+# app/api/single_flight.py
+"""
+Regroupement des requêtes identiques simultanées (« single-flight »).
+
+Quand plusieurs requêtes identiques arrivent en même temps (ouverture d'une même page de département
+par tous les managers à 9h), une seule exécute la lecture ou la simulation ; les autres attendent son
+résultat et le partagent. Le travail est exécuté dans le pool de threads : la boucle d'événements reste
+libre pour accepter les requêtes qui s'y joignent.
+
+La clé d'un vol identifie le calcul : nom de l'opération et paramètres normalisés. Elle doit aussi
+porter ce qui distingue deux lectures de même paramètres : la base interrogée (primaire ou réplica,
+voir session_key) et, si l'endpoint en a un, l'ETag des données (une requête arrivée après une écriture
+ne rejoint pas un vol commencé avant). Le résultat partagé ne doit pas être modifié par les appelants
+(lignes de colonnes, dictionnaires de résultats) ; chaque requête construit sa propre réponse.
+
+Un vol ouvre sa propre session, dans le thread, sur la même base que la session de la requête qui le
+lance : celle-ci est fermée par get_db dès que sa requête se termine (client déconnecté...), alors que
+les requêtes regroupées attendent encore le résultat.
+
+Désactivable par settings.SINGLE_FLIGHT_ENABLED ; compteurs consultables sous /debug/single-flight
+si settings.SINGLE_FLIGHT_DEBUG_ENABLED (accès contrôlé comme les profils, voir app/api/profiling.py).
+"""
+import asyncio
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, Union
+
+from fastapi import APIRouter, Header
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.api import profiling
+from app.core.config import settings
+from app.db.session import write_session
+
+def _run_in_session(bind: Optional[Union[Engine, Connection]], fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Exécute fn(session, *args, **kwargs) avec une session ouverte pour l'occasion sur 'bind' (None : session shardée)."""
+    session = Session(bind=bind, autoflush=False) if bind is not None else write_session()
+    try:
+        return fn(session, *args, **kwargs)
+    finally:
+        session.close()
+
+class SingleFlight:
+    """Vols en cours (une tâche par clé) et compteurs par opération."""
+
+    def __init__(self):
+        self._vols: Dict[Tuple[str, Hashable], asyncio.Task] = {}
+        self._compteurs: Dict[str, Dict[str, int]] = {}
+
+    def _compter(self, nom: str, compteur: str) -> None:
+        compteurs = self._compteurs.setdefault(nom, {"executions": 0, "regroupees": 0})
+        compteurs[compteur] += 1
+
+    async def do(self, nom: str, cle: Hashable, db: Session, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Exécute fn(session, *args, **kwargs) dans le pool de threads, ou attend l'exécution identique déjà en cours.
+
+        Args:
+            nom: Nom de l'opération (regroupement des compteurs).
+            cle: Paramètres normalisés (hachables) de l'appel.
+            db: Session de la requête : le vol ouvre sa propre session sur la même base (voir session_key).
+            fn: Fonction synchrone à exécuter, recevant la session en premier argument ; ses exceptions
+                sont propagées à tous les appelants regroupés.
+
+        Returns:
+            Le résultat de fn, partagé entre les appelants regroupés.
+        """
+        if not settings.SINGLE_FLIGHT_ENABLED: # Pas de partage : la session de la requête suffit
+            return await run_in_threadpool(fn, db, *args, **kwargs)
+        cle_vol = (nom, cle)
+        vol = self._vols.get(cle_vol)
+        if vol is None:
+            self._compter(nom, "executions")
+            vol = asyncio.ensure_future(run_in_threadpool(_run_in_session, db.bind, fn, *args, **kwargs))
+            self._vols[cle_vol] = vol
+            vol.add_done_callback(lambda _: self._vols.pop(cle_vol, None))
+        else:
+            self._compter(nom, "regroupees")
+        # shield : la déconnexion d'un client n'annule pas le calcul attendu par les autres
+        return await asyncio.shield(vol)
+
+    def stats(self) -> Dict[str, Any]:
+        """Compteurs par opération (exécutions réelles, requêtes servies par un vol en cours) et vols en cours."""
+        return {"operations": {nom: dict(c) for nom, c in self._compteurs.items()}, "en_cours": len(self._vols)}
+
+def session_key(db: Session) -> int:
+    """Identifie la base lue par une session (primaire, réplica ; 0 pour une session shardée qui route elle-même)."""
+    return id(db.bind) if db.bind is not None else 0
+
+single_flight = SingleFlight()
+
+# --- Consultation (/debug/single-flight, montée par app/main.py avec /debug/profiles) ---
+router = APIRouter(
+    tags=["Debug"]
+)
+
+@router.get("/")
+async def read_single_flight_stats(x_profile: Optional[str] = Header(default=None)):
+    """Compteurs du regroupement (lectures et simulations servies par un calcul en cours)."""
+    profiling.check_access(x_profile)
+    return single_flight.stats()
@@ -0,0 +1,108 @@
+# app/core/config.py
+import os
+from dotenv import load_dotenv
+
+# Charger les variables d'environnement du fichier .env
+load_dotenv()
+
+class Settings:
+    """
+    Configuration centralisée de l'application, lue depuis les variables d'environnement.
+    (DATABASE_URL, DATABASE_REPLICA_URLS et DATABASE_SHARD_URLS restent lues par app/db/session.py.)
+    """
+    # --- Projections de performance pré-calculées (voir app/services/projection_service.py) ---
+    PROJECTION_HORIZON_MOIS: int = int(os.getenv("PROJECTION_HORIZON_MOIS", "6"))
+    # Intervalle du rafraîchissement en tâche de fond, en secondes (0 = désactivé, utiliser la CLI)
+    PROJECTION_REFRESH_INTERVAL_SECONDS: int = int(os.getenv("PROJECTION_REFRESH_INTERVAL_SECONDS", "0"))
+    PROJECTION_BATCH_SIZE: int = int(os.getenv("PROJECTION_BATCH_SIZE", "5000"))
+
+    # --- Clôture automatique des pointages oubliés (voir app/scripts/close_open_pointages.py) ---
+    # Un pointage encore ouvert plus de N jours après sa date est considéré comme un départ oublié
+    POINTAGE_AUTO_CLOSE_AFTER_DAYS: int = int(os.getenv("POINTAGE_AUTO_CLOSE_AFTER_DAYS", "1"))
+    # Durée de poste appliquée à partir de l'heure d'arrivée pour fixer l'heure de départ
+    POINTAGE_AUTO_CLOSE_SHIFT_HOURS: float = float(os.getenv("POINTAGE_AUTO_CLOSE_SHIFT_HOURS", "8"))
+    # Durée de conservation des clés d'idempotence des badgeages (purgées par le même job)
+    BADGE_IDEMPOTENCY_TTL_HOURS: int = int(os.getenv("BADGE_IDEMPOTENCY_TTL_HOURS", "72"))
+
+    # --- Archivage des pointages historiques (voir app/scripts/archive_pointages.py) ---
+    # Les pointages fermés datant de plus de N jours sont déplacés dans 'pointages_archive'
+    POINTAGE_ARCHIVE_AFTER_DAYS: int = int(os.getenv("POINTAGE_ARCHIVE_AFTER_DAYS", "365"))
+    POINTAGE_ARCHIVE_BATCH_SIZE: int = int(os.getenv("POINTAGE_ARCHIVE_BATCH_SIZE", "5000"))
+
+    # --- Compression des réponses (voir app/api/compression.py) ---
+    # Taille minimale (octets) en dessous de laquelle une réponse est envoyée telle quelle
+    COMPRESSION_MINIMUM_SIZE: int = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1000"))
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    # Qualité brotli (0-11) : 4-5 compresse mieux que gzip 6 pour un coût CPU comparable
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+
+    # --- Réplicas en lecture (DATABASE_REPLICA_URLS, voir app/db/session.py) ---
+    # Durée pendant laquelle les lectures d'un client restent sur le primaire après une de ses écritures
+    # (doit couvrir le retard de réplication habituel)
+    READ_YOUR_WRITES_SECONDS: float = float(os.getenv("READ_YOUR_WRITES_SECONDS", "10"))
+
+    # --- Sharding par département (DATABASE_SHARD_URLS, voir app/db/sharding.py) ---
+    # Nombre d'ids réservés à la fois dans 'shard_sequences' (une écriture en base principale par bloc)
+    SHARD_ID_BLOCK_SIZE: int = int(os.getenv("SHARD_ID_BLOCK_SIZE", "100"))
+    # Durée de vie du cache de l'annuaire en mémoire : délai maximal avant qu'un rééquilibrage
+    # (app/scripts/rebalance_shards.py, autre processus) soit vu par l'API
+    SHARD_DIRECTORY_CACHE_SECONDS: float = float(os.getenv("SHARD_DIRECTORY_CACHE_SECONDS", "60"))
+
+    # --- Journal des modifications (GET /events, voir app/api/api_v1/endpoints/events.py) ---
+    # Intervalle entre deux lectures du journal pendant un long-poll ou un flux SSE
+    EVENTS_POLL_SECONDS: float = float(os.getenv("EVENTS_POLL_SECONDS", "0.5"))
+    # Âge minimal d'un événement avant diffusion : laisse aux transactions concurrentes (PostgreSQL)
+    # le temps de valider leurs ids inférieurs, pour qu'un consommateur n'en saute aucun
+    EVENTS_SETTLE_SECONDS: float = float(os.getenv("EVENTS_SETTLE_SECONDS", "1"))
+    # Durée de conservation des événements (purgés par app/scripts/close_open_pointages.py)
+    EVENTS_RETENTION_DAYS: int = int(os.getenv("EVENTS_RETENTION_DAYS", "30"))
+
+    # --- Profilage à la demande (voir app/api/profiling.py) ---
+    # Active le middleware et /debug/profiles ; sans effet sur les requêtes non profilées
+    PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "0").lower() in ("1", "true", "yes")
+    # Valeur attendue de l'en-tête X-Profile (déclenchement et consultation) ; vide = toute valeur
+    PROFILING_TOKEN: str = os.getenv("PROFILING_TOKEN", "")
+    # Proportion des requêtes profilées sans en-tête (0 = uniquement à la demande)
+    PROFILING_SAMPLE_RATE: float = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+    PROFILING_INTERVAL_MS: float = float(os.getenv("PROFILING_INTERVAL_MS", "1"))
+    PROFILING_MAX_PROFILES: int = int(os.getenv("PROFILING_MAX_PROFILES", "50")) # Conservés en mémoire, par processus
+
+    # --- Contrôle d'admission (voir app/api/admission.py) ---
+    ADMISSION_CONTROL_ENABLED: bool = os.getenv("ADMISSION_CONTROL_ENABLED", "1").lower() in ("1", "true", "yes")
+    # Requêtes simultanées par worker (0 = pas de limite) ; au-delà : 503 immédiat
+    SIMULATION_MAX_CONCURRENT: int = int(os.getenv("SIMULATION_MAX_CONCURRENT", "4"))
+    LIST_MAX_CONCURRENT: int = int(os.getenv("LIST_MAX_CONCURRENT", "8"))
+    # Limites de débit par client (0 = aucune) ; au-delà : 429 avec Retry-After
+    RATE_LIMIT_PER_SECOND: float = float(os.getenv("RATE_LIMIT_PER_SECOND", "0"))
+    RATE_LIMIT_BURST: float = float(os.getenv("RATE_LIMIT_BURST", "0")) # 0 = deux secondes de débit
+    RATE_LIMIT_SIMULATIONS_PER_MINUTE: float = float(os.getenv("RATE_LIMIT_SIMULATIONS_PER_MINUTE", "0"))
+    # Fichier SQLite partagé par les workers d'une machine pour les limites de débit (vide = mémoire du worker)
+    ADMISSION_STATE_PATH: str = os.getenv("ADMISSION_STATE_PATH", "")
+    # Identifier le client par le premier X-Forwarded-For (uniquement derrière un proxy qui le réécrit)
+    ADMISSION_TRUST_FORWARDED: bool = os.getenv("ADMISSION_TRUST_FORWARDED", "0").lower() in ("1", "true", "yes")
+
+    # --- Regroupement des requêtes identiques simultanées (voir app/api/single_flight.py) ---
+    SINGLE_FLIGHT_ENABLED: bool = os.getenv("SINGLE_FLIGHT_ENABLED", "1").lower() in ("1", "true", "yes")
+    # Expose les compteurs sous /debug/single-flight (en-tête X-Profile exigé si PROFILING_TOKEN est défini)
+    SINGLE_FLIGHT_DEBUG_ENABLED: bool = os.getenv("SINGLE_FLIGHT_DEBUG_ENABLED", "0").lower() in ("1", "true", "yes")
+
+    # --- Horaires et ponctualité (voir app/services/horaire_service.py) ---
+    # Fuseau des employés et départements qui n'en précisent pas (dates locales des pointages, voir app/core/timezones.py)
+    DEFAULT_TIMEZONE: str = os.getenv("DEFAULT_TIMEZONE", "Europe/Paris")
+    LATENESS_TOLERANCE_MINUTES: float = float(os.getenv("LATENESS_TOLERANCE_MINUTES", "5")) # Retard non compté en deçà
+    PONCTUALITE_MAX_JOURS: int = int(os.getenv("PONCTUALITE_MAX_JOURS", "366")) # Période maximale d'un calcul
+
+    # --- Détection d'anomalies de pointage (voir app/services/anomalie_service.py) ---
+    # Seuil de signalement d'une arrivée, durée ou écart inhabituel (en écarts types de l'historique récent)
+    ANOMALIE_Z_SEUIL: float = float(os.getenv("ANOMALIE_Z_SEUIL", "3.5"))
+    ANOMALIE_FENETRE: int = int(os.getenv("ANOMALIE_FENETRE", "20")) # Pointages précédents formant l'historique récent
+    ANOMALIE_MIN_HISTORIQUE: int = int(os.getenv("ANOMALIE_MIN_HISTORIQUE", "10")) # En deçà, pas de z-score
+    ANOMALIE_HISTORIQUE_JOURS: int = int(os.getenv("ANOMALIE_HISTORIQUE_JOURS", "60")) # Jours relus avant la période analysée
+    # Durées de pointage invraisemblables, et écart en deçà duquel deux pointages sont un badgeage en double
+    ANOMALIE_DUREE_MIN_MINUTES: float = float(os.getenv("ANOMALIE_DUREE_MIN_MINUTES", "10"))
+    ANOMALIE_DUREE_MAX_HEURES: float = float(os.getenv("ANOMALIE_DUREE_MAX_HEURES", "16"))
+    ANOMALIE_DOUBLON_MINUTES: float = float(os.getenv("ANOMALIE_DOUBLON_MINUTES", "5"))
+    # Période analysée par la première exécution (les suivantes reprennent après la précédente)
+    ANOMALIE_PREMIERE_ANALYSE_JOURS: int = int(os.getenv("ANOMALIE_PREMIERE_ANALYSE_JOURS", "90"))
+
+settings = Settings()
@@ -0,0 +1,74 @@
+# app/core/timezones.py
+"""
+Fuseaux horaires et dates locales des pointages.
+
+Convention : les horodatages sont enregistrés en UTC ; un horodatage reçu sans fuseau est considéré
+comme UTC (SQLite ne conserve pas le fuseau, comme pour les compteurs de modifications). Le fuseau d'un
+employé est le sien, sinon celui de son département (site), sinon settings.DEFAULT_TIMEZONE ; il sert
+à calculer la date locale d'un pointage (colonne jour_local, voir crud_pointage) et les heures locales
+comparées aux horaires (voir horaire_service). Les réponses de l'API portent le décalage ("Z").
+
+Les pointages enregistrés avant cette convention (jour_local NULL) portent l'heure locale de l'employé,
+sans fuseau : app/scripts/backfill_jour_local.py les convertit en UTC en calculant leur jour_local, et une
+modification d'un tel pointage (départ, badge de sortie) le convertit d'abord (voir from_local).
+"""
+from datetime import date, datetime, time, timezone
+from functools import lru_cache
+from typing import Annotated, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from pydantic import AfterValidator
+
+from app.core.config import settings
+
+@lru_cache(maxsize=None)
+def get_zone(nom: str) -> ZoneInfo:
+    """
+    Fuseau IANA par son nom (ex: "Europe/Paris").
+
+    Raises:
+        ValueError: Si le fuseau est inconnu.
+    """
+    try:
+        return ZoneInfo(nom)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Fuseau horaire inconnu : '{nom}'.")
+
+def check_timezone(nom: Optional[str]) -> Optional[str]:
+    """Validation d'un nom de fuseau (schémas Pydantic) ; None est accepté (fuseau hérité)."""
+    if nom is not None:
+        get_zone(nom)
+    return nom
+
+def resolve_timezone(*candidats: Optional[str]) -> str:
+    """Premier fuseau renseigné (employé, département...), sinon le fuseau par défaut."""
+    return next((nom for nom in candidats if nom), settings.DEFAULT_TIMEZONE)
+
+def to_utc(instant: datetime) -> datetime:
+    """Horodatage en UTC (avec fuseau) ; un horodatage naïf est considéré comme UTC."""
+    if instant.tzinfo is None:
+        return instant.replace(tzinfo=timezone.utc)
+    return instant.astimezone(timezone.utc)
+
+def from_local(instant: datetime, fuseau: str) -> datetime:
+    """
+    Heure locale sans fuseau (pointage antérieur à la convention UTC) -> horodatage UTC (avec fuseau).
+    Un horodatage avec fuseau (relu de PostgreSQL, timestamptz) désigne déjà un instant : seulement ramené en UTC.
+    """
+    if instant.tzinfo is not None:
+        return instant.astimezone(timezone.utc)
+    return instant.replace(tzinfo=get_zone(fuseau)).astimezone(timezone.utc)
+
+# Horodatage des schémas Pydantic : ramené en UTC avec fuseau (naïf = UTC), sérialisé avec "Z"
+UtcDateTime = Annotated[datetime, AfterValidator(to_utc)]
+
+def local_date(instant: datetime, fuseau: str) -> date:
+    """Date locale d'un horodatage dans un fuseau (horodatage naïf = UTC)."""
+    return to_utc(instant).astimezone(get_zone(fuseau)).date()
+
+def utc_offset_minutes(fuseau: str, jour: date) -> float:
+    """
+    Décalage du fuseau par rapport à UTC (minutes) le jour donné, à midi heure locale : exact pour toute
+    heure de la journée, sauf la nuit d'un changement d'heure (entre minuit et 3h environ).
+    """
+    return datetime.combine(jour, time(12), tzinfo=get_zone(fuseau)).utcoffset().total_seconds() / 60
@@ -6,7 +6,9 @@ from .crud_employe import (
     create_employe,
     update_employe,
     delete_employe,
-    get_employes_by_departement
+    get_employes_by_departement,
+    get_employe_timezone,
+    get_employe_timezones
 )
 
 from .import crud_employe as employe
@@ -18,6 +20,7 @@ from .crud_departement import (
     get_departements,
     create_departement,
     update_departement,
+    reassign_employes,
     delete_departement
 )
 
@@ -30,26 +33,104 @@ from .crud_pointage import (
     get_pointages,
     get_pointages_by_employe,
     get_pointage_by_employe_and_date,
+    get_open_pointages,
+    get_pointage_intervals,
+    get_pointage_series,
+    get_first_modified_day,
+    get_daily_presence,
+    fill_local_days,
+    close_stale_open_pointages,
+    record_badge,
+    purge_badge_events,
     create_pointage,
     update_pointage,
     delete_pointage
 )
 from . import crud_pointage as pointage
 
+from .crud_pointage_archive import (
+    get_archived_until,
+    archive_pointages
+)
+from . import crud_pointage_archive as pointage_archive
+
 from .crud_evaluation import (
     get_evaluation,
     get_evaluations,
     get_evaluations_by_employe,
+    get_score_timeseries,
     create_evaluation,
     update_evaluation,
     delete_evaluation
 )
 from . import crud_evaluation as evaluation
 
+from .crud_latest_evaluation import (
+    get_latest_evaluation,
+    get_latest_evaluations,
+    get_latest_evaluations_by_departement,
+    refresh_latest_evaluation,
+    check_latest_evaluations,
+    rebuild_latest_evaluations
+)
+from . import crud_latest_evaluation as latest_evaluation
+
 from .crud_simulation import (
     get_simulation,
     get_simulations_by_employe,
     create_simulation_record,
+    create_simulation_records,
     delete_simulation
 )
-from . import crud_simulation as simulation
\ No newline at end of file
+from . import crud_simulation as simulation
+
+from .crud_calibration import (
+    get_calibration,
+    get_calibrations,
+    replace_calibrations,
+    purge_calibrations
+)
+from . import crud_calibration as calibration
+
+from .crud_projection import (
+    get_projections_by_departement,
+    replace_projections,
+    purge_projections
+)
+from . import crud_projection as projection
+from .crud_change_counter import (
+    get_versions,
+    bump_versions
+)
+from . import crud_change_counter as change_counter
+
+from .crud_change_event import (
+    get_events,
+    record_event,
+    record_events,
+    purge_events
+)
+from . import crud_change_event as change_event
+
+from .crud_horaire import (
+    get_horaire_departement,
+    get_horaire_employe,
+    get_horaires_employes_by_departement,
+    replace_horaire_departement,
+    replace_horaire_employe,
+    get_jours_feries,
+    create_jour_ferie,
+    delete_jour_ferie
+)
+from . import crud_horaire as horaire
+
+from .crud_anomalie import (
+    get_anomalies,
+    replace_anomalies,
+    get_last_analysis,
+    record_analysis,
+    forget_pointage,
+    get_first_deleted_day,
+    purge_deletions
+)
+from . import crud_anomalie as anomalie
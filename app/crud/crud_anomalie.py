@@ -0,0 +1,129 @@
+# app/crud/crud_anomalie.py
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional
+from datetime import date, datetime, timezone
+
+from app.db import sharding
+from app.models.employe import Employe as EmployeModel
+from app.models.pointage_anomalie import (
+    PointageAnomalie as AnomalieModel, AnalyseAnomalies as AnalyseModel, PointageSuppression as SuppressionModel
+)
+
+ANOMALIE_SORT_FIELDS = ("jour", "employe_id", "pointage_id")
+
+def get_anomalies(
+    db: Session,
+    employe_id: Optional[int] = None,
+    departement_id: Optional[int] = None,
+    type_anomalie: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    skip: int = 0,
+    limit: int = 100
+) -> List[AnomalieModel]:
+    """
+    Récupère les anomalies de pointage détectées, avec filtres optionnels.
+
+    Args:
+        db: Session de base de données SQLAlchemy.
+        employe_id: Restreindre à cet employé (optionnel).
+        departement_id: Restreindre aux employés de ce département (optionnel).
+        type_anomalie: Restreindre à un type d'anomalie (optionnel).
+        start_date, end_date: Période sur la date locale du pointage (bornes incluses, optionnelles).
+        skip: Nombre d'enregistrements à sauter.
+        limit: Nombre maximum d'enregistrements à retourner.
+
+    Returns:
+        Une liste d'objets AnomalieModel, du jour le plus récent au plus ancien.
+    """
+    if employe_id is None and departement_id is None and sharding.is_sharded(db): # Fusion des pages de chaque shard
+        return sharding.scatter_gather(
+            lambda shard_db, n, colonnes: get_anomalies(shard_db, None, None, type_anomalie, start_date, end_date, 0, n),
+            ANOMALIE_SORT_FIELDS, skip, limit, descending=True
+        )
+    query = db.query(AnomalieModel)
+    if employe_id is not None:
+        query = query.filter(AnomalieModel.employe_id == employe_id)
+    if departement_id is not None:
+        query = query.join(EmployeModel, EmployeModel.id == AnomalieModel.employe_id)\
+                     .filter(EmployeModel.departement_id == departement_id)
+    if type_anomalie is not None:
+        query = query.filter(AnomalieModel.type == type_anomalie)
+    if start_date:
+        query = query.filter(AnomalieModel.jour >= start_date)
+    if end_date:
+        query = query.filter(AnomalieModel.jour <= end_date)
+    return query.order_by(*(getattr(AnomalieModel, champ).desc() for champ in ANOMALIE_SORT_FIELDS))\
+                .offset(skip).limit(limit).all()
+
+def replace_anomalies(
+    db: Session,
+    premier_employe_id: int,
+    dernier_employe_id: int,
+    start_date: date,
+    end_date: date,
+    anomalies: List[Dict[str, Any]]
+) -> int:
+    """
+    Remplace en bloc les anomalies d'une plage d'employés sur une période (DELETE + INSERT multi-lignes,
+    une transaction) : une nouvelle analyse de la même période remplace la précédente.
+
+    Args:
+        db: Session de base de données SQLAlchemy (une base : la principale ou un shard).
+        premier_employe_id, dernier_employe_id: Plage d'ids d'employés analysée (bornes incluses).
+        start_date, end_date: Période analysée (bornes incluses).
+        anomalies: Dictionnaires avec les colonnes employe_id, pointage_id, type, jour, valeur, moyenne, z_score.
+
+    Returns:
+        Le nombre d'anomalies enregistrées.
+    """
+    db.execute(
+        delete(AnomalieModel)
+        .where(AnomalieModel.employe_id.between(premier_employe_id, dernier_employe_id))
+        .where(AnomalieModel.jour.between(start_date, end_date))
+    )
+    if anomalies:
+        db.execute(insert(AnomalieModel), anomalies)
+    db.commit()
+    return len(anomalies)
+
+def get_last_analysis(db: Session) -> Optional[AnalyseModel]:
+    """Dernière exécution de la détection (celle qui va le plus loin), ou None si elle n'a jamais tourné."""
+    return db.scalars(select(AnalyseModel).order_by(AnalyseModel.jusqu_au.desc(), AnalyseModel.id.desc()).limit(1)).first()
+
+def record_analysis(
+    db: Session, depuis: date, jusqu_au: date, pointages: int, anomalies: int, marque: Optional[datetime]
+) -> AnalyseModel:
+    """
+    Enregistre une exécution de la détection : la suivante reprendra au lendemain de 'jusqu_au', ou au
+    premier jour d'un pointage créé ou modifié depuis 'marque' (début de l'exécution, UTC).
+    """
+    db_analyse = AnalyseModel(depuis=depuis, jusqu_au=jusqu_au, pointages=pointages, anomalies=anomalies, marque=marque)
+    db.add(db_analyse)
+    db.commit()
+    db.refresh(db_analyse)
+    return db_analyse
+
+def forget_pointage(db: Session, employe_id: int, pointage_id: int, jour: date) -> None:
+    """
+    Supprime les anomalies d'un pointage supprimé et note son jour pour la prochaine détection
+    (anomalies des pointages voisins à revoir). Ne fait PAS de commit : à appeler dans la transaction
+    de la suppression.
+    """
+    db.execute(
+        delete(AnomalieModel)
+        .where(AnomalieModel.employe_id == employe_id)
+        .where(AnomalieModel.pointage_id == pointage_id)
+    )
+    db.merge(SuppressionModel(employe_id=employe_id, jour=jour, date_suppression=datetime.now(timezone.utc)))
+
+def get_first_deleted_day(db: Session, depuis: datetime) -> Optional[date]:
+    """Plus ancien jour dont un pointage a été supprimé depuis un instant, ou None."""
+    return db.scalar(select(func.min(SuppressionModel.jour)).where(SuppressionModel.date_suppression >= depuis))
+
+def purge_deletions(db: Session, avant: datetime) -> int:
+    """Oublie les suppressions antérieures à un instant (déjà prises en compte par la détection). Retourne le nombre supprimé."""
+    deleted = db.execute(delete(SuppressionModel).where(SuppressionModel.date_suppression < avant)).rowcount
+    db.commit()
+    return deleted
@@ -0,0 +1,60 @@
+# app/crud/crud_calibration.py
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.models.employe_calibration import EmployeCalibration as CalibrationModel
+from app.models.evaluation import Evaluation as EvaluationModel
+
+def get_calibration(db: Session, employe_id: int) -> Optional[CalibrationModel]:
+    """
+    Récupère les paramètres calibrés d'un employé (lecture par clé primaire).
+
+    Args:
+        db: Session de base de données SQLAlchemy.
+        employe_id: ID de l'employé.
+
+    Returns:
+        L'objet CalibrationModel s'il existe, sinon None.
+    """
+    return db.get(CalibrationModel, employe_id)
+
+def get_calibrations(db: Session, employe_ids: Iterable[int]) -> Dict[int, CalibrationModel]:
+    """Récupère les paramètres calibrés de plusieurs employés en une requête ({employe_id: CalibrationModel})."""
+    ids = list(employe_ids)
+    if not ids:
+        return {}
+    rows = db.query(CalibrationModel).filter(CalibrationModel.employe_id.in_(ids)).all()
+    return {row.employe_id: row for row in rows}
+
+def replace_calibrations(db: Session, employe_ids: List[int], calibrations: List[Dict[str, Any]]) -> int:
+    """
+    Remplace en bloc les calibrations d'un ensemble d'employés (DELETE ... IN + INSERT multi-lignes).
+    Les employés de 'employe_ids' absents de 'calibrations' perdent leur calibration (données insuffisantes).
+
+    Args:
+        db: Session de base de données SQLAlchemy.
+        employe_ids: IDs des employés traités par ce lot.
+        calibrations: Dictionnaires avec les colonnes employe_id, base_growth, base_decay, nb_evaluations, rmse.
+
+    Returns:
+        Le nombre de calibrations enregistrées.
+    """
+    if employe_ids:
+        db.execute(delete(CalibrationModel).where(CalibrationModel.employe_id.in_(employe_ids)))
+    if calibrations:
+        db.execute(insert(CalibrationModel), calibrations)
+    db.commit()
+    return len(calibrations)
+
+def purge_calibrations(db: Session) -> int:
+    """
+    Supprime les calibrations des employés qui n'ont plus aucune évaluation notée.
+
+    Returns:
+        Le nombre de calibrations supprimées.
+    """
+    evalues = select(EvaluationModel.employe_id).where(EvaluationModel.score_global.isnot(None))
+    result = db.execute(delete(CalibrationModel).where(CalibrationModel.employe_id.not_in(evalues)))
+    db.commit()
+    return result.rowcount
@@ -0,0 +1,45 @@
+# app/crud/crud_change_counter.py
+from datetime import datetime, timezone
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from typing import Dict, Optional, Tuple
+
+from app.models.change_counter import ChangeCounter as ChangeCounterModel
+
+def get_versions(db: Session, *cles: str) -> Dict[str, Tuple[int, Optional[datetime]]]:
+    """
+    Lit les compteurs de plusieurs clés en une requête (lecture par clé primaire).
+
+    Returns:
+        Un dictionnaire {cle: (version, date_modification)} ; (0, None) pour une clé jamais modifiée.
+    """
+    versions = {cle: (0, None) for cle in cles}
+    rows = db.execute(
+        select(ChangeCounterModel.cle, ChangeCounterModel.version, ChangeCounterModel.date_modification)
+        .where(ChangeCounterModel.cle.in_(cles))
+    )
+    for cle, version, date_modification in rows:
+        if date_modification is not None and date_modification.tzinfo is None:
+            date_modification = date_modification.replace(tzinfo=timezone.utc) # SQLite ne conserve pas le fuseau
+        versions[cle] = (version, date_modification)
+    return versions
+
+def bump_versions(db: Session, *cles: str) -> None:
+    """
+    Incrémente les compteurs des clés données (création à 1 si absente).
+    Ne fait PAS de commit : doit être appelée dans la transaction de l'écriture concernée,
+    pour que le compteur et la donnée changent ensemble.
+    """
+    maintenant = datetime.now(timezone.utc)
+    for cle in sorted(set(cles)): # Ordre fixe : évite les interblocages entre écritures concurrentes
+        increment = update(ChangeCounterModel)\
+            .where(ChangeCounterModel.cle == cle)\
+            .values(version=ChangeCounterModel.version + 1, date_modification=maintenant)
+        if db.execute(increment).rowcount:
+            continue
+        try:
+            with db.begin_nested(): # SAVEPOINT : un conflit n'annule pas l'écriture en cours
+                db.execute(insert(ChangeCounterModel).values(cle=cle, version=1, date_modification=maintenant))
+        except IntegrityError: # Clé créée entre-temps par une écriture concurrente
+            db.execute(increment)
@@ -0,0 +1,121 @@
+# app/crud/crud_change_event.py
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from sqlalchemy import delete, event, insert, select
+from sqlalchemy.orm import Session
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.models.change_event import ChangeEvent as ChangeEventModel
+from app.db import sharding # Journal en base principale en mode shardé
+from app.core import timezones
+
+RESSOURCES = ("employes", "pointages", "evaluations") # Ressources journalisées
+COLONNES_INTERNES = ("date_modification",) # Tenue à jour par la base à l'écriture : pas dans les événements
+EN_ATTENTE = "change_events_en_attente" # Clé de Session.info : événements à écrire après le commit (mode shardé)
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return timezones.to_utc(value).isoformat() # Sans fuseau = UTC (relu de SQLite)
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+def row_data(obj: Any) -> Dict[str, Any]:
+    """Colonnes d'un objet ORM, d'une ligne Core ou d'un dictionnaire, sous forme sérialisable en JSON."""
+    if isinstance(obj, dict):
+        mapping = obj
+    elif hasattr(obj, "_mapping"):
+        mapping = obj._mapping
+    else:
+        mapping = {c.key: getattr(obj, c.key) for c in obj.__table__.columns}
+    return {cle: _json_value(valeur) for cle, valeur in mapping.items() if cle not in COLONNES_INTERNES}
+
+def record_events(db: Session, ressource: str, operation: str, lignes: Iterable[Tuple[int, Optional[Dict[str, Any]]]]) -> None:
+    """
+    Ajoute des événements au journal (un seul INSERT, quel que soit leur nombre).
+    Ne fait PAS de commit : doit être appelée dans la transaction de l'écriture concernée,
+    pour que l'événement et la donnée soient validés (ou annulés) ensemble.
+
+    En mode shardé, le journal est en base principale et la donnée sur un shard : les événements
+    sont gardés dans la session et écrits juste après son commit, dans une transaction séparée
+    (jamais d'événement pour une écriture annulée ; un événement peut en revanche manquer si
+    le processus s'arrête entre les deux commits).
+
+    Args:
+        db: Session de base de données SQLAlchemy.
+        ressource: "employes", "pointages" ou "evaluations".
+        operation: "create", "update" ou "delete".
+        lignes: Couples (id de la ligne, données après écriture ; None pour une suppression).
+    """
+    maintenant = datetime.now(timezone.utc)
+    valeurs = [
+        {"date_creation": maintenant, "ressource": ressource, "ressource_id": ressource_id,
+         "operation": operation, "donnees": donnees}
+        for ressource_id, donnees in lignes
+    ]
+    if not valeurs:
+        return
+    if sharding.router is not None and (sharding.is_sharded(db) or db.get_bind() is not sharding.router.global_engine):
+        # ShardedSession ou session d'un seul shard (traitements par lots) : voir _write_pending
+        db.info.setdefault(EN_ATTENTE, []).extend(valeurs)
+        return
+    db.execute(insert(ChangeEventModel), valeurs)
+
+@event.listens_for(Session, "after_commit")
+def _write_pending(db: Session) -> None:
+    """Écrit en base principale les événements d'une transaction shardée qui vient d'être validée."""
+    valeurs = db.info.pop(EN_ATTENTE, None)
+    if not valeurs:
+        return
+    try:
+        with sharding.router.global_engine.begin() as conn:
+            conn.execute(insert(ChangeEventModel), valeurs)
+    except Exception as e:
+        # La donnée est déjà validée : ne pas faire échouer l'écriture, les événements sont perdus
+        print(f"Erreur lors de l'écriture de {len(valeurs)} événement(s) du journal : {e}")
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(db: Session) -> None:
+    db.info.pop(EN_ATTENTE, None)
+
+def record_event(db: Session, ressource: str, operation: str, obj: Any) -> None:
+    """Journalise l'écriture d'un objet ORM (voir record_events) ; ses données ne sont pas reprises pour une suppression."""
+    record_events(db, ressource, operation, [(obj.id, None if operation == "delete" else row_data(obj))])
+
+def get_events(
+    db: Session, since: int = 0, limit: int = 500, settle_seconds: float = 0
+) -> List[ChangeEventModel]:
+    """
+    Récupère les événements d'id supérieur à 'since', dans l'ordre (lecture par plage de clé primaire).
+
+    Args:
+        db: Session de base de données SQLAlchemy.
+        since: Dernier id déjà reçu par le consommateur (0 = depuis le début du journal).
+        limit: Nombre maximum d'événements.
+        settle_seconds: Ne livrer que les événements plus anciens que ce délai (voir settings.EVENTS_SETTLE_SECONDS).
+
+    Returns:
+        Une liste d'objets ChangeEventModel triée par id.
+    """
+    events = list(db.scalars(
+        select(ChangeEventModel).where(ChangeEventModel.id > since).order_by(ChangeEventModel.id).limit(limit)
+    ))
+    if settle_seconds > 0:
+        # Une transaction plus lente peut valider après coup un id inférieur (PostgreSQL) : ne livrer
+        # que des événements assez anciens, et s'arrêter au premier trop récent pour rester dans l'ordre
+        limite = datetime.now(timezone.utc) - timedelta(seconds=settle_seconds)
+        for rang, event in enumerate(events):
+            date_creation = event.date_creation
+            if date_creation.tzinfo is None:
+                date_creation = date_creation.replace(tzinfo=timezone.utc) # SQLite ne conserve pas le fuseau
+            if date_creation > limite:
+                return events[:rang]
+    return events
+
+def purge_events(db: Session, avant: datetime) -> int:
+    """Supprime les événements créés avant une date. Retourne le nombre supprimé."""
+    deleted = db.execute(delete(ChangeEventModel).where(ChangeEventModel.date_creation < avant)).rowcount
+    db.commit()
+    return deleted
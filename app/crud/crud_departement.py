@@ -1,9 +1,15 @@
 # app/crud/crud_departement.py
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Sequence
 
 from app.models.departement import Departement as DepartementModel # Renommer pour clarté
+from app.models.employe import Employe as EmployeModel
 from app.schemas.departement import DepartementCreate, DepartementUpdate
+from app.crud.fields import with_fields
+from app.crud import crud_change_counter # Versions pour les ETag des endpoints de lecture
+from app.crud import crud_change_event # Journal des modifications (GET /events)
+from app.db import sharding # Lectures réparties en mode shardé
 
 def get_departement(db: Session, departement_id: int) -> Optional[DepartementModel]:
     """
@@ -31,7 +37,9 @@ def get_departement_by_nom(db: Session, nom: str) -> Optional[DepartementModel]:
     """
     return db.query(DepartementModel).filter(DepartementModel.nom == nom).first()
 
-def get_departements(db: Session, skip: int = 0, limit: int = 100) -> List[DepartementModel]:
+def get_departements(
+    db: Session, skip: int = 0, limit: int = 100, fields: Optional[Sequence[str]] = None
+) -> List[DepartementModel]:
     """
     Récupère une liste de départements avec pagination.
 
@@ -39,11 +47,17 @@ def get_departements(db: Session, skip: int = 0, limit: int = 100) -> List[Depar
         db: Session de base de données SQLAlchemy.
         skip: Nombre d'enregistrements à sauter.
         limit: Nombre maximum d'enregistrements à retourner.
+        fields: Colonnes à charger (optionnel) ; les lignes sont alors des tuples de colonnes.
 
     Returns:
-        Une liste d'objets DepartementModel.
+        Une liste d'objets DepartementModel (ou de tuples si 'fields' est fourni).
     """
-    return db.query(DepartementModel).offset(skip).limit(limit).all()
+    if sharding.is_sharded(db): # Liste globale : fusion des pages de chaque shard
+        return sharding.scatter_gather(
+            lambda shard_db, n, colonnes: get_departements(shard_db, 0, n, colonnes), ("id",), skip, limit, fields
+        )
+    query = with_fields(db.query(DepartementModel), DepartementModel, fields)
+    return query.order_by(DepartementModel.id).offset(skip).limit(limit).all()
 
 def create_departement(db: Session, departement: DepartementCreate) -> DepartementModel:
     """
@@ -71,6 +85,8 @@ def create_departement(db: Session, departement: DepartementCreate) -> Departeme
 
     db_departement = DepartementModel(**departement.model_dump())
     db.add(db_departement)
+    db.flush() # Obtenir l'ID pour la clé de version de la ressource
+    crud_change_counter.bump_versions(db, "departements", f"departements:{db_departement.id}")
     db.commit()
     db.refresh(db_departement)
     return db_departement
@@ -107,20 +123,66 @@ def update_departement(
             raise ValueError(f"Un autre département nommé '{update_data['nom']}' existe déjà.")
         db_departement.nom = update_data["nom"] # Mettre à jour le nom
 
-    # Potentiellement d'autres champs à mettre à jour si ajoutés au modèle/schéma
+    # Fuseau du site : les dates locales des pointages déjà enregistrés ne sont pas recalculées
+    # (relancer app.scripts.backfill_jour_local --recompute --departement-id)
+    if "fuseau_horaire" in update_data:
+        db_departement.fuseau_horaire = update_data["fuseau_horaire"]
 
     db.add(db_departement)
+    crud_change_counter.bump_versions(db, "departements", f"departements:{departement_id}")
     db.commit()
     db.refresh(db_departement)
     return db_departement
 
+def reassign_employes(
+    db: Session, departement_id: int, departement_cible_id: Optional[int]
+) -> List[int]:
+    """
+    Déplace tous les employés d'un département vers un autre (ou les désaffecte) en un seul UPDATE.
+
+    Args:
+        db: Session de base de données SQLAlchemy.
+        departement_id: ID du département d'origine.
+        departement_cible_id: ID du département de destination (None = employés sans département).
+
+    Returns:
+        La liste des IDs des employés déplacés.
+
+    Raises:
+        ValueError: Si le département de destination n'existe pas, est le département d'origine
+                    ou se trouve sur un autre shard (mode shardé).
+    """
+    if departement_cible_id == departement_id:
+        raise ValueError("Le département de destination doit être différent du département d'origine.")
+    if departement_cible_id is not None and get_departement(db, departement_id=departement_cible_id) is None:
+        raise ValueError(f"Le département de destination (ID {departement_cible_id}) n'existe pas.")
+    if sharding.is_sharded(db) and departement_cible_id is not None and \
+            sharding.router.shard_for_departement(departement_cible_id) != sharding.router.shard_for_departement(departement_id):
+        raise ValueError("Les deux départements sont sur des shards différents : utiliser app.scripts.rebalance_shards.")
+
+    # Lignes complètes renvoyées par l'UPDATE : elles alimentent aussi le journal des modifications
+    lignes = db.execute(
+        update(EmployeModel)
+        .where(EmployeModel.departement_id == departement_id)
+        .values(departement_id=departement_cible_id)
+        .returning(*EmployeModel.__table__.columns),
+        execution_options={"synchronize_session": False} # La session est expirée par le commit
+    ).all()
+    employe_ids = [ligne.id for ligne in lignes]
+    if employe_ids:
+        crud_change_counter.bump_versions(db, "employes", *(f"employes:{employe_id}" for employe_id in employe_ids))
+        crud_change_event.record_events(
+            db, "employes", "update", [(ligne.id, crud_change_event.row_data(ligne)) for ligne in lignes]
+        )
+    db.commit()
+    return employe_ids
+
 def delete_departement(db: Session, departement_id: int) -> Optional[DepartementModel]:
     """
     Supprime un département.
-    Attention: Gérer les employés liés à ce département avant suppression
-              (par exemple, les mettre à NULL ou empêcher la suppression).
-              La logique actuelle ne gère pas ce cas explicitement,
-              cela dépendra des contraintes de clé étrangère et de la stratégie souhaitée.
+    Ses employés restent en base, sans département : la clé étrangère employes.departement_id
+    est déclarée ON DELETE SET NULL, la base les met à jour sans que l'ORM ne les charge.
+    Pour les affecter ailleurs, appeler reassign_employes avant la suppression.
 
     Args:
         db: Session de base de données SQLAlchemy.
@@ -133,30 +195,23 @@ def delete_departement(db: Session, departement_id: int) -> Optional[Departement
     if db_departement is None:
         return None
 
-    # --- Logique de gestion des employés liés (Exemple) ---
-    # Option 1: Vérifier s'il y a des employés et empêcher la suppression
-    # if db_departement.employes: # Accès via la relation définie dans le modèle
-    #    raise ValueError(f"Impossible de supprimer le département '{db_departement.nom}' car il contient des employés.")
-
-    # Option 2: Mettre departement_id à NULL pour les employés liés (si FK le permet)
-    # for employe in db_departement.employes:
-    #     employe.departement_id = None
-    #     db.add(employe)
-    # Note: Ceci nécessite un commit séparé ou doit être géré dans la même transaction.
-
-    # Option 3: Compter sur la cascade ou la configuration FK (SET NULL, RESTRICT)
-    # C'est souvent géré au niveau de la base de données ou de SQLAlchemy.
-    # Par défaut, si des employés existent, une erreur d'intégrité sera levée au commit.
-    # -------------------------------------------------------
-
+    # Employés concernés par le SET NULL (ETag et journal des modifications), lus sans charger les objets
+    employes = db.execute(
+        select(EmployeModel.__table__).where(EmployeModel.departement_id == departement_id)
+    ).all()
     db.delete(db_departement)
+    cles = ["departements", f"departements:{departement_id}"]
+    if employes:
+        cles += ["employes"] + [f"employes:{ligne.id}" for ligne in employes]
+        crud_change_event.record_events(db, "employes", "update", [
+            (ligne.id, crud_change_event.row_data({**ligne._mapping, "departement_id": None})) for ligne in employes
+        ])
+    crud_change_counter.bump_versions(db, *cles)
     try:
         db.commit()
     except Exception as e:
-        db.rollback() # Annuler la transaction en cas d'erreur (ex: violation FK)
-        # Renvoyer l'erreur ou la logger
+        db.rollback() # Annuler la transaction en cas d'erreur
         print(f"Erreur lors de la suppression du département {departement_id}: {e}")
-        # Vous pourriez vouloir lever une exception spécifique ici
-        raise e # Ou retourner None ou un message d'erreur
+        raise e
 
-    return db_departement
\ No newline at end of file
+    return db_departement
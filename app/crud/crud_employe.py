@@ -1,9 +1,16 @@
 # app/crud/crud_employe.py
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence
 
+from app.core import timezones
 from app.models.employe import Employe as EmployeModel # Renommer pour éviter conflit de nom
+from app.models.departement import Departement as DepartementModel
 from app.schemas.employe import EmployeCreate, EmployeUpdate
+from app.crud.fields import with_fields
+from app.crud import crud_change_counter # Versions pour les ETag des endpoints de lecture
+from app.crud import crud_change_event # Journal des modifications (GET /events)
+from app.db import sharding # Lectures réparties en mode shardé
 
 def get_employe(db: Session, employe_id: int) -> Optional[EmployeModel]:
     """
@@ -31,7 +38,9 @@ def get_employe_by_email(db: Session, email: str) -> Optional[EmployeModel]:
     """
     return db.query(EmployeModel).filter(EmployeModel.email == email).first()
 
-def get_employes(db: Session, skip: int = 0, limit: int = 100) -> List[EmployeModel]:
+def get_employes(
+    db: Session, skip: int = 0, limit: int = 100, fields: Optional[Sequence[str]] = None
+) -> List[EmployeModel]:
     """
     Récupère une liste d'employés avec pagination.
 
@@ -39,11 +48,17 @@ def get_employes(db: Session, skip: int = 0, limit: int = 100) -> List[EmployeMo
         db: Session de base de données SQLAlchemy.
         skip: Nombre d'enregistrements à sauter (pour pagination).
         limit: Nombre maximum d'enregistrements à retourner.
+        fields: Colonnes à charger (optionnel) ; les lignes sont alors des tuples de colonnes.
 
     Returns:
-        Une liste d'objets EmployeModel.
+        Une liste d'objets EmployeModel (ou de tuples si 'fields' est fourni).
     """
-    return db.query(EmployeModel).offset(skip).limit(limit).all()
+    if sharding.is_sharded(db): # Liste globale : fusion des pages de chaque shard
+        return sharding.scatter_gather(
+            lambda shard_db, n, colonnes: get_employes(shard_db, 0, n, colonnes), ("id",), skip, limit, fields
+        )
+    query = with_fields(db.query(EmployeModel), EmployeModel, fields)
+    return query.order_by(EmployeModel.id).offset(skip).limit(limit).all()
 
 def create_employe(db: Session, employe: EmployeCreate) -> EmployeModel:
     """
@@ -59,6 +74,9 @@ def create_employe(db: Session, employe: EmployeCreate) -> EmployeModel:
     # Créer une instance du modèle SQLAlchemy à partir des données du schéma Pydantic
     db_employe = EmployeModel(**employe.model_dump())
     db.add(db_employe) # Ajoute l'objet à la session
+    db.flush() # Obtenir l'ID pour la clé de version de la ressource
+    crud_change_counter.bump_versions(db, "employes", f"employes:{db_employe.id}")
+    crud_change_event.record_event(db, "employes", "create", db_employe)
     db.commit()      # Valide la transaction (sauvegarde en BDD)
     db.refresh(db_employe) # Rafraîchit l'objet avec les données de la BDD (ex: l'ID généré)
     return db_employe
@@ -78,6 +96,9 @@ def update_employe(
 
     Returns:
         L'objet EmployeModel mis à jour s'il existe, sinon None.
+
+    Raises:
+        ValueError: En mode shardé, si le nouveau département est sur un autre shard que l'employé.
     """
     db_employe = get_employe(db, employe_id=employe_id)
     if db_employe is None:
@@ -86,12 +107,16 @@ def update_employe(
     # Récupérer les données à mettre à jour sous forme de dictionnaire
     # exclude_unset=True ne prend que les champs explicitement fournis dans la requête
     update_data = employe_update.model_dump(exclude_unset=True)
+    if sharding.is_sharded(db) and update_data.get("departement_id") not in (None, db_employe.departement_id):
+        sharding.check_same_shard(employe_id, update_data["departement_id"])
 
     # Mettre à jour les champs du modèle SQLAlchemy
     for key, value in update_data.items():
         setattr(db_employe, key, value)
 
     db.add(db_employe) # Peut être implicite si l'objet est déjà dans la session, mais ne nuit pas
+    crud_change_counter.bump_versions(db, "employes", f"employes:{employe_id}")
+    crud_change_event.record_event(db, "employes", "update", db_employe)
     db.commit()
     db.refresh(db_employe)
     return db_employe
@@ -111,12 +136,33 @@ def delete_employe(db: Session, employe_id: int) -> Optional[EmployeModel]:
     if db_employe is None:
         return None
 
+    # Historique (pointages, évaluations, simulations, lignes dérivées) supprimé par la base en cascade,
+    # en une instruction par table, quelle que soit sa taille (voir benchmarks/bench_cascade_delete.py)
     db.delete(db_employe)
+    crud_change_counter.bump_versions(db, "employes", f"employes:{employe_id}", f"simulations:employe:{employe_id}")
+    crud_change_event.record_event(db, "employes", "delete", db_employe)
     db.commit()
     return db_employe
 
 # --- Potentiellement d'autres fonctions CRUD ---
 # Par exemple, rechercher des employés par nom, par département, etc.
-def get_employes_by_departement(db: Session, departement_id: int, skip: int = 0, limit: int = 100) -> List[EmployeModel]:
-    """Récupère les employés d'un département spécifique."""
-    return db.query(EmployeModel).filter(EmployeModel.departement_id == departement_id).offset(skip).limit(limit).all()
\ No newline at end of file
+def get_employes_by_departement(
+    db: Session, departement_id: int, skip: int = 0, limit: int = 100, fields: Optional[Sequence[str]] = None
+) -> List[EmployeModel]:
+    """Récupère les employés d'un département spécifique (tuples de colonnes si 'fields' est fourni)."""
+    query = db.query(EmployeModel).filter(EmployeModel.departement_id == departement_id)
+    return with_fields(query, EmployeModel, fields).offset(skip).limit(limit).all()
+
+def get_employe_timezone(db_employe: EmployeModel) -> str:
+    """Fuseau horaire de l'employé : le sien, sinon celui de son département, sinon le fuseau par défaut."""
+    departement = db_employe.departement
+    return timezones.resolve_timezone(db_employe.fuseau_horaire, departement.fuseau_horaire if departement else None)
+
+def get_employe_timezones(db: Session, employe_ids: Sequence[int]) -> Dict[int, str]:
+    """Fuseaux horaires d'un lot d'employés (une requête) : {employe_id: fuseau}."""
+    lignes = db.execute(
+        select(EmployeModel.id, EmployeModel.fuseau_horaire, DepartementModel.fuseau_horaire)
+        .outerjoin(DepartementModel, DepartementModel.id == EmployeModel.departement_id)
+        .where(EmployeModel.id.in_(list(employe_ids)))
+    ).all()
+    return {employe_id: timezones.resolve_timezone(fuseau, fuseau_departement) for employe_id, fuseau, fuseau_departement in lignes}
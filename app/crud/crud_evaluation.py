@@ -1,28 +1,101 @@
 # app/crud/crud_evaluation.py
+from sqlalchemy import Integer, cast, extract, func, select
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Literal, Optional, Sequence, Tuple
 from datetime import date
 
 from app.models.evaluation import Evaluation as EvaluationModel
 from app.schemas.evaluation import EvaluationCreate, EvaluationUpdate
 from app.models.employe import Employe as EmployeModel # Pour vérifier l'employé
+from app.crud import crud_latest_evaluation # Maintien de la table matérialisée 'employe_latest_evaluation'
+from app.crud import crud_change_event # Journal des modifications (GET /events)
+from app.crud.fields import with_fields
+from app.db import sharding # Lectures réparties en mode shardé
 
 def get_evaluation(db: Session, evaluation_id: int) -> Optional[EvaluationModel]:
     return db.query(EvaluationModel).filter(EvaluationModel.id == evaluation_id).first()
 
-def get_evaluations(db: Session, skip: int = 0, limit: int = 100) -> List[EvaluationModel]:
+def get_evaluations(
+    db: Session, skip: int = 0, limit: int = 100, fields: Optional[Sequence[str]] = None
+) -> List[EvaluationModel]:
+    if sharding.is_sharded(db): # Liste globale : fusion des pages de chaque shard
+        return sharding.scatter_gather(
+            lambda shard_db, n, colonnes: get_evaluations(shard_db, 0, n, colonnes),
+            ("date_evaluation",), skip, limit, fields, descending=True
+        )
     # Ordonner par date décroissante par défaut
-    return db.query(EvaluationModel).order_by(EvaluationModel.date_evaluation.desc()).offset(skip).limit(limit).all()
+    query = with_fields(db.query(EvaluationModel), EvaluationModel, fields)
+    return query.order_by(EvaluationModel.date_evaluation.desc()).offset(skip).limit(limit).all()
 
 def get_evaluations_by_employe(
-    db: Session, employe_id: int, skip: int = 0, limit: int = 100
+    db: Session, employe_id: int, skip: int = 0, limit: int = 100, fields: Optional[Sequence[str]] = None
 ) -> List[EvaluationModel]:
     # Vérifier si l'employé existe pourrait être fait ici ou dans l'endpoint
-    return db.query(EvaluationModel)\
+    return with_fields(db.query(EvaluationModel), EvaluationModel, fields)\
              .filter(EvaluationModel.employe_id == employe_id)\
              .order_by(EvaluationModel.date_evaluation.desc())\
              .offset(skip).limit(limit).all()
 
+def _bucket_start(bucket: str, cle: int) -> date:
+    """Premier jour de la période de regroupement 'cle' (voir get_score_timeseries)."""
+    if bucket == "month":
+        return date(cle // 12, cle % 12 + 1, 1)
+    if bucket == "quarter":
+        return date(cle // 4, cle % 4 * 3 + 1, 1)
+    return date(cle, 1, 1)
+
+def get_score_timeseries(
+    db: Session,
+    bucket: Literal["month", "quarter", "year"] = "month",
+    employe_id: Optional[int] = None,
+    departement_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+) -> List[Tuple[date, int, float, float, float]]:
+    """
+    Série des scores globaux par mois, trimestre ou année, agrégée par la base (GROUP BY sur une clé
+    entière de période calculée avec EXTRACT, portable entre SGBD) : d'un employé, d'un département
+    ou de toute l'entreprise. Les évaluations sans score sont ignorées ; les périodes sans évaluation
+    sont absentes.
+
+    Args:
+        db: Session de base de données SQLAlchemy.
+        bucket: Période de regroupement.
+        employe_id: Restreindre à cet employé (optionnel).
+        departement_id: Restreindre aux employés de ce département (optionnel).
+        start_date, end_date: Période sur date_evaluation (bornes incluses, optionnelles).
+
+    Returns:
+        Des tuples (début de période, nombre, moyenne, minimum, maximum), par période croissante.
+    """
+    annee = cast(extract("year", EvaluationModel.date_evaluation), Integer)
+    mois = cast(extract("month", EvaluationModel.date_evaluation), Integer)
+    cle = {"month": annee * 12 + mois - 1, "quarter": annee * 4 + (mois - 1) // 3, "year": annee}[bucket].label("cle")
+    score = EvaluationModel.score_global
+    query = select(cle, func.count(score), func.sum(score), func.min(score), func.max(score))\
+        .where(score.isnot(None)).group_by(cle)
+    if employe_id is not None:
+        query = query.where(EvaluationModel.employe_id == employe_id)
+    if departement_id is not None:
+        query = query.join(EmployeModel, EmployeModel.id == EvaluationModel.employe_id)\
+                     .where(EmployeModel.departement_id == departement_id)
+    if start_date:
+        query = query.where(EvaluationModel.date_evaluation >= start_date)
+    if end_date:
+        query = query.where(EvaluationModel.date_evaluation <= end_date)
+
+    # Session shardée sur toute l'entreprise : une série par shard, fusionnée par période (d'où la somme plutôt que la moyenne)
+    periodes = {}
+    for cle_periode, nombre, somme, minimum, maximum in db.execute(query):
+        cumul = periodes.get(cle_periode)
+        periodes[cle_periode] = [nombre, somme, minimum, maximum] if cumul is None else [
+            cumul[0] + nombre, cumul[1] + somme, min(cumul[2], minimum), max(cumul[3], maximum)
+        ]
+    return [
+        (_bucket_start(bucket, cle_periode), nombre, somme / nombre, minimum, maximum)
+        for cle_periode, (nombre, somme, minimum, maximum) in sorted(periodes.items())
+    ]
+
 def create_evaluation(db: Session, evaluation: EvaluationCreate) -> EvaluationModel:
     # Vérifier si l'employé existe
     db_employe = db.query(EmployeModel).filter(EmployeModel.id == evaluation.employe_id).first()
@@ -39,6 +112,10 @@ def create_evaluation(db: Session, evaluation: EvaluationCreate) -> EvaluationMo
     # Mais ici, Pydantic la génère via default_factory.
 
     db.add(db_evaluation)
+    # Mettre à jour la dernière évaluation matérialisée dans la même transaction
+    crud_latest_evaluation.refresh_latest_evaluation(db, employe_id=db_evaluation.employe_id)
+    db.flush() # Attribue l'ID pour le journal des modifications
+    crud_change_event.record_event(db, "evaluations", "create", db_evaluation)
     db.commit()
     db.refresh(db_evaluation)
     return db_evaluation
@@ -60,6 +137,9 @@ def update_evaluation(
              setattr(db_evaluation, key, value)
 
     db.add(db_evaluation) # Marque l'objet comme modifié
+    # La date ou le score ont pu changer : recalculer la dernière évaluation de l'employé
+    crud_latest_evaluation.refresh_latest_evaluation(db, employe_id=db_evaluation.employe_id)
+    crud_change_event.record_event(db, "evaluations", "update", db_evaluation)
     db.commit()
     db.refresh(db_evaluation)
     return db_evaluation
@@ -68,6 +148,12 @@ def delete_evaluation(db: Session, evaluation_id: int) -> Optional[EvaluationMod
     db_evaluation = get_evaluation(db, evaluation_id=evaluation_id)
     if db_evaluation is None:
         return None
+    # Réaffecter (ou supprimer) la ligne matérialisée AVANT de supprimer l'évaluation qu'elle référence
+    crud_latest_evaluation.refresh_latest_evaluation(
+        db, employe_id=db_evaluation.employe_id, exclude_evaluation_id=db_evaluation.id
+    )
+    db.flush()
     db.delete(db_evaluation)
+    crud_change_event.record_event(db, "evaluations", "delete", db_evaluation)
     db.commit()
     return db_evaluation
\ No newline at end of file
@@ -0,0 +1,97 @@
+# app/crud/crud_horaire.py
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+from typing import List, Optional, Sequence
+from datetime import date
+
+from app.models.horaire import HoraireDepartement as HoraireDepartementModel, HoraireEmploye as HoraireEmployeModel
+from app.models.jour_ferie import JourFerie as JourFerieModel
+from app.models.employe import Employe as EmployeModel
+from app.schemas.horaire import HoraireJour, JourFerie
+
+def get_horaire_departement(db: Session, departement_id: int) -> List[HoraireDepartementModel]:
+    """Horaire hebdomadaire type d'un département (jours travaillés, du lundi au dimanche)."""
+    return db.query(HoraireDepartementModel)\
+             .filter(HoraireDepartementModel.departement_id == departement_id)\
+             .order_by(HoraireDepartementModel.jour_semaine).all()
+
+def get_horaire_employe(db: Session, employe_id: int) -> List[HoraireEmployeModel]:
+    """Horaire individuel d'un employé (liste vide : il suit l'horaire de son département)."""
+    return db.query(HoraireEmployeModel)\
+             .filter(HoraireEmployeModel.employe_id == employe_id)\
+             .order_by(HoraireEmployeModel.jour_semaine).all()
+
+def get_horaires_employes_by_departement(db: Session, departement_id: int) -> List:
+    """
+    Horaires individuels des employés d'un département, en une requête.
+
+    Returns:
+        Des lignes (employe_id, jour_semaine, heure_debut, heure_fin, pause_minutes) triées par employé puis jour.
+    """
+    return db.execute(
+        select(
+            HoraireEmployeModel.employe_id, HoraireEmployeModel.jour_semaine, HoraireEmployeModel.heure_debut,
+            HoraireEmployeModel.heure_fin, HoraireEmployeModel.pause_minutes
+        ).join(EmployeModel, EmployeModel.id == HoraireEmployeModel.employe_id)
+         .where(EmployeModel.departement_id == departement_id)
+         .order_by(HoraireEmployeModel.employe_id, HoraireEmployeModel.jour_semaine)
+    ).all()
+
+def replace_horaire_departement(db: Session, departement_id: int, jours: Sequence[HoraireJour]) -> List[HoraireDepartementModel]:
+    """
+    Remplace l'horaire hebdomadaire d'un département (une liste vide le supprime).
+
+    Returns:
+        Les jours de l'horaire enregistré.
+    """
+    db.execute(delete(HoraireDepartementModel).where(HoraireDepartementModel.departement_id == departement_id))
+    # Objets ORM (et non INSERT en masse) : en mode shardé, la session les route vers le shard du département
+    db.add_all([HoraireDepartementModel(departement_id=departement_id, **jour.model_dump()) for jour in jours])
+    db.commit()
+    return get_horaire_departement(db, departement_id)
+
+def replace_horaire_employe(db: Session, employe_id: int, jours: Sequence[HoraireJour]) -> List[HoraireEmployeModel]:
+    """
+    Remplace l'horaire individuel d'un employé (une liste vide le supprime : l'employé suit
+    l'horaire de son département).
+
+    Returns:
+        Les jours de l'horaire enregistré.
+    """
+    db.execute(delete(HoraireEmployeModel).where(HoraireEmployeModel.employe_id == employe_id))
+    db.add_all([HoraireEmployeModel(employe_id=employe_id, **jour.model_dump()) for jour in jours])
+    db.commit()
+    return get_horaire_employe(db, employe_id)
+
+def get_jours_feries(db: Session, start_date: Optional[date] = None, end_date: Optional[date] = None) -> List[JourFerieModel]:
+    """Jours fériés d'une période (bornes incluses, optionnelles), par date croissante."""
+    query = db.query(JourFerieModel)
+    if start_date:
+        query = query.filter(JourFerieModel.jour >= start_date)
+    if end_date:
+        query = query.filter(JourFerieModel.jour <= end_date)
+    return query.order_by(JourFerieModel.jour).all()
+
+def create_jour_ferie(db: Session, jour_ferie: JourFerie) -> JourFerieModel:
+    """
+    Ajoute un jour férié.
+
+    Raises:
+        ValueError: Si la date est déjà un jour férié.
+    """
+    if db.get(JourFerieModel, jour_ferie.jour) is not None:
+        raise ValueError(f"Le {jour_ferie.jour} est déjà un jour férié.")
+    db_jour_ferie = JourFerieModel(**jour_ferie.model_dump())
+    db.add(db_jour_ferie)
+    db.commit()
+    db.refresh(db_jour_ferie)
+    return db_jour_ferie
+
+def delete_jour_ferie(db: Session, jour: date) -> Optional[JourFerieModel]:
+    """Supprime un jour férié ; renvoie l'objet supprimé, ou None s'il n'existait pas."""
+    db_jour_ferie = db.get(JourFerieModel, jour)
+    if db_jour_ferie is None:
+        return None
+    db.delete(db_jour_ferie)
+    db.commit()
+    return db_jour_ferie
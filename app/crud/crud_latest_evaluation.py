@@ -0,0 +1,132 @@
+# app/crud/crud_latest_evaluation.py
+from sqlalchemy import func, select, delete, insert
+from sqlalchemy.orm import Session
+from typing import Dict, Iterable, List, Optional
+
+from app.models.evaluation import Evaluation as EvaluationModel
+from app.models.employe import Employe as EmployeModel
+from app.models.employe_latest_evaluation import EmployeLatestEvaluation as LatestEvaluationModel
+
+def get_latest_evaluation(db: Session, employe_id: int) -> Optional[LatestEvaluationModel]:
+    """
+    Récupère la dernière évaluation notée d'un employé (lecture par clé primaire).
+
+    Args:
+        db: Session de base de données SQLAlchemy.
+        employe_id: ID de l'employé.
+
+    Returns:
+        L'objet LatestEvaluationModel s'il existe, sinon None.
+    """
+    return db.get(LatestEvaluationModel, employe_id)
+
+def get_latest_evaluations(db: Session, employe_ids: Iterable[int]) -> Dict[int, LatestEvaluationModel]:
+    """
+    Récupère les dernières évaluations notées de plusieurs employés en une seule requête.
+
+    Returns:
+        Un dictionnaire {employe_id: LatestEvaluationModel} (les employés sans évaluation sont absents).
+    """
+    ids = list(employe_ids)
+    if not ids:
+        return {}
+    rows = db.query(LatestEvaluationModel).filter(LatestEvaluationModel.employe_id.in_(ids)).all()
+    return {row.employe_id: row for row in rows}
+
+def get_latest_evaluations_by_departement(db: Session, departement_id: int) -> List[LatestEvaluationModel]:
+    """Récupère la dernière évaluation notée de chaque employé d'un département (sans fonction de fenêtrage)."""
+    return db.query(LatestEvaluationModel)\
+             .join(EmployeModel, EmployeModel.id == LatestEvaluationModel.employe_id)\
+             .filter(EmployeModel.departement_id == departement_id)\
+             .all()
+
+def refresh_latest_evaluation(
+    db: Session, employe_id: int, exclude_evaluation_id: Optional[int] = None
+) -> Optional[LatestEvaluationModel]:
+    """
+    Recalcule la ligne matérialisée d'un employé à partir de la table 'evaluations'.
+    Ne fait PAS de commit : doit être appelée dans la transaction de l'écriture qui l'a rendue nécessaire.
+
+    Args:
+        db: Session de base de données SQLAlchemy.
+        employe_id: ID de l'employé dont la dernière évaluation a pu changer.
+        exclude_evaluation_id: ID d'une évaluation sur le point d'être supprimée (à ignorer).
+
+    Returns:
+        La ligne matérialisée à jour, ou None si l'employé n'a plus d'évaluation notée.
+    """
+    db.flush() # S'assurer que l'écriture en cours (INSERT/UPDATE/DELETE) est visible par la requête
+    query = db.query(EvaluationModel)\
+              .filter(EvaluationModel.employe_id == employe_id)\
+              .filter(EvaluationModel.score_global.isnot(None))
+    if exclude_evaluation_id is not None:
+        query = query.filter(EvaluationModel.id != exclude_evaluation_id)
+    latest = query.order_by(EvaluationModel.date_evaluation.desc(), EvaluationModel.id.desc())\
+                  .first()
+
+    db_latest = db.get(LatestEvaluationModel, employe_id)
+    if latest is None:
+        if db_latest is not None:
+            db.delete(db_latest)
+        return None
+
+    if db_latest is None:
+        db_latest = LatestEvaluationModel(employe_id=employe_id)
+        db.add(db_latest)
+    db_latest.evaluation_id = latest.id
+    db_latest.score = latest.score_global
+    db_latest.date = latest.date_evaluation
+    return db_latest
+
+def _ranked_latest_select():
+    """Requête ensembliste (ROW_NUMBER) donnant la dernière évaluation notée de chaque employé."""
+    ranked = select(
+        EvaluationModel.employe_id,
+        EvaluationModel.id.label("evaluation_id"),
+        EvaluationModel.score_global.label("score"),
+        EvaluationModel.date_evaluation.label("date"),
+        func.row_number().over(
+            partition_by=EvaluationModel.employe_id,
+            order_by=(EvaluationModel.date_evaluation.desc(), EvaluationModel.id.desc())
+        ).label("rang")
+    ).where(EvaluationModel.score_global.isnot(None)).subquery()
+    return select(ranked.c.employe_id, ranked.c.evaluation_id, ranked.c.score, ranked.c.date)\
+        .where(ranked.c.rang == 1)
+
+def check_latest_evaluations(db: Session) -> List[int]:
+    """
+    Vérifie la cohérence de la table matérialisée avec la table 'evaluations'.
+
+    Returns:
+        La liste triée des IDs d'employés dont la ligne est absente, en trop ou obsolète.
+    """
+    expected = {row.employe_id: tuple(row) for row in db.execute(_ranked_latest_select())}
+    actual = {
+        row.employe_id: tuple(row)
+        for row in db.execute(select(
+            LatestEvaluationModel.employe_id,
+            LatestEvaluationModel.evaluation_id,
+            LatestEvaluationModel.score,
+            LatestEvaluationModel.date
+        ))
+    }
+    return sorted(
+        employe_id for employe_id in expected.keys() | actual.keys()
+        if expected.get(employe_id) != actual.get(employe_id)
+    )
+
+def rebuild_latest_evaluations(db: Session) -> int:
+    """
+    Reconstruit entièrement la table matérialisée en deux instructions ensemblistes (DELETE + INSERT ... SELECT).
+
+    Returns:
+        Le nombre de lignes insérées.
+    """
+    db.execute(delete(LatestEvaluationModel))
+    result = db.execute(
+        insert(LatestEvaluationModel).from_select(
+            ["employe_id", "evaluation_id", "score", "date"], _ranked_latest_select()
+        )
+    )
+    db.commit()
+    return result.rowcount
@@ -1,22 +1,118 @@
 # app/crud/crud_pointage.py
+from sqlalchemy import distinct, update, func, select, union_all, type_coerce, String
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from datetime import date
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+from datetime import date, datetime, timedelta
 
 from app.models.pointage import Pointage as PointageModel
-from app.schemas.pointage import PointageCreate, PointageUpdate
+from app.models.badge_event import BadgeEvent as BadgeEventModel
+from app.models.pointage_archive import PointageArchive as PointageArchiveModel
+from app.schemas.pointage import PointageCreate, PointageUpdate, PointageBadge
 from app.models.employe import Employe as EmployeModel # Pour vérifier l'existence de l'employé
+from app.crud.fields import with_fields
+from app.crud.crud_pointage_archive import ARCHIVE_COLUMNS, get_archived_until
+from app.crud.crud_employe import get_employe_timezone, get_employe_timezones
+from app.core import timezones # Horodatages en UTC, date locale dans le fuseau de l'employé
+from app.crud import crud_change_event # Journal des modifications (GET /events)
+from app.crud import crud_anomalie # Anomalies du pointage supprimé
+from app.db import sharding # Lectures réparties en mode shardé
 
-def get_pointage(db: Session, pointage_id: int) -> Optional[PointageModel]:
-    return db.query(PointageModel).filter(PointageModel.id == pointage_id).first()
+POINTAGE_SORT_FIELDS = ("date_pointage", "heure_arrivee") # Ordre des listes (décroissant)
+MAX_WRITE_RETRIES = 3 # Tentatives en cas de conflit d'unicité (seq ou clé d'idempotence) entre écritures concurrentes
 
-def get_pointages(db: Session, skip: int = 0, limit: int = 100) -> List[PointageModel]:
-    return db.query(PointageModel).order_by(PointageModel.date_pointage.desc(), PointageModel.heure_arrivee.desc()).offset(skip).limit(limit).all()
+def get_pointage(db: Session, pointage_id: int, include_archive: bool = False) -> Optional[PointageModel]:
+    """Pointage par ID ; avec include_archive, cherche aussi dans l'archive (lecture seule)."""
+    db_pointage = db.query(PointageModel).filter(PointageModel.id == pointage_id).first()
+    if db_pointage is None and include_archive:
+        return db.get(PointageArchiveModel, pointage_id)
+    return db_pointage
+
+def _archive_needed(db: Session, start_date: Optional[date]) -> bool:
+    """La période demandée (à partir de start_date, ou sans borne) recouvre-t-elle des dates archivées ?"""
+    archived_until = get_archived_until(db)
+    return archived_until is not None and (start_date is None or start_date <= archived_until)
+
+def _select_with_archive(
+    db: Session,
+    conditions: Callable[[Any], List[Any]],
+    skip: int,
+    limit: int,
+    fields: Optional[Sequence[str]]
+) -> List[Any]:
+    """
+    Lecture paginée de 'pointages' et 'pointages_archive' réunies (UNION ALL), triée comme les lectures
+    sur la table vive (date puis heure d'arrivée décroissantes). Chaque branche est limitée à skip + limit
+    lignes avant la fusion, via ses index.
+
+    Args:
+        conditions: Fonction recevant une table et renvoyant la liste des conditions WHERE sur ses colonnes.
+        fields: Colonnes renvoyées (None = toutes).
+
+    Returns:
+        Des lignes (tuples nommés, accès par attribut) avec les colonnes demandées.
+    """
+    noms = list(fields) if fields is not None else ARCHIVE_COLUMNS
+    inconnus = [nom for nom in noms if nom not in ARCHIVE_COLUMNS]
+    if inconnus:
+        raise ValueError(f"Champ inconnu pour Pointage : '{inconnus[0]}'.")
+
+    branches = []
+    for table in (PointageModel.__table__, PointageArchiveModel.__table__):
+        branche = select(
+            *[table.c[nom] for nom in noms],
+            table.c.date_pointage.label("_tri_date"),
+            table.c.heure_arrivee.label("_tri_arrivee")
+        ).where(*conditions(table))\
+         .order_by(table.c.date_pointage.desc(), table.c.heure_arrivee.desc())\
+         .limit(skip + limit)\
+         .subquery()
+        branches.append(select(branche))
+    reunion = union_all(*branches).subquery()
+    return db.execute(
+        select(*[reunion.c[nom] for nom in noms])
+        .order_by(reunion.c._tri_date.desc(), reunion.c._tri_arrivee.desc())
+        .offset(skip).limit(limit)
+    ).all()
+
+def get_pointages(
+    db: Session, skip: int = 0, limit: int = 100, fields: Optional[Sequence[str]] = None
+) -> List[Any]:
+    """
+    Pointages du plus récent au plus ancien, archive comprise.
+    Renvoie toujours des lignes (tuples nommés, accès par attribut) avec les colonnes demandées
+    (toutes si fields est None), que l'archive soit consultée ou non.
+    """
+    if sharding.is_sharded(db): # Liste globale : fusion des pages de chaque shard
+        return sharding.scatter_gather(
+            lambda shard_db, n, colonnes: get_pointages(shard_db, 0, n, colonnes),
+            POINTAGE_SORT_FIELDS, skip, limit, fields, descending=True
+        )
+    if _archive_needed(db, start_date=None):
+        return _select_with_archive(db, lambda table: [], skip, limit, fields)
+    query = with_fields(db.query(PointageModel), PointageModel, fields if fields is not None else ARCHIVE_COLUMNS)
+    return query.order_by(PointageModel.date_pointage.desc(), PointageModel.heure_arrivee.desc()).offset(skip).limit(limit).all()
 
 def get_pointages_by_employe(
-    db: Session, employe_id: int, start_date: Optional[date] = None, end_date: Optional[date] = None, skip: int = 0, limit: int = 100
-) -> List[PointageModel]:
-    query = db.query(PointageModel).filter(PointageModel.employe_id == employe_id)
+    db: Session, employe_id: int, start_date: Optional[date] = None, end_date: Optional[date] = None, skip: int = 0, limit: int = 100,
+    fields: Optional[Sequence[str]] = None
+) -> List[Any]:
+    """
+    Pointages d'un employé sur une période, archive comprise si la période remonte jusqu'aux dates archivées.
+    Renvoie toujours des lignes avec les colonnes demandées (toutes si fields est None), comme get_pointages.
+    """
+    if _archive_needed(db, start_date):
+        def conditions(table):
+            criteres = [table.c.employe_id == employe_id]
+            if start_date:
+                criteres.append(table.c.date_pointage >= start_date)
+            if end_date:
+                criteres.append(table.c.date_pointage <= end_date)
+            return criteres
+        return _select_with_archive(db, conditions, skip, limit, fields)
+
+    query = with_fields(db.query(PointageModel), PointageModel, fields if fields is not None else ARCHIVE_COLUMNS)\
+        .filter(PointageModel.employe_id == employe_id)
     if start_date:
         query = query.filter(PointageModel.date_pointage >= start_date)
     if end_date:
@@ -31,19 +127,463 @@ def get_pointage_by_employe_and_date(db: Session, employe_id: int, date_pointage
         PointageModel.date_pointage == date_pointage
     ).first()
 
+def get_open_pointages(
+    db: Session,
+    departement_id: Optional[int] = None,
+    jour: Optional[date] = None,
+    skip: int = 0,
+    limit: int = 100,
+    fields: Optional[Sequence[str]] = None
+) -> List[PointageModel]:
+    """
+    Récupère les pointages ouverts (heure_depart IS NULL) : employés présents ou départs oubliés.
+    La condition 'heure_depart IS NULL' correspond à l'index partiel ix_pointages_open,
+    le coût est donc proportionnel au nombre de pointages ouverts et non à tout l'historique.
+
+    Args:
+        db: Session de base de données SQLAlchemy.
+        departement_id: Restreindre aux employés de ce département (optionnel).
+        jour: Restreindre aux pointages de cette date (optionnel, ex: aujourd'hui pour "qui est sur site").
+        skip: Nombre d'enregistrements à sauter.
+        limit: Nombre maximum d'enregistrements à retourner.
+        fields: Colonnes à charger (optionnel) ; les lignes sont alors des tuples de colonnes.
+
+    Returns:
+        Une liste d'objets PointageModel (ou de tuples si 'fields' est fourni), du plus récent au plus ancien.
+    """
+    if departement_id is None and sharding.is_sharded(db): # Tous départements : fusion des pages de chaque shard
+        return sharding.scatter_gather(
+            lambda shard_db, n, colonnes: get_open_pointages(shard_db, None, jour, 0, n, colonnes),
+            POINTAGE_SORT_FIELDS, skip, limit, fields, descending=True
+        )
+    query = with_fields(db.query(PointageModel), PointageModel, fields).filter(PointageModel.heure_depart.is_(None))
+    if jour:
+        query = query.filter(PointageModel.date_pointage == jour)
+    if departement_id is not None:
+        query = query.join(EmployeModel, EmployeModel.id == PointageModel.employe_id)\
+                     .filter(EmployeModel.departement_id == departement_id)
+    return query.order_by(PointageModel.date_pointage.desc(), PointageModel.heure_arrivee.desc()).offset(skip).limit(limit).all()
+
+def _period_selects(
+    db: Session,
+    colonnes: Callable[[Any, Any], List[Any]],
+    start_date: date,
+    end_date: date,
+    departement_id: Optional[int] = None,
+    employe_id: Optional[int] = None,
+    employe_range: Optional[Tuple[int, int]] = None
+) -> List[Any]:
+    """
+    SELECT des pointages d'une période de dates locales, à réunir par UNION ALL : pour chaque table
+    (vive, et archive si la période remonte jusqu'aux dates archivées), les pointages datés sur
+    jour_local, et ceux pas encore datés par le backfill (jour_local NULL) sur date_pointage, via
+    l'index partiel ix_pointages_jour_local_null. Deux SELECT plutôt qu'un OR : chacun garde son
+    index (un OR impose une double recherche par employé).
+
+    Args:
+        colonnes: Fonction recevant une table et sa colonne de date locale, et renvoyant les colonnes
+            à sélectionner.
+        departement_id, employe_id: Restrictions optionnelles.
+        employe_range: Restriction optionnelle à une plage d'ids d'employés (bornes incluses).
+    """
+    tables = [PointageModel.__table__]
+    if _archive_needed(db, start_date):
+        tables.append(PointageArchiveModel.__table__)
+    selects = []
+    for table in tables:
+        for jour, critere in (
+            (table.c.jour_local, table.c.jour_local.between(start_date, end_date)),
+            (table.c.date_pointage, table.c.jour_local.is_(None) & table.c.date_pointage.between(start_date, end_date))
+        ):
+            requete = select(*colonnes(table, jour)).where(critere)
+            if employe_id is not None:
+                requete = requete.where(table.c.employe_id == employe_id)
+            if employe_range is not None:
+                requete = requete.where(table.c.employe_id.between(*employe_range))
+            if departement_id is not None:
+                requete = requete.join(EmployeModel.__table__, EmployeModel.__table__.c.id == table.c.employe_id)\
+                                 .where(EmployeModel.__table__.c.departement_id == departement_id)
+            selects.append(requete)
+    return selects
+
+def get_pointage_intervals(
+    db: Session,
+    start_date: date,
+    end_date: date,
+    departement_id: Optional[int] = None,
+    employe_id: Optional[int] = None
+) -> List[Any]:
+    """
+    Pointages d'une période de dates locales (bornes incluses), archive comprise, pour les calculs de
+    temps de travail : colonnes (employe_id, jour, heure_arrivee, heure_depart), sans tri ni pagination.
+    Les dates et heures ne sont pas converties par SQLAlchemy (texte ISO tel que stocké sur SQLite,
+    objets du pilote ailleurs) : le calcul les convertit en bloc avec NumPy (voir horaire_service).
+
+    Args:
+        db: Session de base de données SQLAlchemy.
+        start_date, end_date: Période (sur la date locale jour_local).
+        departement_id: Restreindre aux employés de ce département (optionnel).
+        employe_id: Restreindre à cet employé (optionnel).
+
+    Returns:
+        Des tuples (employe_id, jour, heure_arrivee, heure_depart) ; heures en UTC, heure_depart None pour un pointage ouvert.
+    """
+    selects = _period_selects(
+        db,
+        lambda table, jour: [
+            table.c.employe_id,
+            type_coerce(jour, String).label("jour"),
+            type_coerce(table.c.heure_arrivee, String).label("heure_arrivee"),
+            type_coerce(table.c.heure_depart, String).label("heure_depart")
+        ],
+        start_date, end_date, departement_id=departement_id, employe_id=employe_id
+    )
+    resultat = db.execute(union_all(*selects))
+    curseur = getattr(resultat, "cursor", None) # Absent des résultats fusionnés d'une session shardée
+    if curseur is None:
+        return resultat.all()
+    try: # Tuples du pilote, sans construire d'objets Row (des centaines de milliers de lignes par mois et département)
+        return curseur.fetchall()
+    finally:
+        resultat.close()
+
+def get_pointage_series(
+    db: Session, start_date: date, end_date: date, premier_employe_id: int, dernier_employe_id: int
+) -> List[Any]:
+    """
+    Pointages d'une plage d'employés sur une période de dates locales, archive comprise, pour la détection
+    d'anomalies : tuples (id, employe_id, jour, heure_arrivee, heure_depart) du pilote, sans tri, dates et
+    heures non converties (voir get_pointage_intervals).
+
+    Args:
+        db: Session de base de données SQLAlchemy (une base : la principale ou un shard).
+        start_date, end_date: Période (sur la date locale jour_local).
+        premier_employe_id, dernier_employe_id: Plage d'ids d'employés (bornes incluses).
+    """
+    selects = _period_selects(
+        db,
+        lambda table, jour: [
+            table.c.id,
+            table.c.employe_id,
+            type_coerce(jour, String).label("jour"),
+            type_coerce(table.c.heure_arrivee, String).label("heure_arrivee"),
+            type_coerce(table.c.heure_depart, String).label("heure_depart")
+        ],
+        start_date, end_date, employe_range=(premier_employe_id, dernier_employe_id)
+    )
+    resultat = db.execute(union_all(*selects))
+    try:
+        return resultat.cursor.fetchall()
+    finally:
+        resultat.close()
+
+def get_first_modified_day(db: Session, depuis: datetime) -> Optional[date]:
+    """
+    Plus ancienne date locale des pointages créés ou modifiés depuis un instant (index sur date_modification),
+    ou None. Les pointages archivés ne sont plus modifiés.
+    """
+    return db.scalar(
+        select(func.min(func.coalesce(PointageModel.jour_local, PointageModel.date_pointage)))
+        .where(PointageModel.date_modification >= depuis)
+    )
+
+def get_daily_presence(
+    db: Session, start_date: date, end_date: date, departement_id: Optional[int] = None
+) -> List[Tuple[date, int, int]]:
+    """
+    Présences par date locale sur une période, calculées par la base (GROUP BY sur jour_local),
+    archive comprise : (jour, nombre d'employés présents, nombre de pointages), par date croissante.
+    """
+    selects = _period_selects(
+        db, lambda table, jour: [jour.label("jour"), table.c.employe_id],
+        start_date, end_date, departement_id=departement_id
+    )
+    pointages = union_all(*selects).subquery()
+    lignes = db.execute(
+        select(pointages.c.jour, func.count(distinct(pointages.c.employe_id)), func.count())
+        .group_by(pointages.c.jour).order_by(pointages.c.jour)
+    ).all()
+    if not sharding.is_sharded(db):
+        return [tuple(ligne) for ligne in lignes]
+    # Session shardée : une série par shard ; les employés d'un jour sont distincts d'un shard à l'autre
+    totaux = {}
+    for jour, employes, nombre in lignes:
+        cumul = totaux.setdefault(jour, [0, 0])
+        cumul[0] += employes
+        cumul[1] += nombre
+    return [(jour, employes, nombre) for jour, (employes, nombre) in sorted(totaux.items())]
+
+def _legacy_to_utc(ligne: Any, fuseau: str) -> dict:
+    """
+    Pointage antérieur aux fuseaux horaires (jour_local NULL), dont les heures sont l'heure locale de
+    l'employé sans fuseau (SQLite) : heures converties en UTC et date locale de l'arrivée. Relues avec
+    fuseau (PostgreSQL), les heures sont déjà des instants exacts : seule la date locale est calculée.
+    """
+    heure_arrivee = timezones.from_local(ligne.heure_arrivee, fuseau)
+    return {
+        "heure_arrivee": heure_arrivee,
+        "heure_depart": timezones.from_local(ligne.heure_depart, fuseau) if ligne.heure_depart is not None else None,
+        "jour_local": timezones.local_date(heure_arrivee, fuseau)
+    }
+
+def _convert_legacy(db_pointage: PointageModel, fuseau: str) -> None:
+    """Convertit un pointage antérieur aux fuseaux (voir _legacy_to_utc) avant sa modification ; sans commit."""
+    if db_pointage.jour_local is None:
+        for colonne, valeur in _legacy_to_utc(db_pointage, fuseau).items():
+            setattr(db_pointage, colonne, valeur)
+
+def fill_local_days(
+    db: Session,
+    recompute: bool = False,
+    employe_ids: Optional[Sequence[int]] = None,
+    batch_size: int = 5000,
+    on_batch: Optional[Callable[[int], None]] = None
+) -> int:
+    """
+    Calcule jour_local (date locale de l'arrivée dans le fuseau de l'employé) des pointages, archive
+    comprise, par lots d'une transaction chacun : pointages antérieurs à la colonne, ou à recalculer
+    après un changement de fuseau d'un employé ou d'un département. Relançable après une interruption.
+
+    Les pointages antérieurs à la colonne (jour_local NULL) ont été enregistrés en heure locale sans
+    fuseau : leurs heures d'arrivée et de départ sont converties en UTC dans le fuseau de l'employé
+    dans le même UPDATE (une seule fois : jour_local est alors renseigné).
+
+    Args:
+        db: Session de base de données SQLAlchemy (une base : la principale ou un shard).
+        recompute: Recalculer aussi les pointages déjà datés.
+        employe_ids: Restreindre à ces employés (optionnel).
+        batch_size: Nombre de pointages mis à jour par transaction.
+        on_batch: Appelée après chaque lot avec le nombre total de pointages traités (suivi, optionnel).
+
+    Returns:
+        Le nombre de pointages dont jour_local a été (re)calculé.
+    """
+    total = 0
+    for model in (PointageModel, PointageArchiveModel):
+        criteres = []
+        if not recompute:
+            criteres.append(model.jour_local.is_(None))
+        if employe_ids is not None:
+            criteres.append(model.employe_id.in_(list(employe_ids)))
+        dernier_id = 0
+        while True:
+            lot = db.execute(
+                select(model.id, model.employe_id, model.jour_local, model.heure_arrivee, model.heure_depart)
+                .where(model.id > dernier_id, *criteres).order_by(model.id).limit(batch_size)
+            ).all()
+            if not lot:
+                break
+            fuseaux = get_employe_timezones(db, {ligne.employe_id for ligne in lot})
+            anciens = [
+                {"id": ligne.id, **_legacy_to_utc(ligne, fuseaux[ligne.employe_id])}
+                for ligne in lot if ligne.jour_local is None
+            ]
+            dates = [
+                {"id": ligne.id, "jour_local": timezones.local_date(ligne.heure_arrivee, fuseaux[ligne.employe_id])}
+                for ligne in lot if ligne.jour_local is not None
+            ]
+            # UPDATE groupés par clé primaire, un par jeu de colonnes
+            for valeurs in (anciens, dates):
+                if valeurs:
+                    db.execute(update(model), valeurs)
+            db.commit()
+            dernier_id = lot[-1].id
+            total += len(lot)
+            if on_batch is not None:
+                on_batch(total)
+    return total
+
+def close_stale_open_pointages(db: Session, avant: date, duree: timedelta, batch_size: int = 1000) -> int:
+    """
+    Clôture les pointages restés ouverts avant une date (départs oubliés) :
+    heure_depart = heure_arrivee + duree, et cloture_automatique = True.
+
+    Args:
+        db: Session de base de données SQLAlchemy.
+        avant: Seuls les pointages dont date_pointage < avant sont clôturés.
+        duree: Durée de poste appliquée à partir de l'heure d'arrivée.
+        batch_size: Nombre de pointages mis à jour par transaction.
+
+    Returns:
+        Le nombre de pointages clôturés.
+    """
+    # Parcours via l'index partiel, puis UPDATE groupés par clé primaire
+    # (l'arithmétique de dates en SQL diffère selon le SGBD).
+    # Lignes complètes : elles alimentent aussi le journal des modifications
+    ouverts = db.execute(
+        select(PointageModel.__table__)
+        .where(PointageModel.heure_depart.is_(None))
+        .where(PointageModel.date_pointage < avant)
+    ).all()
+    for debut in range(0, len(ouverts), batch_size):
+        lot = [
+            {**ligne._mapping, "heure_depart": ligne.heure_arrivee + duree, "cloture_automatique": True}
+            for ligne in ouverts[debut:debut + batch_size]
+        ]
+        db.execute(
+            update(PointageModel),
+            [{"id": ligne["id"], "heure_depart": ligne["heure_depart"], "cloture_automatique": True} for ligne in lot]
+        )
+        crud_change_event.record_events(
+            db, "pointages", "update", [(ligne["id"], crud_change_event.row_data(ligne)) for ligne in lot]
+        )
+        db.commit()
+    return len(ouverts)
+
+def _next_seq(db: Session, employe_id: int, date_pointage: date) -> int:
+    """N° du prochain pointage de l'employé pour cette date (lecture via l'index unique (employé, date, seq))."""
+    current = db.query(func.max(PointageModel.seq))\
+                .filter(PointageModel.employe_id == employe_id, PointageModel.date_pointage == date_pointage)\
+                .scalar()
+    return (current or 0) + 1
 
 def create_pointage(db: Session, pointage: PointageCreate) -> PointageModel:
     # Vérifier si l'employé existe
     db_employe = db.query(EmployeModel).filter(EmployeModel.id == pointage.employe_id).first()
     if not db_employe:
         raise ValueError(f"L'employé avec l'ID {pointage.employe_id} n'existe pas.")
-    # Ajouter d'autres logiques si nécessaire (ex: vérifier si déjà un pointage pour ce jour)
 
-    db_pointage = PointageModel(**pointage.model_dump())
-    db.add(db_pointage)
+    # Horodatages enregistrés en UTC ; date locale de l'arrivée calculée dans le fuseau de l'employé
+    donnees = pointage.model_dump()
+    donnees["heure_arrivee"] = timezones.to_utc(pointage.heure_arrivee)
+    if pointage.heure_depart is not None:
+        donnees["heure_depart"] = timezones.to_utc(pointage.heure_depart)
+    donnees["jour_local"] = timezones.local_date(donnees["heure_arrivee"], get_employe_timezone(db_employe))
+    if abs((pointage.date_pointage - donnees["jour_local"]).days) > 1:
+        raise ValueError(
+            f"date_pointage ({pointage.date_pointage}) ne correspond pas à la date locale de l'arrivée ({donnees['jour_local']})."
+        )
+
+    # Le n° de pointage dans la journée est unique : réessayer si un pointage concurrent a pris le même
+    for tentative in range(MAX_WRITE_RETRIES):
+        db_pointage = PointageModel(
+            **donnees,
+            seq=_next_seq(db, pointage.employe_id, pointage.date_pointage)
+        )
+        db.add(db_pointage)
+        try:
+            db.flush() # Attribue l'ID (et détecte tout de suite un conflit de seq)
+            crud_change_event.record_event(db, "pointages", "create", db_pointage)
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            if tentative == MAX_WRITE_RETRIES - 1:
+                raise
+            continue
+        db.refresh(db_pointage)
+        return db_pointage
+
+def _as_comparable(value: datetime, reference: datetime) -> datetime:
+    """Aligne 'value' sur 'reference' (naïf/aware) : SQLite renvoie des datetimes naïfs."""
+    if reference.tzinfo is None and value.tzinfo is not None:
+        return value.replace(tzinfo=None)
+    return value
+
+def _get_open_pointage_for_badge(db: Session, employe_id: int, jours: List[date]) -> Optional[PointageModel]:
+    """Dernier pointage ouvert de l'employé parmi les dates données (index partiel ix_pointages_open)."""
+    return db.query(PointageModel)\
+             .filter(PointageModel.heure_depart.is_(None))\
+             .filter(PointageModel.employe_id == employe_id)\
+             .filter(PointageModel.date_pointage.in_(jours))\
+             .order_by(PointageModel.date_pointage.desc(), PointageModel.seq.desc())\
+             .first()
+
+def _apply_badge(db: Session, badge: PointageBadge, fuseau: str) -> Tuple[PointageModel, str]:
+    """
+    Décision ouverture/fermeture d'un badgeage, sans commit. Retourne (pointage, action).
+    La date du pointage est la date locale du passage dans le fuseau de l'employé.
+    """
+    horodatage = timezones.to_utc(badge.horodatage)
+    jour = timezones.local_date(horodatage, fuseau)
+
+    if badge.direction == "entree":
+        ouvert = _get_open_pointage_for_badge(db, badge.employe_id, [jour])
+        if ouvert is not None:
+            return ouvert, "deja_ouvert" # Double passage du badge : le pointage en cours est conservé
+        db_pointage = PointageModel(
+            employe_id=badge.employe_id,
+            date_pointage=jour,
+            jour_local=jour,
+            heure_arrivee=horodatage,
+            seq=_next_seq(db, badge.employe_id, jour)
+        )
+        db.add(db_pointage)
+        db.flush() # Attribue l'ID (et détecte tout de suite un conflit de seq)
+        return db_pointage, "ouverture"
+
+    # Sortie : fermer le dernier pointage ouvert du jour ou de la veille (poste de nuit)
+    ouvert = _get_open_pointage_for_badge(db, badge.employe_id, [jour, jour - timedelta(days=1)])
+    if ouvert is None:
+        raise ValueError(f"Aucun pointage ouvert pour l'employé {badge.employe_id} : sortie sans entrée.")
+    _convert_legacy(ouvert, fuseau)
+    if _as_comparable(horodatage, ouvert.heure_arrivee) <= ouvert.heure_arrivee:
+        raise ValueError("L'heure de sortie doit être postérieure à l'heure d'arrivée du pointage ouvert.")
+    ouvert.heure_depart = horodatage
+    ouvert.cloture_automatique = False
+    return ouvert, "fermeture"
+
+def record_badge(db: Session, badge: PointageBadge) -> Tuple[PointageModel, str, bool]:
+    """
+    Traite un badgeage de façon idempotente, en une seule transaction :
+    ouverture d'un pointage (entrée) ou fermeture du pointage ouvert (sortie),
+    plus l'enregistrement de la clé d'idempotence.
+
+    Args:
+        db: Session de base de données SQLAlchemy.
+        badge: Badgeage reçu (employé, horodatage, direction, clé d'idempotence).
+
+    Returns:
+        Un tuple (pointage, action, rejeu) : action vaut "ouverture", "fermeture" ou "deja_ouvert" ;
+        rejeu est True si la clé avait déjà été traitée (aucune écriture n'a alors lieu).
+
+    Raises:
+        ValueError: Employé inexistant, sortie sans entrée, horodatage incohérent,
+                    ou clé d'idempotence déjà utilisée pour un autre badgeage.
+        IntegrityError: Conflit concurrent persistant après MAX_WRITE_RETRIES tentatives.
+    """
+    for tentative in range(MAX_WRITE_RETRIES):
+        deja_traite = db.get(BadgeEventModel, badge.idempotency_key)
+        if deja_traite is not None:
+            if deja_traite.employe_id != badge.employe_id or deja_traite.direction != badge.direction:
+                raise ValueError(f"La clé d'idempotence '{badge.idempotency_key}' a déjà été utilisée pour un autre badgeage.")
+            return get_pointage(db, pointage_id=deja_traite.pointage_id), deja_traite.action, True
+
+        if tentative == 0:
+            db_employe = db.get(EmployeModel, badge.employe_id)
+            if db_employe is None:
+                raise ValueError(f"L'employé avec l'ID {badge.employe_id} n'existe pas.")
+            fuseau = get_employe_timezone(db_employe)
+
+        try:
+            db_pointage, action = _apply_badge(db, badge, fuseau)
+            db.add(BadgeEventModel(
+                idempotency_key=badge.idempotency_key,
+                employe_id=badge.employe_id,
+                direction=badge.direction,
+                horodatage=badge.horodatage,
+                pointage_id=db_pointage.id,
+                action=action
+            ))
+            if action != "deja_ouvert":
+                crud_change_event.record_event(db, "pointages", "create" if action == "ouverture" else "update", db_pointage)
+            db.commit()
+        except IntegrityError:
+            # Clé rejouée en parallèle ou seq pris par un autre lecteur : on relit l'état validé
+            db.rollback()
+            if tentative == MAX_WRITE_RETRIES - 1:
+                raise
+            continue
+        except ValueError:
+            db.rollback()
+            raise
+        db.refresh(db_pointage)
+        return db_pointage, action, False
+
+def purge_badge_events(db: Session, avant: datetime) -> int:
+    """Supprime les clés d'idempotence reçues avant une date (rejeux devenus improbables). Retourne le nombre supprimé."""
+    deleted = db.query(BadgeEventModel).filter(BadgeEventModel.date_reception < avant).delete(synchronize_session=False)
     db.commit()
-    db.refresh(db_pointage)
-    return db_pointage
+    return deleted
 
 def update_pointage(
     db: Session,
@@ -58,13 +598,17 @@ def update_pointage(
 
     # Valider heure_depart vs heure_arrivee existante
     if 'heure_depart' in update_data and update_data['heure_depart'] is not None:
-        if update_data['heure_depart'] <= db_pointage.heure_arrivee:
+        _convert_legacy(db_pointage, get_employe_timezone(db_pointage.employe))
+        heure_depart = timezones.to_utc(update_data['heure_depart'])
+        if _as_comparable(heure_depart, db_pointage.heure_arrivee) <= db_pointage.heure_arrivee:
              raise ValueError("L'heure de départ doit être postérieure à l'heure d'arrivée existante.")
-        db_pointage.heure_depart = update_data['heure_depart']
+        db_pointage.heure_depart = heure_depart
+        db_pointage.cloture_automatique = False # Départ saisi explicitement
 
     # Mettre à jour d'autres champs si présents dans update_data et autorisés
 
     db.add(db_pointage)
+    crud_change_event.record_event(db, "pointages", "update", db_pointage)
     db.commit()
     db.refresh(db_pointage)
     return db_pointage
@@ -74,5 +618,9 @@ def delete_pointage(db: Session, pointage_id: int) -> Optional[PointageModel]:
     if db_pointage is None:
         return None
     db.delete(db_pointage)
+    crud_anomalie.forget_pointage(
+        db, db_pointage.employe_id, db_pointage.id, db_pointage.jour_local or db_pointage.date_pointage
+    )
+    crud_change_event.record_event(db, "pointages", "delete", db_pointage)
     db.commit()
     return db_pointage
\ No newline at end of file
@@ -0,0 +1,61 @@
+# app/crud/crud_pointage_archive.py
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+from typing import Callable, Optional
+from datetime import date
+
+from app.models.pointage import Pointage as PointageModel
+from app.models.pointage_archive import PointageArchive as PointageArchiveModel
+
+# Colonnes communes aux deux tables, dans l'ordre de 'pointages'
+ARCHIVE_COLUMNS = [column.key for column in PointageModel.__table__.columns]
+
+def get_archived_until(db: Session) -> Optional[date]:
+    """
+    Date du pointage archivé le plus récent (lecture de l'index sur date_pointage), ou None si l'archive est vide.
+    Une lecture dont la période commence après cette date n'a pas besoin de consulter l'archive.
+    """
+    # Session shardée : une ligne par shard, on garde la date la plus récente
+    dates = [d for d in db.scalars(select(func.max(PointageArchiveModel.date_pointage))) if d is not None]
+    return max(dates, default=None)
+
+def archive_pointages(
+    db: Session, avant: date, batch_size: int = 5000, on_batch: Optional[Callable[[int], None]] = None
+) -> int:
+    """
+    Déplace vers 'pointages_archive' les pointages fermés antérieurs à une date, par lots.
+    Chaque lot est une transaction de deux instructions ensemblistes : DELETE ... RETURNING sur
+    'pointages' puis INSERT multi-lignes dans l'archive ; une ligne modifiée pendant l'archivage
+    est donc archivée dans son dernier état ou pas du tout.
+    Les pointages ouverts ne sont jamais archivés (ils restent à clôturer). Les IDs archivés ne sont
+    pas réattribués ('pointages' est en AUTOINCREMENT sous SQLite).
+
+    Args:
+        db: Session de base de données SQLAlchemy.
+        avant: Seuls les pointages dont date_pointage < avant sont archivés.
+        batch_size: Nombre de pointages déplacés par transaction.
+        on_batch: Appelée après chaque lot avec le nombre total de pointages archivés (suivi, optionnel).
+
+    Returns:
+        Le nombre de pointages archivés.
+    """
+    eligibles = (
+        PointageModel.date_pointage < avant,
+        PointageModel.heure_depart.isnot(None),
+    )
+    colonnes = [PointageModel.__table__.c[nom] for nom in ARCHIVE_COLUMNS]
+
+    total = 0
+    while True:
+        lot = select(PointageModel.id).where(*eligibles).order_by(PointageModel.id).limit(batch_size)
+        deplaces = db.execute(
+            delete(PointageModel.__table__).where(PointageModel.id.in_(lot.scalar_subquery())).returning(*colonnes)
+        ).all()
+        if not deplaces:
+            break
+        db.execute(insert(PointageArchiveModel), [dict(zip(ARCHIVE_COLUMNS, ligne)) for ligne in deplaces])
+        db.commit()
+        total += len(deplaces)
+        if on_batch is not None:
+            on_batch(total)
+    return total
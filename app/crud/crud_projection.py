@@ -0,0 +1,69 @@
+# app/crud/crud_projection.py
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional, Sequence
+
+from app.models.projection import Projection as ProjectionModel
+from app.models.employe import Employe as EmployeModel
+from app.crud.fields import with_fields
+
+def get_projections_by_departement(
+    db: Session, departement_id: int, horizon_mois: int, skip: int = 0, limit: int = 100,
+    fields: Optional[Sequence[str]] = None
+) -> List[ProjectionModel]:
+    """
+    Récupère les projections pré-calculées des employés d'un département pour un horizon donné.
+
+    Args:
+        db: Session de base de données SQLAlchemy.
+        departement_id: ID du département.
+        horizon_mois: Horizon de projection (en mois).
+        skip: Nombre d'enregistrements à sauter.
+        limit: Nombre maximum d'enregistrements à retourner.
+        fields: Colonnes à charger (optionnel) ; les lignes sont alors des tuples de colonnes.
+
+    Returns:
+        Une liste d'objets ProjectionModel (ou de tuples si 'fields' est fourni), triée par employe_id.
+    """
+    return with_fields(db.query(ProjectionModel), ProjectionModel, fields)\
+             .join(EmployeModel, EmployeModel.id == ProjectionModel.employe_id)\
+             .filter(EmployeModel.departement_id == departement_id)\
+             .filter(ProjectionModel.horizon_mois == horizon_mois)\
+             .order_by(ProjectionModel.employe_id)\
+             .offset(skip).limit(limit).all()
+
+def replace_projections(db: Session, horizon_mois: int, projections: List[Dict[str, Any]]) -> int:
+    """
+    Remplace en bloc les projections d'un lot d'employés pour un horizon (DELETE ... IN + INSERT multi-lignes).
+
+    Args:
+        db: Session de base de données SQLAlchemy.
+        horizon_mois: Horizon de projection commun au lot.
+        projections: Dictionnaires avec les colonnes employe_id, evaluation_id, performance_initiale, performance_predite,
+            base_growth, base_decay.
+
+    Returns:
+        Le nombre de projections enregistrées.
+    """
+    if not projections:
+        return 0
+    db.execute(
+        delete(ProjectionModel)
+        .where(ProjectionModel.horizon_mois == horizon_mois)
+        .where(ProjectionModel.employe_id.in_([p["employe_id"] for p in projections]))
+    )
+    db.execute(insert(ProjectionModel), [dict(p, horizon_mois=horizon_mois) for p in projections])
+    db.commit()
+    return len(projections)
+
+def purge_projections(db: Session) -> int:
+    """
+    Supprime les projections des employés inactifs.
+
+    Returns:
+        Le nombre de projections supprimées.
+    """
+    inactifs = select(EmployeModel.id).where(EmployeModel.is_active.is_(False))
+    result = db.execute(delete(ProjectionModel).where(ProjectionModel.employe_id.in_(inactifs)))
+    db.commit()
+    return result.rowcount
@@ -1,19 +1,21 @@
 # app/crud/crud_simulation.py
 from sqlalchemy.orm import Session
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Sequence, Tuple
 from datetime import datetime
 
 from app.models.simulation import Simulation as SimulationModel
 from app.schemas.simulation import SimulationParams # Utilisé pour le type hinting peut-être
+from app.crud.fields import with_fields
+from app.crud import crud_change_counter # Versions pour les ETag des endpoints de lecture
 
 def get_simulation(db: Session, simulation_id: int) -> Optional[SimulationModel]:
     return db.query(SimulationModel).filter(SimulationModel.id == simulation_id).first()
 
 def get_simulations_by_employe(
-    db: Session, employe_id: int, skip: int = 0, limit: int = 100
+    db: Session, employe_id: int, skip: int = 0, limit: int = 100, fields: Optional[Sequence[str]] = None
 ) -> List[SimulationModel]:
     # Vérifier si l'employé existe peut être fait ici ou dans l'endpoint
-    return db.query(SimulationModel)\
+    return with_fields(db.query(SimulationModel), SimulationModel, fields)\
              .filter(SimulationModel.employe_id == employe_id)\
              .order_by(SimulationModel.date_simulation.desc())\
              .offset(skip).limit(limit).all()
@@ -44,14 +46,43 @@ def create_simulation_record(
         resultats_simulation=resultats
     )
     db.add(db_simulation)
+    crud_change_counter.bump_versions(db, f"simulations:employe:{employe_id}")
     db.commit()
     db.refresh(db_simulation)
     return db_simulation
 
+def create_simulation_records(
+    db: Session,
+    employe_id: int,
+    runs: List[Tuple[Dict[str, Any], Dict[str, Any]]]
+) -> List[SimulationModel]:
+    """
+    Enregistre plusieurs simulations d'un même employé en une seule transaction.
+
+    Args:
+        db: Session de base de données.
+        employe_id: ID de l'employé concerné.
+        runs: Liste de couples (parametres, resultats), un par scénario.
+
+    Returns:
+        Les enregistrements SimulationModel créés, dans l'ordre de 'runs'.
+    """
+    db_simulations = [
+        SimulationModel(employe_id=employe_id, parametres_entree=parametres, resultats_simulation=resultats)
+        for parametres, resultats in runs
+    ]
+    db.add_all(db_simulations)
+    crud_change_counter.bump_versions(db, f"simulations:employe:{employe_id}")
+    db.commit()
+    for db_simulation in db_simulations:
+        db.refresh(db_simulation)
+    return db_simulations
+
 def delete_simulation(db: Session, simulation_id: int) -> Optional[SimulationModel]:
     db_simulation = get_simulation(db, simulation_id=simulation_id)
     if db_simulation is None:
         return None
     db.delete(db_simulation)
+    crud_change_counter.bump_versions(db, f"simulations:employe:{db_simulation.employe_id}")
     db.commit()
     return db_simulation
@@ -0,0 +1,28 @@
+# app/crud/fields.py
+from typing import Optional, Sequence
+
+from sqlalchemy.orm import Query
+
+def with_fields(query: Query, model, fields: Optional[Sequence[str]]) -> Query:
+    """
+    Restreint une requête ORM (db.query(Model)...) aux colonnes nommées, dans cet ordre.
+    Les filtres, jointures, tris et la pagination sont conservés ; la requête renvoie alors
+    des tuples de colonnes au lieu d'objets ORM (pas d'identity map ni de chargement d'attributs).
+
+    Args:
+        query: Requête portant sur 'model'.
+        model: Classe du modèle SQLAlchemy.
+        fields: Noms des attributs à charger (None = requête inchangée, objets ORM complets).
+
+    Raises:
+        ValueError: Si un nom ne correspond à aucune colonne du modèle.
+    """
+    if fields is None:
+        return query
+    columns = []
+    for field in fields:
+        column = model.__table__.columns.get(field)
+        if column is None:
+            raise ValueError(f"Champ inconnu pour {model.__name__} : '{field}'.")
+        columns.append(getattr(model, field))
+    return query.with_entities(*columns)
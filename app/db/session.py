@@ -1,9 +1,18 @@
 # app/db/session.py
+import itertools
 import os
-from sqlalchemy import create_engine
+import time
+
+from typing import List
+
+from fastapi import Request
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 
+from app.core.config import settings
+from app.db import sharding
+
 # Charger les variables d'environnement du fichier .env
 load_dotenv()
 
@@ -13,14 +22,44 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if DATABASE_URL is None:
     raise ValueError("La variable d'environnement DATABASE_URL n'est pas définie.")
 
-# Créer l'engine SQLAlchemy
-# Pour SQLite, il faut ajouter connect_args pour autoriser l'utilisation dans plusieurs threads (nécessaire avec FastAPI)
-if DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(
-        DATABASE_URL, connect_args={"check_same_thread": False}
-    )
-else:
-    engine = create_engine(DATABASE_URL) # Pas besoin de connect_args pour PostgreSQL/MySQL par défaut
+# Réplicas en lecture (optionnel) : URLs séparées par des virgules. Les requêtes GET/HEAD y sont
+# servies (en alternance), les écritures et les lectures qui suivent de près une écriture vont au primaire.
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+
+# Shards (optionnel) : URLs séparées par des virgules. Les données des employés sont réparties par
+# département entre ces bases ; DATABASE_URL garde les tables globales et l'annuaire (voir app/db/sharding.py).
+# Les réplicas en lecture ne sont pas utilisés en mode shardé.
+DATABASE_SHARD_URLS = [url.strip() for url in os.getenv("DATABASE_SHARD_URLS", "").split(",") if url.strip()]
+
+# Lecture de ses propres écritures : après une écriture, la réponse porte un cookie (et un en-tête, à
+# renvoyer tel quel par les clients non navigateurs) contenant l'instant jusqu'auquel les lectures du
+# client restent sur le primaire (voir app/api/read_your_writes.py)
+READ_YOUR_WRITES_COOKIE = "db_primary_until"
+READ_YOUR_WRITES_HEADER = "x-db-primary-until"
+
+def enable_sqlite_foreign_keys(engine) -> None:
+    """
+    Active le contrôle des clés étrangères de SQLite sur chaque connexion (désactivé par défaut),
+    nécessaire aux suppressions en cascade déclarées en base (ON DELETE CASCADE).
+    """
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragma(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+def make_engine(url: str):
+    """Crée un engine (SQLite : multi-thread et clés étrangères actives)."""
+    # Pour SQLite, il faut ajouter connect_args pour autoriser l'utilisation dans plusieurs threads (nécessaire avec FastAPI)
+    if url.startswith("sqlite"):
+        sqlite_engine = create_engine(url, connect_args={"check_same_thread": False})
+        enable_sqlite_foreign_keys(sqlite_engine)
+        return sqlite_engine
+    return create_engine(url) # Pas besoin de connect_args pour PostgreSQL/MySQL par défaut
+
+# Créer l'engine SQLAlchemy (primaire) et ceux des réplicas
+engine = make_engine(DATABASE_URL)
+replica_engines = [make_engine(url) for url in DATABASE_REPLICA_URLS]
 
 # Créer une factory de session configurée
 # autocommit=False: Les transactions ne sont pas automatiquement validées.
@@ -28,14 +67,61 @@ else:
 # bind=engine: Associe cette factory de session à notre engine.
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Mode shardé : sessions routées (ShardedSession) pour l'API, une fabrique par shard pour les traitements par lots
+shard_engines = {str(rang): make_engine(url) for rang, url in enumerate(DATABASE_SHARD_URLS)}
+ShardedSessionLocal = sharding.configure_sharding(
+    engine, shard_engines, id_block_size=settings.SHARD_ID_BLOCK_SIZE,
+    directory_ttl=settings.SHARD_DIRECTORY_CACHE_SECONDS
+) if shard_engines else None
+
+def data_sessionmakers() -> List[sessionmaker]:
+    """
+    Fabriques de sessions des bases contenant les données des employés, pour les traitements par lots
+    (scripts, tâches de fond) qui s'exécutent base par base : chaque shard, ou la base principale.
+    """
+    return list(sharding.router.sessionmakers.values()) if ShardedSessionLocal is not None else [SessionLocal]
+
+def write_session():
+    """
+    Nouvelle session sur la base d'écriture (primaire, ou sessions routées en mode shardé), pour le travail
+    fait hors d'une requête HTTP ordinaire : WebSocket, fin d'une réponse en flux.
+    """
+    return ShardedSessionLocal() if ShardedSessionLocal is not None else SessionLocal()
+
+ReplicaSessionLocals = [
+    sessionmaker(autocommit=False, autoflush=False, bind=replica_engine) for replica_engine in replica_engines
+]
+_replica_sessions = itertools.cycle(ReplicaSessionLocals) # Répartition des lectures en alternance
+
+def reads_from_primary(request: Request) -> bool:
+    """
+    Indique si la requête doit être servie par le primaire : écriture, ou lecture d'un client
+    ayant écrit récemment (cookie ou en-tête de lecture de ses propres écritures encore valide).
+    """
+    if request.method not in ("GET", "HEAD"):
+        return True
+    primary_until = request.cookies.get(READ_YOUR_WRITES_COOKIE) or request.headers.get(READ_YOUR_WRITES_HEADER)
+    try:
+        return float(primary_until) > time.time()
+    except (TypeError, ValueError):
+        return False
+
 # Fonction de dépendance pour FastAPI
-def get_db():
+def get_db(request: Request):
     """
     Générateur de session de base de données pour les dépendances FastAPI.
+    En mode shardé, la session route elle-même chaque requête vers le(s) shard(s) concerné(s).
+    Sinon, les lectures (GET/HEAD) sont servies par un réplica s'il y en a de configurés, sauf juste après
+    une écriture du même client ; tout le reste utilise le primaire.
     Assure que la session est correctement fermée après chaque requête.
     """
-    db = SessionLocal()
+    if ShardedSessionLocal is not None:
+        db = ShardedSessionLocal()
+    elif ReplicaSessionLocals and not reads_from_primary(request):
+        db = next(_replica_sessions)()
+    else:
+        db = SessionLocal()
     try:
         yield db # Fournit la session à la fonction de l'endpoint
     finally:
-        db.close() # Ferme la session après utilisation
\ No newline at end of file
+        db.close() # Ferme la session après utilisation
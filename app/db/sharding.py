@@ -0,0 +1,447 @@
+# app/db/sharding.py
+"""
+Sharding optionnel par département (DATABASE_SHARD_URLS, voir app/db/session.py).
+
+Chaque shard est une base complète (mêmes migrations Alembic) qui contient des départements entiers :
+le département et son horaire, ses employés et tout leur historique (pointages, archive, évaluations,
+simulations, horaires individuels, lignes dérivées). Les clés étrangères et les suppressions en cascade
+restent donc locales à un shard.
+La base principale (DATABASE_URL) garde les tables globales (change_counters, change_events, badge_events,
+jours_feries) et :
+  - l'annuaire 'shard_directory' : shard de chaque département et de chaque employé, écrit à la
+    création (département : id modulo le nombre de shards ; employé : shard de son département,
+    sinon id modulo) puis modifié uniquement par le rééquilibrage (app/scripts/rebalance_shards.py) ;
+    gardé en cache par chaque processus (SHARD_DIRECTORY_CACHE_SECONDS) ;
+  - 'shard_sequences' : ids des tables shardées alloués par blocs, uniques sur tous les shards.
+
+La session (ShardedSession de SQLAlchemy) route chaque requête : vers le shard de l'employé ou du
+département quand la requête filtre dessus (égalité ou IN), vers la base principale pour les tables
+globales, sinon vers tous les shards. Les listes globales paginées passent par scatter_gather.
+
+Limites : une transaction qui touche plusieurs bases n'est pas atomique ; l'unicité (nom de département,
+email) n'est garantie par la base qu'à l'intérieur d'un shard (les fonctions crud vérifient avant
+d'écrire) ; un employé ne change de shard qu'avec son département (rééquilibrage).
+"""
+import heapq
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from itertools import islice
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import Column, delete, event, func, insert, select, update
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.horizontal_shard import ShardedSession
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.sql import operators, visitors
+from sqlalchemy.sql.elements import BindParameter
+
+from app import models
+
+GLOBAL = "global" # Identifiant de la base principale dans la ShardedSession
+
+# Tables de la base principale (non shardées)
+GLOBAL_MODELS = (
+    models.ChangeCounter, models.ChangeEvent, models.BadgeEvent, models.ShardDirectory, models.ShardSequence,
+    models.JourFerie
+)
+# Modèles dont l'id est alloué dans 'shard_sequences'
+SEQUENCE_MODELS = (models.Departement, models.Employe, models.Pointage, models.Evaluation, models.Simulation)
+# Modèles dont la clé primaire commence par employe_id
+EMPLOYE_KEYED_MODELS = (
+    models.EmployeLatestEvaluation, models.EmployeCalibration, models.Projection, models.HoraireEmploye,
+    models.PointageAnomalie, models.PointageSuppression
+)
+# Tables de l'historique d'un employé, dans l'ordre des clés étrangères (copie lors d'un rééquilibrage)
+EMPLOYE_TABLES = tuple(model.__table__ for model in (
+    models.Evaluation, models.Pointage, models.PointageArchive, models.Simulation,
+    models.EmployeLatestEvaluation, models.EmployeCalibration, models.Projection, models.HoraireEmploye,
+    models.PointageAnomalie, models.PointageSuppression
+))
+IN_CHUNK_SIZE = 500 # Valeurs par clause IN (annuaire, rééquilibrage)
+
+def _comparisons(statement) -> List[tuple]:
+    """Comparaisons 'colonne = valeur' et 'colonne IN (valeurs)' d'une requête : [(table, colonne, valeurs)]."""
+    resultats = []
+
+    def visit_binary(binary):
+        if binary.operator not in (operators.eq, operators.in_op):
+            return
+        gauche, droite = binary.left, binary.right
+        if isinstance(gauche, BindParameter) and isinstance(droite, Column):
+            gauche, droite = droite, gauche
+        if not (isinstance(gauche, Column) and isinstance(droite, BindParameter) and gauche.table is not None):
+            return
+        valeur = droite.effective_value
+        valeurs = valeur if binary.operator is operators.in_op else [valeur]
+        resultats.append((gauche.table.name, gauche.key, [v for v in valeurs if v is not None]))
+
+    visitors.traverse(statement, {}, {"binary": visit_binary})
+    return resultats
+
+class ShardRouter:
+    """Annuaire, allocation des ids, choix du shard et lectures réparties d'un ensemble de shards."""
+
+    def __init__(
+        self,
+        global_engine: Engine,
+        shard_engines: Dict[str, Engine],
+        id_block_size: int = 100,
+        directory_ttl: float = 60.0
+    ) -> None:
+        self.global_engine = global_engine
+        self.shard_engines = shard_engines
+        self.shard_ids = list(shard_engines)
+        self.id_block_size = id_block_size
+        self.sessionmakers = {
+            shard_id: sessionmaker(autocommit=False, autoflush=False, bind=shard_engine)
+            for shard_id, shard_engine in shard_engines.items()
+        }
+        self._id_blocks: Dict[str, List[int]] = {} # nom de table -> [prochain id, fin du bloc (exclue)]
+        self._id_lock = threading.Lock()
+        # Cache de l'annuaire (clé -> shard) : seules les clés présentes en base y entrent (un employé créé
+        # par un autre processus ne doit pas rester routé par défaut). Vidé entièrement toutes les
+        # directory_ttl secondes pour voir un rééquilibrage fait par un autre processus.
+        self.directory_ttl = directory_ttl
+        self._annuaire: Dict[str, str] = {}
+        self._annuaire_expiration = 0.0
+        self._annuaire_lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=4 * len(shard_engines), thread_name_prefix="shard")
+
+    # --- Annuaire ---
+
+    def lookup(self, cle: str) -> Optional[str]:
+        return self.lookup_many([cle]).get(cle)
+
+    def lookup_many(self, cles: Iterable[str]) -> Dict[str, str]:
+        """Shards des clés présentes dans l'annuaire (cache, puis une requête IN par lot pour les autres)."""
+        cles = list(cles)
+        with self._annuaire_lock:
+            if time.monotonic() >= self._annuaire_expiration:
+                self._annuaire.clear()
+                self._annuaire_expiration = time.monotonic() + self.directory_ttl
+            trouvees = {cle: self._annuaire[cle] for cle in cles if cle in self._annuaire}
+        manquantes = list({cle for cle in cles if cle not in trouvees})
+        if manquantes:
+            directory = models.ShardDirectory
+            with self.global_engine.connect() as conn:
+                for debut in range(0, len(manquantes), IN_CHUNK_SIZE):
+                    trouvees.update(conn.execute(
+                        select(directory.cle, directory.shard)
+                        .where(directory.cle.in_(manquantes[debut:debut + IN_CHUNK_SIZE]))
+                    ).tuples().all())
+            with self._annuaire_lock:
+                self._annuaire.update((cle, trouvees[cle]) for cle in manquantes if cle in trouvees)
+        return trouvees
+
+    def assign(self, entrees: Dict[str, str]) -> None:
+        """Enregistre (ou remplace) des entrées de l'annuaire, dans une transaction de la base principale."""
+        maintenant = datetime.now(timezone.utc)
+        cles = list(entrees)
+        with self.global_engine.begin() as conn:
+            for debut in range(0, len(cles), IN_CHUNK_SIZE):
+                lot = cles[debut:debut + IN_CHUNK_SIZE]
+                conn.execute(delete(models.ShardDirectory).where(models.ShardDirectory.cle.in_(lot)))
+                conn.execute(insert(models.ShardDirectory), [
+                    {"cle": cle, "shard": entrees[cle], "date_modification": maintenant} for cle in lot
+                ])
+        with self._annuaire_lock:
+            self._annuaire.update(entrees)
+
+    def default_shard(self, identifiant: int) -> str:
+        return self.shard_ids[identifiant % len(self.shard_ids)]
+
+    def shard_for_departement(self, departement_id: int) -> str:
+        return self.lookup(f"departements:{departement_id}") or self.default_shard(departement_id)
+
+    def shard_for_employe(self, employe_id: int) -> str:
+        return self.lookup(f"employes:{employe_id}") or self.default_shard(employe_id)
+
+    def shards_for(self, prefixe: str, identifiants: Iterable[int]) -> set:
+        """Shards d'un ensemble de départements ou d'employés (prefixe 'departements' ou 'employes'), en un appel."""
+        identifiants = set(identifiants)
+        annuaire = self.lookup_many([f"{prefixe}:{i}" for i in identifiants])
+        return {annuaire.get(f"{prefixe}:{i}") or self.default_shard(i) for i in identifiants}
+
+    # --- Allocation des ids ---
+
+    def allocate_id(self, nom: str) -> int:
+        """Prochain id de la table 'nom', unique sur tous les shards (bloc réservé en base principale)."""
+        with self._id_lock:
+            bloc = self._id_blocks.get(nom)
+            if bloc is None or bloc[0] >= bloc[1]:
+                debut = self._reserve_block(nom)
+                bloc = self._id_blocks[nom] = [debut, debut + self.id_block_size]
+            identifiant = bloc[0]
+            bloc[0] += 1
+            return identifiant
+
+    def _reserve_block(self, nom: str) -> int:
+        # Transaction courte et séparée : un bloc réservé n'est jamais rendu (des trous sont possibles)
+        sequence = models.ShardSequence
+        for _ in range(2):
+            with self.global_engine.begin() as conn:
+                fin = conn.scalar(
+                    update(sequence).where(sequence.nom == nom)
+                    .values(prochain_id=sequence.prochain_id + self.id_block_size)
+                    .returning(sequence.prochain_id)
+                )
+                if fin is not None:
+                    return fin - self.id_block_size
+            # Première allocation : partir après le plus grand id existant (données antérieures au sharding)
+            debut = self._max_id(nom) + 1
+            try:
+                with self.global_engine.begin() as conn:
+                    conn.execute(insert(sequence).values(nom=nom, prochain_id=debut + self.id_block_size))
+                return debut
+            except IntegrityError:
+                continue # Initialisée en parallèle par un autre processus : réserver normalement
+        raise RuntimeError(f"Impossible de réserver des ids pour la table '{nom}'.")
+
+    def _max_id(self, nom: str) -> int:
+        table = models.Base.metadata.tables[nom]
+        maximum = 0
+        for shard_engine in [self.global_engine, *self.shard_engines.values()]:
+            with shard_engine.connect() as conn:
+                maximum = max(maximum, conn.scalar(select(func.max(table.c.id))) or 0)
+        return maximum
+
+    def before_flush(self, session: Session, flush_context, instances) -> None:
+        """Attribue les ids des nouveaux objets shardés et enregistre les nouveaux départements et employés."""
+        nouveaux = [obj for obj in session.new if isinstance(obj, SEQUENCE_MODELS) and obj.id is None]
+        if not nouveaux:
+            return
+        for obj in nouveaux:
+            obj.id = self.allocate_id(obj.__tablename__)
+        departements = {obj.id: self.default_shard(obj.id) for obj in nouveaux if isinstance(obj, models.Departement)}
+        if departements:
+            self.assign({f"departements:{departement_id}": shard for departement_id, shard in departements.items()})
+        employes = {}
+        for obj in nouveaux:
+            if isinstance(obj, models.Employe):
+                # Avec son département ; sans département : réparti selon son id
+                employes[f"employes:{obj.id}"] = self.shard_for_departement(obj.departement_id) \
+                    if obj.departement_id is not None else self.default_shard(obj.id)
+        if employes:
+            self.assign(employes)
+
+    # --- Choix du shard (fonctions de rappel de ShardedSession) ---
+
+    def shard_chooser(self, mapper, instance, clause=None, **kw) -> str:
+        """Shard d'un nouvel objet (les objets chargés gardent le shard dont ils proviennent)."""
+        cls = mapper.class_
+        if cls in GLOBAL_MODELS:
+            return GLOBAL
+        if instance is None:
+            raise ValueError(f"Écriture sur '{mapper.local_table.name}' sans objet : utiliser une session de shard.")
+        if cls is models.Departement:
+            return self.shard_for_departement(instance.id)
+        if cls is models.HoraireDepartement:
+            return self.shard_for_departement(instance.departement_id)
+        if cls is models.Employe:
+            return self.shard_for_employe(instance.id)
+        return self.shard_for_employe(instance.employe_id)
+
+    def identity_chooser(self, mapper, primary_key, *, lazy_loaded_from, **kw) -> List[str]:
+        """Shard(s) à interroger pour une lecture par clé primaire (Session.get)."""
+        if lazy_loaded_from is not None:
+            return [lazy_loaded_from.identity_token]
+        cls = mapper.class_
+        if cls in GLOBAL_MODELS:
+            return [GLOBAL]
+        if cls is models.Departement or cls is models.HoraireDepartement:
+            return [self.shard_for_departement(primary_key[0])]
+        if cls is models.Employe or cls in EMPLOYE_KEYED_MODELS:
+            return [self.shard_for_employe(primary_key[0])]
+        return self.shard_ids # Ids uniques sur tous les shards : un seul shard répondra
+
+    def execute_chooser(self, orm_context) -> List[str]:
+        """Shard(s) à interroger pour une requête, d'après ses critères sur employe_id / departement_id."""
+        mapper = orm_context.bind_mapper
+        if mapper is not None and mapper.class_ in GLOBAL_MODELS:
+            return [GLOBAL]
+        if orm_context.is_insert:
+            raise ValueError("INSERT en masse sur une table shardée : utiliser une session de shard.")
+        shards = set()
+        for table, colonne, valeurs in _comparisons(orm_context.statement):
+            if colonne == "employe_id" or (table == "employes" and colonne == "id"):
+                shards.update(self.shards_for("employes", valeurs))
+            elif colonne == "departement_id" or (table == "departements" and colonne == "id"):
+                shards.update(self.shards_for("departements", valeurs))
+        return sorted(shards) if shards else self.shard_ids
+
+    # --- Lectures réparties ---
+
+    def scatter_gather(
+        self,
+        fetch: Callable[[Session, int, Optional[Sequence[str]]], List[Any]],
+        sort_fields: Sequence[str],
+        skip: int,
+        limit: int,
+        fields: Optional[Sequence[str]] = None,
+        descending: bool = False
+    ) -> List[Any]:
+        """
+        Lecture paginée sur tous les shards : chaque shard renvoie ses skip + limit premières lignes
+        (en parallèle), les listes triées sont fusionnées puis la page [skip, skip + limit) est extraite.
+
+        Args:
+            fetch: Fonction (session du shard, nombre de lignes, colonnes) -> lignes triées selon sort_fields.
+            sort_fields: Colonnes du tri (toutes dans le même sens).
+            skip, limit: Pagination globale.
+            fields: Colonnes demandées (None = objets ORM) ; les colonnes de tri manquantes sont
+                ajoutées pour la fusion puis retirées.
+            descending: Tri décroissant.
+
+        Returns:
+            Les lignes de la page, comme les aurait renvoyées fetch sur une base unique.
+        """
+        colonnes = None if fields is None else tuple(fields) + tuple(c for c in sort_fields if c not in fields)
+
+        def fetch_on_shard(shard_id: str) -> List[Any]:
+            session = self.sessionmakers[shard_id]()
+            try:
+                return fetch(session, skip + limit, colonnes)
+            finally:
+                session.close()
+
+        partiels = list(self._pool.map(fetch_on_shard, self.shard_ids))
+        page = list(islice(heapq.merge(*partiels, key=attrgetter(*sort_fields), reverse=descending), skip, skip + limit))
+        if colonnes is not None and len(colonnes) > len(fields):
+            page = [tuple(ligne[:len(fields)]) for ligne in page]
+        return page
+
+    # --- Rééquilibrage ---
+
+    def _delete_departement(self, conn: Connection, departement_id: int, employe_ids: Sequence[int]) -> None:
+        # Historique supprimé en cascade avec les employés (ON DELETE CASCADE)
+        for debut in range(0, len(employe_ids), IN_CHUNK_SIZE):
+            conn.execute(delete(models.Employe.__table__).where(
+                models.Employe.__table__.c.id.in_(employe_ids[debut:debut + IN_CHUNK_SIZE])
+            ))
+        conn.execute(delete(models.Departement.__table__).where(models.Departement.__table__.c.id == departement_id))
+
+    def move_departement(self, departement_id: int, shard_cible: str, batch_size: int = 5000) -> Dict[str, int]:
+        """
+        Déplace un département, ses employés et tout leur historique vers un autre shard :
+        copie (par lots) dans une transaction du shard cible, mise à jour de l'annuaire, puis
+        suppression sur le shard d'origine. À lancer département inactif : une écriture reçue
+        pendant la copie serait perdue. Relançable après une interruption (la copie partielle
+        éventuelle sur le shard cible est d'abord supprimée).
+
+        Returns:
+            Le nombre de lignes copiées par table.
+        """
+        if shard_cible not in self.shard_engines:
+            raise ValueError(f"Shard inconnu : '{shard_cible}' (shards : {', '.join(self.shard_ids)}).")
+        source = self.shard_for_departement(departement_id)
+        if source == shard_cible:
+            return {}
+        departements, employes = models.Departement.__table__, models.Employe.__table__
+        horaires = models.HoraireDepartement.__table__
+
+        with self.shard_engines[source].connect() as conn_source:
+            if conn_source.scalar(select(departements.c.id).where(departements.c.id == departement_id)) is None:
+                raise ValueError(f"Le département {departement_id} n'existe pas sur le shard '{source}'.")
+            employe_ids = conn_source.scalars(select(employes.c.id).where(employes.c.departement_id == departement_id)).all()
+
+            copies = {}
+            with self.shard_engines[shard_cible].begin() as conn_cible:
+                self._delete_departement(conn_cible, departement_id, employe_ids)
+                requetes = [
+                    (departements, [select(departements).where(departements.c.id == departement_id)]),
+                    (horaires, [select(horaires).where(horaires.c.departement_id == departement_id)]),
+                ]
+                for table in (employes,) + EMPLOYE_TABLES:
+                    colonne = table.c.id if table is employes else table.c.employe_id
+                    requetes.append((table, [
+                        select(table).where(colonne.in_(employe_ids[debut:debut + IN_CHUNK_SIZE]))
+                        for debut in range(0, len(employe_ids), IN_CHUNK_SIZE)
+                    ]))
+                for table, selects in requetes:
+                    copies[table.name] = 0
+                    for requete in selects:
+                        resultat = conn_source.execution_options(yield_per=batch_size).execute(requete)
+                        for lot in resultat.partitions():
+                            conn_cible.execute(insert(table), [dict(ligne._mapping) for ligne in lot])
+                            copies[table.name] += len(lot)
+
+        self.assign({
+            f"departements:{departement_id}": shard_cible,
+            **{f"employes:{employe_id}": shard_cible for employe_id in employe_ids}
+        })
+        with self.shard_engines[source].begin() as conn_source:
+            self._delete_departement(conn_source, departement_id, employe_ids)
+        return copies
+
+    def rebuild_directory(self) -> int:
+        """Reconstruit l'annuaire d'après le contenu des shards (mise en place du sharding sur des données existantes)."""
+        entrees = {}
+        for shard_id, shard_engine in self.shard_engines.items():
+            with shard_engine.connect() as conn:
+                entrees.update({f"departements:{i}": shard_id for i in conn.scalars(select(models.Departement.id))})
+                entrees.update({f"employes:{i}": shard_id for i in conn.scalars(select(models.Employe.id))})
+        if entrees:
+            self.assign(entrees)
+        return len(entrees)
+
+    def shard_counts(self, tables: Iterable[str] = ("departements", "employes", "pointages")) -> Dict[str, Dict[str, int]]:
+        """Nombre de lignes par shard et par table."""
+        comptes = {}
+        for shard_id, shard_engine in self.shard_engines.items():
+            with shard_engine.connect() as conn:
+                comptes[shard_id] = {
+                    nom: conn.scalar(select(func.count()).select_from(models.Base.metadata.tables[nom])) for nom in tables
+                }
+        return comptes
+
+# Routeur actif (None si le sharding n'est pas configuré)
+router: Optional[ShardRouter] = None
+
+def configure_sharding(
+    global_engine: Engine,
+    shard_engines: Dict[str, Engine],
+    id_block_size: int = 100,
+    directory_ttl: float = 60.0
+) -> sessionmaker:
+    """Active le sharding et renvoie la fabrique de sessions routées."""
+    global router
+    router = ShardRouter(global_engine, shard_engines, id_block_size=id_block_size, directory_ttl=directory_ttl)
+    factory = sessionmaker(
+        class_=ShardedSession,
+        autocommit=False,
+        autoflush=False,
+        shards={GLOBAL: global_engine, **shard_engines},
+        shard_chooser=router.shard_chooser,
+        identity_chooser=router.identity_chooser,
+        execute_chooser=router.execute_chooser
+    )
+    event.listen(factory, "before_flush", router.before_flush)
+    return factory
+
+def is_sharded(db: Session) -> bool:
+    """La session est-elle une session routée sur plusieurs shards ?"""
+    return isinstance(db, ShardedSession)
+
+def scatter_gather(*args, **kwargs) -> List[Any]:
+    """Voir ShardRouter.scatter_gather."""
+    return router.scatter_gather(*args, **kwargs)
+
+def check_same_shard(employe_id: int, departement_id: Optional[int]) -> None:
+    """
+    Vérifie qu'un employé peut rejoindre un département sans changer de shard.
+
+    Raises:
+        ValueError: Le département est sur un autre shard (déplacer le département entier avec le rééquilibrage).
+    """
+    if departement_id is None:
+        return
+    actuel, cible = router.shard_for_employe(employe_id), router.shard_for_departement(departement_id)
+    if actuel != cible:
+        raise ValueError(
+            f"Le département {departement_id} est sur un autre shard ('{cible}') que l'employé {employe_id} ('{actuel}') : "
+            "utiliser app.scripts.rebalance_shards."
+        )
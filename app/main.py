@@ -1,17 +1,79 @@
 # app/main.py
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
 from app.api.api_v1.api import api_router # Importez le routeur de l'API v1
-# from app.core.config import settings # Si vous avez un fichier de config centralisé
+from app.core.config import settings # Configuration centralisée
+from app.api.serialization import DefaultResponse # orjson si disponible
+from app.api.compression import CompressionMiddleware
+from app.api.read_your_writes import ReadYourWritesMiddleware
+from app.api import profiling
+from app.api.admission import AdmissionControlMiddleware, default_rules
+from app.api import single_flight
+from app.db.session import DATABASE_REPLICA_URLS
+from app.services import projection_service
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Démarre (et arrête proprement) les tâches de fond de l'application."""
+    background_tasks = []
+    if settings.PROJECTION_REFRESH_INTERVAL_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(
+            projection_service.projection_refresh_loop(settings.PROJECTION_REFRESH_INTERVAL_SECONDS)
+        ))
+    yield
+    for task in background_tasks:
+        task.cancel()
 
 # Initialiser l'application FastAPI
 app = FastAPI(
     title="Système de Gestion Intelligente des Employés API",
     # description="Description détaillée de l'API...", # Optionnel
     version="1.0.0", # Version de l'API
-    openapi_url="/api/v1/openapi.json" # Chemin pour le schéma OpenAPI
+    openapi_url="/api/v1/openapi.json", # Chemin pour le schéma OpenAPI
+    lifespan=lifespan, # Tâches de fond (rafraîchissement des projections...)
+    default_response_class=DefaultResponse # Encodage JSON final plus rapide (le schéma OpenAPI est inchangé)
+)
+
+# Compression brotli/gzip négociée des réponses au-delà du seuil configuré
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY
 )
 
+# Avec des réplicas en lecture : un client qui vient d'écrire relit depuis le primaire
+if DATABASE_REPLICA_URLS:
+    app.add_middleware(ReadYourWritesMiddleware, window_seconds=settings.READ_YOUR_WRITES_SECONDS)
+
+# Contrôle d'admission : limites de débit par client et de simultanéité des routes coûteuses (429/503 immédiats)
+if settings.ADMISSION_CONTROL_ENABLED:
+    app.add_middleware(
+        AdmissionControlMiddleware,
+        rules=default_rules(),
+        par_seconde=settings.RATE_LIMIT_PER_SECOND,
+        rafale=settings.RATE_LIMIT_BURST or None,
+        state_path=settings.ADMISSION_STATE_PATH,
+        trust_forwarded=settings.ADMISSION_TRUST_FORWARDED
+    )
+
+# Profilage à la demande (en-tête X-Profile ou échantillonnage), profils consultables sous /debug/profiles.
+# Ajouté en dernier : le plus externe, il mesure aussi les autres middlewares.
+if settings.PROFILING_ENABLED:
+    app.add_middleware(
+        profiling.ProfilingMiddleware,
+        sample_rate=settings.PROFILING_SAMPLE_RATE,
+        interval_ms=settings.PROFILING_INTERVAL_MS
+    )
+    app.include_router(profiling.router, prefix="/debug/profiles", include_in_schema=False)
+
+# Compteurs du regroupement des requêtes identiques, même contrôle d'accès que les profils
+if settings.SINGLE_FLIGHT_DEBUG_ENABLED:
+    app.include_router(single_flight.router, prefix="/debug/single-flight", include_in_schema=False)
+
 # Inclure le routeur principal de l'API v1
 app.include_router(api_router, prefix="/api/v1") # Toutes les routes d'api_router seront préfixées par /api/v1
 
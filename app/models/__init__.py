@@ -3,8 +3,20 @@ from .base import Base
 from .departement import Departement
 from .employe import Employe
 from .pointage import Pointage
+from .pointage_archive import PointageArchive
 from .evaluation import Evaluation
 from .simulation import Simulation
+from .employe_latest_evaluation import EmployeLatestEvaluation
+from .employe_calibration import EmployeCalibration
+from .projection import Projection
+from .badge_event import BadgeEvent
+from .change_counter import ChangeCounter
+from .change_event import ChangeEvent
+from .shard_directory import ShardDirectory
+from .shard_sequence import ShardSequence
+from .horaire import HoraireDepartement, HoraireEmploye
+from .jour_ferie import JourFerie
+from .pointage_anomalie import PointageAnomalie, AnalyseAnomalies, PointageSuppression
 
 # Optionnel: Définir __all__ pour contrôler ce qui est importé avec "from .models import *"
 __all__ = [
@@ -12,6 +24,21 @@ __all__ = [
     "Departement",
     "Employe",
     "Pointage",
+    "PointageArchive",
     "Evaluation",
     "Simulation",
+    "EmployeLatestEvaluation",
+    "EmployeCalibration",
+    "Projection",
+    "BadgeEvent",
+    "ChangeCounter",
+    "ChangeEvent",
+    "ShardDirectory",
+    "ShardSequence",
+    "HoraireDepartement",
+    "HoraireEmploye",
+    "JourFerie",
+    "PointageAnomalie",
+    "AnalyseAnomalies",
+    "PointageSuppression",
 ]
\ No newline at end of file
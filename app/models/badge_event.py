@@ -0,0 +1,25 @@
+# app/models/badge_event.py
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+
+from .base import Base
+
+class BadgeEvent(Base):
+    """
+    Journal d'idempotence des badgeages (POST /pointages/badge) : une ligne par clé d'idempotence.
+    Un badgeage rejoué avec la même clé renvoie le pointage déjà traité au lieu d'en créer un autre.
+    employe_id / pointage_id sont de simples références (pas de clé étrangère) pour que ce journal,
+    purgé périodiquement, ne bloque pas la suppression d'un employé ou d'un pointage.
+    """
+    __tablename__ = "badge_events"
+
+    idempotency_key = Column(String(100), primary_key=True) # Fournie par le lecteur de badge
+    employe_id = Column(Integer, nullable=False)
+    direction = Column(String(10), nullable=False) # "entree" ou "sortie"
+    horodatage = Column(DateTime(timezone=True), nullable=False) # Heure du badgeage
+    pointage_id = Column(Integer, nullable=True) # Pointage ouvert/fermé par ce badgeage
+    action = Column(String(20), nullable=False) # "ouverture", "fermeture" ou "deja_ouvert"
+    date_reception = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<BadgeEvent(idempotency_key='{self.idempotency_key}', employe_id={self.employe_id}, direction='{self.direction}')>"
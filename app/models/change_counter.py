@@ -0,0 +1,22 @@
+# app/models/change_counter.py
+from sqlalchemy import Column, Integer, String, DateTime
+
+from .base import Base
+
+class ChangeCounter(Base):
+    """
+    Compteurs de modifications par ressource ou collection, incrémentés par les fonctions crud
+    d'écriture dans la même transaction. Servent à produire les ETag / Last-Modified des endpoints
+    de lecture sans rejouer leur requête (voir app/api/caching.py).
+
+    Clés utilisées : "employes", "employes:<id>", "departements", "departements:<id>",
+    "simulations:employe:<employe_id>". Une clé absente équivaut à la version 0.
+    """
+    __tablename__ = "change_counters"
+
+    cle = Column(String(100), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    date_modification = Column(DateTime(timezone=True), nullable=False) # Dernière écriture (UTC)
+
+    def __repr__(self):
+        return f"<ChangeCounter(cle='{self.cle}', version={self.version})>"
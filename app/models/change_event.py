@@ -0,0 +1,30 @@
+# app/models/change_event.py
+from sqlalchemy import Column, Integer, String, DateTime, JSON
+
+from .base import Base
+
+class ChangeEvent(Base):
+    """
+    Journal des modifications (outbox) des employés, pointages et évaluations, écrit par les fonctions
+    crud dans la transaction de l'écriture elle-même (juste après son commit en mode shardé) et
+    diffusé par GET /events (voir app/api/api_v1/endpoints/events.py). L'id croissant donne l'ordre des événements.
+
+    'donnees' contient la ligne complète après l'écriture (création ou modification), None pour une
+    suppression. Les lignes supprimées en cascade (historique d'un employé supprimé) ou simplement
+    déplacées dans 'pointages_archive' ne produisent pas d'événement. Purgé par
+    app/scripts/close_open_pointages.py.
+    """
+    __tablename__ = "change_events"
+    # SQLite : AUTOINCREMENT pour qu'un id ne soit jamais réattribué, même après une purge qui vide
+    # la table (un consommateur qui a déjà lu since=N ne verrait sinon plus rien)
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id = Column(Integer, primary_key=True) # Ordre de diffusion
+    date_creation = Column(DateTime(timezone=True), nullable=False, index=True) # UTC
+    ressource = Column(String(50), nullable=False) # "employes", "pointages" ou "evaluations"
+    ressource_id = Column(Integer, nullable=False)
+    operation = Column(String(10), nullable=False) # "create", "update" ou "delete"
+    donnees = Column(JSON, nullable=True)
+
+    def __repr__(self):
+        return f"<ChangeEvent(id={self.id}, ressource='{self.ressource}', ressource_id={self.ressource_id}, operation='{self.operation}')>"
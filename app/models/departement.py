@@ -9,9 +9,13 @@ class Departement(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     nom = Column(String(100), unique=True, index=True, nullable=False) # Longueur max 100, unique, indexé, requis
+    fuseau_horaire = Column(String(50), nullable=True) # Fuseau IANA du site ; NULL = settings.DEFAULT_TIMEZONE
 
     # Relation inverse : Un département peut avoir plusieurs employés
-    employes = relationship("Employe", back_populates="departement") # "Employe" est le nom de la classe, "departement" est le nom de l'attribut de relation dans la classe Employe
+    # Si on supprime un département, la base remet departement_id à NULL chez ses employés (ON DELETE SET NULL)
+    employes = relationship("Employe", back_populates="departement", passive_deletes=True) # "Employe" est le nom de la classe, "departement" est le nom de l'attribut de relation dans la classe Employe
+    # Horaire hebdomadaire type, supprimé avec le département (ON DELETE CASCADE)
+    horaires = relationship("HoraireDepartement", back_populates="departement", cascade="all, delete-orphan", passive_deletes=True)
 
     def __repr__(self):
         return f"<Departement(id={self.id}, nom='{self.nom}')>"
\ No newline at end of file
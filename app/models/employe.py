@@ -17,17 +17,26 @@ class Employe(Base):
     date_embauche = Column(Date, nullable=True) # Peut être null si non connu immédiatement
     position = Column(String(100), nullable=True) # Poste occupé
     is_active = Column(Boolean, default=True) # Pour désactiver un employé sans le supprimer
+    fuseau_horaire = Column(String(50), nullable=True) # Fuseau IANA (ex: "Europe/Paris") ; NULL = celui du département
 
     # Clé étrangère vers le département
-    departement_id = Column(Integer, ForeignKey("departements.id"), nullable=True) # Peut être null si l'employé n'est pas encore affecté
+    departement_id = Column(Integer, ForeignKey("departements.id", ondelete="SET NULL"), nullable=True, index=True) # Peut être null si l'employé n'est pas encore affecté
 
     # Relation Many-to-One : Plusieurs employés appartiennent à un département
     departement = relationship("Departement", back_populates="employes")
 
     # Relations One-to-Many inverses
-    pointages = relationship("Pointage", back_populates="employe", cascade="all, delete-orphan") # Si on supprime un employé, ses pointages sont supprimés
-    evaluations = relationship("Evaluation", back_populates="employe", cascade="all, delete-orphan")
-    simulations = relationship("Simulation", back_populates="employe", cascade="all, delete-orphan")
+    # Si on supprime un employé, tout son historique (pointages, pointages archivés, évaluations, simulations,
+    # lignes dérivées) est supprimé par la base (ON DELETE CASCADE), sans le charger :
+    # passive_deletes évite un SELECT par relation + un DELETE par ligne côté ORM
+    pointages = relationship("Pointage", back_populates="employe", cascade="all, delete-orphan", passive_deletes=True)
+    evaluations = relationship("Evaluation", back_populates="employe", cascade="all, delete-orphan", passive_deletes=True)
+    simulations = relationship("Simulation", back_populates="employe", cascade="all, delete-orphan", passive_deletes=True)
+    latest_evaluation = relationship("EmployeLatestEvaluation", back_populates="employe", uselist=False, cascade="all, delete-orphan", passive_deletes=True) # Ligne matérialisée (voir crud_latest_evaluation)
+    calibration = relationship("EmployeCalibration", back_populates="employe", uselist=False, cascade="all, delete-orphan", passive_deletes=True) # Paramètres ajustés (voir calibration_service)
+    projections = relationship("Projection", back_populates="employe", cascade="all, delete-orphan", passive_deletes=True) # Projections pré-calculées (voir projection_service)
+    horaires = relationship("HoraireEmploye", back_populates="employe", cascade="all, delete-orphan", passive_deletes=True) # Horaire individuel (voir horaire_service)
+    anomalies = relationship("PointageAnomalie", back_populates="employe", cascade="all, delete-orphan", passive_deletes=True) # Pointages signalés (voir anomalie_service)
 
     def __repr__(self):
         return f"<Employe(id={self.id}, nom='{self.nom}', prenom='{self.prenom}', email='{self.email}')>"
\ No newline at end of file
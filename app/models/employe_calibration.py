@@ -0,0 +1,28 @@
+# app/models/employe_calibration.py
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+
+from .base import Base
+from .employe import Employe # Importation pour ForeignKey
+
+class EmployeCalibration(Base):
+    """
+    Paramètres du modèle de performance ajustés sur l'historique d'évaluations d'un employé
+    (voir app/services/calibration_service.py). Utilisés par le service de simulation à la place
+    des taux par défaut lorsqu'ils existent.
+    """
+    __tablename__ = "employe_calibrations"
+
+    employe_id = Column(Integer, ForeignKey("employes.id", ondelete="CASCADE"), primary_key=True) # Une calibration par employé
+    base_growth = Column(Float, nullable=False) # Taux de croissance ajusté
+    base_decay = Column(Float, nullable=False) # Taux de déclin ajusté
+    nb_evaluations = Column(Integer, nullable=False) # Nombre d'évaluations notées utilisées pour l'ajustement
+    rmse = Column(Float, nullable=True) # Erreur quadratique moyenne de l'ajustement (points/mois)
+    date_calibration = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    # Relation Many-to-One
+    employe = relationship("Employe", back_populates="calibration")
+
+    def __repr__(self):
+        return f"<EmployeCalibration(employe_id={self.employe_id}, base_growth={self.base_growth}, base_decay={self.base_decay})>"
@@ -0,0 +1,26 @@
+# app/models/employe_latest_evaluation.py
+from sqlalchemy import Column, Integer, Float, Date, ForeignKey
+from sqlalchemy.orm import relationship
+
+from .base import Base
+from .employe import Employe # Importation pour ForeignKey
+
+class EmployeLatestEvaluation(Base):
+    """
+    Table matérialisée : dernière évaluation notée (score_global non NULL) de chaque employé.
+    Maintenue dans la même transaction par create/update/delete_evaluation,
+    ce qui permet une lecture par clé primaire au lieu d'un ORDER BY sur 'evaluations'.
+    """
+    __tablename__ = "employe_latest_evaluation"
+
+    employe_id = Column(Integer, ForeignKey("employes.id", ondelete="CASCADE"), primary_key=True) # Une seule ligne par employé
+    evaluation_id = Column(Integer, ForeignKey("evaluations.id", ondelete="CASCADE"), nullable=False)
+    score = Column(Float, nullable=False) # Copie de Evaluation.score_global
+    date = Column(Date, nullable=False) # Copie de Evaluation.date_evaluation
+
+    # Relations Many-to-One (permettent à l'unité de travail d'ordonner les suppressions)
+    employe = relationship("Employe", back_populates="latest_evaluation")
+    evaluation = relationship("Evaluation")
+
+    def __repr__(self):
+        return f"<EmployeLatestEvaluation(employe_id={self.employe_id}, evaluation_id={self.evaluation_id}, score={self.score}, date='{self.date}')>"
@@ -20,7 +20,7 @@ class Evaluation(Base):
     # criteres_scores = Column(JSON, nullable=True)
 
     # Clé étrangère vers l'employé évalué
-    employe_id = Column(Integer, ForeignKey("employes.id"), nullable=False, index=True)
+    employe_id = Column(Integer, ForeignKey("employes.id", ondelete="CASCADE"), nullable=False, index=True)
 
     # Relation Many-to-One
     employe = relationship("Employe", back_populates="evaluations")
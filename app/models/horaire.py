@@ -0,0 +1,44 @@
+# app/models/horaire.py
+from sqlalchemy import Column, Integer, Time, ForeignKey
+from sqlalchemy.orm import relationship
+
+from .base import Base
+from .departement import Departement # Importation pour ForeignKey
+from .employe import Employe # Importation pour ForeignKey
+
+class HoraireDepartement(Base):
+    """
+    Horaire hebdomadaire type d'un département : une ligne par jour travaillé (0 = lundi ... 6 = dimanche).
+    Un jour sans ligne n'est pas travaillé. S'applique aux employés du département qui n'ont pas
+    d'horaire individuel (voir HoraireEmploye et app/services/horaire_service.py).
+    """
+    __tablename__ = "horaires_departement"
+
+    departement_id = Column(Integer, ForeignKey("departements.id", ondelete="CASCADE"), primary_key=True)
+    jour_semaine = Column(Integer, primary_key=True) # 0 = lundi ... 6 = dimanche
+    heure_debut = Column(Time, nullable=False) # Heure d'arrivée prévue (heure locale)
+    heure_fin = Column(Time, nullable=False) # Heure de départ prévue
+    pause_minutes = Column(Integer, nullable=False, default=0) # Pause non travaillée comprise dans [debut, fin]
+
+    departement = relationship("Departement", back_populates="horaires")
+
+    def __repr__(self):
+        return f"<HoraireDepartement(departement_id={self.departement_id}, jour_semaine={self.jour_semaine}, debut='{self.heure_debut}', fin='{self.heure_fin}')>"
+
+class HoraireEmploye(Base):
+    """
+    Horaire hebdomadaire individuel : mêmes colonnes que HoraireDepartement. S'il existe (au moins
+    une ligne), il remplace entièrement celui du département ; ses jours sans ligne ne sont pas travaillés.
+    """
+    __tablename__ = "horaires_employe"
+
+    employe_id = Column(Integer, ForeignKey("employes.id", ondelete="CASCADE"), primary_key=True)
+    jour_semaine = Column(Integer, primary_key=True)
+    heure_debut = Column(Time, nullable=False)
+    heure_fin = Column(Time, nullable=False)
+    pause_minutes = Column(Integer, nullable=False, default=0)
+
+    employe = relationship("Employe", back_populates="horaires")
+
+    def __repr__(self):
+        return f"<HoraireEmploye(employe_id={self.employe_id}, jour_semaine={self.jour_semaine}, debut='{self.heure_debut}', fin='{self.heure_fin}')>"
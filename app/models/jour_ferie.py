@@ -0,0 +1,17 @@
+# app/models/jour_ferie.py
+from sqlalchemy import Column, Date, String
+
+from .base import Base
+
+class JourFerie(Base):
+    """
+    Jours fériés (communs à tous les départements) : aucun horaire ne s'y applique, le travail
+    effectué ces jours-là est compté en heures supplémentaires (voir app/services/horaire_service.py).
+    """
+    __tablename__ = "jours_feries"
+
+    jour = Column(Date, primary_key=True)
+    libelle = Column(String(100), nullable=False)
+
+    def __repr__(self):
+        return f"<JourFerie(jour='{self.jour}', libelle='{self.libelle}')>"
@@ -1,5 +1,5 @@
 # app/models/pointage.py
-from sqlalchemy import Column, Integer, DateTime, ForeignKey, Date
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Date, Boolean, Index, text, false
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -8,14 +8,48 @@ from .employe import Employe # Importation pour ForeignKey
 
 class Pointage(Base):
     __tablename__ = "pointages"
+    __table_args__ = (
+        # Index partiel des pointages ouverts (heure_depart IS NULL) : "qui est présent", pointages oubliés.
+        # Sa taille est proportionnelle au nombre de pointages ouverts, pas à l'historique.
+        Index(
+            "ix_pointages_open", "date_pointage", "employe_id",
+            sqlite_where=text("heure_depart IS NULL"),
+            postgresql_where=text("heure_depart IS NULL")
+        ),
+        # Unicité du n° de pointage dans la journée d'un employé : empêche les doublons
+        # (badgeages concurrents ou rejoués) et sert aux recherches par (employé, date).
+        Index("ix_pointages_employe_jour_seq", "employe_id", "date_pointage", "seq", unique=True),
+        # Agrégations journalières par date locale (GROUP BY jour_local), par employé ou département
+        Index("ix_pointages_employe_jour_local", "employe_id", "jour_local"),
+        # Pointages pas encore datés par le backfill (app/scripts/backfill_jour_local.py) : index vide ensuite
+        Index(
+            "ix_pointages_jour_local_null", "employe_id", "date_pointage",
+            sqlite_where=text("jour_local IS NULL"),
+            postgresql_where=text("jour_local IS NULL")
+        ),
+        # SQLite : AUTOINCREMENT pour ne jamais réattribuer l'ID d'un pointage supprimé ou archivé
+        # (sans lui, SQLite reprend max(id) + 1, qui peut déjà exister dans 'pointages_archive')
+        {"sqlite_autoincrement": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    date_pointage = Column(Date, nullable=False, index=True) # Date du pointage
-    heure_arrivee = Column(DateTime(timezone=True), nullable=False) # Heure d'arrivée exacte avec timezone
+    date_pointage = Column(Date, nullable=False, index=True) # Date du pointage (fournie par le client)
+    # Date locale de l'arrivée dans le fuseau de l'employé, calculée par le serveur à l'insertion
+    # (NULL pour les pointages antérieurs non encore traités par le backfill)
+    jour_local = Column(Date, nullable=True, index=True)
+    heure_arrivee = Column(DateTime(timezone=True), nullable=False) # Heure d'arrivée exacte (UTC, voir app/core/timezones.py)
     heure_depart = Column(DateTime(timezone=True), nullable=True) # Heure de départ, peut être null si l'employé est toujours présent ou oubli
+    seq = Column(Integer, nullable=False, default=1, server_default=text("1")) # N° du pointage dans la journée de l'employé (1, 2, ...)
 
-    # Clé étrangère vers l'employé
-    employe_id = Column(Integer, ForeignKey("employes.id"), nullable=False, index=True)
+    # True si l'heure de départ a été fixée par le job de clôture des pointages oubliés
+    cloture_automatique = Column(Boolean, nullable=False, default=False, server_default=false())
+
+    # Dernière écriture (UTC, création ou modification, y compris en masse) : la détection d'anomalies
+    # réanalyse les jours des pointages modifiés depuis son exécution précédente (NULL : avant la colonne)
+    date_modification = Column(DateTime(timezone=True), nullable=True, index=True, default=func.now(), onupdate=func.now())
+
+    # Clé étrangère vers l'employé (suppression de l'employé : pointages supprimés par la base)
+    employe_id = Column(Integer, ForeignKey("employes.id", ondelete="CASCADE"), nullable=False, index=True)
 
     # Relation Many-to-One : Plusieurs pointages appartiennent à un employé
     employe = relationship("Employe", back_populates="pointages")
@@ -0,0 +1,73 @@
+# app/models/pointage_anomalie.py
+from sqlalchemy import Column, Integer, Float, String, Date, DateTime, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+
+from .base import Base
+from .employe import Employe # Importation pour ForeignKey
+
+class PointageAnomalie(Base):
+    """
+    Pointage signalé par la détection d'anomalies (voir app/services/anomalie_service.py) :
+    durée invraisemblable, badgeage en double, ou arrivée / durée / écart avec le pointage précédent
+    inhabituels par rapport à l'historique récent de l'employé (z-score).
+    Un pointage peut avoir plusieurs anomalies, une par type.
+    """
+    __tablename__ = "pointage_anomalies"
+    __table_args__ = (
+        # Consultation par période (GET /pointages/anomalies)
+        Index("ix_pointage_anomalies_jour", "jour"),
+    )
+
+    employe_id = Column(Integer, ForeignKey("employes.id", ondelete="CASCADE"), primary_key=True)
+    # Pas de clé étrangère : le pointage peut avoir été archivé depuis (ids uniques entre les deux tables)
+    pointage_id = Column(Integer, primary_key=True)
+    type = Column(String(30), primary_key=True) # duree_invraisemblable, badge_double, arrivee_inhabituelle...
+    jour = Column(Date, nullable=False) # Date locale du pointage
+    valeur = Column(Float, nullable=False) # Valeur observée (minutes : heure d'arrivée locale, durée, écart)
+    moyenne = Column(Float, nullable=True) # Moyenne de l'historique récent (anomalies statistiques)
+    z_score = Column(Float, nullable=True) # Écart à la moyenne en écarts types (anomalies statistiques)
+    date_detection = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    employe = relationship("Employe", back_populates="anomalies")
+
+    def __repr__(self):
+        return f"<PointageAnomalie(employe_id={self.employe_id}, pointage_id={self.pointage_id}, type='{self.type}')>"
+
+class AnalyseAnomalies(Base):
+    """
+    Exécutions de la détection d'anomalies : la suivante reprend après le dernier jour analysé, ou au
+    premier jour dont un pointage a été créé ou modifié depuis 'marque' (saisie tardive, correction,
+    départ d'un pointage encore ouvert lors de l'exécution).
+    Une ligne par exécution (et par base en mode shardé, chaque shard étant analysé séparément).
+    Les suppressions de pointages sont notées à part (PointageSuppression).
+    """
+    __tablename__ = "analyses_anomalies"
+
+    id = Column(Integer, primary_key=True)
+    depuis = Column(Date, nullable=False) # Premier jour analysé
+    jusqu_au = Column(Date, nullable=False, index=True) # Dernier jour analysé (inclus)
+    pointages = Column(Integer, nullable=False) # Pointages de la période analysés
+    anomalies = Column(Integer, nullable=False) # Anomalies enregistrées
+    # Début de l'exécution (UTC) : les pointages modifiés depuis n'ont pas forcément été lus (NULL : avant la colonne)
+    marque = Column(DateTime(timezone=True), nullable=True)
+    date_execution = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<AnalyseAnomalies(id={self.id}, depuis='{self.depuis}', jusqu_au='{self.jusqu_au}')>"
+
+class PointageSuppression(Base):
+    """
+    Jours dont un pointage a été supprimé depuis la dernière détection d'anomalies : la suivante les
+    réanalyse, comme ceux d'un pointage modifié (les anomalies des pointages voisins, badge_double ou
+    ecart_inhabituel, ont pu être calculées avec lui). Une ligne par employé et par jour, purgée une
+    fois prise en compte (voir anomalie_service.run_detection).
+    """
+    __tablename__ = "pointages_suppressions"
+
+    employe_id = Column(Integer, ForeignKey("employes.id", ondelete="CASCADE"), primary_key=True)
+    jour = Column(Date, primary_key=True) # Date locale du pointage supprimé
+    date_suppression = Column(DateTime(timezone=True), nullable=False, index=True) # Dernière suppression ce jour (UTC)
+
+    def __repr__(self):
+        return f"<PointageSuppression(employe_id={self.employe_id}, jour='{self.jour}')>"
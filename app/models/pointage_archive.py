@@ -0,0 +1,33 @@
+# app/models/pointage_archive.py
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Date, Boolean, Index, false
+
+from .base import Base
+from .employe import Employe # Importation pour ForeignKey
+
+class PointageArchive(Base):
+    """
+    Pointages historiques (fermés, antérieurs à l'horizon d'archivage) déplacés hors de la table
+    'pointages' par le job d'archivage (voir crud_pointage_archive.archive_pointages).
+    Mêmes colonnes et mêmes IDs que dans 'pointages' ; les lectures de crud_pointage couvrent les
+    deux tables de façon transparente. Les lignes archivées ne sont plus modifiables.
+    """
+    __tablename__ = "pointages_archive"
+    __table_args__ = (
+        Index("ix_pointages_archive_employe_date", "employe_id", "date_pointage"),
+        Index("ix_pointages_archive_employe_jour_local", "employe_id", "jour_local"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=False) # ID d'origine dans 'pointages'
+    date_pointage = Column(Date, nullable=False, index=True)
+    jour_local = Column(Date, nullable=True) # Date locale de l'arrivée (voir Pointage.jour_local)
+    heure_arrivee = Column(DateTime(timezone=True), nullable=False)
+    heure_depart = Column(DateTime(timezone=True), nullable=True)
+    seq = Column(Integer, nullable=False, default=1)
+    cloture_automatique = Column(Boolean, nullable=False, default=False, server_default=false())
+    date_modification = Column(DateTime(timezone=True), nullable=True) # Dernière écriture avant l'archivage
+
+    # Suppression d'un employé : ses pointages archivés sont supprimés par la base (ON DELETE CASCADE)
+    employe_id = Column(Integer, ForeignKey("employes.id", ondelete="CASCADE"), nullable=False)
+
+    def __repr__(self):
+        return f"<PointageArchive(id={self.id}, employe_id={self.employe_id}, date='{self.date_pointage}')>"
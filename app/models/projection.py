@@ -0,0 +1,35 @@
+# app/models/projection.py
+from sqlalchemy import Column, Integer, Float, JSON, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+
+from .base import Base
+from .employe import Employe # Importation pour ForeignKey
+
+class Projection(Base):
+    """
+    Projection pré-calculée (scénario standard) de la performance d'un employé sur un horizon donné.
+    Rafraîchie en tâche de fond par app/services/projection_service.py ; une ligne par (employé, horizon).
+    """
+    __tablename__ = "projections"
+
+    employe_id = Column(Integer, ForeignKey("employes.id", ondelete="CASCADE"), primary_key=True)
+    horizon_mois = Column(Integer, primary_key=True)
+
+    # Source de la condition initiale (pour le rafraîchissement incrémental)
+    evaluation_id = Column(Integer, nullable=True) # Dernière évaluation notée utilisée (NULL = performance par défaut)
+    performance_initiale = Column(Float, nullable=False)
+    # Paramètres de calibration utilisés (NULL = taux par défaut) : toute recalibration ou purge de la
+    # calibration les rend différents de ceux de employe_calibrations, quelle que soit l'heure du calcul
+    base_growth = Column(Float, nullable=True)
+    base_decay = Column(Float, nullable=True)
+
+    # Série mensuelle prédite [P(0), P(1), ..., P(horizon)], arrondie à 0.1
+    performance_predite = Column(JSON, nullable=False)
+    date_calcul = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    # Relation Many-to-One
+    employe = relationship("Employe", back_populates="projections")
+
+    def __repr__(self):
+        return f"<Projection(employe_id={self.employe_id}, horizon_mois={self.horizon_mois}, date_calcul='{self.date_calcul}')>"
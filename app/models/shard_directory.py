@@ -0,0 +1,21 @@
+# app/models/shard_directory.py
+from sqlalchemy import Column, String, DateTime
+
+from .base import Base
+
+class ShardDirectory(Base):
+    """
+    Annuaire du sharding (base principale uniquement, voir app/db/sharding.py) : shard où se trouve
+    chaque département et chaque employé. Écrit à la création et par le rééquilibrage
+    (app/scripts/rebalance_shards.py).
+
+    Clés utilisées : "departements:<id>", "employes:<id>".
+    """
+    __tablename__ = "shard_directory"
+
+    cle = Column(String(100), primary_key=True)
+    shard = Column(String(50), nullable=False) # Identifiant du shard (rang dans DATABASE_SHARD_URLS)
+    date_modification = Column(DateTime(timezone=True), nullable=False) # UTC
+
+    def __repr__(self):
+        return f"<ShardDirectory(cle='{self.cle}', shard='{self.shard}')>"
@@ -0,0 +1,18 @@
+# app/models/shard_sequence.py
+from sqlalchemy import Column, BigInteger, String
+
+from .base import Base
+
+class ShardSequence(Base):
+    """
+    Compteurs d'identifiants partagés par les shards (base principale uniquement) : les ids des
+    tables shardées sont alloués ici par blocs, pour rester uniques sur l'ensemble des shards
+    (voir ShardRouter.allocate_id dans app/db/sharding.py).
+    """
+    __tablename__ = "shard_sequences"
+
+    nom = Column(String(100), primary_key=True) # Nom de la table
+    prochain_id = Column(BigInteger, nullable=False) # Premier id non encore réservé
+
+    def __repr__(self):
+        return f"<ShardSequence(nom='{self.nom}', prochain_id={self.prochain_id})>"
@@ -13,7 +13,7 @@ class Simulation(Base):
     date_simulation = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True) # Quand la simulation a été lancée
 
     # Clé étrangère vers l'employé concerné par la simulation
-    employe_id = Column(Integer, ForeignKey("employes.id"), nullable=False, index=True)
+    employe_id = Column(Integer, ForeignKey("employes.id", ondelete="CASCADE"), nullable=False, index=True)
 
     # Paramètres utilisés pour lancer la simulation (sous forme de JSON)
     parametres_entree = Column(JSON, nullable=True)
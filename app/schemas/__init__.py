@@ -2,10 +2,21 @@
 
 # Importer les classes spécifiques depuis chaque fichier de schéma
 from .employe import Employe, EmployeCreate, EmployeUpdate, EmployeBase
-from .departement import Departement, DepartementCreate, DepartementUpdate, DepartementBase
-from .evaluation import Evaluation, EvaluationCreate, EvaluationUpdate, EvaluationBase
-from .simulation import Simulation, SimulationParams, SimulationRun, SimulationBase
-from .pointage import Pointage, PointageCreate, PointageUpdate
+from .departement import (
+    Departement, DepartementCreate, DepartementUpdate, DepartementBase, ProjectionEmploye,
+    DepartementReassign, DepartementReassignResult
+)
+from .evaluation import Evaluation, EvaluationCreate, EvaluationUpdate, EvaluationBase, EvaluationTimeseries
+from .simulation import (
+    Simulation, SimulationParams, SimulationRun, SimulationBase,
+    SimulationCompare, SimulationComparison, SimulationComparisonScenario, SimulationSegment
+)
+from .pointage import (
+    Pointage, PointageCreate, PointageUpdate, PointageBadge, PointageBadgeResult, PresenceJour,
+    PointageAnomalie, TypeAnomalie
+)
+from .change_event import ChangeEvent
+from .horaire import HoraireJour, Horaire, JourFerie, PonctualiteEmploye, PonctualiteJour
 # Ajoutez ici les imports pour les futurs schémas (Pointage, Evaluation, Simulation)
 # quand vous les créerez. Par exemple :
 # from .pointage import Pointage, PointageCreate, PointageBase
@@ -26,18 +37,39 @@ __all__ = [
     "DepartementCreate",
     "DepartementUpdate",
     "DepartementBase",
+    "ProjectionEmploye",
+    "DepartementReassign",
+    "DepartementReassignResult",
     # Evaluation schemas
     "Evaluation",
     "EvaluationCreate",
     "EvaluationUpdate",
     "EvaluationBase",
+    "EvaluationTimeseries",
     # Simualation schemas
     "Simulation",
     "SimulationParams",
     "SimulationRun",
     "SimulationBase",
+    "SimulationCompare",
+    "SimulationComparison",
+    "SimulationComparisonScenario",
+    "SimulationSegment",
     # Departement schemas
     "Pointage",
     "PointageCreate",
     "PointageUpdate",
+    "PointageBadge",
+    "PointageBadgeResult",
+    "PresenceJour",
+    "PointageAnomalie",
+    "TypeAnomalie",
+    # Journal des modifications
+    "ChangeEvent",
+    # Horaires, jours fériés et ponctualité
+    "HoraireJour",
+    "Horaire",
+    "JourFerie",
+    "PonctualiteEmploye",
+    "PonctualiteJour",
 ]
\ No newline at end of file
@@ -0,0 +1,16 @@
+# app/schemas/change_event.py
+from pydantic import BaseModel, ConfigDict
+from typing import Any, Dict, Literal, Optional
+
+from app.core.timezones import UtcDateTime
+
+# Événement du journal des modifications (GET /events)
+class ChangeEvent(BaseModel):
+    id: int # Curseur : repasser le dernier id reçu dans 'since' (ou Last-Event-ID en SSE)
+    date_creation: UtcDateTime
+    ressource: Literal["employes", "pointages", "evaluations"]
+    ressource_id: int
+    operation: Literal["create", "update", "delete"]
+    donnees: Optional[Dict[str, Any]] = None # Ligne complète après l'écriture ; None pour une suppression
+
+    model_config = ConfigDict(from_attributes=True)
@@ -1,10 +1,15 @@
 # app/schemas/departement.py
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, field_validator
 from typing import Optional, List
 
+from app.core.timezones import UtcDateTime, check_timezone
+
 # Schéma de base (pour la création et la mise à jour simple)
 class DepartementBase(BaseModel):
     nom: str
+    fuseau_horaire: Optional[str] = None # Fuseau IANA du site (ex: "Europe/Paris") ; None = fuseau par défaut
+
+    _check_fuseau = field_validator('fuseau_horaire')(check_timezone)
 
 # Schéma pour la création (hérite de Base)
 class DepartementCreate(DepartementBase):
@@ -13,6 +18,9 @@ class DepartementCreate(DepartementBase):
 # Schéma pour la mise à jour (nom optionnel)
 class DepartementUpdate(BaseModel):
     nom: Optional[str] = None
+    fuseau_horaire: Optional[str] = None
+
+    _check_fuseau = field_validator('fuseau_horaire')(check_timezone)
 
     model_config = ConfigDict(extra='ignore')
 
@@ -23,6 +31,25 @@ class Departement(DepartementBase):
     # Permet de créer le schéma depuis un objet ORM
     model_config = ConfigDict(from_attributes=True)
 
+# Réaffectation de tous les employés d'un département
+class DepartementReassign(BaseModel):
+    departement_cible_id: Optional[int] = None # None = employés sans département
+
+class DepartementReassignResult(BaseModel):
+    departement_id: int
+    departement_cible_id: Optional[int] = None
+    employes_deplaces: int
+
+# Projection pré-calculée (scénario standard) d'un employé du département
+class ProjectionEmploye(BaseModel):
+    employe_id: int
+    horizon_mois: int
+    performance_initiale: float
+    performance_predite: List[float] # Série mensuelle [P(0), ..., P(horizon)]
+    date_calcul: UtcDateTime
+
+    model_config = ConfigDict(from_attributes=True)
+
 # Optionnel : Schéma pour lire un département avec la liste de ses employés
 # from .employe import Employe # Attention aux imports circulaires potentiels
 
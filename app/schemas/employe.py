@@ -1,8 +1,10 @@
 # app/schemas/employe.py
-from pydantic import BaseModel, EmailStr, ConfigDict
+from pydantic import BaseModel, EmailStr, ConfigDict, field_validator
 from typing import Optional
 from datetime import date
 
+from app.core.timezones import check_timezone
+
 # Propriétés partagées (communes à la lecture et création/update)
 class EmployeBase(BaseModel):
     nom: str
@@ -12,6 +14,9 @@ class EmployeBase(BaseModel):
     position: Optional[str] = None
     departement_id: Optional[int] = None
     is_active: Optional[bool] = True
+    fuseau_horaire: Optional[str] = None # Fuseau IANA (ex: "America/Montreal") ; None = celui du département
+
+    _check_fuseau = field_validator('fuseau_horaire')(check_timezone)
 
 # Propriétés requises pour la création d'un employé
 class EmployeCreate(EmployeBase):
@@ -29,6 +34,9 @@ class EmployeUpdate(BaseModel):
     position: Optional[str] = None
     departement_id: Optional[int] = None
     is_active: Optional[bool] = None
+    fuseau_horaire: Optional[str] = None
+
+    _check_fuseau = field_validator('fuseau_horaire')(check_timezone)
 
     # Permet d'accepter des champs supplémentaires sans erreur,
     # mais ils ne seront pas utilisés si non définis ci-dessus
@@ -1,6 +1,6 @@
 # app/schemas/evaluation.py
 from pydantic import BaseModel, ConfigDict, Field
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Literal
 from datetime import date
 
 class EvaluationBase(BaseModel):
@@ -32,4 +32,16 @@ class Evaluation(EvaluationBase):
     # Remplacer date_evaluation optionnelle de Base par une requise ici
     date_evaluation: date
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+# Série temporelle des scores (GET /evaluations/timeseries), en colonnes : une valeur par période
+# dans chaque liste, aux mêmes positions que 'periodes' ; agrégations non demandées absentes
+class EvaluationTimeseries(BaseModel):
+    bucket: Literal["month", "quarter", "year"]
+    employe_id: Optional[int] = None
+    departement_id: Optional[int] = None # Ni employé ni département : toute l'entreprise
+    periodes: List[date] # Premier jour de chaque période ayant au moins une évaluation notée
+    mean: Optional[List[float]] = None
+    min: Optional[List[float]] = None
+    max: Optional[List[float]] = None
+    count: Optional[List[int]] = None
@@ -0,0 +1,63 @@
+# app/schemas/horaire.py
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+from typing import List, Optional
+from datetime import date, time
+
+# Un jour travaillé d'un horaire hebdomadaire
+class HoraireJour(BaseModel):
+    jour_semaine: int = Field(..., ge=0, le=6) # 0 = lundi ... 6 = dimanche
+    heure_debut: time
+    heure_fin: time
+    pause_minutes: int = Field(default=0, ge=0)
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @model_validator(mode='after')
+    def check_heures(self):
+        if self.heure_fin <= self.heure_debut:
+            raise ValueError("heure_fin doit être postérieure à heure_debut")
+        duree = (self.heure_fin.hour * 60 + self.heure_fin.minute) - (self.heure_debut.hour * 60 + self.heure_debut.minute)
+        if self.pause_minutes >= duree:
+            raise ValueError("La pause doit être plus courte que la journée prévue")
+        return self
+
+# Horaire hebdomadaire complet (remplace l'horaire existant) ; les jours absents ne sont pas travaillés
+class Horaire(BaseModel):
+    jours: List[HoraireJour]
+
+    @model_validator(mode='after')
+    def check_jours(self):
+        jours = [jour.jour_semaine for jour in self.jours]
+        if len(jours) != len(set(jours)):
+            raise ValueError("Chaque jour de la semaine ne peut apparaître qu'une fois")
+        return self
+
+class JourFerie(BaseModel):
+    jour: date
+    libelle: str = Field(..., min_length=1, max_length=100)
+
+    model_config = ConfigDict(from_attributes=True)
+
+# Écarts à l'horaire d'un employé sur une période (GET /horaires/departements/{id}/ponctualite)
+class PonctualiteEmploye(BaseModel):
+    employe_id: int
+    jours_prevus: int # Jours travaillés selon l'horaire (hors jours fériés)
+    jours_presents: int # Jours prévus avec au moins un pointage
+    absences: int # Jours prévus sans pointage
+    retards: int # Jours prévus avec une arrivée au-delà de la tolérance
+    retard_minutes: float # Somme des retards (première arrivée - heure prévue)
+    travail_minutes: float # Temps pointé (pointages fermés)
+    prevu_minutes: float # Temps prévu par l'horaire (pauses déduites)
+    heures_sup_minutes: float # Dépassements journaliers + travail hors jours prévus
+
+# Détail journalier d'un employé (GET /horaires/employes/{id}/ponctualite)
+class PonctualiteJour(BaseModel):
+    jour: date
+    prevu: bool
+    heure_debut_prevue: Optional[time] = None
+    premiere_arrivee: Optional[time] = None
+    retard_minutes: float
+    travail_minutes: float
+    prevu_minutes: float
+    heures_sup_minutes: float
+    absent: bool
@@ -1,12 +1,14 @@
 # app/schemas/pointage.py
-from pydantic import BaseModel, ConfigDict, field_validator
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing import Optional, Literal
 from datetime import date, datetime
 
+from app.core.timezones import UtcDateTime
+
 class PointageBase(BaseModel):
     date_pointage: date
-    heure_arrivee: datetime # Supposant que le modèle utilise timezone=True
-    heure_depart: Optional[datetime] = None
+    heure_arrivee: UtcDateTime # UTC (sans fuseau = UTC), voir app/core/timezones.py
+    heure_depart: Optional[UtcDateTime] = None
     employe_id: int
 
     @field_validator('heure_depart')
@@ -31,4 +33,40 @@ class PointageUpdate(BaseModel):
 
 class Pointage(PointageBase):
     id: int
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    jour_local: Optional[date] = None # Date locale de l'arrivée (fuseau de l'employé), calculée par le serveur
+    seq: int = 1 # N° du pointage dans la journée de l'employé
+    cloture_automatique: bool = False # Départ fixé par la clôture automatique des pointages oubliés
+    model_config = ConfigDict(from_attributes=True)
+
+# Badgeage envoyé par un lecteur de badge (POST /pointages/badge)
+class PointageBadge(BaseModel):
+    employe_id: int
+    horodatage: datetime # Heure du passage
+    direction: Literal["entree", "sortie"]
+    idempotency_key: str = Field(..., min_length=1, max_length=100) # Unique par badgeage, réutilisée en cas de renvoi
+
+# Résultat d'un badgeage
+class PointageBadgeResult(BaseModel):
+    pointage: Pointage
+    action: Literal["ouverture", "fermeture", "deja_ouvert"]
+    rejeu: bool # True si la clé d'idempotence avait déjà été traitée
+
+# Présences d'une date locale (GET /pointages/presences)
+class PresenceJour(BaseModel):
+    jour: date
+    employes_presents: int # Employés distincts ayant pointé ce jour-là
+    pointages: int
+
+TypeAnomalie = Literal["duree_invraisemblable", "badge_double", "arrivee_inhabituelle", "duree_inhabituelle", "ecart_inhabituel"]
+
+# Anomalie détectée par app/scripts/detect_anomalies.py (GET /pointages/anomalies)
+class PointageAnomalie(BaseModel):
+    employe_id: int
+    pointage_id: int
+    type: TypeAnomalie
+    jour: date # Date locale du pointage
+    valeur: float # Minutes : heure locale d'arrivée, durée ou écart avec le pointage précédent
+    moyenne: Optional[float] = None # Moyenne de l'historique récent de l'employé (anomalies statistiques)
+    z_score: Optional[float] = None
+    date_detection: UtcDateTime
+    model_config = ConfigDict(from_attributes=True)
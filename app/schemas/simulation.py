@@ -1,7 +1,22 @@
 # app/schemas/simulation.py
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 from typing import Optional, Dict, Any, List
-from datetime import datetime
+
+from app.core.timezones import UtcDateTime
+
+# Segment d'un planning de scénarios : un scénario appliqué sur l'intervalle [debut_mois, fin_mois]
+class SimulationSegment(BaseModel):
+    debut_mois: int = Field(..., ge=0)
+    fin_mois: int = Field(..., gt=0)
+    scenario: str = "standard" # Mêmes scénarios que SimulationParams.scenario
+    facteur_stress: Optional[float] = None
+    impact_formation: Optional[float] = None
+
+    @model_validator(mode='after')
+    def check_interval(self):
+        if self.fin_mois <= self.debut_mois:
+            raise ValueError("fin_mois doit être strictement supérieur à debut_mois")
+        return self
 
 # Schéma pour les paramètres d'entrée de la simulation (ce que l'utilisateur fournit)
 class SimulationParams(BaseModel):
@@ -10,10 +25,25 @@ class SimulationParams(BaseModel):
     # Ajoutez d'autres paramètres spécifiques que votre modèle Runge-Kutta pourrait utiliser
     facteur_stress: Optional[float] = None
     impact_formation: Optional[float] = None
+    # Planning optionnel (ex: formation sur les mois 0-2 puis charge accrue sur les mois 3-8).
+    # S'il est fourni, il remplace 'scenario' ; les mois non couverts suivent le scénario standard.
+    planning: Optional[List[SimulationSegment]] = None
     # ... autres paramètres ...
 
     model_config = ConfigDict(extra='allow') # Permet des paramètres non définis explicitement
 
+    @model_validator(mode='after')
+    def check_planning(self):
+        if self.planning:
+            segments = sorted(self.planning, key=lambda seg: seg.debut_mois)
+            for previous, current in zip(segments, segments[1:]):
+                if current.debut_mois < previous.fin_mois:
+                    raise ValueError("Les segments du planning ne doivent pas se chevaucher")
+            if segments[-1].fin_mois > self.duree_mois:
+                raise ValueError("Le planning ne peut pas dépasser duree_mois")
+            self.planning = segments
+        return self
+
 # Schéma pour lancer une simulation (via l'API)
 class SimulationRun(BaseModel):
     employe_id: int
@@ -22,7 +52,7 @@ class SimulationRun(BaseModel):
 # Schéma de base pour représenter une simulation enregistrée en BDD
 class SimulationBase(BaseModel):
     employe_id: int
-    date_simulation: datetime
+    date_simulation: UtcDateTime
     parametres_entree: Optional[Dict[str, Any]] = None # Stockage des paramètres utilisés
     resultats_simulation: Optional[Dict[str, Any]] = None # Stockage des résultats (ex: {'temps': [], 'performance': []})
 
@@ -33,4 +63,24 @@ class SimulationBase(BaseModel):
 class Simulation(SimulationBase):
     id: int
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+# Schéma pour comparer plusieurs scénarios pour un même employé (via l'API)
+class SimulationCompare(BaseModel):
+    employe_id: int
+    scenarios: List[SimulationParams] = Field(..., min_length=1, max_length=20) # Le premier sert de référence
+
+# Résultat d'un scénario dans une comparaison
+class SimulationComparisonScenario(BaseModel):
+    simulation_id: int # ID de l'enregistrement créé pour ce scénario
+    parametres: SimulationParams
+    performance_predite: List[Optional[float]] # Série alignée sur temps_relatif_mois (None au-delà de l'horizon du scénario)
+    delta_final: float # Performance finale - performance initiale
+    delta_vs_reference: List[Optional[float]] # Écart point par point avec le premier scénario
+
+# Réponse de la comparaison de scénarios
+class SimulationComparison(BaseModel):
+    employe_id: int
+    performance_initiale: float
+    temps_relatif_mois: List[float] # Axe de temps commun (horizon le plus long)
+    scenarios: List[SimulationComparisonScenario]
\ No newline at end of file
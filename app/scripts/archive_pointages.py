@@ -0,0 +1,39 @@
+# app/scripts/archive_pointages.py
+"""
+Archivage des pointages historiques : déplace les pointages fermés plus anciens que l'horizon
+configuré de 'pointages' vers 'pointages_archive', par lots.
+
+Usage:
+    python -m app.scripts.archive_pointages [--after-days 365] [--batch-size 5000]
+"""
+import argparse
+import sys
+from datetime import date, timedelta
+
+from app import crud
+from app.core.config import settings
+from app.db.session import data_sessionmakers
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Archive les pointages fermés datant de plus de N jours.")
+    parser.add_argument("--after-days", type=int, default=settings.POINTAGE_ARCHIVE_AFTER_DAYS,
+                        help="Archiver les pointages datant de plus de N jours")
+    parser.add_argument("--batch-size", type=int, default=settings.POINTAGE_ARCHIVE_BATCH_SIZE,
+                        help="Nombre de pointages déplacés par transaction")
+    args = parser.parse_args(argv)
+
+    avant = date.today() - timedelta(days=args.after_days)
+    for DataSession in data_sessionmakers(): # Chaque shard en mode shardé
+        db = DataSession()
+        try:
+            count = crud.pointage_archive.archive_pointages(
+                db, avant=avant, batch_size=args.batch_size,
+                on_batch=lambda total: print(f"{total} pointage(s) archivé(s)...")
+            )
+            print(f"{count} pointage(s) antérieur(s) au {avant} archivé(s) ; archive jusqu'au {crud.get_archived_until(db)}.")
+        finally:
+            db.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
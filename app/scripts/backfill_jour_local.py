@@ -0,0 +1,48 @@
+# app/scripts/backfill_jour_local.py
+"""
+Calcul de la date locale (jour_local) des pointages, archive comprise, par lots : pointages créés
+avant la colonne, ou à recalculer après un changement de fuseau horaire d'un employé ou d'un
+département. Les pointages créés avant la colonne (heure locale sans fuseau) sont en même temps
+convertis en UTC, une seule fois. Relançable sans risque après une interruption.
+
+Usage:
+    python -m app.scripts.backfill_jour_local [--batch-size 5000] [--recompute]
+        [--employe-id ID ...] [--departement-id ID]
+"""
+import argparse
+import sys
+
+from sqlalchemy import select
+
+from app import crud, models
+from app.db.session import data_sessionmakers
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Calcule jour_local des pointages qui n'en ont pas.")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Nombre de pointages mis à jour par transaction")
+    parser.add_argument("--recompute", action="store_true",
+                        help="Recalculer aussi les pointages déjà datés (changement de fuseau)")
+    parser.add_argument("--employe-id", type=int, action="append", dest="employe_ids",
+                        help="Restreindre à un employé (option répétable)")
+    parser.add_argument("--departement-id", type=int, help="Restreindre aux employés d'un département")
+    args = parser.parse_args(argv)
+
+    for DataSession in data_sessionmakers(): # Chaque shard en mode shardé
+        db = DataSession()
+        try:
+            employe_ids = args.employe_ids
+            if args.departement_id is not None:
+                employe_ids = (employe_ids or []) + list(db.scalars(
+                    select(models.Employe.id).where(models.Employe.departement_id == args.departement_id)
+                ))
+            count = crud.pointage.fill_local_days(
+                db, recompute=args.recompute, employe_ids=employe_ids, batch_size=args.batch_size,
+                on_batch=lambda total: print(f"{total} pointage(s) daté(s)...")
+            )
+            print(f"{count} pointage(s) daté(s).")
+        finally:
+            db.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+# app/scripts/calibrate.py
+"""
+Calibration nocturne des taux du modèle de performance sur l'historique d'évaluations.
+
+Usage:
+    python -m app.scripts.calibrate [--workers 8] [--chunk-size 10000] [--regularisation 1.0] [--min-evaluations 3]
+"""
+import argparse
+import sys
+import time
+
+from app.db.session import data_sessionmakers
+from app.services import calibration_service
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Calibre base_growth/base_decay pour chaque employé.")
+    parser.add_argument("--workers", type=int, default=None, help="Nombre de processus (défaut: nombre de CPU)")
+    parser.add_argument("--chunk-size", type=int, default=calibration_service.DEFAULT_CHUNK_SIZE, help="Employés par lot")
+    parser.add_argument("--regularisation", type=float, default=calibration_service.DEFAULT_REGULARISATION)
+    parser.add_argument("--min-evaluations", type=int, default=calibration_service.DEFAULT_MIN_EVALUATIONS)
+    args = parser.parse_args(argv)
+
+    for DataSession in data_sessionmakers(): # Chaque shard en mode shardé
+        db = DataSession()
+        try:
+            debut = time.perf_counter()
+            stats = calibration_service.run_calibration(
+                db,
+                workers=args.workers,
+                chunk_size=args.chunk_size,
+                regularisation=args.regularisation,
+                min_evaluations=args.min_evaluations
+            )
+            print(
+                f"Calibration terminée en {time.perf_counter() - debut:.1f}s: "
+                f"{stats['calibres']} employé(s) calibré(s) sur {stats['employes']}, "
+                f"{stats['supprimes']} calibration(s) obsolète(s) supprimée(s)."
+            )
+        finally:
+            db.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+# app/scripts/close_open_pointages.py
+"""
+Clôture automatique des pointages restés ouverts (départs oubliés)
+et purge des clés d'idempotence de badgeage et des événements du journal des modifications expirés.
+
+Usage:
+    python -m app.scripts.close_open_pointages [--after-days 1] [--shift-hours 8] [--badge-ttl-hours 72] [--events-ttl-days 30]
+"""
+import argparse
+import sys
+from datetime import date, datetime, timedelta, timezone
+
+from app import crud
+from app.core.config import settings
+from app.db.session import SessionLocal, data_sessionmakers
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Clôture les pointages ouverts depuis plus de N jours.")
+    parser.add_argument("--after-days", type=int, default=settings.POINTAGE_AUTO_CLOSE_AFTER_DAYS,
+                        help="Clôturer les pointages datant d'au moins N jours")
+    parser.add_argument("--shift-hours", type=float, default=settings.POINTAGE_AUTO_CLOSE_SHIFT_HOURS,
+                        help="Durée de poste appliquée à partir de l'heure d'arrivée")
+    parser.add_argument("--badge-ttl-hours", type=int, default=settings.BADGE_IDEMPOTENCY_TTL_HOURS,
+                        help="Conservation des clés d'idempotence de badgeage")
+    parser.add_argument("--events-ttl-days", type=int, default=settings.EVENTS_RETENTION_DAYS,
+                        help="Conservation des événements du journal des modifications (GET /events)")
+    args = parser.parse_args(argv)
+
+    avant = date.today() - timedelta(days=args.after_days - 1) # after_days=1 : tout ce qui précède aujourd'hui
+    count = 0
+    for DataSession in data_sessionmakers(): # Chaque shard en mode shardé
+        db = DataSession()
+        try:
+            count += crud.pointage.close_stale_open_pointages(db, avant=avant, duree=timedelta(hours=args.shift_hours))
+        finally:
+            db.close()
+    print(f"{count} pointage(s) ouvert(s) antérieur(s) au {avant} clôturé(s) automatiquement.")
+
+    db = SessionLocal() # Journaux des badgeages et des modifications : base principale
+    try:
+        # date_reception est renseignée par la BDD (CURRENT_TIMESTAMP, en UTC)
+        expiration = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=args.badge_ttl_hours)
+        purges = crud.pointage.purge_badge_events(db, avant=expiration)
+        print(f"{purges} clé(s) d'idempotence de badgeage purgée(s).")
+        purges = crud.change_event.purge_events(db, avant=datetime.now(timezone.utc) - timedelta(days=args.events_ttl_days))
+        print(f"{purges} événement(s) du journal des modifications purgé(s).")
+        return 0
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+# app/scripts/detect_anomalies.py
+"""
+Détection des anomalies de pointage (durées invraisemblables, badgeages en double, arrivées, durées
+et écarts inhabituels), incrémentale : analyse les jours écoulés depuis l'exécution précédente, et
+réanalyse les jours dont des pointages ont été créés ou modifiés depuis.
+
+Usage:
+    python -m app.scripts.detect_anomalies [--workers 8] [--chunk-size 2000] [--depuis 2025-01-01] [--jusqu-au 2025-01-31]
+"""
+import argparse
+import sys
+import time
+from datetime import date, timedelta
+
+from app.db.session import data_sessionmakers
+from app.services import anomalie_service
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Détecte les anomalies des pointages depuis la dernière exécution.")
+    parser.add_argument("--workers", type=int, default=None, help="Nombre de processus (défaut: nombre de CPU)")
+    parser.add_argument("--chunk-size", type=int, default=anomalie_service.DEFAULT_CHUNK_SIZE, help="Employés par lot")
+    parser.add_argument("--depuis", type=date.fromisoformat, default=None,
+                        help="Premier jour analysé (défaut: lendemain de la dernière exécution) ; réanalyse une période")
+    parser.add_argument("--jusqu-au", type=date.fromisoformat, default=None, help="Dernier jour analysé (défaut: hier)")
+    args = parser.parse_args(argv)
+
+    for DataSession in data_sessionmakers(): # Chaque shard en mode shardé
+        db = DataSession()
+        try:
+            debut = time.perf_counter()
+            stats = anomalie_service.run_detection(
+                db, depuis=args.depuis, jusqu_au=args.jusqu_au, workers=args.workers, chunk_size=args.chunk_size
+            )
+            if stats["depuis"] > stats["jusqu_au"]:
+                print(f"Rien à analyser : pointages déjà analysés jusqu'au {stats['depuis'] - timedelta(days=1)}.")
+                continue
+            print(
+                f"Analyse du {stats['depuis']} au {stats['jusqu_au']} terminée en {time.perf_counter() - debut:.1f}s: "
+                f"{stats['anomalies']} anomalie(s) sur {stats['pointages']} pointage(s) de {stats['employes']} employé(s)."
+            )
+        finally:
+            db.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
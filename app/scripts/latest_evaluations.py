@@ -0,0 +1,40 @@
+# app/scripts/latest_evaluations.py
+"""
+Vérification / reconstruction de la table matérialisée 'employe_latest_evaluation'.
+
+Usage:
+    python -m app.scripts.latest_evaluations check    # Liste les employés incohérents (code retour 1 si incohérence)
+    python -m app.scripts.latest_evaluations rebuild  # Reconstruit toute la table en une transaction
+"""
+import argparse
+import sys
+
+from app import crud
+from app.db.session import data_sessionmakers
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Cohérence de la table 'employe_latest_evaluation'.")
+    parser.add_argument("action", choices=["check", "rebuild"], help="check: vérifier, rebuild: reconstruire")
+    args = parser.parse_args(argv)
+
+    code_retour = 0
+    for DataSession in data_sessionmakers(): # Chaque shard en mode shardé
+        db = DataSession()
+        try:
+            if args.action == "rebuild":
+                count = crud.latest_evaluation.rebuild_latest_evaluations(db)
+                print(f"Table 'employe_latest_evaluation' reconstruite: {count} ligne(s).")
+                continue
+
+            incoherents = crud.latest_evaluation.check_latest_evaluations(db)
+            if incoherents:
+                print(f"{len(incoherents)} employé(s) incohérent(s): {incoherents}")
+                code_retour = 1
+            else:
+                print("Table 'employe_latest_evaluation' cohérente.")
+        finally:
+            db.close()
+    return code_retour
+
+if __name__ == "__main__":
+    sys.exit(main())
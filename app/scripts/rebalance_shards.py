@@ -0,0 +1,64 @@
+# app/scripts/rebalance_shards.py
+"""
+Administration du sharding par département (DATABASE_SHARD_URLS, voir app/db/sharding.py).
+
+Usage:
+    python -m app.scripts.rebalance_shards status                             # Lignes par shard
+    python -m app.scripts.rebalance_shards move --departement 12 --shard 1    # Déplacer un département
+    python -m app.scripts.rebalance_shards rebuild-directory                  # Reconstruire l'annuaire
+
+Chaque shard (et la base principale) se migre avec Alembic : DATABASE_URL=<url du shard> alembic upgrade head.
+Pour activer le sharding sur des données existantes, répartir les données puis lancer rebuild-directory.
+L'API garde l'annuaire en cache : un déplacement n'y est vu qu'après SHARD_DIRECTORY_CACHE_SECONDS
+(garder le département inactif jusque-là).
+"""
+import argparse
+import sys
+import time
+
+from app.db import sharding
+from app.db.session import ShardedSessionLocal
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Administration des shards (répartition des départements).")
+    actions = parser.add_subparsers(dest="action", required=True)
+    actions.add_parser("status", help="Nombre de départements, d'employés et de pointages par shard")
+    move = actions.add_parser("move", help="Déplacer un département (employés et historique compris) vers un shard")
+    move.add_argument("--departement", type=int, required=True, help="ID du département")
+    move.add_argument("--shard", required=True, help="Shard de destination (rang dans DATABASE_SHARD_URLS)")
+    move.add_argument("--batch-size", type=int, default=5000, help="Lignes copiées par instruction INSERT")
+    actions.add_parser("rebuild-directory", help="Reconstruire l'annuaire d'après le contenu des shards")
+    args = parser.parse_args(argv)
+
+    if ShardedSessionLocal is None:
+        print("Sharding non configuré (DATABASE_SHARD_URLS).")
+        return 1
+    router = sharding.router
+
+    if args.action == "status":
+        for shard_id, comptes in router.shard_counts().items():
+            print(f"shard {shard_id}: " + ", ".join(f"{nom}={n}" for nom, n in comptes.items()))
+        return 0
+
+    if args.action == "move":
+        debut = time.perf_counter()
+        try:
+            copies = router.move_departement(args.departement, args.shard, batch_size=args.batch_size)
+        except ValueError as e:
+            print(f"Erreur: {e}")
+            return 1
+        if not copies:
+            print(f"Le département {args.departement} est déjà sur le shard '{args.shard}'.")
+            return 0
+        print(
+            f"Département {args.departement} déplacé vers le shard '{args.shard}' en {time.perf_counter() - debut:.1f}s: "
+            + ", ".join(f"{nom}={n}" for nom, n in copies.items())
+        )
+        return 0
+
+    count = router.rebuild_directory()
+    print(f"Annuaire reconstruit: {count} entrée(s).")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+# app/scripts/refresh_projections.py
+"""
+Rafraîchissement des projections de performance pré-calculées.
+
+Usage:
+    python -m app.scripts.refresh_projections [--horizon 6] [--batch-size 5000] [--full]
+"""
+import argparse
+import sys
+import time
+
+from app.core.config import settings
+from app.db.session import data_sessionmakers
+from app.services import projection_service
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Rafraîchit les projections (scénario standard) des employés actifs.")
+    parser.add_argument("--horizon", type=int, default=settings.PROJECTION_HORIZON_MOIS, help="Horizon en mois")
+    parser.add_argument("--batch-size", type=int, default=settings.PROJECTION_BATCH_SIZE, help="Employés par lot vectorisé")
+    parser.add_argument("--full", action="store_true", help="Tout recalculer (pas seulement les employés modifiés)")
+    args = parser.parse_args(argv)
+
+    for DataSession in data_sessionmakers(): # Chaque shard en mode shardé
+        db = DataSession()
+        try:
+            debut = time.perf_counter()
+            stats = projection_service.refresh_projections(
+                db, horizon_mois=args.horizon, batch_size=args.batch_size, full=args.full
+            )
+            print(
+                f"Projections à {args.horizon} mois rafraîchies en {time.perf_counter() - debut:.1f}s: "
+                f"{stats['projetes']} écrite(s), {stats['supprimes']} supprimée(s)."
+            )
+        finally:
+            db.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+# app/scripts/sync_sqlite_replica.py
+"""
+Réplication simulée pour tester localement le routage des lectures avec deux fichiers SQLite :
+copie la base primaire (DATABASE_URL) vers chaque réplica SQLite de DATABASE_REPLICA_URLS
+(API de sauvegarde de sqlite3), une fois ou à intervalle régulier (retard de réplication simulé).
+Avec PostgreSQL, utiliser la réplication native (streaming) à la place.
+
+Usage:
+    DATABASE_URL=sqlite:///./app.db DATABASE_REPLICA_URLS=sqlite:///./replica.db \\
+        python -m app.scripts.sync_sqlite_replica [--interval 5]
+"""
+import argparse
+import sqlite3
+import sys
+import time
+
+from app.db.session import engine, replica_engines
+
+def sync_replicas() -> int:
+    """Copie le primaire vers chaque réplica SQLite ; renvoie le nombre de réplicas mis à jour."""
+    if engine.url.get_backend_name() != "sqlite":
+        raise ValueError("La base primaire n'est pas une base SQLite.")
+    replicas = [e for e in replica_engines if e.url.get_backend_name() == "sqlite"]
+    source = sqlite3.connect(engine.url.database)
+    try:
+        for replica in replicas:
+            destination = sqlite3.connect(replica.url.database)
+            try:
+                source.backup(destination)
+            finally:
+                destination.close()
+    finally:
+        source.close()
+    return len(replicas)
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Copie la base SQLite primaire vers les réplicas SQLite configurés.")
+    parser.add_argument("--interval", type=float, default=0,
+                        help="Recopier toutes les N secondes (0 = une seule copie)")
+    args = parser.parse_args(argv)
+
+    if not replica_engines:
+        print("Aucun réplica configuré (DATABASE_REPLICA_URLS).")
+        return 1
+    while True:
+        count = sync_replicas()
+        print(f"{time.strftime('%H:%M:%S')} : {count} réplica(s) synchronisé(s).")
+        if args.interval <= 0:
+            return 0
+        time.sleep(args.interval)
+
+if __name__ == "__main__":
+    sys.exit(main())
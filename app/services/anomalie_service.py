@@ -0,0 +1,284 @@
+# app/services/anomalie_service.py
+"""
+Détection d'anomalies de pointage, par lots (voir app/scripts/detect_anomalies.py).
+
+Les pointages sont lus par tranches d'employés (plages d'ids), chaque tranche étant analysée dans un
+pool de processus pendant que la suivante est chargée ; les anomalies sont écrites par le processus
+principal, une transaction par tranche. Pour chaque employé, pointages triés par heure d'arrivée :
+- duree_invraisemblable : durée hors de [ANOMALIE_DUREE_MIN_MINUTES, ANOMALIE_DUREE_MAX_HEURES] ;
+- badge_double : arrivée moins de ANOMALIE_DOUBLON_MINUTES après l'arrivée ou le départ du pointage
+  précédent (ou pendant celui-ci) ;
+- arrivee_inhabituelle, duree_inhabituelle, ecart_inhabituel : heure locale de la première arrivée du
+  jour, durée, ou temps écoulé depuis le départ précédent à plus de ANOMALIE_Z_SEUIL écarts types de la
+  moyenne des ANOMALIE_FENETRE pointages précédents (z-score glissant, calculé par sommes cumulées).
+
+Exécution incrémentale : chaque exécution analyse les jours suivant la précédente (table
+analyses_anomalies), en relisant ANOMALIE_HISTORIQUE_JOURS jours avant pour l'historique glissant.
+Elle reprend plus tôt si des pointages de jours déjà analysés ont été créés ou modifiés depuis le début
+de l'exécution précédente (Pointage.date_modification) : saisie ou correction tardive, départ d'un
+pointage encore ouvert à ce moment (poste de nuit, départ oublié clôturé ensuite). Une nouvelle
+analyse d'une période déjà analysée remplace ses anomalies.
+"""
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.core import timezones
+from app.core.config import settings
+from app.models.employe import Employe as EmployeModel
+from app.services.horaire_service import as_datetime64
+
+TYPES = ("duree_invraisemblable", "badge_double", "arrivee_inhabituelle", "duree_inhabituelle", "ecart_inhabituel")
+DEFAULT_CHUNK_SIZE = 2_000 # Employés par tâche du pool de processus
+# Marge sur le début de l'exécution précédente : écritures horodatées avant lui mais validées après
+# (transaction en cours, horloge du serveur de base de données)
+MARGE_MODIFICATIONS = timedelta(minutes=5)
+# Écart type minimal (minutes) : un employé très régulier n'est pas signalé pour quelques minutes d'écart
+ECART_TYPE_MIN_ARRIVEE = 10.0
+ECART_TYPE_MIN_DUREE = 15.0
+ECART_TYPE_MIN_ECART = 60.0
+
+def rolling_stats(debut_groupe: np.ndarray, valeurs: np.ndarray, fenetre: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Moyenne, écart type et effectif des valeurs des 'fenetre' lignes précédant chaque ligne dans son
+    groupe (lignes contiguës), la ligne elle-même exclue ; les valeurs NaN sont ignorées.
+
+    Args:
+        debut_groupe: Indice de la première ligne du groupe de chaque ligne.
+        valeurs: Valeurs (NaN = absente).
+        fenetre: Nombre de lignes précédentes prises en compte.
+
+    Returns:
+        Un tuple (moyenne, ecart_type, effectif) ; moyenne et écart type NaN si l'effectif est nul.
+    """
+    valides = ~np.isnan(valeurs)
+    x = np.where(valides, valeurs, 0.0)
+    n_cumul = np.concatenate(([0], np.cumsum(valides)))
+    s_cumul = np.concatenate(([0.0], np.cumsum(x)))
+    s2_cumul = np.concatenate(([0.0], np.cumsum(x * x)))
+    i = np.arange(len(valeurs))
+    debut = np.maximum(debut_groupe, i - fenetre)
+    effectif = n_cumul[i] - n_cumul[debut]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        moyenne = (s_cumul[i] - s_cumul[debut]) / effectif
+        variance = (s2_cumul[i] - s2_cumul[debut]) / effectif - moyenne * moyenne
+    return moyenne, np.sqrt(np.clip(variance, 0, None)), effectif
+
+def detect_anomalies(
+    pointage_ids: np.ndarray,
+    employe_ids: np.ndarray,
+    jours: np.ndarray,
+    arrivees: np.ndarray,
+    departs: np.ndarray,
+    decalages: np.ndarray,
+    premier_jour: int,
+    fenetre: int,
+    min_historique: int,
+    z_seuil: float,
+    duree_min: float,
+    duree_max: float,
+    doublon: float
+) -> Tuple[np.ndarray, ...]:
+    """
+    Anomalies des pointages d'un lot d'employés, en une passe vectorisée (exécutée dans le pool de processus).
+
+    Args:
+        pointage_ids, employe_ids: Pointages du lot, dans un ordre quelconque.
+        jours: Date locale de chaque pointage (jours depuis une origine, minuit UTC).
+        arrivees, departs: Heures d'arrivée et de départ (minutes UTC depuis la même origine ; départ NaN si ouvert).
+        decalages: Décalage de l'heure locale par rapport à UTC (minutes) de chaque pointage.
+        premier_jour: Premier jour analysé ; les pointages antérieurs ne servent que d'historique.
+        fenetre, min_historique, z_seuil: Historique glissant (pointages) et seuil de signalement.
+        duree_min, duree_max, doublon: Seuils des durées invraisemblables et des badgeages en double (minutes).
+
+    Returns:
+        Un tuple de tableaux (type (indice dans TYPES), pointage_id, employe_id, jour, valeur, moyenne, z_score),
+        une entrée par anomalie ; moyenne et z_score NaN pour les anomalies non statistiques.
+    """
+    ordre = np.lexsort((arrivees, employe_ids))
+    pointage_ids, employe_ids, jours = pointage_ids[ordre], employe_ids[ordre], jours[ordre]
+    arrivees, departs, decalages = arrivees[ordre], departs[ordre], decalages[ordre]
+    n = len(ordre)
+
+    meme_employe = np.zeros(n, dtype=bool)
+    meme_employe[1:] = employe_ids[1:] == employe_ids[:-1]
+    debut_groupe = np.maximum.accumulate(np.where(meme_employe, 0, np.arange(n)))
+    precedente_arrivee = np.where(meme_employe, np.roll(arrivees, 1), np.nan)
+    precedent_depart = np.where(meme_employe, np.roll(departs, 1), np.nan)
+
+    duree = departs - arrivees
+    ecart = arrivees - precedent_depart # Temps écoulé depuis le départ précédent
+    premier_du_jour = ~(meme_employe & (np.roll(jours, 1) == jours))
+    arrivee = np.where(premier_du_jour, arrivees + decalages - jours * 1440.0, np.nan) # Heure locale (minutes)
+    with np.errstate(invalid='ignore'):
+        rearrivee = arrivees - precedente_arrivee < doublon
+        double = meme_employe & (rearrivee | (ecart < doublon))
+    ecart_double = np.where(rearrivee, arrivees - precedente_arrivee, ecart) # Minutes depuis l'arrivée ou le départ précédent
+    ecart[double] = np.nan # Déjà signalé, et exclu de l'historique des écarts
+
+    analyses = jours >= premier_jour
+    resultats = []
+
+    def signaler(nom: str, masque: np.ndarray, valeurs: np.ndarray, moyenne=None, z=None) -> None:
+        lignes = np.flatnonzero(masque & analyses)
+        resultats.append((
+            np.full(len(lignes), TYPES.index(nom)), pointage_ids[lignes], employe_ids[lignes], jours[lignes],
+            valeurs[lignes],
+            np.full(len(lignes), np.nan) if moyenne is None else moyenne[lignes],
+            np.full(len(lignes), np.nan) if z is None else z[lignes]
+        ))
+
+    with np.errstate(invalid='ignore'):
+        signaler("duree_invraisemblable", (duree < duree_min) | (duree > duree_max), duree)
+        signaler("badge_double", double, ecart_double)
+        for nom, valeurs, ecart_type_min in (
+            ("arrivee_inhabituelle", arrivee, ECART_TYPE_MIN_ARRIVEE),
+            ("duree_inhabituelle", duree, ECART_TYPE_MIN_DUREE),
+            ("ecart_inhabituel", ecart, ECART_TYPE_MIN_ECART),
+        ):
+            moyenne, ecart_type, effectif = rolling_stats(debut_groupe, valeurs, fenetre)
+            z = (valeurs - moyenne) / np.maximum(ecart_type, ecart_type_min)
+            signaler(nom, (effectif >= min_historique) & (np.abs(z) > z_seuil), valeurs, moyenne, z)
+    return tuple(np.concatenate(colonne) for colonne in zip(*resultats))
+
+def _employe_ranges(db: Session, chunk_size: int) -> List[List[int]]:
+    """Ids des employés (triés) découpés en tranches d'au plus 'chunk_size' employés."""
+    employe_ids = db.scalars(select(EmployeModel.id).order_by(EmployeModel.id)).all()
+    return [employe_ids[debut:debut + chunk_size] for debut in range(0, len(employe_ids), chunk_size)]
+
+def _load_chunk(
+    db: Session, employe_ids: List[int], debut: date, fin: date, premier_jour: date, decalages: Dict[str, np.ndarray]
+) -> Optional[Tuple[Any, ...]]:
+    """
+    Arguments de detect_anomalies pour une tranche d'employés (None si elle n'a aucun pointage) :
+    pointages de [debut, fin] convertis en tableaux, décalage horaire de chaque pointage.
+    'decalages' (fuseau -> décalage de chaque jour de [debut, fin]) est complété au besoin.
+    """
+    lignes = crud.pointage.get_pointage_series(db, debut, fin, employe_ids[0], employe_ids[-1])
+    if not lignes:
+        return None
+    p_ids, p_employes, p_jours, p_arrivees, p_departs = zip(*lignes)
+    del lignes
+    origine = np.datetime64(debut, "D")
+    minute = np.timedelta64(1, "m")
+    jours = as_datetime64(p_jours, "D")
+    arrivees = (as_datetime64(p_arrivees, "us") - origine) / minute
+    departs = (as_datetime64(p_departs, "us") - origine) / minute
+    del p_jours, p_arrivees, p_departs
+    employes = np.array(p_employes, dtype=np.int64)
+    indices_jour = (jours - origine).astype(np.int64)
+
+    # Décalage de chaque pointage : fuseau de son employé, à sa date locale
+    fuseaux = crud.employe.get_employe_timezones(db, employe_ids)
+    noms, fuseau_employe = np.unique([fuseaux.get(i, settings.DEFAULT_TIMEZONE) for i in employe_ids], return_inverse=True)
+    for nom in noms.tolist():
+        if nom not in decalages:
+            decalages[nom] = np.array([
+                timezones.utc_offset_minutes(nom, debut + timedelta(days=k)) for k in range((fin - debut).days + 1)
+            ])
+    table = np.stack([decalages[nom] for nom in noms.tolist()])
+    decalage = table[fuseau_employe[np.searchsorted(employe_ids, employes)], indices_jour]
+
+    return (
+        np.array(p_ids, dtype=np.int64), employes, indices_jour, arrivees, departs, decalage,
+        (premier_jour - debut).days, settings.ANOMALIE_FENETRE, settings.ANOMALIE_MIN_HISTORIQUE,
+        settings.ANOMALIE_Z_SEUIL, settings.ANOMALIE_DUREE_MIN_MINUTES, settings.ANOMALIE_DUREE_MAX_HEURES * 60,
+        settings.ANOMALIE_DOUBLON_MINUTES
+    )
+
+def _submit(pool: Optional[ProcessPoolExecutor], tache: Optional[Tuple[Any, ...]]) -> Future:
+    """Analyse d'une tranche dans le pool, ou immédiate (pas de pool, ou tranche sans pointage)."""
+    if pool is not None and tache is not None:
+        return pool.submit(detect_anomalies, *tache)
+    future = Future()
+    future.set_result(None if tache is None else detect_anomalies(*tache))
+    return future
+
+def run_detection(
+    db: Session,
+    depuis: Optional[date] = None,
+    jusqu_au: Optional[date] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Dict[str, Any]:
+    """
+    Détecte les anomalies des pointages d'une période et les enregistre, puis note l'exécution.
+
+    Args:
+        db: Session de base de données (une base : la principale ou un shard).
+        depuis: Premier jour analysé (défaut : lendemain de la dernière exécution, ou plus tôt si des
+            pointages de jours déjà analysés ont été créés, modifiés ou supprimés depuis son début ; sans exécution
+            précédente, ANOMALIE_PREMIERE_ANALYSE_JOURS jours avant 'jusqu_au').
+        jusqu_au: Dernier jour analysé, inclus (défaut : hier, dernier jour complet).
+        workers: Nombre de processus (None = nombre de CPU ; 1 = exécution dans le processus courant).
+        chunk_size: Nombre d'employés par tranche.
+
+    Returns:
+        Un dictionnaire {'depuis', 'jusqu_au', 'employes', 'pointages', 'anomalies'} ; 'depuis' postérieur
+        à 'jusqu_au' (et rien d'enregistré) si la période est déjà analysée.
+    """
+    jusqu_au = jusqu_au or date.today() - timedelta(days=1)
+    marque = datetime.now(timezone.utc) # Avant toute lecture
+    derniere = crud.anomalie.get_last_analysis(db)
+    if depuis is None:
+        if derniere is None:
+            depuis = jusqu_au - timedelta(days=settings.ANOMALIE_PREMIERE_ANALYSE_JOURS - 1)
+        else:
+            depuis = derniere.jusqu_au + timedelta(days=1)
+            if derniere.marque is not None:
+                reprise = derniere.marque - MARGE_MODIFICATIONS
+                jours = (crud.pointage.get_first_modified_day(db, reprise), crud.anomalie.get_first_deleted_day(db, reprise))
+                depuis = min([depuis, *(jour for jour in jours if jour is not None)])
+                crud.anomalie.purge_deletions(db, reprise) # Déjà prises en compte par les exécutions précédentes
+    elif derniere is not None:
+        # Période imposée : les modifications d'autres jours restent à reprendre par l'exécution suivante
+        marque = derniere.marque
+    stats = {"depuis": depuis, "jusqu_au": jusqu_au, "employes": 0, "pointages": 0, "anomalies": 0}
+    if depuis > jusqu_au:
+        return stats
+
+    debut = depuis - timedelta(days=settings.ANOMALIE_HISTORIQUE_JOURS)
+    tranches = _employe_ranges(db, chunk_size)
+    workers = workers or os.cpu_count() or 1
+    decalages: Dict[str, np.ndarray] = {}
+
+    def enregistrer(employe_ids: List[int], future: Future) -> None:
+        resultat = future.result()
+        anomalies = [] if resultat is None else [
+            {
+                "employe_id": employe_id, "pointage_id": pointage_id, "type": TYPES[indice_type],
+                "jour": debut + timedelta(days=jour), "valeur": round(valeur, 2),
+                "moyenne": None if moyenne != moyenne else round(moyenne, 2), # NaN -> NULL
+                "z_score": None if z != z else round(z, 2),
+            }
+            for indice_type, pointage_id, employe_id, jour, valeur, moyenne, z in zip(*(colonne.tolist() for colonne in resultat))
+        ]
+        stats["anomalies"] += crud.anomalie.replace_anomalies(db, employe_ids[0], employe_ids[-1], depuis, jusqu_au, anomalies)
+        stats["employes"] += len(employe_ids)
+
+    # Chargement de la tranche suivante pendant l'analyse des précédentes ; au plus 2 tranches par processus en attente
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 and len(tranches) > 1 else None
+    try:
+        en_cours = deque()
+        for employe_ids in tranches:
+            tache = _load_chunk(db, employe_ids, debut, jusqu_au, depuis, decalages)
+            if tache is not None:
+                stats["pointages"] += int(np.count_nonzero(tache[2] >= tache[6]))
+            en_cours.append((employe_ids, _submit(pool, tache)))
+            while len(en_cours) > (2 * workers if pool else 0):
+                enregistrer(*en_cours.popleft())
+        while en_cours:
+            enregistrer(*en_cours.popleft())
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    crud.anomalie.record_analysis(db, depuis, jusqu_au, stats["pointages"], stats["anomalies"], marque)
+    return stats
@@ -0,0 +1,177 @@
+# app/services/calibration_service.py
+"""
+Calibration des taux du modèle de performance (base_growth, base_decay) sur l'historique
+d'évaluations de chaque employé.
+
+Sous le scénario standard, l'équation du service de simulation s'écrit :
+    dP/dt = base_growth * (100 - P) / 50 - base_decay * P / 50 = a - k * P
+avec a = 2 * base_growth et k = (base_growth + base_decay) / 50.
+Elle est linéaire en (a, k) : on ajuste donc, pour chaque employé, la pente observée entre deux
+évaluations successives (dP/dt ≈ ΔP / Δt, P pris au milieu de l'intervalle) par moindres carrés.
+Les sommes nécessaires sont calculées pour tous les employés à la fois (np.bincount), puis chaque
+système 2x2 est résolu en forme close, sans boucle Python par employé.
+Une régularisation (ridge) rappelle (a, k) vers les valeurs par défaut quand l'historique est court.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.models.evaluation import Evaluation as EvaluationModel
+from app.services.simulation_service import BASE_GROWTH_RATE, BASE_DECAY_RATE
+
+JOURS_PAR_MOIS = 365.25 / 12
+DEFAULT_REGULARISATION = 1.0 # Poids du rappel vers les taux par défaut (en équivalent d'observations)
+DEFAULT_MIN_EVALUATIONS = 3 # En dessous, l'employé garde les taux par défaut
+DEFAULT_CHUNK_SIZE = 10_000 # Employés par tâche du pool de processus
+
+def fit_growth_decay(
+    employe_ids: np.ndarray,
+    mois: np.ndarray,
+    scores: np.ndarray,
+    regularisation: float = DEFAULT_REGULARISATION,
+    min_evaluations: int = DEFAULT_MIN_EVALUATIONS
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Ajuste (base_growth, base_decay) pour tous les employés présents dans les tableaux, en une passe vectorisée.
+
+    Args:
+        employe_ids, mois, scores: Évaluations notées, triées par (employe_id, date) ;
+            'mois' est la date exprimée en mois (origine quelconque).
+        regularisation: Poids du rappel vers les taux par défaut (0 = moindres carrés purs).
+        min_evaluations: Nombre minimal d'évaluations (à dates distinctes + 1) pour calibrer un employé.
+
+    Returns:
+        Un tuple (employe_ids, base_growth, base_decay, nb_evaluations, rmse) limité aux employés calibrés.
+    """
+    empty = np.array([], dtype=np.int64), np.array([]), np.array([]), np.array([], dtype=np.int64), np.array([])
+    if len(employe_ids) < 2:
+        return empty
+
+    # Différences entre évaluations successives d'un même employé (dates distinctes uniquement)
+    dt = np.diff(mois)
+    valid = (employe_ids[1:] == employe_ids[:-1]) & (dt > 0)
+    if not valid.any():
+        return empty
+    ids = employe_ids[1:][valid]
+    dt = dt[valid]
+    y = np.diff(scores)[valid] / dt # Pente observée (points par mois)
+    x = (scores[1:] + scores[:-1])[valid] / 2 # Performance au milieu de l'intervalle
+
+    # Sommes par employé (groupes contigus car les tableaux sont triés)
+    uniques, groupes = np.unique(ids, return_inverse=True)
+    n = np.bincount(groupes).astype(float)
+    sx = np.bincount(groupes, weights=x)
+    sy = np.bincount(groupes, weights=y)
+    sxx = np.bincount(groupes, weights=x * x)
+    sxy = np.bincount(groupes, weights=x * y)
+
+    # Résidu r = y - a + k x ; équations normales régularisées : (XᵀX + λD) θ = Xᵀy + λD θ0, X = [1, -x].
+    # D = diag(1, 50²) met les deux pénalités à la même échelle (k multiplie une performance ~50).
+    a0 = 2 * BASE_GROWTH_RATE
+    k0 = (BASE_GROWTH_RATE + BASE_DECAY_RATE) / 50
+    m11 = n + regularisation
+    m12 = -sx
+    m22 = sxx + regularisation * 2500
+    b1 = sy + regularisation * a0
+    b2 = -sxy + regularisation * 2500 * k0
+    det = m11 * m22 - m12 * m12
+    with np.errstate(divide='ignore', invalid='ignore'):
+        a = (m22 * b1 - m12 * b2) / det
+        k = (m11 * b2 - m12 * b1) / det
+
+    base_growth = np.clip(a / 2, 0, None)
+    base_decay = np.clip(50 * k - base_growth, 0, None)
+
+    # Erreur quadratique moyenne de l'ajustement, par employé
+    residus = y - a[groupes] + k[groupes] * x
+    rmse = np.sqrt(np.bincount(groupes, weights=residus * residus) / n)
+
+    # n différences <=> n + 1 évaluations
+    keep = (n + 1 >= min_evaluations) & np.isfinite(a) & np.isfinite(k)
+    return uniques[keep], base_growth[keep], base_decay[keep], (n[keep] + 1).astype(np.int64), rmse[keep]
+
+def load_evaluation_arrays(db: Session) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Charge toutes les évaluations notées sous forme de tableaux NumPy triés par (employe_id, date).
+
+    Returns:
+        Un tuple (employe_ids, mois, scores).
+    """
+    rows = db.execute(
+        select(EvaluationModel.employe_id, EvaluationModel.date_evaluation, EvaluationModel.score_global)
+        .where(EvaluationModel.score_global.isnot(None))
+        .order_by(EvaluationModel.employe_id, EvaluationModel.date_evaluation, EvaluationModel.id)
+    ).all()
+    if not rows:
+        return np.array([], dtype=np.int64), np.array([]), np.array([])
+
+    employe_ids, dates, scores = zip(*rows)
+    jours = np.array(dates, dtype='datetime64[D]').astype(np.int64)
+    return np.array(employe_ids, dtype=np.int64), jours / JOURS_PAR_MOIS, np.array(scores, dtype=float)
+
+def _split_by_employe(employe_ids: np.ndarray, chunk_size: int) -> List[slice]:
+    """Découpe des tableaux triés par employé en tranches d'au plus 'chunk_size' employés (sans couper un employé)."""
+    if len(employe_ids) == 0:
+        return []
+    debuts = np.flatnonzero(np.r_[True, employe_ids[1:] != employe_ids[:-1]]) # Première ligne de chaque employé
+    coupures = list(debuts[::chunk_size]) + [len(employe_ids)]
+    return [slice(a, b) for a, b in zip(coupures, coupures[1:])]
+
+def run_calibration(
+    db: Session,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    regularisation: float = DEFAULT_REGULARISATION,
+    min_evaluations: int = DEFAULT_MIN_EVALUATIONS
+) -> Dict[str, int]:
+    """
+    Calibre tous les employés ayant des évaluations notées et enregistre les résultats par lots.
+    Les lots d'employés sont ajustés en parallèle dans un pool de processus ; l'écriture reste
+    dans le processus principal (une transaction par lot).
+
+    Args:
+        db: Session de base de données.
+        workers: Nombre de processus (None = nombre de CPU ; 1 = exécution dans le processus courant).
+        chunk_size: Nombre d'employés par lot.
+        regularisation, min_evaluations: Voir fit_growth_decay.
+
+    Returns:
+        Un dictionnaire {'employes': employés traités, 'calibres': calibrations enregistrées,
+        'supprimes': calibrations obsolètes supprimées}.
+    """
+    employe_ids, mois, scores = load_evaluation_arrays(db)
+    tranches = _split_by_employe(employe_ids, chunk_size)
+    taches = [(employe_ids[t], mois[t], scores[t], regularisation, min_evaluations) for t in tranches]
+    workers = workers or os.cpu_count() or 1
+
+    if workers > 1 and len(taches) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            resultats = list(pool.map(fit_growth_decay, *zip(*taches)))
+    else:
+        resultats = [fit_growth_decay(*tache) for tache in taches]
+
+    total_employes, total_calibres = 0, 0
+    for tache, (ids, base_growth, base_decay, nb_evaluations, rmse) in zip(taches, resultats):
+        employes_du_lot = np.unique(tache[0]).tolist()
+        calibrations = [
+            {
+                "employe_id": int(employe_id),
+                "base_growth": float(g),
+                "base_decay": float(d),
+                "nb_evaluations": int(nb),
+                "rmse": float(err),
+            }
+            for employe_id, g, d, nb, err in zip(ids, base_growth, base_decay, nb_evaluations, rmse)
+        ]
+        total_calibres += crud.calibration.replace_calibrations(db, employes_du_lot, calibrations)
+        total_employes += len(employes_du_lot)
+
+    # Employés dont toutes les évaluations notées ont disparu depuis la dernière calibration
+    supprimes = crud.calibration.purge_calibrations(db)
+
+    return {"employes": total_employes, "calibres": total_calibres, "supprimes": supprimes}
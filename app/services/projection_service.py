@@ -0,0 +1,148 @@
+# app/services/projection_service.py
+"""
+Projections de performance pré-calculées (scénario standard) pour tous les employés actifs.
+
+Le rafraîchissement est incrémental : seuls les employés sans projection, ou dont la condition
+initiale (dernière évaluation notée) ou la calibration a changé depuis le dernier calcul, sont
+recalculés. Ils sont intégrés par lots vectorisés (une intégration RK45 par lot) et écrits
+en une transaction par lot.
+"""
+import asyncio
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import select, func, or_, and_
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.core.config import settings
+from app.db.session import data_sessionmakers
+from app.models.employe import Employe as EmployeModel
+from app.models.employe_latest_evaluation import EmployeLatestEvaluation as LatestEvaluationModel
+from app.models.employe_calibration import EmployeCalibration as CalibrationModel
+from app.models.projection import Projection as ProjectionModel
+from app.services import simulation_service
+
+def _stale_employes_query(horizon_mois: int, full: bool):
+    """
+    Employés actifs à (re)projeter, avec tout ce qu'il faut pour les simuler :
+    (employe_id, evaluation_id, score, base_growth, base_decay).
+    """
+    performance_initiale = func.coalesce(LatestEvaluationModel.score, simulation_service.DEFAULT_INITIAL_PERFORMANCE)
+    query = select(
+        EmployeModel.id,
+        LatestEvaluationModel.evaluation_id,
+        LatestEvaluationModel.score,
+        CalibrationModel.base_growth,
+        CalibrationModel.base_decay,
+    ).select_from(EmployeModel)\
+     .outerjoin(LatestEvaluationModel, LatestEvaluationModel.employe_id == EmployeModel.id)\
+     .outerjoin(CalibrationModel, CalibrationModel.employe_id == EmployeModel.id)\
+     .outerjoin(ProjectionModel, and_(
+         ProjectionModel.employe_id == EmployeModel.id,
+         ProjectionModel.horizon_mois == horizon_mois
+     ))\
+     .where(EmployeModel.is_active.isnot(False))\
+     .order_by(EmployeModel.id)
+
+    if not full:
+        query = query.where(or_(
+            ProjectionModel.employe_id.is_(None), # Jamais projeté
+            ProjectionModel.evaluation_id.is_distinct_from(LatestEvaluationModel.evaluation_id), # Nouvelle évaluation
+            ProjectionModel.performance_initiale != performance_initiale, # Score de l'évaluation modifié
+            # Recalibré ou calibration purgée depuis (comparaison des valeurs, pas des horodatages)
+            ProjectionModel.base_growth.is_distinct_from(CalibrationModel.base_growth),
+            ProjectionModel.base_decay.is_distinct_from(CalibrationModel.base_decay),
+        ))
+    return query
+
+def compute_projection_batch(rows: List, horizon_mois: int) -> List[Dict]:
+    """
+    Simule un lot d'employés en un seul système vectorisé (scénario standard).
+
+    Args:
+        rows: Lignes (employe_id, evaluation_id, score, base_growth, base_decay) de _stale_employes_query.
+        horizon_mois: Horizon de projection.
+
+    Returns:
+        Les dictionnaires de colonnes attendus par crud.projection.replace_projections.
+    """
+    employe_ids, evaluation_ids, scores, growth, decay = zip(*rows)
+    initial = np.array(
+        [simulation_service.DEFAULT_INITIAL_PERFORMANCE if s is None else s for s in scores], dtype=float
+    ).clip(0, 100)
+    base_growth = np.array([simulation_service.BASE_GROWTH_RATE if g is None else g for g in growth], dtype=float)
+    base_decay = np.array([simulation_service.BASE_DECAY_RATE if d is None else d for d in decay], dtype=float)
+
+    _, performances = simulation_service.solve_performance_batch(
+        initial, horizon_mois, base_growth=base_growth, base_decay=base_decay
+    )
+    performances = np.round(performances, 1)
+    return [
+        {
+            "employe_id": employe_id,
+            "evaluation_id": evaluation_id,
+            # Score brut (non borné) pour que la détection de changement compare des valeurs identiques
+            "performance_initiale": simulation_service.DEFAULT_INITIAL_PERFORMANCE if score is None else score,
+            "performance_predite": serie,
+            "base_growth": g, # Calibration utilisée (None = taux par défaut), pour la détection de changement
+            "base_decay": d,
+        }
+        for employe_id, evaluation_id, score, g, d, serie
+        in zip(employe_ids, evaluation_ids, scores, growth, decay, performances.tolist())
+    ]
+
+def refresh_projections(
+    db: Session,
+    horizon_mois: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    full: bool = False
+) -> Dict[str, int]:
+    """
+    Rafraîchit les projections des employés actifs (incrémental sauf si full=True).
+
+    Args:
+        db: Session de base de données.
+        horizon_mois: Horizon de projection (défaut: settings.PROJECTION_HORIZON_MOIS).
+        batch_size: Employés par lot vectorisé (défaut: settings.PROJECTION_BATCH_SIZE).
+        full: Recalculer tous les employés actifs, même inchangés.
+
+    Returns:
+        Un dictionnaire {'projetes': projections écrites, 'supprimes': projections d'inactifs supprimées}.
+    """
+    horizon_mois = horizon_mois or settings.PROJECTION_HORIZON_MOIS
+    batch_size = batch_size or settings.PROJECTION_BATCH_SIZE
+
+    # Matérialiser la liste avant d'écrire (les écritures modifient les tables de la requête)
+    stale = db.execute(_stale_employes_query(horizon_mois, full)).all()
+    projetes = 0
+    for debut in range(0, len(stale), batch_size):
+        lot = stale[debut:debut + batch_size]
+        projetes += crud.projection.replace_projections(db, horizon_mois, compute_projection_batch(lot, horizon_mois))
+
+    supprimes = crud.projection.purge_projections(db)
+    return {"projetes": projetes, "supprimes": supprimes}
+
+async def projection_refresh_loop(interval_seconds: int) -> None:
+    """
+    Tâche asyncio de fond : rafraîchit les projections toutes les 'interval_seconds' secondes.
+    Le calcul (bloquant) est exécuté dans un thread pour ne pas bloquer la boucle d'événements.
+    """
+    def _refresh_once() -> Dict[str, int]:
+        total = {"projetes": 0, "supprimes": 0}
+        for DataSession in data_sessionmakers(): # Chaque shard en mode shardé
+            db = DataSession()
+            try:
+                stats = refresh_projections(db)
+            finally:
+                db.close()
+            total = {cle: total[cle] + stats[cle] for cle in total}
+        return total
+
+    while True:
+        try:
+            stats = await asyncio.to_thread(_refresh_once)
+            print(f"Projections rafraîchies: {stats}")
+        except Exception as e:
+            print(f"Erreur lors du rafraîchissement des projections: {e}") # Log temporaire
+        await asyncio.sleep(interval_seconds)
@@ -2,18 +2,23 @@
 
 import time
 import random
-from typing import Dict, Any, List, Tuple, Optional
+import threading
+from typing import Dict, Any, Iterator, List, Tuple, Optional, Sequence, Union
 from datetime import datetime, timedelta
 
 # --- Imports for Runge-Kutta ---
 import numpy as np
-from scipy.integrate import solve_ivp
+from scipy.integrate import RK45
 # --------------------------------
 
-from app import crud, models # crud n'est plus utilisé directement ici si on passe l'état initial
+from app import crud, models
 from sqlalchemy.orm import Session
-from app.schemas.simulation import SimulationParams
-from app.models.evaluation import Evaluation as EvaluationModel # Pour chercher la dernière éval
+from app.schemas.simulation import SimulationParams, SimulationSegment
+
+# Valeurs par défaut, remplacées par les taux calibrés de l'employé s'ils existent (voir calibration_service)
+BASE_GROWTH_RATE = 0.2   # Taux d'apprentissage/motivation de base
+BASE_DECAY_RATE = 0.1    # Taux de fatigue/déclin de base
+DEFAULT_INITIAL_PERFORMANCE = 70.0 # Performance de départ si aucune évaluation notée (à ajuster)
 
 # ==============================================
 # ==      MODÈLE DE PERFORMANCE (Exemple)     ==
@@ -31,7 +36,7 @@ def performance_differential_equation(
     dP/dt = f(t, P, params...)
 
     Args:
-        t: Temps (en mois dans notre cas). Non utilisé dans ce modèle simple, mais requis par solve_ivp.
+        t: Temps (en mois dans notre cas). Non utilisé dans ce modèle simple, mais requis par l'intégrateur.
         P: État actuel [performance]. P[0] est la performance.
         base_growth: Taux de croissance de base.
         base_decay: Taux de déclin/fatigue de base.
@@ -65,6 +70,289 @@ def performance_differential_equation(
 
     return [dPdt]
 
+def performance_differential_equation_vectorized(
+    t: float,
+    P: np.ndarray,
+    base_growth: np.ndarray,
+    base_decay: np.ndarray,
+    scenario_impact: np.ndarray,
+    stress_factor: np.ndarray
+) -> np.ndarray:
+    """
+    Version vectorisée de performance_differential_equation : P contient N performances
+    indépendantes (N employés et/ou N scénarios) intégrées comme un seul système.
+    Les paramètres sont des tableaux de taille N (ou des scalaires, par broadcasting).
+
+    Returns:
+        Tableau de taille N contenant dP/dt pour chaque composante.
+    """
+    current_performance = np.clip(P, 0, 100)
+
+    growth_term = base_growth * (100 - current_performance) / 50
+    decay_term = (base_decay * (1 + stress_factor)) * current_performance / 50
+    dPdt = growth_term - decay_term + scenario_impact
+
+    # Mêmes butées qu'en version scalaire
+    dPdt = np.where((current_performance >= 100) & (dPdt > 0), 0.0, dPdt)
+    dPdt = np.where((current_performance <= 0) & (dPdt < 0), 0.0, dPdt)
+    return dPdt
+
+def get_scenario_coefficients(params: Union[SimulationParams, SimulationSegment]) -> Tuple[float, float]:
+    """
+    Traduit un scénario (de SimulationParams ou d'un segment de planning) en coefficients du modèle.
+
+    Returns:
+        Un tuple (scenario_impact, stress_multiplier).
+    """
+    scenario_impact_value = 0.0 # Impact direct du scénario
+    stress_multiplier = 0.0   # Facteur additionnel de stress impactant le déclin
+
+    if params.scenario == "formation":
+        # Augmentation temporaire de la croissance ou impact direct positif
+        scenario_impact_value = params.impact_formation if params.impact_formation else 2.0 # Boost direct mensuel
+    elif params.scenario == "augmentation_charge":
+        # Augmentation du stress et potentiellement un léger impact négatif direct
+        stress_multiplier = params.facteur_stress if params.facteur_stress else 0.5 # Augmente le déclin de 50%
+        scenario_impact_value = -1.0 # Léger impact négatif direct
+    # Ajouter d'autres scénarios ici si nécessaire ("promotion", "standard", etc.)
+    # Scénario standard : utilise les valeurs de base
+
+    return scenario_impact_value, stress_multiplier
+
+def get_initial_performance(db: Session, employe_id: int) -> float:
+    """
+    Condition initiale de la simulation : dernier score d'évaluation de l'employé (borné à 0-100),
+    ou DEFAULT_INITIAL_PERFORMANCE s'il n'a aucune évaluation notée.
+    """
+    # Lire la dernière évaluation valide de l'employé dans la table matérialisée (lookup par clé primaire)
+    latest_evaluation = crud.latest_evaluation.get_latest_evaluation(db, employe_id=employe_id)
+
+    if latest_evaluation and latest_evaluation.score is not None:
+        # S'assurer qu'elle est dans les bornes 0-100
+        initial_performance = max(0.0, min(100.0, float(latest_evaluation.score)))
+        print(f"Performance initiale basée sur l'évaluation du {latest_evaluation.date}: {initial_performance:.1f}")
+        return initial_performance
+
+    print(f"Aucune évaluation trouvée ou score invalide, utilisation de la performance initiale par défaut: {DEFAULT_INITIAL_PERFORMANCE:.1f}")
+    return DEFAULT_INITIAL_PERFORMANCE
+
+def get_schedule_coefficients(params: SimulationParams) -> Tuple[List[int], np.ndarray, np.ndarray]:
+    """
+    Traduit les paramètres (scénario unique ou planning) en coefficients constants par morceaux.
+    Les mois non couverts par le planning suivent le scénario standard.
+
+    Returns:
+        Un tuple (bornes, impacts, stress) : bornes = [0, b1, ..., duree_mois] (K + 1 valeurs),
+        impacts et stress sont des tableaux de taille K (un coefficient par intervalle).
+    """
+    if not params.planning:
+        scenario_impact_value, stress_multiplier = get_scenario_coefficients(params)
+        return [0, params.duree_mois], np.array([scenario_impact_value]), np.array([stress_multiplier])
+
+    bornes, impacts, stress = [0], [], []
+    for segment in params.planning: # Trié et sans chevauchement (validé par le schéma)
+        if segment.debut_mois > bornes[-1]:
+            # Trou dans le planning : scénario standard (aucun impact ni stress)
+            bornes.append(segment.debut_mois)
+            impacts.append(0.0)
+            stress.append(0.0)
+        scenario_impact_value, stress_multiplier = get_scenario_coefficients(segment)
+        bornes.append(segment.fin_mois)
+        impacts.append(scenario_impact_value)
+        stress.append(stress_multiplier)
+    if bornes[-1] < params.duree_mois:
+        bornes.append(params.duree_mois)
+        impacts.append(0.0)
+        stress.append(0.0)
+    return bornes, np.array(impacts, dtype=float), np.array(stress, dtype=float)
+
+def get_model_rates(db: Session, employe_id: int) -> Tuple[float, float]:
+    """
+    Taux du modèle pour un employé : paramètres calibrés sur son historique s'ils existent
+    (voir calibration_service), sinon BASE_GROWTH_RATE / BASE_DECAY_RATE.
+
+    Returns:
+        Un tuple (base_growth, base_decay).
+    """
+    calibration = crud.calibration.get_calibration(db, employe_id=employe_id)
+    if calibration is not None:
+        print(f"Taux calibrés utilisés: croissance={calibration.base_growth:.3f}, déclin={calibration.base_decay:.3f}")
+        return calibration.base_growth, calibration.base_decay
+    return BASE_GROWTH_RATE, BASE_DECAY_RATE
+
+def iter_performance_piecewise(
+    initial_performances: Sequence[float],
+    bornes: Sequence[int],
+    scenario_impacts: Any,
+    stress_factors: Any,
+    base_growth: Any = BASE_GROWTH_RATE,
+    base_decay: Any = BASE_DECAY_RATE,
+    arret: Optional[threading.Event] = None
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Intègre N trajectoires indépendantes avec des coefficients constants par morceaux, en produisant
+    les points mensuels au fur et à mesure que l'intégrateur (RK45) les dépasse. L'intégration est
+    relancée à chaque borne à partir de l'état atteint, au lieu d'utiliser un second membre discontinu
+    en t qui forcerait l'intégrateur à réduire son pas autour des sauts.
+    Les points sont interpolés comme le fait solve_ivp avec t_eval (sortie dense de chaque pas) :
+    les résultats sont identiques. Fermer le générateur (ou cesser de l'itérer) arrête le calcul.
+
+    Args:
+        initial_performances: Performances de départ (taille N).
+        bornes: Bornes entières croissantes des intervalles, en mois ([0, ..., horizon], K + 1 valeurs).
+        scenario_impacts, stress_factors: Tableaux de forme (K,) (partagés) ou (N, K) (par trajectoire).
+        base_growth, base_decay: Scalaires ou tableaux de taille N.
+        arret: Événement vérifié entre deux pas d'intégration : s'il est positionné, le générateur
+            s'arrête (utilisable depuis un autre thread pendant un next(), contrairement à close()).
+
+    Yields:
+        Des tuples (temps, performances) de formes (m,) et (N, m), bornées à [0, 100] : d'abord l'état
+        initial (t = bornes[0]), puis les mois suivants, un ou plusieurs par pas d'intégration.
+
+    Raises:
+        ValueError: Si l'intégration numérique échoue.
+    """
+    y = np.asarray(initial_performances, dtype=float)
+    scenario_impacts = np.asarray(scenario_impacts, dtype=float)
+    stress_factors = np.asarray(stress_factors, dtype=float)
+    base_growth = np.asarray(base_growth, dtype=float)
+    base_decay = np.asarray(base_decay, dtype=float)
+
+    yield np.array([float(bornes[0])]), np.clip(y[:, np.newaxis], 0, 100)
+    for k in range(len(bornes) - 1):
+        t_eval = np.arange(bornes[k] + 1, bornes[k + 1] + 1, dtype=float) # Un point par mois après la borne de début
+        coefficients = (base_growth, base_decay, scenario_impacts[..., k], stress_factors[..., k])
+        try:
+            solver = RK45(
+                lambda t, P: performance_differential_equation_vectorized(t, P, *coefficients),
+                bornes[k], y, bornes[k + 1]
+            )
+            emis = 0
+            while solver.status == "running":
+                if arret is not None and arret.is_set():
+                    return
+                message = solver.step()
+                if solver.status == "failed":
+                    print(f"La simulation RK45 a échoué: {message}")
+                    raise ValueError(f"La simulation n'a pas convergé ou a échoué: {message}")
+                fin = np.searchsorted(t_eval, solver.t, side="right") # Mois dépassés par ce pas
+                if fin > emis:
+                    yield t_eval[emis:fin], np.clip(solver.dense_output()(t_eval[emis:fin]), 0, 100)
+                    emis = fin
+        except ValueError:
+            raise
+        except Exception as e:
+            print(f"Erreur durant l'intégration RK45: {e}")
+            raise ValueError(f"La simulation numérique a échoué: {e}")
+        y = solver.y # État à la borne de fin = condition initiale du segment suivant
+
+def solve_performance_piecewise(
+    initial_performances: Sequence[float],
+    bornes: Sequence[int],
+    scenario_impacts: Any,
+    stress_factors: Any,
+    base_growth: Any = BASE_GROWTH_RATE,
+    base_decay: Any = BASE_DECAY_RATE
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Intègre N trajectoires indépendantes avec des coefficients constants par morceaux
+    (voir iter_performance_piecewise, dont les morceaux sont rassemblés).
+
+    Returns:
+        Un tuple (temps, performances) où temps a la forme (horizon + 1,)
+        et performances la forme (N, horizon + 1), bornées à [0, 100].
+
+    Raises:
+        ValueError: Si l'intégration numérique échoue.
+    """
+    morceaux = list(iter_performance_piecewise(
+        initial_performances, bornes, scenario_impacts, stress_factors, base_growth=base_growth, base_decay=base_decay
+    ))
+    return np.concatenate([temps for temps, _ in morceaux]), np.concatenate([perf for _, perf in morceaux], axis=1)
+
+def solve_performance_batch(
+    initial_performances: Sequence[float],
+    duree_mois: int,
+    scenario_impacts: Any = 0.0,
+    stress_factors: Any = 0.0,
+    base_growth: Any = BASE_GROWTH_RATE,
+    base_decay: Any = BASE_DECAY_RATE
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Intègre N trajectoires de performance à coefficients constants en une seule intégration RK45.
+
+    Args:
+        initial_performances: Performances de départ (taille N).
+        duree_mois: Horizon commun de la simulation, en mois.
+        scenario_impacts, stress_factors, base_growth, base_decay: Scalaires ou tableaux de taille N.
+
+    Returns:
+        Un tuple (temps, performances) où temps a la forme (duree_mois + 1,)
+        et performances la forme (N, duree_mois + 1), bornées à [0, 100].
+
+    Raises:
+        ValueError: Si l'intégration numérique échoue.
+    """
+    return solve_performance_piecewise(
+        initial_performances,
+        [0, duree_mois],
+        np.asarray(scenario_impacts, dtype=float)[..., np.newaxis],
+        np.asarray(stress_factors, dtype=float)[..., np.newaxis],
+        base_growth=base_growth,
+        base_decay=base_decay
+    )
+
+def solve_performance_schedules(
+    initial_performances: Sequence[float],
+    schedules: List[SimulationParams],
+    base_growth: Any = BASE_GROWTH_RATE,
+    base_decay: Any = BASE_DECAY_RATE
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Intègre N trajectoires ayant chacune leurs propres paramètres (scénario unique ou planning).
+    Les bornes de tous les plannings sont fusionnées : le système vectorisé est relancé à chaque
+    borne, et chaque trajectoire y reçoit les coefficients de son propre intervalle.
+
+    Returns:
+        Un tuple (temps, performances) sur l'horizon le plus long (voir solve_performance_piecewise).
+    """
+    # Un lot partage souvent le même objet de paramètres : ne traduire chaque planning qu'une fois
+    distinct: Dict[int, int] = {}
+    distinct_params: List[SimulationParams] = []
+    rows = []
+    for params in schedules:
+        if id(params) not in distinct:
+            distinct[id(params)] = len(distinct_params)
+            distinct_params.append(params)
+        rows.append(distinct[id(params)])
+    per_schedule = [get_schedule_coefficients(params) for params in distinct_params]
+    bornes = sorted(set().union(*(schedule_bornes for schedule_bornes, _, _ in per_schedule)))
+
+    # Coefficients de chaque planning distinct sur chaque intervalle fusionné [bornes[k], bornes[k + 1]]
+    debuts = np.asarray(bornes[:-1])
+    impacts = np.empty((len(per_schedule), len(debuts)))
+    stress = np.empty((len(per_schedule), len(debuts)))
+    for i, (schedule_bornes, schedule_impacts, schedule_stress) in enumerate(per_schedule):
+        # Au-delà de son horizon, une trajectoire garde ses derniers coefficients (points ignorés ensuite)
+        idx = np.minimum(np.searchsorted(schedule_bornes, debuts, side='right') - 1, len(schedule_impacts) - 1)
+        impacts[i] = schedule_impacts[idx]
+        stress[i] = schedule_stress[idx]
+    if len(per_schedule) == 1:
+        impacts, stress = impacts[0], stress[0] # Coefficients partagés (forme (K,)), diffusés par broadcasting
+    else:
+        impacts, stress = impacts[np.asarray(rows)], stress[np.asarray(rows)] # Une ligne par trajectoire (forme (N, K))
+
+    return solve_performance_piecewise(
+        initial_performances, bornes, impacts, stress, base_growth=base_growth, base_decay=base_decay
+    )
+
+def format_simulation_results(times: np.ndarray, performances: np.ndarray) -> Dict[str, Any]:
+    """Met en forme une trajectoire au format stocké dans Simulation.resultats_simulation."""
+    return {
+        "temps_relatif_mois": times.tolist(),
+        "performance_predite": [round(p, 1) for p in performances.tolist()]
+    }
+
 # ==============================================
 # ==      SERVICE DE SIMULATION PRINCIPAL     ==
 # ==============================================
@@ -91,89 +379,104 @@ def run_performance_simulation(
     print(f"Lancement de la simulation RK pour l'employé {employe_id} avec params: {params.model_dump()}")
 
     # --- 1. Obtenir la condition initiale (Performance de départ) ---
-    # Chercher la dernière évaluation valide de l'employé
-    latest_evaluation = db.query(EvaluationModel)\
-                          .filter(EvaluationModel.employe_id == employe_id)\
-                          .filter(EvaluationModel.score_global.isnot(None))\
-                          .order_by(EvaluationModel.date_evaluation.desc())\
-                          .first()
-
-    if latest_evaluation and latest_evaluation.score_global is not None:
-        initial_performance = float(latest_evaluation.score_global)
-        # S'assurer qu'elle est dans les bornes 0-100
-        initial_performance = max(0.0, min(100.0, initial_performance))
-        print(f"Performance initiale basée sur l'évaluation du {latest_evaluation.date_evaluation}: {initial_performance:.1f}")
+    initial_performance = get_initial_performance(db, employe_id)
+
+    # --- 2. Définir les paramètres du modèle basés sur le scénario (ou le planning) ---
+    if params.planning:
+        print(f"Planning de {len(params.planning)} segment(s) appliqué.")
     else:
-        # Pas d'évaluation ou score nul, utiliser une valeur par défaut raisonnable
-        initial_performance = 70.0 # Valeur par défaut (à ajuster)
-        print(f"Aucune évaluation trouvée ou score invalide, utilisation de la performance initiale par défaut: {initial_performance:.1f}")
+        print(f"Scénario: {params.scenario} appliqué.")
 
-    y0 = [initial_performance] # Condition initiale pour solve_ivp (doit être une liste/array)
+    # --- 3. Exécuter la simulation (système à une seule composante) ---
+    base_growth, base_decay = get_model_rates(db, employe_id)
+    times, performances = solve_performance_schedules(
+        [initial_performance], [params], base_growth=base_growth, base_decay=base_decay
+    )
 
-    # --- 2. Définir les paramètres du modèle basés sur le scénario ---
-    # !!! VALEURS À AJUSTER / CALIBRER EN FONCTION DES DONNÉES RÉELLES !!!
-    base_growth_rate = 0.2   # Taux d'apprentissage/motivation de base
-    base_decay_rate = 0.1    # Taux de fatigue/déclin de base
-    scenario_impact_value = 0.0 # Impact direct du scénario
-    stress_multiplier = 0.0   # Facteur additionnel de stress impactant le déclin
+    # --- 4. Traiter et retourner les résultats ---
+    resultats = format_simulation_results(times, performances[0])
+    print(f"Résultats de la simulation (RK): {resultats}")
+    return resultats
 
-    if params.scenario == "formation":
-        # Augmentation temporaire de la croissance ou impact direct positif
-        scenario_impact_value = params.impact_formation if params.impact_formation else 2.0 # Boost direct mensuel
-        print("Scénario: Formation appliqué.")
-    elif params.scenario == "augmentation_charge":
-        # Augmentation du stress et potentiellement un léger impact négatif direct
-        stress_multiplier = params.facteur_stress if params.facteur_stress else 0.5 # Augmente le déclin de 50%
-        scenario_impact_value = -1.0 # Léger impact négatif direct
-        print("Scénario: Augmentation de charge appliquée.")
-    # Ajouter d'autres scénarios ici si nécessaire ("promotion", "standard", etc.)
-    else: # Scénario standard
-        print("Scénario: Standard appliqué.")
-        pass # Utilise les valeurs de base
-
-    # --- 3. Définir l'intervalle et les points d'évaluation ---
-    simulation_duration_months = params.duree_mois
-    t_span = (0, simulation_duration_months) # Intervalle de temps [début, fin] en mois
-
-    # Points où l'on veut connaître la valeur de la performance (ex: chaque mois)
-    t_eval = np.linspace(t_span[0], t_span[1], simulation_duration_months + 1)
-
-    # --- 4. Exécuter la simulation avec solve_ivp (méthode RK45 par défaut) ---
-    print("Appel de solve_ivp...")
-    try:
-        sol = solve_ivp(
-            fun=performance_differential_equation, # Notre fonction dP/dt
-            t_span=t_span,                      # Intervalle de temps
-            y0=y0,                              # Condition initiale [P(0)]
-            method='RK45',                      # Méthode Runge-Kutta (ou autre: 'LSODA', 'BDF'...)
-            t_eval=t_eval,                      # Points où évaluer la solution
-            args=(base_growth_rate,             # Arguments additionnels pour notre fonction dP/dt
-                  base_decay_rate,
-                  scenario_impact_value,
-                  stress_multiplier)
-        )
-    except Exception as e:
-        print(f"Erreur durant l'exécution de solve_ivp: {e}")
-        raise ValueError(f"La simulation numérique a échoué: {e}")
-
-    # --- 5. Traiter et retourner les résultats ---
-    if sol.success:
-        print("Simulation solve_ivp réussie.")
-        # Extraire les temps et les valeurs de performance prédites
-        times = sol.t.tolist()
-        # sol.y est un array 2D (même si une seule variable), prendre la première ligne
-        performance_predicted = sol.y[0]
-
-        # S'assurer que les valeurs restent dans les bornes [0, 100] et arrondir
-        performance_predicted = np.clip(performance_predicted, 0, 100)
-        performance_list = [round(p, 1) for p in performance_predicted.tolist()]
-
-        resultats = {
-            "temps_relatif_mois": times,
-            "performance_predite": performance_list
-        }
-        print(f"Résultats de la simulation (RK): {resultats}")
-        return resultats
-    else:
-        print(f"La simulation solve_ivp a échoué: {sol.message}")
-        raise ValueError(f"La simulation n'a pas convergé ou a échoué: {sol.message}")
\ No newline at end of file
+def iter_performance_simulation(
+    initial_performance: float,
+    params: SimulationParams,
+    base_growth: float = BASE_GROWTH_RATE,
+    base_decay: float = BASE_DECAY_RATE,
+    arret: Optional[threading.Event] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Version progressive de run_performance_simulation, sans accès à la base : la condition initiale
+    et les taux (get_initial_performance, get_model_rates) sont lus au préalable par l'appelant.
+    Mis bout à bout, les morceaux produits donnent les résultats de run_performance_simulation.
+    Fermer le générateur, ou positionner 'arret' (voir iter_performance_piecewise), arrête l'intégration.
+
+    Yields:
+        Les morceaux de trajectoire au format de format_simulation_results, au fil de l'intégration.
+
+    Raises:
+        ValueError: Si l'intégration numérique échoue.
+    """
+    bornes, impacts, stress = get_schedule_coefficients(params)
+    for times, performances in iter_performance_piecewise(
+        [initial_performance], bornes, impacts, stress, base_growth=base_growth, base_decay=base_decay, arret=arret
+    ):
+        yield format_simulation_results(times, performances[0])
+
+def compare_performance_scenarios(
+    db: Session,
+    employe_id: int,
+    scenarios: List[SimulationParams]
+) -> Dict[str, Any]:
+    """
+    Simule plusieurs scénarios (ou plannings) pour un même employé en une seule intégration vectorisée.
+    La condition initiale n'est lue qu'une fois ; chaque scénario est une composante du système.
+
+    Args:
+        db: Session de base de données.
+        employe_id: ID de l'employé.
+        scenarios: Liste des paramètres de simulation à comparer (le premier sert de référence).
+
+    Returns:
+        Un dictionnaire avec la performance initiale, l'axe de temps commun (horizon le plus long)
+        et, par scénario, ses résultats propres et la série alignée sur l'axe commun
+        (None au-delà de son horizon), ainsi que ses écarts : delta_final (fin - initiale)
+        et delta_vs_reference (écart point par point avec le premier scénario).
+
+    Raises:
+        ValueError: Si la liste de scénarios est vide ou si la simulation échoue.
+    """
+    if not scenarios:
+        raise ValueError("Au moins un scénario est requis pour la comparaison.")
+
+    initial_performance = get_initial_performance(db, employe_id)
+    base_growth, base_decay = get_model_rates(db, employe_id)
+    times, performances = solve_performance_schedules(
+        np.full(len(scenarios), initial_performance), scenarios, base_growth=base_growth, base_decay=base_decay
+    )
+
+    comparaison = []
+    for params, trajectory in zip(scenarios, performances):
+        n_points = params.duree_mois + 1
+        resultats = format_simulation_results(times[:n_points], trajectory[:n_points])
+        serie_alignee = resultats["performance_predite"] + [None] * (len(times) - n_points)
+        comparaison.append({
+            "parametres": params,
+            "resultats": resultats,
+            "serie_alignee": serie_alignee,
+            "delta_final": round(resultats["performance_predite"][-1] - initial_performance, 1),
+        })
+
+    # Écart point par point avec le scénario de référence (le premier de la liste)
+    reference = comparaison[0]["serie_alignee"]
+    for item in comparaison:
+        item["delta_vs_reference"] = [
+            round(p - r, 1) if p is not None and r is not None else None
+            for p, r in zip(item["serie_alignee"], reference)
+        ]
+
+    return {
+        "performance_initiale": initial_performance,
+        "temps_relatif_mois": times.tolist(),
+        "scenarios": comparaison,
+    }
@@ -0,0 +1,73 @@
+# benchmarks/bench_admission.py
+"""
+Mesure la protection apportée par le contrôle d'admission (app/api/admission.py) : latence d'un client
+« sage » (GET /employes/{id}) seul, puis pendant qu'un autre client inonde POST /simulations/run,
+sans puis avec le middleware (limite de simultanéité des simulations et limites de débit).
+
+Sans admission, garder --concurrence-abus sous la taille du pool de connexions (15 par défaut) :
+au-delà, la boucle d'événements se bloque en attente d'une connexion tenue par une requête qui
+attend elle-même la boucle, jusqu'au délai du pool (30 s) ; c'est ce que la limite de simultanéité évite.
+
+Usage:
+    python -m benchmarks.bench_admission [--requetes 200] [--abus 200] [--concurrence-abus 8]
+"""
+import argparse
+import asyncio
+import contextlib
+import os
+import sys
+import tempfile
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requetes", type=int, default=200, help="Requêtes du client sage")
+    parser.add_argument("--abus", type=int, default=200, help="Simulations demandées par le client abusif")
+    parser.add_argument("--concurrence-abus", type=int, default=8)
+    parser.add_argument("--simulations-simultanees", type=int, default=2, help="Limite de simultanéité testée")
+    parser.add_argument("--simulations-par-minute", type=float, default=60, help="Limite de débit testée par client")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as dossier:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(dossier, 'bench.db')}"
+        os.environ["ADMISSION_CONTROL_ENABLED"] = "0" # Le middleware est ajouté ci-dessous, pour la seconde variante
+        from app import models
+        from app.api.admission import AdmissionControlMiddleware, RouteRule
+        from app.db.session import engine
+        from app.main import app
+        from benchmarks import datagen
+        from benchmarks.load import drive
+
+        models.Base.metadata.create_all(engine)
+        taille = datagen.PROFILS["petit"]
+        datagen.generate(engine, **taille)
+        n_emp = taille["employes"]
+
+        protege = AdmissionControlMiddleware(app, rules=(
+            RouteRule("simulations", "POST", r"^/api/v1/simulations/(run|run/stream|compare)$",
+                      max_concurrent=args.simulations_simultanees, par_minute=args.simulations_par_minute),
+        ))
+        sage = lambda rng: ("GET", f"/api/v1/employes/{rng.randint(1, n_emp)}", None)
+        abusif = lambda rng: ("POST", "/api/v1/simulations/run", {
+            "employe_id": rng.randint(1, n_emp),
+            "parametres": {"duree_mois": 24, "planning": [{"debut_mois": 0, "fin_mois": 12, "scenario": "formation"}]}
+        })
+
+        async def sous_abus(application):
+            return await asyncio.gather(
+                drive(application, sage, args.requetes, 2, adresse=("10.0.0.1", 1000)),
+                drive(application, abusif, args.abus, args.concurrence_abus, adresse=("10.0.0.66", 1000)),
+            )
+
+        with contextlib.redirect_stdout(open(os.devnull, "w")): # La simulation écrit beaucoup
+            seul = asyncio.run(drive(app, sage, args.requetes, 2, adresse=("10.0.0.1", 1000)))
+            sans, abus_sans = asyncio.run(sous_abus(app))
+            avec, abus_avec = asyncio.run(sous_abus(protege))
+        engine.dispose()
+
+    print(f"{'client sage':<28} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}   client abusif (statuts)")
+    for nom, m, abus in (("seul", seul, None), ("abus, sans admission", sans, abus_sans), ("abus, avec admission", avec, abus_avec)):
+        print(f"{nom:<28} {m['p50_ms']:8.2f} {m['p95_ms']:8.2f} {m['p99_ms']:8.2f}   {abus['statuts'] if abus else ''}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+# benchmarks/bench_cascade_delete.py
+"""
+Mesure la suppression d'un employé selon la taille de son historique (pointages, évaluations,
+simulations) : suppression actuelle (crud.delete_employe, cascade ON DELETE en base) comparée à la
+cascade côté ORM (chargement des lignes filles puis un DELETE par ligne, comportement précédent).
+Compte aussi les instructions SQL émises par chaque variante (une par jeu de paramètres d'un executemany).
+
+Usage:
+    python -m benchmarks.bench_cascade_delete [--tailles 100,1000,10000,50000] [--repeat 3]
+"""
+import argparse
+import os
+import time
+from datetime import date, datetime, timedelta, timezone
+
+os.environ.setdefault("DATABASE_URL", "sqlite://") # app.db.session exige la variable ; la base est créée ci-dessous
+
+from sqlalchemy import create_engine, event, func, insert, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import crud, models
+from app.db.session import enable_sqlite_foreign_keys
+
+TABLES_HISTORIQUE = (models.Pointage, models.Evaluation, models.Simulation)
+
+def seed_historique(db, employe_id: int, n: int) -> None:
+    """Crée un employé avec n pointages, n évaluations et n simulations."""
+    debut = date(2000, 1, 1)
+    db.execute(insert(models.Employe), [{
+        "id": employe_id, "nom": f"Nom{employe_id}", "prenom": "Prénom",
+        "email": f"employe{employe_id}@example.com", "departement_id": 1, "is_active": True
+    }])
+    db.execute(insert(models.Pointage), [
+        {"employe_id": employe_id, "date_pointage": debut + timedelta(days=i), "seq": 1,
+         "heure_arrivee": datetime(2000, 1, 1, 8, tzinfo=timezone.utc) + timedelta(days=i),
+         "heure_depart": datetime(2000, 1, 1, 17, tzinfo=timezone.utc) + timedelta(days=i)}
+        for i in range(n)
+    ])
+    db.execute(insert(models.Evaluation), [
+        {"employe_id": employe_id, "date_evaluation": debut + timedelta(days=i), "score_global": 50 + i % 50}
+        for i in range(n)
+    ])
+    db.execute(insert(models.Simulation), [
+        {"employe_id": employe_id, "date_simulation": datetime(2000, 1, 1, tzinfo=timezone.utc) + timedelta(hours=i),
+         "parametres_entree": {"scenario": "standard"}, "resultats_simulation": {"performance_predite": [70.0]}}
+        for i in range(n)
+    ])
+    db.commit()
+
+def delete_orm_cascade(db, employe_id: int) -> None:
+    """Ancienne suppression : l'ORM charge chaque relation puis supprime les lignes une à une."""
+    for model in TABLES_HISTORIQUE:
+        for ligne in db.scalars(select(model).where(model.employe_id == employe_id)):
+            db.delete(ligne)
+    db.flush()
+    db.delete(db.get(models.Employe, employe_id))
+    db.commit()
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tailles", default="100,1000,10000,50000", help="Tailles d'historique (lignes par table)")
+    parser.add_argument("--repeat", type=int, default=3, help="Nombre de répétitions (on garde le minimum)")
+    args = parser.parse_args(argv)
+    tailles = [int(t) for t in args.tailles.split(",")]
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    enable_sqlite_foreign_keys(engine)
+    models.Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        db.execute(insert(models.Departement), [{"id": 1, "nom": "Département 1"}])
+        db.commit()
+
+    instructions = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def compter(conn, cursor, statement, parameters, context, executemany):
+        instructions.append(len(parameters) if executemany else 1)
+
+    variantes = [
+        ("cascade en base", lambda db, employe_id: crud.delete_employe(db, employe_id=employe_id)),
+        ("cascade ORM", delete_orm_cascade),
+    ]
+    print(f"{'historique':>10} {'variante':<16} {'ms':>9} {'instr. SQL':>10}")
+    employe_id = 1
+    for n in tailles:
+        for label, supprimer in variantes:
+            temps = []
+            for _ in range(args.repeat):
+                employe_id += 1
+                with Session() as db:
+                    seed_historique(db, employe_id, n)
+                with Session() as db:
+                    instructions.clear()
+                    t0 = time.perf_counter()
+                    supprimer(db, employe_id)
+                    temps.append((time.perf_counter() - t0) * 1e3)
+                    nb_instructions = sum(instructions)
+                with Session() as db:
+                    restant = sum(
+                        db.scalar(select(func.count()).select_from(model).where(model.employe_id == employe_id))
+                        for model in TABLES_HISTORIQUE
+                    )
+                    assert restant == 0, (label, n, restant)
+            print(f"{n:>10} {label:<16} {min(temps):9.2f} {nb_instructions:>10}")
+
+if __name__ == "__main__":
+    main()
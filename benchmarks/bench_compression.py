@@ -0,0 +1,95 @@
+# benchmarks/bench_compression.py
+"""
+Mesure, pour des réponses typiques, les octets transmis et la latence de bout en bout selon
+l'encodage (aucun, gzip, brotli si installé) et la sélection de champs (fields=).
+La latence totale est estimée comme temps serveur + transfert sur un lien de débit donné.
+
+Usage:
+    python -m benchmarks.bench_compression [--lignes 1000] [--debit-kbps 2000] [--rtt-ms 50] [--repeat 10]
+"""
+import argparse
+import os
+import timeit
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("DATABASE_URL", "sqlite://") # app.db.session exige la variable ; la base est remplacée ci-dessous
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import models
+from app.api.compression import available_encodings
+from app.db.session import get_db
+from app.main import app
+from benchmarks.bench_serialization import seed
+
+HORIZON_LONG_MOIS = 120
+
+def seed_long_simulations(db, n: int) -> None:
+    """Simulations longues (planning sur 10 ans, série mensuelle) pour l'employé 2."""
+    debut = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    db.execute(insert(models.Simulation), [
+        {"employe_id": 2, "date_simulation": debut + timedelta(hours=i),
+         "parametres_entree": {"scenario": "formation", "duree_mois": HORIZON_LONG_MOIS},
+         "resultats_simulation": {
+             "temps_relatif_mois": [float(t) for t in range(HORIZON_LONG_MOIS + 1)],
+             "performance_predite": [round(70 + 20 * (1 - 0.97 ** t) + (i % 7) * 0.1, 2) for t in range(HORIZON_LONG_MOIS + 1)],
+         }}
+        for i in range(n)
+    ])
+    db.commit()
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lignes", type=int, default=1000, help="Lignes par table (et taille de page)")
+    parser.add_argument("--debit-kbps", type=float, default=2000, help="Débit du lien simulé (kbit/s)")
+    parser.add_argument("--rtt-ms", type=float, default=50, help="Aller-retour réseau du lien simulé (ms)")
+    parser.add_argument("--repeat", type=int, default=10, help="Nombre de répétitions (on garde le minimum)")
+    args = parser.parse_args(argv)
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    models.Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        seed(db, args.lignes)
+        seed_long_simulations(db, 100)
+
+    def override_get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    client = TestClient(app)
+
+    requetes = [
+        ("pointages employé (page complète)", f"/api/v1/pointages/by_employe/1?limit={args.lignes}"),
+        ("pointages employé fields=date,arrivée,départ",
+         f"/api/v1/pointages/by_employe/1?limit={args.lignes}&fields=date_pointage,heure_arrivee,heure_depart"),
+        ("employés (500)", "/api/v1/employes/?limit=500"),
+        ("employés fields=id,nom,prenom", "/api/v1/employes/?limit=500&fields=id,nom,prenom"),
+        (f"simulations {HORIZON_LONG_MOIS} mois (100)", "/api/v1/simulations/by_employe/2?limit=100"),
+    ]
+    encodages = ("identity",) + available_encodings()
+
+    print(f"--- lien simulé : {args.debit_kbps:g} kbit/s, RTT {args.rtt_ms:g} ms ---")
+    print(f"{'réponse':<44} {'encodage':<9} {'octets':>9} {'serveur ms':>11} {'total ms':>9}")
+    for label, url in requetes:
+        for encodage in encodages:
+            headers = {"Accept-Encoding": encodage}
+            response = client.get(url, headers=headers)
+            assert response.status_code == 200, (url, response.status_code)
+            assert response.headers.get("content-encoding", "identity") == encodage or len(response.content) < 1000
+            octets = response.num_bytes_downloaded # Taille du corps tel que transmis (avant décompression)
+            serveur = min(timeit.repeat(lambda: client.get(url, headers=headers).read(), number=1, repeat=args.repeat)) * 1e3
+            total = serveur + args.rtt_ms + octets * 8 / args.debit_kbps # kbit/s = bit/ms
+            print(f"{label:<44} {encodage:<9} {octets:9d} {serveur:11.2f} {total:9.1f}")
+
+    app.dependency_overrides.clear()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# benchmarks/bench_ponctualite.py
+"""
+Mesure le calcul des écarts aux horaires (app/services/horaire_service.py) pour un département entier :
+chargement des pointages du mois, calcul vectorisé des retards / heures supplémentaires / absences,
+puis totaux par employé. Objectif : un mois pour 10 000 employés en moins d'une seconde.
+
+Usage:
+    python -m benchmarks.bench_ponctualite [--employes 10000] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, time as heure
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--employes", type=int, default=10000, help="Employés du département")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as dossier:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(dossier, 'bench.db')}"
+        from app import crud, models, schemas
+        from app.db.session import SessionLocal, engine
+        from app.services import horaire_service
+        from benchmarks import datagen
+        from benchmarks.results import summarize
+
+        models.Base.metadata.create_all(engine)
+        datagen.generate(engine, departements=1, employes=args.employes, annees=1, evaluations_par_an=1)
+        debut, fin = date(datagen.FIN_DONNEES.year, datagen.FIN_DONNEES.month, 1), datagen.FIN_DONNEES
+
+        db = SessionLocal()
+        try:
+            crud.horaire.replace_horaire_departement(db, 1, [
+                schemas.HoraireJour(jour_semaine=j, heure_debut=heure(8, 30), heure_fin=heure(17, 30), pause_minutes=60)
+                for j in range(5)
+            ])
+            crud.horaire.create_jour_ferie(db, schemas.JourFerie(jour=date(fin.year, 12, 25), libelle="Noël"))
+            # Un employé sur dix a un horaire individuel
+            for employe_id in range(1, args.employes + 1, 10):
+                crud.horaire.replace_horaire_employe(db, employe_id, [
+                    schemas.HoraireJour(jour_semaine=j, heure_debut=heure(7), heure_fin=heure(15)) for j in range(4)
+                ])
+
+            durees, chargements = [], []
+            for _ in range(args.repeat):
+                depart = time.perf_counter()
+                pointages = crud.pointage.get_pointage_intervals(db, debut, fin, departement_id=1)
+                chargements.append(time.perf_counter() - depart)
+                depart = time.perf_counter()
+                totaux = horaire_service.summarize_by_employe(
+                    horaire_service.compute_deviations(db, debut, fin, departement_id=1)
+                )
+                durees.append(time.perf_counter() - depart)
+        finally:
+            db.close()
+            engine.dispose()
+
+    requete, total = summarize(chargements), summarize(durees)
+    print(f"{len(totaux)} employés, {len(pointages)} pointages du {debut} au {fin}")
+    print(f"{'étape':<32} {'p50 ms':>8} {'min ms':>8}")
+    print(f"{'requête des pointages':<32} {requete['p50_ms']:8.1f} {min(chargements) * 1000:8.1f}")
+    print(f"{'calcul complet (service)':<32} {total['p50_ms']:8.1f} {min(durees) * 1000:8.1f}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+# benchmarks/bench_serialization.py
+"""
+Compare, pour chaque endpoint de liste, la sérialisation FastAPI habituelle (objets ORM validés
+par Pydantic via from_attributes, puis json.dumps) avec le chemin rapide (tuples de colonnes
+encodés directement, voir app/api/serialization.py). Vérifie aussi que les deux JSON sont identiques.
+
+Usage:
+    python -m benchmarks.bench_serialization [--lignes 500] [--repeat 20]
+"""
+import argparse
+import json
+import timeit
+from datetime import date, datetime, timedelta, timezone
+from typing import List
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import crud, models, schemas
+from app.api.serialization import dumps, rows_to_dicts, schema_fields
+
+def seed(db, n: int) -> None:
+    """Insère n lignes par table (un seul département, n lignes par employé pour les listes par employé)."""
+    debut = date(2024, 1, 1)
+    db.execute(insert(models.Departement), [{"id": 1, "nom": "Département 1"}] + [
+        {"id": i, "nom": f"Département {i}"} for i in range(2, n + 1)
+    ])
+    db.execute(insert(models.Employe), [
+        {"id": i, "nom": f"Nom{i}", "prenom": f"Prénom{i}", "email": f"employe{i}@example.com",
+         "date_embauche": debut - timedelta(days=i), "position": "Analyste", "departement_id": 1, "is_active": True}
+        for i in range(1, n + 1)
+    ])
+    db.execute(insert(models.Evaluation), [
+        {"employe_id": 1, "date_evaluation": debut + timedelta(days=i), "evaluateur": "Manager",
+         "score_global": 50 + i % 50, "commentaires": "RAS"}
+        for i in range(n)
+    ])
+    # Employé 1 : pointages fermés ; employé 2 : pointages ouverts (GET /pointages/open)
+    db.execute(insert(models.Pointage), [
+        {"employe_id": employe_id, "date_pointage": debut + timedelta(days=i), "seq": 1,
+         "heure_arrivee": datetime(2024, 1, 1, 8, tzinfo=timezone.utc) + timedelta(days=i),
+         "heure_depart": datetime(2024, 1, 1, 17, tzinfo=timezone.utc) + timedelta(days=i) if employe_id == 1 else None}
+        for employe_id in (1, 2) for i in range(n)
+    ])
+    db.execute(insert(models.Projection), [
+        {"employe_id": i, "horizon_mois": 12, "evaluation_id": 1, "performance_initiale": 70.0,
+         "performance_predite": [70.0 + k * 0.5 for k in range(13)]}
+        for i in range(1, n + 1)
+    ])
+    db.execute(insert(models.Simulation), [
+        {"employe_id": 1, "date_simulation": datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(hours=i),
+         "parametres_entree": {"scenario": "standard", "duree_mois": 6},
+         "resultats_simulation": {"temps_mois": list(range(7)), "performance_predite": [70.0] * 7}}
+        for i in range(n)
+    ])
+    db.commit()
+
+def endpoints(n: int):
+    """(libellé, fonction crud, arguments, schéma de réponse) de chaque endpoint de liste."""
+    return [
+        ("GET /employes/", crud.get_employes, {"limit": n}, schemas.Employe),
+        ("GET /employes/by_departement/{id}", crud.get_employes_by_departement, {"departement_id": 1, "limit": n}, schemas.Employe),
+        ("GET /departements/", crud.get_departements, {"limit": n}, schemas.Departement),
+        ("GET /departements/{id}/projections", crud.get_projections_by_departement,
+         {"departement_id": 1, "horizon_mois": 12, "limit": n}, schemas.ProjectionEmploye),
+        ("GET /evaluations/", crud.get_evaluations, {"limit": n}, schemas.Evaluation),
+        ("GET /evaluations/by_employe/{id}", crud.get_evaluations_by_employe, {"employe_id": 1, "limit": n}, schemas.Evaluation),
+        ("GET /pointages/", crud.get_pointages, {"limit": n}, schemas.Pointage),
+        ("GET /pointages/by_employe/{id}", crud.get_pointages_by_employe, {"employe_id": 1, "limit": n}, schemas.Pointage),
+        ("GET /pointages/open", crud.get_open_pointages, {"limit": n}, schemas.Pointage),
+        ("GET /simulations/by_employe/{id}", crud.get_simulations_by_employe, {"employe_id": 1, "limit": n}, schemas.Simulation),
+    ]
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lignes", type=int, default=500, help="Taille de page (lignes par réponse)")
+    parser.add_argument("--repeat", type=int, default=20, help="Nombre de répétitions (on garde le minimum)")
+    args = parser.parse_args(argv)
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    models.Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    seed(db, args.lignes)
+
+    print(f"--- {args.lignes} lignes par réponse, temps par ligne (µs) ---")
+    print(f"{'endpoint':<36} {'sérial. std':>11} {'rapide':>8} {'gain':>6}   {'requête+sérial. std':>19} {'rapide':>8} {'gain':>6}")
+    for label, fn, kwargs, schema in endpoints(args.lignes):
+        adapter = TypeAdapter(List[schema])
+        fields = schema_fields(schema)
+
+        # Chemin standard de FastAPI : validation from_attributes, dump en mode JSON, json.dumps
+        def serialize_standard(objets):
+            return JSONResponse(adapter.dump_python(adapter.validate_python(objets, from_attributes=True), mode="json")).body
+
+        def serialize_fast(lignes):
+            return dumps(rows_to_dicts(lignes, fields))
+
+        def full_standard():
+            db.expunge_all() # Pas d'identity map déjà remplie d'une répétition à l'autre
+            return serialize_standard(fn(db, **kwargs))
+
+        def full_fast():
+            return serialize_fast(fn(db, fields=fields, **kwargs))
+
+        objets, lignes = fn(db, **kwargs), fn(db, fields=fields, **kwargs)
+        assert len(objets) == args.lignes, label
+        assert json.loads(serialize_standard(objets)) == json.loads(serialize_fast(lignes)), f"JSON différent : {label}"
+
+        temps = [
+            min(timeit.repeat(f, number=1, repeat=args.repeat)) * 1e6 / args.lignes
+            for f in (lambda: serialize_standard(objets), lambda: serialize_fast(lignes), full_standard, full_fast)
+        ]
+        print(f"{label:<36} {temps[0]:11.2f} {temps[1]:8.2f} {temps[0] / temps[1]:5.1f}x"
+              f"   {temps[2]:19.2f} {temps[3]:8.2f} {temps[2] / temps[3]:5.1f}x")
+
+if __name__ == "__main__":
+    main()
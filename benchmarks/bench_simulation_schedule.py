@@ -0,0 +1,74 @@
+# benchmarks/bench_simulation_schedule.py
+"""
+Compare le coût d'une simulation à planning (2 segments, intégration relancée à la borne)
+avec celui d'une simulation à scénario unique, et avec l'approche naïve d'un second membre
+discontinu en t intégré d'un seul tenant.
+
+Usage:
+    python -m benchmarks.bench_simulation_schedule [--employes 1000] [--repeat 20]
+"""
+import argparse
+import timeit
+
+import numpy as np
+from scipy.integrate import solve_ivp
+
+from app.schemas.simulation import SimulationParams
+from app.services import simulation_service
+
+DUREE_MOIS = 9
+PLANNING = {
+    "duree_mois": DUREE_MOIS,
+    "planning": [
+        {"debut_mois": 0, "fin_mois": 3, "scenario": "formation"},
+        {"debut_mois": 3, "fin_mois": DUREE_MOIS, "scenario": "augmentation_charge"},
+    ],
+}
+
+def run_single_segment(y0):
+    params = SimulationParams(scenario="formation", duree_mois=DUREE_MOIS)
+    return simulation_service.solve_performance_schedules(y0, [params] * len(y0))
+
+def run_schedule(y0):
+    params = SimulationParams(**PLANNING)
+    return simulation_service.solve_performance_schedules(y0, [params] * len(y0))
+
+def run_discontinuous_rhs(y0, **solver_options):
+    """Approche naïve : coefficients choisis dans le second membre selon t (discontinuité à t=3)."""
+    impacts, stress = np.array([2.0, -1.0]), np.array([0.0, 0.5])
+
+    def rhs(t, P):
+        k = 0 if t < 3 else 1
+        return simulation_service.performance_differential_equation_vectorized(
+            t, P, simulation_service.BASE_GROWTH_RATE, simulation_service.BASE_DECAY_RATE, impacts[k], stress[k]
+        )
+
+    sol = solve_ivp(rhs, (0, DUREE_MOIS), y0, method='RK45', t_eval=np.arange(DUREE_MOIS + 1.0), **solver_options)
+    return sol.t, np.clip(sol.y, 0, 100)
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--employes", type=int, default=1000, help="Taille du lot vectorisé")
+    parser.add_argument("--repeat", type=int, default=20, help="Nombre de répétitions (on garde le minimum)")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(42)
+    for n in sorted({1, args.employes}):
+        y0 = rng.uniform(40, 90, size=n)
+        # Solution de référence du planning : pas d'intégration très fin
+        _, reference = run_discontinuous_rhs(y0, max_step=0.01)
+        print(f"--- {n} employé(s), horizon {DUREE_MOIS} mois ---")
+        for label, fn, compare in [
+            ("scénario unique", run_single_segment, False),
+            ("planning 2 segments", run_schedule, True),
+            ("second membre discontinu", run_discontinuous_rhs, True),
+        ]:
+            best = min(timeit.repeat(lambda: fn(y0), number=1, repeat=args.repeat))
+            line = f"{label:<26} {best * 1e3:8.2f} ms"
+            if compare:
+                _, performances = fn(y0)
+                line += f"   erreur max vs référence: {np.abs(performances - reference).max():.4f}"
+            print(line)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# benchmarks/bench_single_flight.py
+"""
+Mesure le regroupement des requêtes identiques (app/api/single_flight.py) : un pic de requêtes
+identiques simultanées (même page d'employés d'un département, même simulation) sans puis avec
+regroupement, et le nombre de requêtes servies par un calcul déjà en cours.
+
+Usage:
+    python -m benchmarks.bench_single_flight [--requetes 200] [--concurrence 8]
+"""
+import argparse
+import asyncio
+import contextlib
+import os
+import sys
+import tempfile
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requetes", type=int, default=200, help="Requêtes par scénario")
+    parser.add_argument("--concurrence", type=int, default=8, help="Requêtes identiques simultanées (sous la taille du pool)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as dossier:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(dossier, 'bench.db')}"
+        os.environ["ADMISSION_CONTROL_ENABLED"] = "0"
+        from app import models
+        from app.api.single_flight import single_flight
+        from app.core.config import settings
+        from app.db.session import engine
+        from app.main import app
+        from benchmarks import datagen
+        from benchmarks.load import drive
+
+        models.Base.metadata.create_all(engine)
+        datagen.generate(engine, **datagen.PROFILS["petit"])
+
+        scenarios = {
+            "employes par departement": lambda rng: ("GET", "/api/v1/employes/by_departement/1?limit=100", None),
+            "simulation": lambda rng: ("POST", "/api/v1/simulations/run", {
+                "employe_id": 1,
+                "parametres": {"duree_mois": 24, "planning": [{"debut_mois": 0, "fin_mois": 12, "scenario": "formation"}]}
+            }),
+        }
+        mesures = []
+        with contextlib.redirect_stdout(open(os.devnull, "w")): # La simulation écrit beaucoup
+            for nom, scenario in scenarios.items():
+                for actif in (False, True):
+                    settings.SINGLE_FLIGHT_ENABLED = actif
+                    mesures.append((nom, actif, asyncio.run(drive(app, scenario, args.requetes, args.concurrence))))
+        stats = single_flight.stats()
+        engine.dispose()
+
+    print(f"{'scénario':<28} {'regroupement':>12} {'p50 ms':>8} {'p95 ms':>8} {'req/s':>8} {'erreurs':>8}")
+    for nom, actif, m in mesures:
+        print(f"{nom:<28} {'oui' if actif else 'non':>12} {m['p50_ms']:8.2f} {m['p95_ms']:8.2f} {m['debit_rps']:8.1f} {m['erreurs']:8}")
+    print(f"compteurs : {stats['operations']}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,321 @@
+# benchmarks/datagen.py
+"""
+Générateur de données synthétiques reproductibles (graine fixe) : N départements, M employés et
+plusieurs années de pointages et d'évaluations, écrits directement par INSERT groupés (sans passer
+par l'API ni par l'ORM). Utilisé par la suite de benchmarks (benchmarks/suite.py), ou seul pour
+remplir une base de test ou de dimensionnement (profil "capacite" : 100 000 employés, ~50 M de
+pointages, 1 M d'évaluations).
+
+Distributions :
+- pointages les jours ouvrés (heures locales du fuseau par défaut, enregistrées en UTC, jour_local
+  renseigné), absences aléatoires ; arrivée selon un mélange (horaires habituels
+  autour de 8h40, équipe du matin vers 7h, retardataires au-delà de 9h) décalé par une habitude
+  propre à chaque employé ; journées plus courtes le vendredi ; quelques départs oubliés le dernier jour ;
+- évaluations à intervalle régulier (légèrement variable), score en marche aléatoire par employé.
+
+Les clés étrangères sont respectées par construction (ids attribués par le générateur) ; les compteurs
+d'ids (séquences PostgreSQL, 'shard_sequences') sont ensuite avancés au-delà des ids écrits. Sur SQLite,
+les lignes sont écrites par executemany sur la connexion du pilote, journal et synchronisation
+désactivés le temps du chargement : une interruption peut laisser la base inutilisable (la recréer).
+Cible : une base non shardée (en mode shardé, générer dans chaque shard avec des plages d'ids distinctes
+n'est pas pris en charge ; utiliser app.scripts.rebalance_shards après un chargement en base unique).
+
+Usage:
+    python -m benchmarks.datagen [--database-url sqlite:///./bench.db] [--profil moyen] [--seed 42]
+    python -m benchmarks.datagen --database-url sqlite:///./bench.db --departements 10 --employes 500 --annees 2
+    DATABASE_URL=postgresql://... python -m benchmarks.datagen --profil capacite
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import func, insert, select, text, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+# L'application (app.db.session lit DATABASE_URL à l'import) n'est importée qu'à l'usage : la suite de
+# benchmarks choisit sa base après avoir importé ce module
+
+# Tailles prédéfinies (pointages ≈ employés × 250 jours ouvrés × 0,95 × années)
+PROFILS = {
+    "petit": {"departements": 5, "employes": 200, "annees": 1, "evaluations_par_an": 4},
+    "moyen": {"departements": 20, "employes": 2000, "annees": 2, "evaluations_par_an": 4},
+    "grand": {"departements": 50, "employes": 10000, "annees": 3, "evaluations_par_an": 4},
+    "capacite": {"departements": 200, "employes": 100000, "annees": 2, "evaluations_par_an": 5},
+}
+FIN_DONNEES = date(2025, 12, 31) # Dernier jour de données (fixe : mêmes données d'un run à l'autre)
+TAUX_ABSENCE = 0.05
+TAUX_OUVERT_DERNIER_JOUR = 0.02 # Départ oublié le dernier jour : alimente les pointages ouverts
+CHUNK_SIZE = 50000 # Lignes par INSERT groupé
+POSTES = ("Développeur", "Analyste", "Technicien", "Chef de projet", "Assistant", "Commercial")
+
+# Heure d'arrivée (minutes après minuit) : (proportion, moyenne, écart type) ; les retardataires
+# arrivent après RETARD_DEBUT, avec un retard de loi exponentielle
+ARRIVEES = ((0.80, 8 * 60 + 40, 18), (0.15, 7 * 60, 15))
+RETARD_DEBUT, RETARD_MOYEN = 9 * 60, 40
+HABITUDE_ECART_TYPE = 15 # Décalage propre à chaque employé (minutes)
+DUREE_MOYENNE, DUREE_ECART_TYPE = 8 * 60 + 15, 30 # Durée de présence (minutes)
+RACCOURCI_VENDREDI = 45
+
+# Pragmas du chargement SQLite (rétablis ensuite, sauf ceux propres à la connexion)
+PRAGMAS_CHARGEMENT = ("journal_mode = OFF", "synchronous = OFF", "foreign_keys = OFF",
+                      "temp_store = MEMORY", "cache_size = -262144")
+
+class _Writer:
+    """
+    Écriture de lots de lignes (tuples dans l'ordre des colonnes). Valeurs temporelles reçues en
+    numpy (datetime64[D] pour les dates, entiers en minutes UTC depuis l'époque pour les horodatages).
+    """
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.sqlite = engine.dialect.name == "sqlite"
+
+    def __enter__(self):
+        self.conn = self.engine.connect()
+        if self.sqlite:
+            self.dbapi = self.conn.connection.driver_connection
+            self.journal_mode = self.dbapi.execute("PRAGMA journal_mode").fetchone()[0]
+            for pragma in PRAGMAS_CHARGEMENT:
+                self.dbapi.execute(f"PRAGMA {pragma}")
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.sqlite:
+            if exc_type is None:
+                self.dbapi.commit()
+            else:
+                self.dbapi.rollback()
+            self.dbapi.execute(f"PRAGMA journal_mode = {self.journal_mode}")
+            self.dbapi.execute("PRAGMA synchronous = FULL")
+            self.dbapi.execute("PRAGMA foreign_keys = ON")
+        elif exc_type is None:
+            self.conn.commit()
+        self.conn.close()
+
+    def dates(self, jours: np.ndarray) -> List[Any]:
+        if self.sqlite:
+            return np.datetime_as_string(jours, unit="D").tolist() # Format de stockage de SQLAlchemy
+        return jours.astype(object).tolist()
+
+    def datetimes(self, minutes: np.ndarray, absents: Optional[np.ndarray] = None) -> List[Any]:
+        instants = minutes.astype("datetime64[m]")
+        if self.sqlite:
+            valeurs = [texte.replace("T", " ") + ":00.000000" for texte in np.datetime_as_string(instants, unit="m").tolist()]
+        else:
+            valeurs = [instant.replace(tzinfo=timezone.utc) for instant in instants.astype(object).tolist()]
+        if absents is not None:
+            for rang in np.flatnonzero(absents).tolist():
+                valeurs[rang] = None
+        return valeurs
+
+    def insert(self, model, colonnes: Sequence[str], lignes: List[tuple]) -> None:
+        if not lignes:
+            return
+        if self.sqlite:
+            table = model.__table__.name
+            self.dbapi.executemany(
+                f"INSERT INTO {table} ({', '.join(colonnes)}) VALUES ({', '.join('?' * len(colonnes))})", lignes
+            )
+        else:
+            self.conn.execute(insert(model), [dict(zip(colonnes, ligne)) for ligne in lignes])
+
+def _jours_ouvres(debut: date, fin: date) -> np.ndarray:
+    jours = np.arange(np.datetime64(debut, "D"), np.datetime64(fin, "D") + 1)
+    return jours[np.is_busday(jours)]
+
+def _minutes(jours: np.ndarray) -> np.ndarray:
+    """Minutes depuis l'époque au début de chaque jour."""
+    return jours.astype("datetime64[m]").astype(np.int64)
+
+def _heures_arrivee(rng: np.random.Generator, n: int) -> np.ndarray:
+    """Heures d'arrivée (minutes après minuit) tirées selon le mélange ARRIVEES + retardataires."""
+    composante = rng.choice(len(ARRIVEES) + 1, size=n, p=[p for p, _, _ in ARRIVEES] + [1 - sum(p for p, _, _ in ARRIVEES)])
+    moyennes = np.array([m for _, m, _ in ARRIVEES] + [RETARD_DEBUT], dtype=float)[composante]
+    ecarts = np.array([e for _, _, e in ARRIVEES] + [0], dtype=float)[composante]
+    heures = moyennes + ecarts * rng.standard_normal(n)
+    retard = composante == len(ARRIVEES)
+    heures[retard] += rng.exponential(RETARD_MOYEN, size=int(retard.sum()))
+    return heures
+
+def _pointages(
+    rng: np.random.Generator, writer: _Writer, employe_ids: np.ndarray, jours: np.ndarray, decalages: np.ndarray
+) -> List[tuple]:
+    """
+    Pointages d'un bloc d'employés sur tous les jours ouvrés (une ligne par employé et jour de présence) ;
+    heures tirées en heure locale puis enregistrées en UTC (decalages : minutes par rapport à UTC par jour).
+    """
+    n_jours = len(jours)
+    employes = np.repeat(employe_ids, n_jours)
+    indices_jour = np.tile(np.arange(n_jours), len(employe_ids))
+    presents = rng.random(employes.size) >= TAUX_ABSENCE
+    employes, indices_jour = employes[presents], indices_jour[presents]
+    n = employes.size
+
+    habitudes = rng.normal(0, HABITUDE_ECART_TYPE, size=len(employe_ids))
+    habitude = habitudes[np.searchsorted(employe_ids, employes)]
+    arrivees = np.clip(_heures_arrivee(rng, n) + habitude, 5 * 60, 12 * 60).round().astype(np.int64)
+    vendredi = (jours[indices_jour].astype(np.int64) + 3) % 7 == 4 # 1970-01-01 était un jeudi
+    durees = rng.normal(DUREE_MOYENNE, DUREE_ECART_TYPE, size=n) - RACCOURCI_VENDREDI * vendredi
+    durees = np.clip(durees, 4 * 60, 11 * 60).round().astype(np.int64)
+    ouverts = (indices_jour == n_jours - 1) & (rng.random(n) < TAUX_OUVERT_DERNIER_JOUR)
+
+    debut_jour = (_minutes(jours) - decalages)[indices_jour] # Minuit local, en minutes UTC
+    dates = writer.dates(jours[indices_jour])
+    return list(zip(
+        employes.tolist(), dates, dates, [1] * n,
+        writer.datetimes(debut_jour + arrivees), writer.datetimes(debut_jour + arrivees + durees, absents=ouverts),
+        [False] * n
+    ))
+
+def _evaluations(
+    rng: np.random.Generator, writer: _Writer, employe_ids: np.ndarray, debut: date, fin: date, par_an: float
+) -> List[tuple]:
+    """Évaluations d'un bloc d'employés : même nombre par employé, dates décalées et bruitées, score en marche aléatoire."""
+    intervalle = 365 / par_an
+    n_eval = max(1, int((fin - debut).days / intervalle))
+    decalages = rng.uniform(0, intervalle, size=(len(employe_ids), 1))
+    jitter = rng.normal(0, 7, size=(len(employe_ids), n_eval))
+    jours_offset = np.clip((decalages + np.arange(n_eval) * intervalle + jitter).round(), 0, (fin - debut).days).astype(np.int64)
+    scores = rng.uniform(45, 85, size=(len(employe_ids), 1)) + np.cumsum(rng.normal(0, 5, size=(len(employe_ids), n_eval)), axis=1)
+    scores = np.clip(scores, 0, 100).round(1)
+
+    employes = np.repeat(employe_ids, n_eval)
+    jours = np.datetime64(debut, "D") + jours_offset.ravel()
+    n = employes.size
+    return list(zip(
+        employes.tolist(), writer.dates(jours), [f"Manager {employe_id % 37}" for employe_id in employes.tolist()],
+        scores.ravel().tolist(), [None] * n
+    ))
+
+def _par_blocs(employes: int, lignes_par_employe: int, chunk_size: int):
+    """Blocs d'ids d'employés consécutifs produisant environ chunk_size lignes chacun."""
+    taille = max(1, chunk_size // max(1, lignes_par_employe))
+    for premier in range(1, employes + 1, taille):
+        yield np.arange(premier, min(premier + taille, employes + 1), dtype=np.int64)
+
+def _advance_sequences(engine: Engine, tables: Sequence[Any]) -> None:
+    """Fait repartir les compteurs d'ids après le plus grand id écrit (sinon le premier INSERT de l'API échouerait)."""
+    from app import models
+
+    sequence = models.ShardSequence
+    with engine.begin() as conn:
+        for table in tables:
+            maximum = conn.scalar(select(func.max(table.c.id)))
+            if maximum is None:
+                continue
+            if engine.dialect.name == "postgresql":
+                conn.execute(text("SELECT setval(pg_get_serial_sequence(:table, 'id'), :maximum)"), {"table": table.name, "maximum": maximum})
+            # Base destinée au sharding (voir app/db/sharding.py) : ids alloués par blocs depuis 'shard_sequences'
+            conn.execute(
+                update(sequence).where(sequence.nom == table.name, sequence.prochain_id <= maximum).values(prochain_id=maximum + 1)
+            )
+
+def generate(
+    engine: Engine, departements: int, employes: int, annees: int, evaluations_par_an: float = 4,
+    seed: int = 42, chunk_size: int = CHUNK_SIZE, verbose: bool = False
+) -> Dict[str, int]:
+    """
+    Remplit une base vide (schéma déjà créé) ; mêmes paramètres et même graine = mêmes données.
+
+    Returns:
+        Le nombre de lignes insérées par table.
+    """
+    from app import crud, models
+    from app.core import timezones
+    from app.core.config import settings
+
+    rng = np.random.default_rng(seed)
+    debut = FIN_DONNEES - timedelta(days=365 * annees - 1)
+    jours = _jours_ouvres(debut, FIN_DONNEES)
+    # Employés et départements sans fuseau : fuseau par défaut
+    decalages = np.array([timezones.utc_offset_minutes(settings.DEFAULT_TIMEZONE, jour) for jour in jours.tolist()], dtype=np.int64)
+    comptes = {}
+
+    def progression(table: str, n: int, depart: float) -> None:
+        if verbose:
+            duree = time.perf_counter() - depart
+            print(f"  {table}: {n} ligne(s) en {duree:.1f}s ({n / max(duree, 1e-9) * 60:,.0f} lignes/min)".replace(",", " "))
+
+    with _Writer(engine) as writer:
+        depart = time.perf_counter()
+        writer.insert(models.Departement, ("id", "nom"), [(i, f"Département {i}") for i in range(1, departements + 1)])
+        comptes["departements"] = departements
+
+        total = 0
+        for bloc in _par_blocs(employes, 1, chunk_size):
+            n = bloc.size
+            embauches = np.datetime64(debut, "D") - rng.integers(0, 3650, size=n)
+            writer.insert(models.Employe, ("id", "nom", "prenom", "email", "date_embauche", "position", "departement_id", "is_active"), list(zip(
+                bloc.tolist(), [f"Nom{i}" for i in bloc.tolist()], [f"Prénom{i}" for i in bloc.tolist()],
+                [f"employe{i}@example.com" for i in bloc.tolist()], writer.dates(embauches),
+                [POSTES[k] for k in rng.integers(0, len(POSTES), size=n).tolist()],
+                (1 + (bloc - 1) % departements).tolist(), (rng.random(n) > 0.03).tolist()
+            )))
+            total += n
+        comptes["employes"] = total
+        progression("departements + employes", departements + total, depart)
+
+        depart, total = time.perf_counter(), 0
+        for bloc in _par_blocs(employes, len(jours), chunk_size):
+            lignes = _pointages(rng, writer, bloc, jours, decalages)
+            writer.insert(models.Pointage, ("employe_id", "date_pointage", "jour_local", "seq", "heure_arrivee", "heure_depart", "cloture_automatique"), lignes)
+            total += len(lignes)
+        comptes["pointages"] = total
+        progression("pointages", total, depart)
+
+        depart, total = time.perf_counter(), 0
+        for bloc in _par_blocs(employes, int(annees * evaluations_par_an), chunk_size):
+            lignes = _evaluations(rng, writer, bloc, debut, FIN_DONNEES, evaluations_par_an)
+            writer.insert(models.Evaluation, ("employe_id", "date_evaluation", "evaluateur", "score_global", "commentaires"), lignes)
+            total += len(lignes)
+        comptes["evaluations"] = total
+        progression("evaluations", total, depart)
+
+    _advance_sequences(engine, [model.__table__ for model in (models.Departement, models.Employe, models.Pointage, models.Evaluation)])
+    with sessionmaker(bind=engine)() as db:
+        comptes["employe_latest_evaluation"] = crud.rebuild_latest_evaluations(db)
+    return comptes
+
+def is_empty(engine: Engine) -> bool:
+    from app import models
+
+    with engine.connect() as conn:
+        return not conn.scalar(select(func.count()).select_from(models.Employe))
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Remplit une base avec des données synthétiques reproductibles.")
+    parser.add_argument("--database-url", default=os.environ.get("DATABASE_URL"),
+                        help="Base cible (défaut : DATABASE_URL ; tables créées si besoin, doit être vide)")
+    parser.add_argument("--profil", choices=sorted(PROFILS), default="petit")
+    parser.add_argument("--departements", type=int, help="Remplace la valeur du profil")
+    parser.add_argument("--employes", type=int, help="Remplace la valeur du profil")
+    parser.add_argument("--annees", type=int, help="Remplace la valeur du profil")
+    parser.add_argument("--evaluations-par-an", type=float, help="Remplace la valeur du profil")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Lignes par INSERT groupé")
+    args = parser.parse_args(argv)
+    if not args.database_url:
+        parser.error("--database-url ou la variable d'environnement DATABASE_URL est requise")
+    os.environ.setdefault("DATABASE_URL", args.database_url) # Exigée à l'import de app.db.session
+    from app import models
+    from app.db.session import make_engine
+
+    engine = make_engine(args.database_url)
+    models.Base.metadata.create_all(engine) # Sans effet sur une base déjà migrée (alembic upgrade head)
+    if not is_empty(engine):
+        print("La base contient déjà des employés : génération annulée.")
+        return 1
+    taille = {cle: getattr(args, cle) or valeur for cle, valeur in PROFILS[args.profil].items()}
+    print(f"Génération ({args.profil}, graine {args.seed}) : {taille}")
+    debut = time.perf_counter()
+    comptes = generate(engine, seed=args.seed, chunk_size=args.chunk_size, verbose=True, **taille)
+    print(f"Données générées en {time.perf_counter() - debut:.1f}s: " + ", ".join(f"{nom}={n}" for nom, n in comptes.items()))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+# benchmarks/load.py
+"""
+Générateur de charge en processus : envoie des requêtes à l'application ASGI (httpx.ASGITransport,
+sans serveur ni réseau) avec un nombre fixe de requêtes simultanées, et mesure la latence de chaque
+réponse. Mesure la pile applicative complète (middlewares, validation, sérialisation, base), pas le
+serveur HTTP ; utilisé par benchmarks/suite.py.
+"""
+import asyncio
+import collections
+import random
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import httpx
+
+from benchmarks.results import summarize
+
+# Un scénario tire une requête : (méthode, chemin, corps JSON ou None)
+Scenario = Callable[[random.Random], Tuple[str, str, Optional[Dict[str, Any]]]]
+
+async def drive(
+    app, scenario: Scenario, requetes: int, concurrence: int, seed: int = 42, adresse: Tuple[str, int] = ("127.0.0.1", 123)
+) -> Dict[str, Any]:
+    """
+    Exécute 'requetes' requêtes tirées par 'scenario', au plus 'concurrence' à la fois, depuis
+    'adresse' (vue par l'application comme l'adresse du client, ex. pour les limites de débit).
+
+    Returns:
+        Les statistiques de latence (voir results.summarize), le débit global (requêtes/s), le
+        nombre de réponses en erreur (statut >= 400 ou exception) et le décompte des statuts.
+    """
+    rng = random.Random(seed)
+    tirages = [scenario(rng) for _ in range(requetes)] # Tirés d'avance : même séquence d'un run à l'autre
+    durees, erreurs, statuts = [], 0, collections.Counter()
+    file = iter(tirages)
+
+    async def client_worker(client: httpx.AsyncClient) -> None:
+        nonlocal erreurs
+        for methode, url, corps in file: # Itérateur partagé entre les tâches (boucle d'événements unique)
+            debut = time.perf_counter()
+            try:
+                reponse = await client.request(methode, url, json=corps)
+                await reponse.aread()
+                statuts[str(reponse.status_code)] += 1
+                if reponse.status_code >= 400:
+                    erreurs += 1
+            except Exception:
+                erreurs += 1
+                statuts["exception"] += 1
+            durees.append(time.perf_counter() - debut)
+
+    transport = httpx.ASGITransport(app=app, client=adresse)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        debut = time.perf_counter()
+        await asyncio.gather(*(client_worker(client) for _ in range(concurrence)))
+        total = time.perf_counter() - debut
+    stats = summarize(durees)
+    stats.update({"debit_rps": round(requetes / total, 1), "erreurs": erreurs, "statuts": dict(statuts), "concurrence": concurrence})
+    return stats
@@ -0,0 +1,102 @@
+# benchmarks/results.py
+"""
+Format JSON des résultats de la suite de benchmarks (benchmarks/suite.py) et comparaison avec une
+référence enregistrée.
+
+    {
+      "version": 1,
+      "meta": {"date": ..., "commit": ..., "python": ..., "plateforme": ..., "base": ..., "parametres": {...}},
+      "resultats": {
+        "crud.get_employe": {"type": "micro", "n": 200, "moyenne_ms": ..., "p50_ms": ..., "p95_ms": ...,
+                             "p99_ms": ..., "ops_s": ...},
+        "http GET /employes/{id}": {"type": "charge", "n": 500, "erreurs": 0, "debit_rps": ..., "p50_ms": ..., ...}
+      }
+    }
+
+Les comparaisons portent sur une métrique de latence (p50_ms par défaut) : un écart relatif au-delà
+du seuil est signalé comme régression (plus lent) ou amélioration (plus rapide).
+"""
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+FORMAT_VERSION = 1
+
+def summarize(durees_s: Sequence[float]) -> Dict[str, float]:
+    """Statistiques d'une série de durées (secondes) : latences en millisecondes et opérations par seconde."""
+    ms = np.asarray(durees_s, dtype=float) * 1e3
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {
+        "n": int(ms.size),
+        "moyenne_ms": round(float(ms.mean()), 4),
+        "p50_ms": round(float(p50), 4),
+        "p95_ms": round(float(p95), 4),
+        "p99_ms": round(float(p99), 4),
+        "ops_s": round(float(1e3 / ms.mean()), 1),
+    }
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True, timeout=5
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def new_results(base: str, parametres: Dict[str, Any]) -> Dict[str, Any]:
+    """Document de résultats vide, avec le contexte d'exécution (pour juger si deux runs sont comparables)."""
+    return {
+        "version": FORMAT_VERSION,
+        "meta": {
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "plateforme": platform.platform(),
+            "processeur": platform.processor() or platform.machine(),
+            "base": base,
+            "parametres": parametres,
+        },
+        "resultats": {},
+    }
+
+def save(resultats: Dict[str, Any], chemin: str) -> None:
+    with open(chemin, "w", encoding="utf-8") as fichier:
+        json.dump(resultats, fichier, indent=2, ensure_ascii=False)
+
+def load(chemin: str) -> Dict[str, Any]:
+    with open(chemin, encoding="utf-8") as fichier:
+        resultats = json.load(fichier)
+    if resultats.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Format de résultats non pris en charge : version {resultats.get('version')} (attendu {FORMAT_VERSION}).")
+    return resultats
+
+def compare(
+    reference: Dict[str, Any], actuel: Dict[str, Any], seuil: float = 0.10, metrique: str = "p50_ms"
+) -> List[Tuple[str, float, float, float, str]]:
+    """
+    Compare deux runs benchmark par benchmark (ceux présents dans les deux).
+
+    Returns:
+        Des tuples (nom, référence, actuel, écart relatif, verdict) ; verdict vaut "regression",
+        "amelioration" ou "" (écart dans le seuil).
+    """
+    lignes = []
+    for nom, mesure in actuel["resultats"].items():
+        base = reference["resultats"].get(nom)
+        if base is None or not base.get(metrique):
+            continue
+        ecart = (mesure[metrique] - base[metrique]) / base[metrique]
+        verdict = "regression" if ecart > seuil else "amelioration" if ecart < -seuil else ""
+        lignes.append((nom, base[metrique], mesure[metrique], ecart, verdict))
+    return lignes
+
+def print_comparison(lignes: List[Tuple[str, float, float, float, str]], metrique: str = "p50_ms") -> None:
+    largeur = max((len(nom) for nom, *_ in lignes), default=10)
+    print(f"{'benchmark':<{largeur}} {'référence':>11} {'actuel':>11} {'écart':>8}  ({metrique})")
+    for nom, base, mesure, ecart, verdict in lignes:
+        print(f"{nom:<{largeur}} {base:>11.3f} {mesure:>11.3f} {ecart:>+8.1%}  {verdict}")
@@ -0,0 +1,253 @@
+# benchmarks/suite.py
+"""
+Suite de benchmarks reproductible des chemins chauds : microbenchmarks de chaque fonction crud et de
+simulation_service.run_performance_simulation, puis charge HTTP en processus sur les principaux
+endpoints (débit, latences p50/p95/p99). Les données sont générées par benchmarks/datagen.py (graine
+fixe) ; les résultats sont écrits au format JSON de benchmarks/results.py et peuvent être comparés à
+une référence enregistrée (code de sortie 1 en cas de régression avec --fail-on-regression).
+
+Sans --database-url, une base SQLite temporaire est créée et remplie à chaque run. Avec une base
+existante, elle n'est remplie que si elle est vide ; les microbenchmarks d'écriture y ajoutent des lignes.
+
+Usage:
+    python -m benchmarks.suite [--profil petit] [--repeat 200] [--requetes 1000] [--concurrence 10] --out resultats.json
+    python -m benchmarks.suite --baseline reference.json [--seuil 0.10] [--fail-on-regression]
+    python -m benchmarks.suite --only micro --filtre pointage
+"""
+import argparse
+import asyncio
+import contextlib
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, time as dtime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Tuple
+
+from benchmarks import datagen, results
+
+def _silence():
+    """Les fonctions mesurées écrivent beaucoup sur la sortie standard (simulation) : on l'ignore pendant la mesure."""
+    return contextlib.redirect_stdout(open(os.devnull, "w"))
+
+def _micro_benchmarks(taille: Dict[str, int], jeton: str) -> List[Tuple[str, Callable]]:
+    """
+    Liste (nom, fonction(db, i)) des microbenchmarks. Chaque appel reçoit une session neuve et le rang
+    de l'itération ; les écritures créent leurs propres lignes (suffixées par 'jeton', unique par run)
+    et les benchmarks de mise à jour/suppression qui suivent réutilisent celles-ci.
+    """
+    from app import crud, schemas
+    from app.schemas.simulation import SimulationParams
+    from app.services import simulation_service
+
+    rng = random.Random(42)
+    n_emp, n_dep = taille["employes"], taille["departements"]
+    employe = lambda: rng.randint(1, n_emp)
+    departement = lambda: rng.randint(1, n_dep)
+    jour = lambda: datagen.FIN_DONNEES - timedelta(days=rng.randint(0, 300))
+    crees: Dict[str, List[int]] = {"employes": [], "pointages": [], "evaluations": [], "departements": []}
+    # Badgeages et pointages créés après la fin des données générées : pas de collision avec celles-ci
+    jour_ecriture = datetime.combine(datagen.FIN_DONNEES + timedelta(days=30), dtime(8), tzinfo=timezone.utc)
+    standard = SimulationParams(scenario="standard", duree_mois=6)
+    planning = SimulationParams(duree_mois=24, planning=[
+        {"debut_mois": 0, "fin_mois": 3, "scenario": "formation"},
+        {"debut_mois": 3, "fin_mois": 15, "scenario": "augmentation_charge"},
+        {"debut_mois": 15, "fin_mois": 24, "scenario": "standard"},
+    ])
+
+    def creer(ressource: str, objet) -> None:
+        crees[ressource].append(objet.id)
+
+    def badge(db, i):
+        # Entrée puis sortie, un employé par paire d'appels
+        employe_id, tour = 1 + (i // 2) % n_emp, i // (2 * n_emp)
+        horodatage = jour_ecriture + timedelta(days=tour, hours=0 if i % 2 == 0 else 9)
+        crud.record_badge(db, schemas.PointageBadge(
+            employe_id=employe_id, horodatage=horodatage, direction="entree" if i % 2 == 0 else "sortie",
+            idempotency_key=f"bench-{jeton}-{i}"
+        ))
+
+    def create_pointage(db, i):
+        arrivee = jour_ecriture + timedelta(days=400 + i // n_emp)
+        creer("pointages", crud.create_pointage(db, schemas.PointageCreate(
+            employe_id=1 + i % n_emp, date_pointage=arrivee.date(), heure_arrivee=arrivee
+        )))
+
+    def update_pointage(db, i):
+        pointages = crees["pointages"]
+        pointage = crud.get_pointage(db, pointages[i % len(pointages)])
+        crud.update_pointage(db, pointage.id, schemas.PointageUpdate(heure_depart=pointage.heure_arrivee + timedelta(hours=8)))
+
+    return [
+        # --- Lectures ---
+        ("crud.get_employe", lambda db, i: crud.get_employe(db, employe())),
+        ("crud.get_employe_by_email", lambda db, i: crud.get_employe_by_email(db, f"employe{employe()}@example.com")),
+        ("crud.get_employes", lambda db, i: crud.get_employes(db, skip=rng.randint(0, max(0, n_emp - 100)), limit=100)),
+        ("crud.get_employes_by_departement", lambda db, i: crud.get_employes_by_departement(db, departement())),
+        ("crud.get_departement", lambda db, i: crud.get_departement(db, departement())),
+        ("crud.get_departement_by_nom", lambda db, i: crud.get_departement_by_nom(db, f"Département {departement()}")),
+        ("crud.get_departements", lambda db, i: crud.get_departements(db)),
+        ("crud.get_pointage", lambda db, i: crud.get_pointage(db, rng.randint(1, n_emp * 200))),
+        ("crud.get_pointages", lambda db, i: crud.get_pointages(db, skip=rng.randint(0, n_emp * 200), limit=100)),
+        ("crud.get_pointages_by_employe", lambda db, i: crud.get_pointages_by_employe(db, employe())),
+        ("crud.get_pointage_by_employe_and_date", lambda db, i: crud.get_pointage_by_employe_and_date(db, employe(), jour())),
+        ("crud.get_open_pointages", lambda db, i: crud.get_open_pointages(db)),
+        ("crud.get_evaluation", lambda db, i: crud.get_evaluation(db, rng.randint(1, n_emp * 4))),
+        ("crud.get_evaluations", lambda db, i: crud.get_evaluations(db, limit=100)),
+        ("crud.get_evaluations_by_employe", lambda db, i: crud.get_evaluations_by_employe(db, employe())),
+        ("crud.get_latest_evaluation", lambda db, i: crud.get_latest_evaluation(db, employe())),
+        ("crud.get_latest_evaluations", lambda db, i: crud.get_latest_evaluations(db, [employe() for _ in range(100)])),
+        ("crud.get_latest_evaluations_by_departement", lambda db, i: crud.get_latest_evaluations_by_departement(db, departement())),
+        ("crud.get_simulations_by_employe", lambda db, i: crud.get_simulations_by_employe(db, employe())),
+        ("crud.get_versions", lambda db, i: crud.get_versions(db, "employes", "departements")),
+        ("crud.get_events", lambda db, i: crud.get_events(db, since=0, limit=500)),
+        ("crud.get_archived_until", lambda db, i: crud.get_archived_until(db)),
+        # --- Écritures (une transaction par appel) ---
+        ("crud.create_employe", lambda db, i: creer("employes", crud.create_employe(db, schemas.EmployeCreate(
+            nom=f"Bench{i}", prenom="Prénom", email=f"bench-{jeton}-{i}@example.com", departement_id=departement()
+        )))),
+        ("crud.update_employe", lambda db, i: crud.update_employe(db, employe(), schemas.EmployeUpdate(position=f"Poste {i % 7}"))),
+        ("crud.delete_employe", lambda db, i: crud.delete_employe(db, crees["employes"].pop())),
+        ("crud.record_badge", badge),
+        ("crud.create_pointage", create_pointage),
+        ("crud.update_pointage", update_pointage),
+        ("crud.create_evaluation", lambda db, i: creer("evaluations", crud.create_evaluation(db, schemas.EvaluationCreate(
+            employe_id=employe(), date_evaluation=jour_ecriture.date(), evaluateur="Bench", score_global=rng.uniform(40, 95)
+        )))),
+        ("crud.update_evaluation", lambda db, i: crud.update_evaluation(
+            db, crees["evaluations"][i % len(crees["evaluations"])], schemas.EvaluationUpdate(score_global=rng.uniform(40, 95))
+        )),
+        ("crud.delete_evaluation", lambda db, i: crud.delete_evaluation(db, crees["evaluations"].pop())),
+        ("crud.create_departement", lambda db, i: creer("departements", crud.create_departement(
+            db, schemas.DepartementCreate(nom=f"Bench {jeton} {i}")
+        ))),
+        ("crud.update_departement", lambda db, i: crud.update_departement(
+            db, crees["departements"][i % len(crees["departements"])], schemas.DepartementUpdate(nom=f"Bench {jeton} {i} bis")
+        )),
+        ("crud.delete_departement", lambda db, i: crud.delete_departement(db, crees["departements"].pop())),
+        # --- Simulation ---
+        ("simulation.run_performance_simulation", lambda db, i: simulation_service.run_performance_simulation(db, employe(), standard)),
+        ("simulation.run_performance_simulation[planning 24 mois]",
+         lambda db, i: simulation_service.run_performance_simulation(db, employe(), planning)),
+    ]
+
+def _load_scenarios(taille: Dict[str, int]) -> List[Tuple[str, Callable]]:
+    """Liste (nom, scénario) des scénarios de charge HTTP (voir load.Scenario)."""
+    n_emp, n_dep = taille["employes"], taille["departements"]
+    badges = itertools.count()
+    # Jours postérieurs aux données et aux microbenchmarks : chaque badgeage ouvre un nouveau pointage
+    premier_jour = datetime.combine(datagen.FIN_DONNEES + timedelta(days=1000), dtime(8), tzinfo=timezone.utc)
+
+    def badge(rng):
+        i = next(badges)
+        return "POST", "/api/v1/pointages/badge", {
+            "employe_id": 1 + i % n_emp, "horodatage": (premier_jour + timedelta(days=i // n_emp)).isoformat(),
+            "direction": "entree", "idempotency_key": f"charge-{time.time_ns()}-{i}"
+        }
+
+    return [
+        ("GET /employes/", lambda rng: ("GET", f"/api/v1/employes/?skip={rng.randint(0, max(0, n_emp - 100))}&limit=100", None)),
+        ("GET /employes/{id}", lambda rng: ("GET", f"/api/v1/employes/{rng.randint(1, n_emp)}", None)),
+        ("GET /departements/", lambda rng: ("GET", "/api/v1/departements/", None)),
+        ("GET /departements/{id}/projections", lambda rng: ("GET", f"/api/v1/departements/{rng.randint(1, n_dep)}/projections", None)),
+        ("GET /pointages/by_employe/{id}", lambda rng: ("GET", f"/api/v1/pointages/by_employe/{rng.randint(1, n_emp)}", None)),
+        ("GET /pointages/open", lambda rng: ("GET", "/api/v1/pointages/open", None)),
+        ("GET /evaluations/by_employe/{id}", lambda rng: ("GET", f"/api/v1/evaluations/by_employe/{rng.randint(1, n_emp)}", None)),
+        ("POST /pointages/badge", badge),
+        ("POST /simulations/run", lambda rng: ("POST", "/api/v1/simulations/run", {
+            "employe_id": rng.randint(1, n_emp), "parametres": {"scenario": "standard", "duree_mois": 6}
+        })),
+    ]
+
+def run_micro(SessionLocal, taille: Dict[str, int], repeat: int, filtre: str) -> Dict[str, Dict[str, Any]]:
+    jeton = str(time.time_ns())
+    mesures = {}
+    for nom, operation in _micro_benchmarks(taille, jeton):
+        if filtre and filtre not in nom:
+            continue
+        durees = []
+        with _silence():
+            for i in range(repeat):
+                with SessionLocal() as db:
+                    debut = time.perf_counter()
+                    operation(db, i)
+                    durees.append(time.perf_counter() - debut)
+        mesures[nom] = {"type": "micro", **results.summarize(durees)}
+        m = mesures[nom]
+        print(f"{nom:<55} p50 {m['p50_ms']:8.3f} ms  p95 {m['p95_ms']:8.3f} ms  p99 {m['p99_ms']:8.3f} ms  {m['ops_s']:8.0f} op/s")
+    return mesures
+
+def run_charge(app, taille: Dict[str, int], requetes: int, concurrence: int, filtre: str) -> Dict[str, Dict[str, Any]]:
+    from benchmarks.load import drive
+
+    mesures = {}
+    for nom, scenario in _load_scenarios(taille):
+        if filtre and filtre not in nom:
+            continue
+        with _silence():
+            m = asyncio.run(drive(app, scenario, requetes, concurrence))
+        mesures[f"http {nom}"] = {"type": "charge", **m}
+        print(f"{'http ' + nom:<55} p50 {m['p50_ms']:8.3f} ms  p95 {m['p95_ms']:8.3f} ms  p99 {m['p99_ms']:8.3f} ms  "
+              f"{m['debit_rps']:8.0f} req/s  erreurs {m['erreurs']}")
+    return mesures
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Suite de benchmarks reproductible (crud, simulation, charge HTTP).")
+    parser.add_argument("--profil", choices=sorted(datagen.PROFILS), default="petit", help="Taille des données générées")
+    parser.add_argument("--database-url", help="Base à utiliser (défaut : base SQLite temporaire)")
+    parser.add_argument("--repeat", type=int, default=200, help="Appels par microbenchmark")
+    parser.add_argument("--requetes", type=int, default=1000, help="Requêtes par scénario de charge")
+    parser.add_argument("--concurrence", type=int, default=10, help="Requêtes simultanées")
+    parser.add_argument("--only", choices=("micro", "charge"), help="N'exécuter qu'une partie de la suite")
+    parser.add_argument("--filtre", default="", help="Sous-chaîne du nom des benchmarks à exécuter")
+    parser.add_argument("--out", help="Fichier JSON des résultats")
+    parser.add_argument("--baseline", help="Résultats de référence (JSON) à comparer")
+    parser.add_argument("--seuil", type=float, default=0.10, help="Écart relatif signalé (0.10 = 10 %%)")
+    parser.add_argument("--metrique", default="p50_ms", choices=("moyenne_ms", "p50_ms", "p95_ms", "p99_ms"))
+    parser.add_argument("--fail-on-regression", action="store_true", help="Code de sortie 1 si une régression est détectée")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as dossier:
+        # DATABASE_URL est lue à l'import de app.db.session : à fixer avant tout import de l'application
+        os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{os.path.join(dossier, 'bench.db')}"
+        # Mesure du chemin des requêtes, pas des refus du contrôle d'admission (voir benchmarks/bench_admission.py)
+        os.environ.setdefault("ADMISSION_CONTROL_ENABLED", "0")
+        from app import models
+        from app.db.session import SessionLocal, engine
+        from app.main import app
+
+        models.Base.metadata.create_all(engine)
+        taille = dict(datagen.PROFILS[args.profil])
+        if datagen.is_empty(engine):
+            debut = time.perf_counter()
+            comptes = datagen.generate(engine, **taille)
+            print(f"Données générées ({args.profil}) en {time.perf_counter() - debut:.1f}s: {comptes}")
+
+        resultats = results.new_results(engine.dialect.name, {
+            "profil": args.profil, **taille, "repeat": args.repeat, "requetes": args.requetes, "concurrence": args.concurrence
+        })
+        if args.only != "charge":
+            resultats["resultats"].update(run_micro(SessionLocal, taille, args.repeat, args.filtre))
+        if args.only != "micro":
+            resultats["resultats"].update(run_charge(app, taille, args.requetes, args.concurrence, args.filtre))
+        engine.dispose()
+
+    if args.out:
+        results.save(resultats, args.out)
+        print(f"Résultats écrits dans {args.out}")
+    if args.baseline:
+        reference = results.load(args.baseline)
+        if reference["meta"]["parametres"] != resultats["meta"]["parametres"]:
+            print("Attention : paramètres différents de ceux de la référence, comparaison indicative.")
+        lignes = results.compare(reference, resultats, seuil=args.seuil, metrique=args.metrique)
+        results.print_comparison(lignes, metrique=args.metrique)
+        regressions = [nom for nom, *_, verdict in lignes if verdict == "regression"]
+        print(f"{len(regressions)} régression(s) au-delà de {args.seuil:.0%}.")
+        if regressions and args.fail_on_regression:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
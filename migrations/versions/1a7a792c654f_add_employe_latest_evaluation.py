@@ -0,0 +1,49 @@
+"""Add employe_latest_evaluation materialized table
+
+Revision ID: 1a7a792c654f
+Revises: 7482f7bd8d43
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1a7a792c654f'
+down_revision: Union[str, None] = '7482f7bd8d43'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('employe_latest_evaluation',
+    sa.Column('employe_id', sa.Integer(), nullable=False),
+    sa.Column('evaluation_id', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.ForeignKeyConstraint(['employe_id'], ['employes.id'], name=op.f('fk_employe_latest_evaluation_employe_id_employes')),
+    sa.ForeignKeyConstraint(['evaluation_id'], ['evaluations.id'], name=op.f('fk_employe_latest_evaluation_evaluation_id_evaluations')),
+    sa.PrimaryKeyConstraint('employe_id', name=op.f('pk_employe_latest_evaluation'))
+    )
+    # Remplissage initial à partir des évaluations existantes
+    op.execute(
+        """
+        INSERT INTO employe_latest_evaluation (employe_id, evaluation_id, score, date)
+        SELECT employe_id, id, score_global, date_evaluation FROM (
+            SELECT employe_id, id, score_global, date_evaluation,
+                   ROW_NUMBER() OVER (PARTITION BY employe_id ORDER BY date_evaluation DESC, id DESC) AS rang
+            FROM evaluations
+            WHERE score_global IS NOT NULL
+        ) AS classees
+        WHERE rang = 1
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('employe_latest_evaluation')
@@ -0,0 +1,33 @@
+"""Add partial index on open pointages and cloture_automatique flag
+
+Revision ID: 4a4d9786b24e
+Revises: e8433fe74c5a
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4a4d9786b24e'
+down_revision: Union[str, None] = 'e8433fe74c5a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('pointages', sa.Column('cloture_automatique', sa.Boolean(), server_default=sa.false(), nullable=False))
+    op.create_index('ix_pointages_open', 'pointages', ['date_pointage', 'employe_id'], unique=False,
+                    sqlite_where=sa.text('heure_depart IS NULL'),
+                    postgresql_where=sa.text('heure_depart IS NULL'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_pointages_open', table_name='pointages')
+    with op.batch_alter_table('pointages') as batch_op:
+        batch_op.drop_column('cloture_automatique')
@@ -0,0 +1,37 @@
+"""Add employe_calibrations table
+
+Revision ID: 6d67186a0b5c
+Revises: 1a7a792c654f
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6d67186a0b5c'
+down_revision: Union[str, None] = '1a7a792c654f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('employe_calibrations',
+    sa.Column('employe_id', sa.Integer(), nullable=False),
+    sa.Column('base_growth', sa.Float(), nullable=False),
+    sa.Column('base_decay', sa.Float(), nullable=False),
+    sa.Column('nb_evaluations', sa.Integer(), nullable=False),
+    sa.Column('rmse', sa.Float(), nullable=True),
+    sa.Column('date_calibration', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.ForeignKeyConstraint(['employe_id'], ['employes.id'], name=op.f('fk_employe_calibrations_employe_id_employes')),
+    sa.PrimaryKeyConstraint('employe_id', name=op.f('pk_employe_calibrations'))
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('employe_calibrations')
@@ -0,0 +1,33 @@
+"""Add projections.base_growth / base_decay (calibration used, for staleness detection)
+
+Revision ID: a4b5c6d7e8f9
+Revises: f3a4b5c6d7e8
+Create Date: 2026-10-20 12:00:00.000000
+
+Les projections existantes ont NULL (taux par défaut) : celles des employés calibrés sont
+recalculées une fois au prochain rafraîchissement.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4b5c6d7e8f9'
+down_revision: Union[str, None] = 'f3a4b5c6d7e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('projections', sa.Column('base_growth', sa.Float(), nullable=True))
+    op.add_column('projections', sa.Column('base_decay', sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('projections') as batch_op:
+        batch_op.drop_column('base_decay')
+        batch_op.drop_column('base_growth')
@@ -0,0 +1,52 @@
+"""Add horaires_departement, horaires_employe and jours_feries tables (work schedules)
+
+Revision ID: a8b9c0d1e2f3
+Revises: f6a7b8c9d0e1
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8b9c0d1e2f3'
+down_revision: Union[str, None] = 'f6a7b8c9d0e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('horaires_departement',
+    sa.Column('departement_id', sa.Integer(), nullable=False),
+    sa.Column('jour_semaine', sa.Integer(), nullable=False),
+    sa.Column('heure_debut', sa.Time(), nullable=False),
+    sa.Column('heure_fin', sa.Time(), nullable=False),
+    sa.Column('pause_minutes', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['departement_id'], ['departements.id'], name=op.f('fk_horaires_departement_departement_id_departements'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('departement_id', 'jour_semaine', name=op.f('pk_horaires_departement'))
+    )
+    op.create_table('horaires_employe',
+    sa.Column('employe_id', sa.Integer(), nullable=False),
+    sa.Column('jour_semaine', sa.Integer(), nullable=False),
+    sa.Column('heure_debut', sa.Time(), nullable=False),
+    sa.Column('heure_fin', sa.Time(), nullable=False),
+    sa.Column('pause_minutes', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['employe_id'], ['employes.id'], name=op.f('fk_horaires_employe_employe_id_employes'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('employe_id', 'jour_semaine', name=op.f('pk_horaires_employe'))
+    )
+    op.create_table('jours_feries',
+    sa.Column('jour', sa.Date(), nullable=False),
+    sa.Column('libelle', sa.String(length=100), nullable=False),
+    sa.PrimaryKeyConstraint('jour', name=op.f('pk_jours_feries'))
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('jours_feries')
+    op.drop_table('horaires_employe')
+    op.drop_table('horaires_departement')
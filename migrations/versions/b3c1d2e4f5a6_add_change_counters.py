@@ -0,0 +1,33 @@
+"""Add change_counters table (versions for ETag / Last-Modified)
+
+Revision ID: b3c1d2e4f5a6
+Revises: f89a536a93fe
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3c1d2e4f5a6'
+down_revision: Union[str, None] = 'f89a536a93fe'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('change_counters',
+    sa.Column('cle', sa.String(length=100), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('date_modification', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('cle', name=op.f('pk_change_counters'))
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('change_counters')
@@ -0,0 +1,36 @@
+"""Add pointages_suppressions table (re-analysis of days whose pointages were deleted)
+
+Revision ID: b5c6d7e8f9a0
+Revises: a4b5c6d7e8f9
+Create Date: 2026-10-20 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5c6d7e8f9a0'
+down_revision: Union[str, None] = 'a4b5c6d7e8f9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('pointages_suppressions',
+    sa.Column('employe_id', sa.Integer(), nullable=False),
+    sa.Column('jour', sa.Date(), nullable=False),
+    sa.Column('date_suppression', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['employe_id'], ['employes.id'], name=op.f('fk_pointages_suppressions_employe_id_employes'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('employe_id', 'jour', name=op.f('pk_pointages_suppressions'))
+    )
+    op.create_index(op.f('ix_pointages_suppressions_date_suppression'), 'pointages_suppressions', ['date_suppression'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_pointages_suppressions_date_suppression'), table_name='pointages_suppressions')
+    op.drop_table('pointages_suppressions')
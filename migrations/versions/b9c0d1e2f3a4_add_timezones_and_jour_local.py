@@ -0,0 +1,57 @@
+"""Add employee/department timezones and pointages.jour_local (server-computed local date)
+
+Revision ID: b9c0d1e2f3a4
+Revises: a8b9c0d1e2f3
+Create Date: 2026-10-19 22:00:00.000000
+
+jour_local reste NULL pour les pointages existants, qui portent l'heure locale de l'employé sans
+fuseau (la nouvelle convention est UTC) : lancer ensuite, après avoir renseigné les fuseaux des
+employés et des sites qui ne sont pas dans le fuseau par défaut,
+python -m app.scripts.backfill_jour_local (par lots, relançable), qui convertit leurs heures en UTC
+et calcule jour_local. D'ici là, leurs heures sont lues comme UTC (décalées du décalage du fuseau).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9c0d1e2f3a4'
+down_revision: Union[str, None] = 'a8b9c0d1e2f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('departements', sa.Column('fuseau_horaire', sa.String(length=50), nullable=True))
+    op.add_column('employes', sa.Column('fuseau_horaire', sa.String(length=50), nullable=True))
+
+    op.add_column('pointages', sa.Column('jour_local', sa.Date(), nullable=True))
+    op.create_index(op.f('ix_pointages_jour_local'), 'pointages', ['jour_local'], unique=False)
+    op.create_index('ix_pointages_employe_jour_local', 'pointages', ['employe_id', 'jour_local'], unique=False)
+    op.create_index('ix_pointages_jour_local_null', 'pointages', ['employe_id', 'date_pointage'], unique=False,
+                    sqlite_where=sa.text('jour_local IS NULL'),
+                    postgresql_where=sa.text('jour_local IS NULL'))
+
+    op.add_column('pointages_archive', sa.Column('jour_local', sa.Date(), nullable=True))
+    op.create_index('ix_pointages_archive_employe_jour_local', 'pointages_archive', ['employe_id', 'jour_local'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_pointages_archive_employe_jour_local', table_name='pointages_archive')
+    with op.batch_alter_table('pointages_archive') as batch_op:
+        batch_op.drop_column('jour_local')
+
+    op.drop_index('ix_pointages_jour_local_null', table_name='pointages')
+    op.drop_index('ix_pointages_employe_jour_local', table_name='pointages')
+    op.drop_index(op.f('ix_pointages_jour_local'), table_name='pointages')
+    with op.batch_alter_table('pointages') as batch_op:
+        batch_op.drop_column('jour_local')
+
+    with op.batch_alter_table('employes') as batch_op:
+        batch_op.drop_column('fuseau_horaire')
+    with op.batch_alter_table('departements') as batch_op:
+        batch_op.drop_column('fuseau_horaire')
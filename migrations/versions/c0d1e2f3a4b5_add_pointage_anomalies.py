@@ -0,0 +1,53 @@
+"""Add pointage_anomalies and analyses_anomalies tables (attendance anomaly detection)
+
+Revision ID: c0d1e2f3a4b5
+Revises: b9c0d1e2f3a4
+Create Date: 2026-10-19 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c0d1e2f3a4b5'
+down_revision: Union[str, None] = 'b9c0d1e2f3a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('pointage_anomalies',
+    sa.Column('employe_id', sa.Integer(), nullable=False),
+    sa.Column('pointage_id', sa.Integer(), nullable=False),
+    sa.Column('type', sa.String(length=30), nullable=False),
+    sa.Column('jour', sa.Date(), nullable=False),
+    sa.Column('valeur', sa.Float(), nullable=False),
+    sa.Column('moyenne', sa.Float(), nullable=True),
+    sa.Column('z_score', sa.Float(), nullable=True),
+    sa.Column('date_detection', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.ForeignKeyConstraint(['employe_id'], ['employes.id'], name=op.f('fk_pointage_anomalies_employe_id_employes'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('employe_id', 'pointage_id', 'type', name=op.f('pk_pointage_anomalies'))
+    )
+    op.create_index('ix_pointage_anomalies_jour', 'pointage_anomalies', ['jour'], unique=False)
+    op.create_table('analyses_anomalies',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('depuis', sa.Date(), nullable=False),
+    sa.Column('jusqu_au', sa.Date(), nullable=False),
+    sa.Column('pointages', sa.Integer(), nullable=False),
+    sa.Column('anomalies', sa.Integer(), nullable=False),
+    sa.Column('date_execution', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_analyses_anomalies'))
+    )
+    op.create_index(op.f('ix_analyses_anomalies_jusqu_au'), 'analyses_anomalies', ['jusqu_au'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_analyses_anomalies_jusqu_au'), table_name='analyses_anomalies')
+    op.drop_table('analyses_anomalies')
+    op.drop_index('ix_pointage_anomalies_jour', table_name='pointage_anomalies')
+    op.drop_table('pointage_anomalies')
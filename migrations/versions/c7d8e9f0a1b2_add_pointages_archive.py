@@ -0,0 +1,60 @@
+"""Add pointages_archive table and ON DELETE CASCADE on pointages.employe_id
+
+Revision ID: c7d8e9f0a1b2
+Revises: b3c1d2e4f5a6
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d8e9f0a1b2'
+down_revision: Union[str, None] = 'b3c1d2e4f5a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _recreate_pointages_fk(ondelete) -> None:
+    # SQLite : la table est recréée (batch) ; l'index partiel est recréé à part pour garder sa condition
+    op.drop_index('ix_pointages_open', table_name='pointages')
+    with op.batch_alter_table('pointages', recreate='always') as batch_op:
+        batch_op.drop_constraint('fk_pointages_employe_id_employes', type_='foreignkey')
+        batch_op.create_foreign_key(
+            'fk_pointages_employe_id_employes', 'employes', ['employe_id'], ['id'], ondelete=ondelete
+        )
+    op.create_index(
+        'ix_pointages_open', 'pointages', ['date_pointage', 'employe_id'], unique=False,
+        sqlite_where=sa.text('heure_depart IS NULL'), postgresql_where=sa.text('heure_depart IS NULL')
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('pointages_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('date_pointage', sa.Date(), nullable=False),
+    sa.Column('heure_arrivee', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('heure_depart', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('seq', sa.Integer(), nullable=False),
+    sa.Column('cloture_automatique', sa.Boolean(), server_default=sa.false(), nullable=False),
+    sa.Column('employe_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['employe_id'], ['employes.id'], name=op.f('fk_pointages_archive_employe_id_employes'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_pointages_archive'))
+    )
+    op.create_index(op.f('ix_pointages_archive_date_pointage'), 'pointages_archive', ['date_pointage'], unique=False)
+    op.create_index('ix_pointages_archive_employe_date', 'pointages_archive', ['employe_id', 'date_pointage'], unique=False)
+
+    _recreate_pointages_fk(ondelete='CASCADE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _recreate_pointages_fk(ondelete=None)
+
+    op.drop_index('ix_pointages_archive_employe_date', table_name='pointages_archive')
+    op.drop_index(op.f('ix_pointages_archive_date_pointage'), table_name='pointages_archive')
+    op.drop_table('pointages_archive')
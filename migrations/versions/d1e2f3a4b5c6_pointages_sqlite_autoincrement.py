@@ -0,0 +1,59 @@
+"""Rebuild pointages with AUTOINCREMENT (SQLite): never reuse the id of a deleted or archived pointage
+
+Revision ID: d1e2f3a4b5c6
+Revises: c0d1e2f3a4b5
+Create Date: 2026-10-20 09:00:00.000000
+
+Sans AUTOINCREMENT, SQLite attribue max(id) + 1 : une fois le pointage le plus récent supprimé,
+un nouveau pointage pouvait reprendre un ID déjà présent dans 'pointages_archive'. Le compteur
+(sqlite_sequence) est initialisé au plus grand ID connu, archive comprise.
+Sans effet sur PostgreSQL (les séquences ne réattribuent pas d'ID).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd1e2f3a4b5c6'
+down_revision: Union[str, None] = 'c0d1e2f3a4b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _rebuild_pointages(autoincrement: bool) -> None:
+    # SQLite : la table est recréée (batch) ; les index partiels sont recréés à part pour garder leur condition
+    op.drop_index('ix_pointages_open', table_name='pointages')
+    op.drop_index('ix_pointages_jour_local_null', table_name='pointages')
+    with op.batch_alter_table('pointages', recreate='always', table_kwargs={'sqlite_autoincrement': autoincrement}):
+        pass
+    op.create_index(
+        'ix_pointages_open', 'pointages', ['date_pointage', 'employe_id'], unique=False,
+        sqlite_where=sa.text('heure_depart IS NULL'), postgresql_where=sa.text('heure_depart IS NULL')
+    )
+    op.create_index(
+        'ix_pointages_jour_local_null', 'pointages', ['employe_id', 'date_pointage'], unique=False,
+        sqlite_where=sa.text('jour_local IS NULL'), postgresql_where=sa.text('jour_local IS NULL')
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    _rebuild_pointages(autoincrement=True)
+    # Le compteur repart du plus grand ID attribué, y compris ceux des pointages archivés
+    op.execute("DELETE FROM sqlite_sequence WHERE name = 'pointages'")
+    op.execute(
+        "INSERT INTO sqlite_sequence (name, seq) SELECT 'pointages', max(id) FROM "
+        "(SELECT max(id) AS id FROM pointages UNION ALL SELECT max(id) FROM pointages_archive) "
+        "HAVING max(id) IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    _rebuild_pointages(autoincrement=False)
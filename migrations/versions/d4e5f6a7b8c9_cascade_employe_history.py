@@ -0,0 +1,54 @@
+"""ON DELETE CASCADE on employee history tables, SET NULL on employes.departement_id
+
+Revision ID: d4e5f6a7b8c9
+Revises: c7d8e9f0a1b2
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e5f6a7b8c9'
+down_revision: Union[str, None] = 'c7d8e9f0a1b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, colonne, table référencée, ON DELETE)
+FOREIGN_KEYS = [
+    ('evaluations', 'employe_id', 'employes', 'CASCADE'),
+    ('simulations', 'employe_id', 'employes', 'CASCADE'),
+    ('employe_latest_evaluation', 'employe_id', 'employes', 'CASCADE'),
+    ('employe_latest_evaluation', 'evaluation_id', 'evaluations', 'CASCADE'),
+    ('employe_calibrations', 'employe_id', 'employes', 'CASCADE'),
+    ('projections', 'employe_id', 'employes', 'CASCADE'),
+    ('employes', 'departement_id', 'departements', 'SET NULL'),
+]
+
+
+def _recreate_foreign_keys(with_ondelete: bool) -> None:
+    # SQLite : chaque table est recréée (batch). Les clés étrangères ne sont pas contrôlées pendant
+    # la migration (pas de PRAGMA foreign_keys sur la connexion d'Alembic) : recréer 'employes'
+    # ne déclenche donc aucune cascade sur les tables filles.
+    tables = {}
+    for table, colonne, reference, ondelete in FOREIGN_KEYS:
+        tables.setdefault(table, []).append((colonne, reference, ondelete if with_ondelete else None))
+    for table, cles in tables.items():
+        with op.batch_alter_table(table) as batch_op:
+            for colonne, reference, ondelete in cles:
+                nom = f'fk_{table}_{colonne}_{reference}'
+                batch_op.drop_constraint(nom, type_='foreignkey')
+                batch_op.create_foreign_key(nom, reference, [colonne], ['id'], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _recreate_foreign_keys(with_ondelete=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _recreate_foreign_keys(with_ondelete=False)
@@ -0,0 +1,37 @@
+"""Rebuild change_events with AUTOINCREMENT (SQLite): event ids are never reused after a purge
+
+Revision ID: e2f3a4b5c6d7
+Revises: d1e2f3a4b5c6
+Create Date: 2026-10-20 10:00:00.000000
+
+Sans AUTOINCREMENT, SQLite repart de max(id) + 1 : une purge qui vide la table faisait
+repartir les ids à 1 et un consommateur de GET /events?since=N ne recevait plus rien.
+Sans effet sur PostgreSQL (les séquences ne réattribuent pas d'ID).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2f3a4b5c6d7'
+down_revision: Union[str, None] = 'd1e2f3a4b5c6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    # La copie des lignes initialise le compteur (sqlite_sequence) au plus grand id existant
+    with op.batch_alter_table('change_events', recreate='always', table_kwargs={'sqlite_autoincrement': True}):
+        pass
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    with op.batch_alter_table('change_events', recreate='always', table_kwargs={'sqlite_autoincrement': False}):
+        pass
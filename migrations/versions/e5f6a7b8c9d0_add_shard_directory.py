@@ -0,0 +1,39 @@
+"""Add shard_directory and shard_sequences tables (optional sharding by department)
+
+Revision ID: e5f6a7b8c9d0
+Revises: d4e5f6a7b8c9
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f6a7b8c9d0'
+down_revision: Union[str, None] = 'd4e5f6a7b8c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('shard_directory',
+    sa.Column('cle', sa.String(length=100), nullable=False),
+    sa.Column('shard', sa.String(length=50), nullable=False),
+    sa.Column('date_modification', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('cle', name=op.f('pk_shard_directory'))
+    )
+    op.create_table('shard_sequences',
+    sa.Column('nom', sa.String(length=100), nullable=False),
+    sa.Column('prochain_id', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('nom', name=op.f('pk_shard_sequences'))
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('shard_sequences')
+    op.drop_table('shard_directory')
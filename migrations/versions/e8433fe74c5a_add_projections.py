@@ -0,0 +1,39 @@
+"""Add projections table and index employes.departement_id
+
+Revision ID: e8433fe74c5a
+Revises: 6d67186a0b5c
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8433fe74c5a'
+down_revision: Union[str, None] = '6d67186a0b5c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('projections',
+    sa.Column('employe_id', sa.Integer(), nullable=False),
+    sa.Column('horizon_mois', sa.Integer(), nullable=False),
+    sa.Column('evaluation_id', sa.Integer(), nullable=True),
+    sa.Column('performance_initiale', sa.Float(), nullable=False),
+    sa.Column('performance_predite', sa.JSON(), nullable=False),
+    sa.Column('date_calcul', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.ForeignKeyConstraint(['employe_id'], ['employes.id'], name=op.f('fk_projections_employe_id_employes')),
+    sa.PrimaryKeyConstraint('employe_id', 'horizon_mois', name=op.f('pk_projections'))
+    )
+    op.create_index(op.f('ix_employes_departement_id'), 'employes', ['departement_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_employes_departement_id'), table_name='employes')
+    op.drop_table('projections')
@@ -0,0 +1,52 @@
+"""Add pointages.date_modification and analyses_anomalies.marque (re-analysis of modified days)
+
+Revision ID: f3a4b5c6d7e8
+Revises: e2f3a4b5c6d7
+Create Date: 2026-10-20 11:00:00.000000
+
+date_modification reste NULL pour les pointages existants (non modifiés depuis) ; les exécutions
+de la détection d'anomalies antérieures n'ont pas de marque, la suivante reprend donc comme avant
+au lendemain du dernier jour analysé.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a4b5c6d7e8'
+down_revision: Union[str, None] = 'e2f3a4b5c6d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('pointages', sa.Column('date_modification', sa.DateTime(timezone=True), nullable=True))
+    op.create_index(op.f('ix_pointages_date_modification'), 'pointages', ['date_modification'], unique=False)
+    op.add_column('pointages_archive', sa.Column('date_modification', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('analyses_anomalies', sa.Column('marque', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('analyses_anomalies') as batch_op:
+        batch_op.drop_column('marque')
+    with op.batch_alter_table('pointages_archive') as batch_op:
+        batch_op.drop_column('date_modification')
+
+    # SQLite : la table est recréée (batch) ; les index partiels sont recréés à part pour garder leur condition
+    op.drop_index(op.f('ix_pointages_date_modification'), table_name='pointages')
+    op.drop_index('ix_pointages_open', table_name='pointages')
+    op.drop_index('ix_pointages_jour_local_null', table_name='pointages')
+    with op.batch_alter_table('pointages', table_kwargs={'sqlite_autoincrement': True}) as batch_op:
+        batch_op.drop_column('date_modification')
+    op.create_index(
+        'ix_pointages_open', 'pointages', ['date_pointage', 'employe_id'], unique=False,
+        sqlite_where=sa.text('heure_depart IS NULL'), postgresql_where=sa.text('heure_depart IS NULL')
+    )
+    op.create_index(
+        'ix_pointages_jour_local_null', 'pointages', ['employe_id', 'date_pointage'], unique=False,
+        sqlite_where=sa.text('jour_local IS NULL'), postgresql_where=sa.text('jour_local IS NULL')
+    )
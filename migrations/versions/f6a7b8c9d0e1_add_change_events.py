@@ -0,0 +1,38 @@
+"""Add change_events table (outbox of employee, pointage and evaluation changes)
+
+Revision ID: f6a7b8c9d0e1
+Revises: e5f6a7b8c9d0
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6a7b8c9d0e1'
+down_revision: Union[str, None] = 'e5f6a7b8c9d0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('change_events',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('date_creation', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('ressource', sa.String(length=50), nullable=False),
+    sa.Column('ressource_id', sa.Integer(), nullable=False),
+    sa.Column('operation', sa.String(length=10), nullable=False),
+    sa.Column('donnees', sa.JSON(), nullable=True),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_change_events'))
+    )
+    op.create_index(op.f('ix_change_events_date_creation'), 'change_events', ['date_creation'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_change_events_date_creation'), table_name='change_events')
+    op.drop_table('change_events')
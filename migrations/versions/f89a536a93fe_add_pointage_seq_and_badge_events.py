@@ -0,0 +1,59 @@
+"""Add pointages.seq with unique (employe_id, date_pointage, seq) index and badge_events table
+
+Revision ID: f89a536a93fe
+Revises: 4a4d9786b24e
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f89a536a93fe'
+down_revision: Union[str, None] = '4a4d9786b24e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('pointages', sa.Column('seq', sa.Integer(), server_default=sa.text('1'), nullable=False))
+    # Numéroter les pointages existants d'un même employé le même jour avant de poser l'index unique
+    op.execute(
+        """
+        UPDATE pointages SET seq = (
+            SELECT numerotes.rang FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY employe_id, date_pointage ORDER BY heure_arrivee, id
+                ) AS rang
+                FROM pointages
+            ) AS numerotes
+            WHERE numerotes.id = pointages.id
+        )
+        """
+    )
+    op.create_index('ix_pointages_employe_jour_seq', 'pointages', ['employe_id', 'date_pointage', 'seq'], unique=True)
+
+    op.create_table('badge_events',
+    sa.Column('idempotency_key', sa.String(length=100), nullable=False),
+    sa.Column('employe_id', sa.Integer(), nullable=False),
+    sa.Column('direction', sa.String(length=10), nullable=False),
+    sa.Column('horodatage', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('pointage_id', sa.Integer(), nullable=True),
+    sa.Column('action', sa.String(length=20), nullable=False),
+    sa.Column('date_reception', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('idempotency_key', name=op.f('pk_badge_events'))
+    )
+    op.create_index(op.f('ix_badge_events_date_reception'), 'badge_events', ['date_reception'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_badge_events_date_reception'), table_name='badge_events')
+    op.drop_table('badge_events')
+    op.drop_index('ix_pointages_employe_jour_seq', table_name='pointages')
+    with op.batch_alter_table('pointages') as batch_op:
+        batch_op.drop_column('seq')